@@ -0,0 +1,92 @@
+"""
+Blocking engine work for async endpoints.
+
+Handlers never call the engine on the event loop: one-shot calls run under the task scheduler and are awaited
+through their futures, and streamed generators are iterated on the thread pool. Each endpoint has a limit on
+in-flight calls (further requests get 503 with Retry-After rather than piling up) and one-shot calls a timeout.
+"""
+
+import asyncio
+from concurrent.futures import Future
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import HTTPException
+from starlette.concurrency import iterate_in_threadpool
+
+from .. import server_state
+from ..config import ENDPOINT_CONCURRENCY, ENDPOINT_TIMEOUT_SECONDS
+
+_active: Dict[str, int] = {}  # endpoint -> calls in flight; only touched on the event loop
+
+
+def _check(endpoint: str) -> None:
+    if _active.get(endpoint, 0) >= ENDPOINT_CONCURRENCY.get(endpoint, 1):
+        raise HTTPException(status_code=503, detail=f"Too many concurrent {endpoint} requests", headers={"Retry-After": "1"})
+
+
+def _acquire(endpoint: str) -> None:
+    _check(endpoint)
+    _active[endpoint] = _active.get(endpoint, 0) + 1
+
+
+def _release(endpoint: str) -> None:
+    _active[endpoint] -= 1
+
+
+def _release_when_done(endpoint: str, future: Future) -> None:
+    """Release `endpoint`'s slot on the event loop once `future` (possibly still running on a worker) finishes."""
+    loop = asyncio.get_running_loop()
+
+    def release(_):
+        try:
+            loop.call_soon_threadsafe(_release, endpoint)
+        except RuntimeError:
+            pass  # the loop is gone, and its counters with it
+
+    future.add_done_callback(release)
+
+
+async def run_engine_call(endpoint: str, fn: Callable, *args, priority_class: str = "preview", client: str = "anonymous",
+                          timeout: Optional[float] = None, **kwargs):
+    """
+    Await `fn(*args, **kwargs)` run by the task scheduler in `priority_class`.
+
+    Raises 503 when `endpoint` is at its concurrency limit and 504 after `timeout` seconds (default
+    ENDPOINT_TIMEOUT_SECONDS). A call that already started keeps running to completion after a timeout, and keeps
+    its slot until then; only a still-queued one is dropped.
+    """
+    _acquire(endpoint)
+    future = None
+    try:
+        future = server_state.task_manager.schedule(priority_class, fn, *args, client=client, **kwargs)
+        timeout = ENDPOINT_TIMEOUT_SECONDS if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"{endpoint} timed out after {timeout:g}s")
+    finally:
+        if future is None or future.done():
+            _release(endpoint)
+        else:
+            _release_when_done(endpoint, future)
+
+
+def stream_engine_output(endpoint: str, chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Hold one of `endpoint`'s slots while a blocking byte generator is drained on the thread pool.
+
+    The limit is checked immediately, so a 503 is raised before the response starts, but the slot is only taken
+    once the response is iterated: a response that is never sent cannot leak it. Streams that pass the check
+    together may briefly exceed the limit rather than fail after their headers went out.
+    """
+    _check(endpoint)
+
+    async def drain():
+        _active[endpoint] = _active.get(endpoint, 0) + 1
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                yield chunk
+        finally:
+            _release(endpoint)
+
+    return drain()
@@ -1,12 +1,17 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from .. import server_state
-from ..utils import numpy_to_wav_bytes
+from ..utils.stream_encoder import STREAM_MEDIA_TYPES, encode_stream
 from ..dub_logic import run_dub_task
 from ..s2s_logic import run_s2s_task, run_batch_s2s_task
 from ..utils.subtitles import generate_srt_from_segments, generate_vtt_from_segments
+from .tasks import client_key
+from .engine_calls import run_engine_call, stream_engine_output
 from .schemas import PodcastRequest, S2SRequest, BatchS2SRequest, DubRequest, StreamingSynthesisRequest, DetectLanguageRequest, TEMPERATURE_PRESETS
-from ..config import logger
+from ..config import STREAM_COMPRESSION_LEVEL, logger
+from ..result_spool import result_spool
+from concurrent.futures import Future
+from typing import Any, Dict, Tuple
 import io
 
 router = APIRouter(prefix="/api/generate", tags=["generation"])
@@ -17,71 +22,105 @@ async def stream_synthesis(request: StreamingSynthesisRequest):
     Stream audio chunks for low-latency preview.
     """
     try:
-        def audio_generator():
-            # Minimal WAV header for the stream might be needed depending on the client
-            # but for simplicity we yield raw WAV bytes from each chunk.
-            for wav, sr in server_state.engine.stream_synthesize(
-                text=request.text,
-                profile=request.profile,
-                language=request.language or "auto",
-                temperature=request.temperature
-            ):
-                yield numpy_to_wav_bytes(wav, sr).read()
-
-        return StreamingResponse(audio_generator(), media_type="audio/wav")
+        # ⚡ Bolt: Chunks are emitted every few codec frames while the talker is still generating, as one stream with a
+        # single container header; each encoded chunk goes out as its own HTTP chunk.
+        chunks = server_state.engine.stream_synthesize(
+            text=request.text,
+            profile=request.profile,
+            language=request.language or "auto",
+            instruct=request.instruct,
+            temperature=request.temperature
+        )
+        body = stream_engine_output("stream", encode_stream(chunks, request.format, STREAM_COMPRESSION_LEVEL))
+        return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[request.format])
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Streaming synthesis failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Streaming synthesis failed")
 
+def _synthesis_call(is_podcast: bool, request_data: PodcastRequest) -> Tuple[str, Dict[str, Any]]:
+    """Engine method and keyword arguments that synthesize a segment or podcast request."""
+    # ⚡ Bolt Fix: Handle both dict and Pydantic models correctly
+    profiles_map = {}
+    if isinstance(request_data.profiles, dict):
+        for k, v in request_data.profiles.items():
+            # If v is already a dict, use it, else use model_dump
+            profiles_map[k] = v if isinstance(v, dict) else v.model_dump()
+    else:
+        # Fallback for list-based if still exists in some requests
+        for p in request_data.profiles:
+            p_dict = p if isinstance(p, dict) else p.model_dump()
+            profiles_map[p_dict["role"]] = p_dict
+
+    # ⚡ Bolt: Resolve temperature kwargs from preset
+    temp_kwargs = dict(TEMPERATURE_PRESETS.get(request_data.temperature_preset or "balanced", TEMPERATURE_PRESETS["balanced"]))
+    global_temp = temp_kwargs.pop("temperature", 0.9)
+    if request_data.temperature is not None:
+        global_temp = request_data.temperature
+    if request_data.seed is not None:
+        temp_kwargs["seed"] = request_data.seed
+
+    if is_podcast:
+        return "generate_podcast", dict(
+            script=[line.model_dump() for line in request_data.script],
+            profiles=profiles_map,
+            bgm_mood=request_data.bgm_mood,
+            ducking_level=request_data.ducking_level or 0.0,
+            eq_preset=request_data.eq_preset or "flat",
+            reverb_level=request_data.reverb_level or 0.0,
+            master_acx=request_data.master_acx or False,
+            temperature=global_temp,
+            render_session=request_data.render_session,
+            **temp_kwargs
+        )
+    line = request_data.script[0]
+    profile = profiles_map.get(line.role)
+    return "generate_segment", dict(text=line.text, profile=profile, language=line.language, temperature=line.temperature or global_temp, **temp_kwargs)
+
+def _submit_to_workers(is_podcast: bool, method: str, kwargs: Dict[str, Any]) -> Future:
+    """
+    Hand a dispatched synthesis call to the inference worker pool, waiting for a free worker slot.
+
+    Called from the task body, so calls reach the workers in the task scheduler's priority and fair-queuing order.
+    """
+    profiles = kwargs["profiles"].values() if is_podcast else [kwargs["profile"]]
+    model_types = {server_state.engine._get_model_type_for_profile(p) for p in profiles if p}
+    return server_state.worker_pool.submit(method, kwargs, model_types, affinity=kwargs.get("render_session"), wait=None)
+
+def _report_podcast_progress(task_id: str, detail: Dict[str, Any]):
+    """Map `generate_podcast` progress onto the task's 30-80% synthesis span."""
+    done, total = detail["segments_done"], max(detail["segments_total"], 1)
+    message = "Mixing and mastering" if detail["stage"] == "mixing" else f"Synthesized {done}/{total} lines"
+    server_state.task_manager.update_task(task_id, progress=30 + 50 * done // total, message=message, detail=detail)
+
 def run_synthesis_task(task_id: str, is_podcast: bool, request_data: PodcastRequest):
     try:
         server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.PROCESSING, progress=10, message="Initializing engine")
-        
-        # ⚡ Bolt Fix: Handle both dict and Pydantic models correctly
-        profiles_map = {}
-        if isinstance(request_data.profiles, dict):
-            for k, v in request_data.profiles.items():
-                # If v is already a dict, use it, else use model_dump
-                profiles_map[k] = v if isinstance(v, dict) else v.model_dump()
-        else:
-            # Fallback for list-based if still exists in some requests
-            for p in request_data.profiles:
-                p_dict = p if isinstance(p, dict) else p.model_dump()
-                profiles_map[p_dict["role"]] = p_dict
-
-        server_state.task_manager.update_task(task_id, progress=30, message="Loading models and starting inference")
-
-        # ⚡ Bolt: Resolve temperature kwargs from preset
-        temp_kwargs = dict(TEMPERATURE_PRESETS.get(request_data.temperature_preset or "balanced", TEMPERATURE_PRESETS["balanced"]))
-        global_temp = temp_kwargs.pop("temperature", 0.9)
-        if request_data.temperature is not None:
-            global_temp = request_data.temperature
-
-        if is_podcast:
-            script_data = [line.model_dump() for line in request_data.script]
-            result = server_state.engine.generate_podcast(
-                script_data, 
-                profiles=profiles_map, 
-                bgm_mood=request_data.bgm_mood, 
-                ducking_level=request_data.ducking_level or 0.0,
-                eq_preset=request_data.eq_preset or "flat",
-                reverb_level=request_data.reverb_level or 0.0,
-                master_acx=request_data.master_acx or False,
-                temperature=global_temp,
-                **temp_kwargs
-            )
+
+        method, kwargs = _synthesis_call(is_podcast, request_data)
+        if server_state.worker_pool is None:
+            server_state.task_manager.update_task(task_id, progress=30, message="Loading models and starting inference")
+            if is_podcast:
+                kwargs["on_progress"] = lambda detail: _report_podcast_progress(task_id, detail)
+            result = getattr(server_state.engine, method)(**kwargs)
         else:
-            line = request_data.script[0]
-            profile = profiles_map.get(line.role)
-            wav, sr = server_state.engine.generate_segment(line.text, profile=profile, language=line.language, temperature=line.temperature or global_temp, **temp_kwargs)
+            server_state.task_manager.update_task(task_id, progress=20, message="Waiting for an inference worker")
+            future = _submit_to_workers(is_podcast, method, kwargs)
+            server_state.task_manager.update_task(task_id, progress=30, message="Running on inference worker")
+            result = future.result()
+
+        if not is_podcast:
+            wav, sr = result
             result = {"waveform": wav, "sample_rate": sr}
 
         server_state.task_manager.update_task(task_id, progress=80, message="Encoding audio")
         if not result:
             raise Exception("Generation returned no audio")
 
-        wav_bytes = numpy_to_wav_bytes(result["waveform"], result["sample_rate"]).read()
-        server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.COMPLETED, progress=100, message="Ready", result=wav_bytes)
+        # ⚡ Bolt: Spool the WAV to disk; the task record only keeps its path
+        spooled = result_spool.put_wav(task_id, result["waveform"], result["sample_rate"])
+        server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.COMPLETED, progress=100, message="Ready", result=spooled)
 
     except Exception as e:
         logger.error(f"Task {task_id} failed: {e}", exc_info=True)
@@ -93,8 +132,8 @@ def run_voice_changer_task(task_id: str, source_audio: str, target_profile: dict
         result = server_state.engine.generate_voice_changer(source_audio, target_profile)
 
         server_state.task_manager.update_task(task_id, progress=80, message="Encoding audio...")
-        wav_bytes = numpy_to_wav_bytes(result["waveform"], result["sample_rate"]).read()
-        server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.COMPLETED, progress=100, message="Ready", result=wav_bytes)
+        spooled = result_spool.put_wav(task_id, result["waveform"], result["sample_rate"])
+        server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.COMPLETED, progress=100, message="Ready", result=spooled)
     except Exception as e:
         logger.error(f"Voice Changer Task {task_id} failed: {e}")
         server_state.task_manager.update_task(task_id, status=server_state.TaskStatus.FAILED, error=str(e), message=f"Voice changer failed: {e}")
@@ -109,7 +148,7 @@ def validate_request(request: PodcastRequest):
             raise HTTPException(status_code=400, detail='Text too long')
 
 @router.post("/segment")
-async def generate_segment(request: PodcastRequest, background_tasks: BackgroundTasks):
+async def generate_segment(request: PodcastRequest, http_request: Request):
     try:
         validate_request(request)
     except HTTPException as e:
@@ -117,11 +156,11 @@ async def generate_segment(request: PodcastRequest, background_tasks: Background
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     task_id = server_state.task_manager.create_task("segment_generation", {"role": request.script[0].role})
-    background_tasks.add_task(run_synthesis_task, task_id, False, request)
+    server_state.task_manager.submit(task_id, run_synthesis_task, False, request, client=client_key(http_request))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 @router.post("/podcast")
-async def generate_podcast(request: PodcastRequest, background_tasks: BackgroundTasks):
+async def generate_podcast(request: PodcastRequest, http_request: Request):
     try:
         validate_request(request)
     except HTTPException as e:
@@ -137,47 +176,50 @@ async def generate_podcast(request: PodcastRequest, background_tasks: Background
             else:
                 profiles_map = {p["role"]: {"type": p["type"], "value": p["value"]} for p in request.profiles}
             
-            def audio_stream():
-                for wav, sr, item in server_state.engine.stream_podcast(
-                    script=[line.model_dump() for line in request.script],
-                    profiles=profiles_map,
-                    eq_preset=request.eq_preset or "flat",
-                    reverb_level=request.reverb_level or 0.0,
-                    temperature=request.temperature
-                ):
-                    yield numpy_to_wav_bytes(wav, sr).read()
-            
-            return StreamingResponse(audio_stream(), media_type="audio/wav")
+            blocks = server_state.engine.stream_podcast(
+                script=[line.model_dump() for line in request.script],
+                profiles=profiles_map,
+                eq_preset=request.eq_preset or "flat",
+                reverb_level=request.reverb_level or 0.0,
+                temperature=request.temperature
+            )
+            chunks = ((wav, sr) for wav, sr, _ in blocks)
+            body = stream_engine_output("stream", encode_stream(chunks, request.stream_format, STREAM_COMPRESSION_LEVEL))
+            return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[request.stream_format])
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Streaming podcast failed: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Streaming podcast failed")
 
     task_id = server_state.task_manager.create_task("podcast_generation", {"segments": len(request.script)})
-    background_tasks.add_task(run_synthesis_task, task_id, True, request)
+    server_state.task_manager.submit(task_id, run_synthesis_task, True, request, client=client_key(http_request), cost=len(request.script))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 @router.post("/s2s")
-async def generate_s2s(request: S2SRequest, background_tasks: BackgroundTasks):
+async def generate_s2s(request: S2SRequest, http_request: Request):
     task_id = server_state.task_manager.create_task("s2s", {"source": request.source_audio})
-    background_tasks.add_task(run_s2s_task, task_id, request.source_audio, request.target_voice, server_state.engine, request.preserve_prosody, request.instruct)
+    server_state.task_manager.submit(task_id, run_s2s_task, request.source_audio, request.target_voice, server_state.engine, request.preserve_prosody, request.instruct, client=client_key(http_request))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 @router.post("/dub")
-async def generate_dub(request: DubRequest, background_tasks: BackgroundTasks):
+async def generate_dub(request: DubRequest, http_request: Request):
     task_id = server_state.task_manager.create_task("dub", {"source": request.source_audio})
-    background_tasks.add_task(run_dub_task, task_id, request.source_audio, request.target_lang, server_state.engine)
+    server_state.task_manager.submit(task_id, run_dub_task, request.source_audio, request.target_lang, server_state.engine, client=client_key(http_request))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 
 @router.post("/detect-language")
-async def detect_language(request: DetectLanguageRequest):
+async def detect_language(request: DetectLanguageRequest, http_request: Request):
     """Detect language from an existing uploaded audio file."""
     try:
-        result = server_state.engine.transcribe_audio(request.source_audio)
+        result = await run_engine_call("detect_language", server_state.engine.transcribe_audio, request.source_audio, client=client_key(http_request))
         return {
             "language": result["language"],
             "text_preview": result["text"][:200]
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Language detection failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -201,7 +243,7 @@ async def download_subtitles(task_id: str, format: str = "srt"):
         return StreamingResponse(io.BytesIO(content.encode()), media_type="text/plain", headers={"Content-Disposition": f"attachment; filename=subtitles_{task_id}.srt"})
 
 @router.post("/s2s/batch")
-async def generate_batch_s2s(request: BatchS2SRequest, background_tasks: BackgroundTasks):
+async def generate_batch_s2s(request: BatchS2SRequest, http_request: Request):
     task_id = server_state.task_manager.create_task("batch_s2s", {"count": len(request.source_audios)})
-    background_tasks.add_task(run_batch_s2s_task, task_id, request.source_audios, request.target_voice, server_state.engine, request.preserve_prosody, request.instruct)
+    server_state.task_manager.submit(task_id, run_batch_s2s_task, request.source_audios, request.target_voice, server_state.engine, request.preserve_prosody, request.instruct, client=client_key(http_request), cost=len(request.source_audios))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-import zipfile
-import io
+from fastapi.responses import FileResponse, StreamingResponse
 import os
 import json
 from pathlib import Path
 from .schemas import ProjectData
 from ..config import PROJECTS_DIR, VIDEO_DIR, SHARED_ASSETS_DIR, logger
+from ..utils.zip_stream import stream_zip
 
 router = APIRouter(prefix="/api/projects", tags=["projects"])
 
@@ -50,22 +49,14 @@ async def export_project(name: str):
     if not project_file.exists():
         raise HTTPException(status_code=404, detail="Project not found")
 
-    # Create ZIP in memory
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-        # 1. Add project JSON
-        zip_file.write(project_file, f"{safe_name}.json")
+    entries = [(project_file, f"{safe_name}.json")]
+    video_file = VIDEO_DIR / f"{safe_name}.mp4"
+    if video_file.exists():
+        entries.append((video_file, f"{safe_name}.mp4"))
 
-        # 2. Try to find and add generated video
-        video_file = VIDEO_DIR / f"{safe_name}.mp4"
-        if video_file.exists():
-            zip_file.write(video_file, f"{safe_name}.mp4")
-
-    zip_buffer.seek(0)
-
-    from fastapi.responses import StreamingResponse
+    # ⚡ Bolt: Stream the bundle as it is compressed instead of building it in memory first
     return StreamingResponse(
-        zip_buffer,
+        stream_zip(entries),
         media_type="application/x-zip-compressed",
         headers={"Content-Disposition": f"attachment; filename={safe_name}_bundle.zip"}
     )
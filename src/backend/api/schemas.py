@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_validator
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Literal
 
 class SpeakerProfile(BaseModel):
     role: Optional[str] = None
@@ -16,6 +16,7 @@ class VoiceLibrary(BaseModel):
     voices: List[Dict[str, Any]]
 
 class ScriptLine(BaseModel):
+    id: Optional[str] = None  # Production block id; enables per-block reuse in incremental renders
     role: str
     text: str
     start_time: Optional[float] = 0.0
@@ -33,9 +34,12 @@ class PodcastRequest(BaseModel):
     eq_preset: Optional[str] = "flat"
     reverb_level: Optional[float] = 0.0
     stream: Optional[bool] = False
+    stream_format: Literal["pcm", "opus", "mp3"] = "pcm"  # Container of the streamed response
     master_acx: Optional[bool] = False
     temperature: Optional[float] = None
     temperature_preset: Optional[str] = "balanced"
+    seed: Optional[int] = None  # Fixed seed; reproducible and cacheable when continuous batching or the prefix cache is on
+    render_session: Optional[str] = None  # Re-render incrementally against this session's previous render
 
 class S2SRequest(BaseModel):
     source_audio: str
@@ -63,6 +67,7 @@ class StreamingSynthesisRequest(BaseModel):
     language: Optional[str] = "auto"
     instruct: Optional[str] = None
     temperature: Optional[float] = None
+    format: Literal["pcm", "opus", "mp3"] = "pcm"
 
 TEMPERATURE_PRESETS = {
     "consistent": {"temperature": 0.3, "top_k": 20, "top_p": 0.8, "repetition_penalty": 1.2},
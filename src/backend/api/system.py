@@ -54,8 +54,17 @@ async def get_audit_log():
 @router.get("/stats")
 async def get_system_stats():
     from ..utils import resource_monitor, storage_manager
+    from ..engine_modules.segment_cache import segment_cache
+    from ..engine_modules.voice_store import voice_prompt_store
+    from ..model_loader import manager
+    from ..result_spool import result_spool
+    from .. import server_state
     stats = resource_monitor.get_stats()
     stats["storage"] = storage_manager.get_stats()
+    stats["caches"] = {"segments": segment_cache.stats(), "voice_prompts": voice_prompt_store.stats(), "results": result_spool.stats()}
+    stats["models"] = manager.stats()
+    if server_state.worker_pool is not None:
+        stats["workers"] = server_state.worker_pool.stats()
     return stats
 
 @router.post("/benchmark")
@@ -65,12 +74,13 @@ async def run_benchmark():
     import pstats
     from ..utils import Profiler
     from .. import server_state
+    from .engine_calls import run_engine_call
     
     # Sample data for benchmarking
     text = "This is a performance benchmark synthesis for the Qwen TTS engine."
     profile = {"type": "preset", "value": "Ryan"}
     
-    try:
+    def benchmark():
         with Profiler("Engine Benchmark") as p:
             # Run a small synthesis
             server_state.engine.generate_segment(text, profile)
@@ -86,8 +96,14 @@ async def run_benchmark():
         s = io.StringIO()
         ps = pstats.Stats(pr, stream=s).sort_stats('cumulative')
         ps.print_stats(30) # Return top 30
-        
-        return {"status": "ok", "output": s.getvalue()}
+        return s.getvalue()
+
+    try:
+        # ⚡ Bolt: Profile on a scheduler thread, not the event loop
+        output = await run_engine_call("benchmark", benchmark, priority_class="segment")
+        return {"status": "ok", "output": output}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Benchmark failed: {str(e)}")
 
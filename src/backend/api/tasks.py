@@ -1,14 +1,78 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, StreamingResponse
+import asyncio
 import io
+import json
+from typing import Optional
 from .. import server_state
+from ..result_spool import SpooledResult, find_spooled, result_spool
+from ..task_manager import TaskStatus
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+def client_key(request: Request) -> str:
+    """Fair-queuing key of a request: the X-Client-Id header, else the client address."""
+    return request.headers.get("X-Client-Id") or (request.client.host if request.client else "anonymous")
+
+# Seconds between comment lines on an idle event stream, so proxies do not close it
+SSE_KEEPALIVE_SECONDS = 15
+TERMINAL_STATES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+def _sse(snapshot: dict) -> str:
+    return f"event: task\ndata: {json.dumps(snapshot, default=str)}\n\n"
+
+async def _task_events(request: Request, task_id: Optional[str]):
+    """Server-sent `task` events with the task's client view on every change (every task if `task_id` is None)."""
+    manager = server_state.task_manager
+    # Subscribe before reading the current state so no update falls in between
+    subscription = manager.hub.subscribe(task_id)
+    try:
+        if task_id is not None:
+            snapshot = manager.snapshot(task_id)
+            if snapshot is None:
+                yield 'event: error\ndata: {"detail": "Task not found"}\n\n'
+                return
+            yield _sse(snapshot)
+            if snapshot["status"] in TERMINAL_STATES:
+                return
+        while True:
+            try:
+                snapshots = await asyncio.wait_for(subscription.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            for snapshot in snapshots:
+                yield _sse(snapshot)
+            if task_id is not None and snapshots[-1]["status"] in TERMINAL_STATES:
+                return
+    finally:
+        manager.hub.unsubscribe(subscription)
+
+def _event_stream(request: Request, task_id: Optional[str] = None) -> StreamingResponse:
+    return StreamingResponse(
+        _task_events(request, task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/")
 async def list_tasks():
     return server_state.task_manager.list_tasks()
 
+@router.get("/events")
+async def stream_all_task_events(request: Request):
+    """⚡ Bolt: One event stream for every task, replacing per-tab polling of the task list."""
+    return _event_stream(request)
+
+@router.get("/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request):
+    """Push the task's state on every change until it finishes, replacing status polling."""
+    if not server_state.task_manager.get_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+    return _event_stream(request, task_id)
+
 @router.get("/{task_id}")
 async def get_task_status(task_id: str):
     task = server_state.task_manager.get_task(task_id)
@@ -20,7 +84,7 @@ async def get_task_status(task_id: str):
     
     # Hide large binary data in status response
     if result:
-        if isinstance(result, bytes):
+        if isinstance(result, (bytes, SpooledResult)):
             response["has_result"] = True
             del response["result"]
         elif isinstance(result, dict) and "audio" in result:
@@ -32,6 +96,8 @@ async def get_task_status(task_id: str):
     else:
         response["has_result"] = False
 
+    # ⚡ Bolt: Where the task stands in the scheduler, so clients can show a position and ETA instead of polling blind
+    response.update(server_state.task_manager.queue_info(task_id))
     return response
 
 @router.get("/{task_id}/result")
@@ -47,6 +113,14 @@ async def get_task_result(task_id: str):
     if not result:
         raise HTTPException(status_code=404, detail="No result found for this task")
 
+    spooled = find_spooled(result)
+    if spooled is not None:
+        if not spooled.exists:
+            raise HTTPException(status_code=410, detail="Result expired; run the task again")
+        result_spool.touch(spooled)
+        # ⚡ Bolt: Served from the spool file; FileResponse answers Range requests, so players can seek and resume
+        return FileResponse(spooled.path, media_type=spooled.media_type, filename=spooled.filename)
+
     audio_bytes = result if isinstance(result, bytes) else result.get("audio")
     if not audio_bytes:
          raise HTTPException(status_code=404, detail="No audio result found")
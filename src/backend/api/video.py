@@ -1,11 +1,12 @@
 """Video generation API router — endpoints for LTX-2 video generation."""
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter, Request
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from pathlib import Path
 
 from .. import server_state
 from ..config import logger, VIDEO_OUTPUT_DIR
+from .tasks import client_key
 from .schemas import VideoGenerationRequest, NarratedVideoRequest
 
 router = APIRouter(prefix="/api/video", tags=["video"])
@@ -154,7 +155,7 @@ async def video_status():
 
 
 @router.post("/generate")
-async def generate_video(request: VideoGenerationRequest, background_tasks: BackgroundTasks):
+async def generate_video(request: VideoGenerationRequest, http_request: Request):
     """Generate a video from a text prompt (async)."""
     engine = _get_video_engine()
     if not engine.available:
@@ -163,7 +164,7 @@ async def generate_video(request: VideoGenerationRequest, background_tasks: Back
     task_id = server_state.task_manager.create_task(
         "video_generation", {"prompt": request.prompt[:100]}
     )
-    background_tasks.add_task(run_video_generation_task, task_id, request)
+    server_state.task_manager.submit(task_id, run_video_generation_task, request, client=client_key(http_request))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 
@@ -270,7 +271,7 @@ async def suggest_video_scene(request: SuggestionRequest):
     }
 
 @router.post("/narrated")
-async def generate_narrated_video(request: NarratedVideoRequest, background_tasks: BackgroundTasks):
+async def generate_narrated_video(request: NarratedVideoRequest, http_request: Request):
     """Generate a narrated video (TTS audio + LTX-2 video combined)."""
     engine = _get_video_engine()
     if not engine.available:
@@ -279,7 +280,7 @@ async def generate_narrated_video(request: NarratedVideoRequest, background_task
     task_id = server_state.task_manager.create_task(
         "narrated_video", {"prompt": request.prompt[:100]}
     )
-    background_tasks.add_task(run_narrated_video_task, task_id, request)
+    server_state.task_manager.submit(task_id, run_narrated_video_task, request, client=client_key(http_request))
     return {"task_id": task_id, "status": server_state.TaskStatus.PENDING}
 
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Request
 from fastapi.responses import FileResponse, StreamingResponse
 import uuid
 import random
@@ -6,6 +6,8 @@ from pathlib import Path
 import json
 import logging
 from .schemas import SpeakerProfile, MixRequest, VoiceLibrary
+from .tasks import client_key
+from .engine_calls import run_engine_call
 from ..config import VOICE_LIBRARY_FILE, logger
 from .. import server_state
 from ..utils import numpy_to_wav_bytes
@@ -25,6 +27,8 @@ PREVIEW_TEXTS = [
     "Can you believe how far we've come? Just twenty years ago, none of this would have seemed remotely possible.",
 ]
 
+PREVIEW_SEED = 1234
+
 PRESETS = [
     {"id": "aiden", "name": "Aiden", "gender": "Male", "description": "Calm, narrative"},
     {"id": "dylan", "name": "Dylan", "gender": "Male", "description": "Young, energetic"},
@@ -65,17 +69,22 @@ async def upload_voice(file: UploadFile = File(...)):
     return {"filename": safe_filename}
 
 @router.post("/mix")
-async def voice_mix(request: MixRequest):
-    try:
+async def voice_mix(request: MixRequest, http_request: Request):
+    def validate():
         for item in request.voices:
             server_state.engine.get_speaker_embedding(item["profile"])
+
+    try:
+        await run_engine_call("voice_mix", validate, client=client_key(http_request))
         return {"status": "ok", "message": "Mix configuration validated"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Voice mix validation failed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Voice mix validation failed")
 
 @router.post("/preview")
-async def voice_preview(request: SpeakerProfile):
+async def voice_preview(request: SpeakerProfile, http_request: Request):
     try:
         profile = {"type": request.type, "value": request.value}
 
@@ -89,12 +98,21 @@ async def voice_preview(request: SpeakerProfile):
         # Add clarity instruct hint for better sounding previews
         instruct = "clear speech, natural delivery, steady pace"
 
-        wav, sr = server_state.engine.generate_segment(text, profile=profile, instruct=instruct)
+        # ⚡ Bolt: A fixed seed makes previews reproducible wherever the model decodes them with their own RNG
+        # (continuous batching or prefix cache enabled), and repeats are then served from the segment cache
+        # ⚡ Bolt: Previews run off the event loop in the scheduler's top priority class, ahead of queued podcast
+        # and batch work
+        wav, sr = await run_engine_call(
+            "preview", server_state.engine.generate_segment, text,
+            profile=profile, instruct=instruct, seed=PREVIEW_SEED, client=client_key(http_request),
+        )
 
         # Security: Return audio from memory instead of writing to a public static directory
         # This prevents disk space exhaustion (DoS) and unintended file access.
         buffer = numpy_to_wav_bytes(wav, sr)
         return StreamingResponse(buffer, media_type="audio/wav")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Preview failed: {e}", exc_info=True)
         # Security: Return a generic error message instead of leaking internal details
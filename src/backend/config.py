@@ -112,6 +112,85 @@ MODELS = {
     "Tokenizer": "Qwen/Qwen3-TTS-Tokenizer-12Hz"
 }
 
+# Opt-in: map safetensors weights (shared page cache, fast reloads after eviction) instead of reading them.
+# Zero-copy only when the checkpoint dtype is the load dtype (bf16 checkpoints are upcast on CPU); measure
+# with tools/benchmark_weight_mmap.py before enabling
+MMAP_WEIGHTS = os.getenv("QWEN_MMAP_WEIGHTS", "0") == "1"
+
+# Point byte-identical speech tokenizer / speaker encoder / text embedding weights of loaded variants at one copy
+DEDUP_WEIGHTS = os.getenv("QWEN_DEDUP_WEIGHTS", "1") == "1"
+
+# Memory the model manager may fill with resident TTS models (0 picks 60% of system RAM / 90% of GPU memory)
+MODEL_RAM_BUDGET_MB = int(os.getenv("QWEN_MODEL_RAM_BUDGET_MB", "0"))
+MODEL_VRAM_BUDGET_MB = int(os.getenv("QWEN_MODEL_VRAM_BUDGET_MB", "0"))
+
+# On GPU, park evicted models in CPU RAM (within the RAM budget) so switching back is a copy, not a reload
+MODEL_WARM_TIER = os.getenv("QWEN_MODEL_WARM_TIER", "1") == "1"
+
+# While a podcast render synthesizes one model's lines, load the model its remaining lines need in the
+# background when it fits without evicting anything
+MODEL_PREFETCH = os.getenv("QWEN_MODEL_PREFETCH", "1") == "1"
+
+# Model-hosting inference worker processes for queued segment/podcast jobs (0 synthesizes in the server process),
+# their devices ("cuda:0,cuda:1", "cpu"; empty spreads them over the visible GPUs) and per-worker queue depth
+WORKER_PROCESSES = int(os.getenv("QWEN_WORKER_PROCESSES", "0"))
+WORKER_DEVICES = [d.strip() for d in os.getenv("QWEN_WORKER_DEVICES", "").split(",") if d.strip()]
+WORKER_QUEUE_SIZE = int(os.getenv("QWEN_WORKER_QUEUE_SIZE", "2"))
+
+# Max concurrent talker sequences sharing one continuous-batching decode loop (0 disables it)
+CONTINUOUS_BATCH_SIZE = int(os.getenv("QWEN_CONTINUOUS_BATCH_SIZE", "0"))
+
+# Preallocated, reset-in-place KV buffers for talker and sub-talker instead of growing DynamicCache
+STATIC_KV_CACHE = os.getenv("QWEN_STATIC_KV_CACHE", "0") == "1"
+
+# Talker KV snapshots of repeated speaker/instruct/ICL prompt prefixes, restored instead of re-prefilled (0 disables)
+PREFIX_CACHE_MB = int(os.getenv("QWEN_PREFIX_CACHE_MB", "0"))
+
+# Codec frames the 0.6B Base draft proposes per talker verification step for 1.7B Base voice cloning (0 disables)
+SPECULATIVE_DRAFT_TOKENS = int(os.getenv("QWEN_SPECULATIVE_DRAFT_TOKENS", "0"))
+
+# Talker KV-cache budget for one batched podcast synthesis call; the batch planner sizes batches to fit it
+BATCH_MEMORY_MB = int(os.getenv("QWEN_BATCH_MEMORY_MB", "2048"))
+
+# Weight-only talker/code-predictor quantization on CPU: "int8" for every model type, or per type such as
+# "Base=int8,CustomVoice=int4" (empty keeps float32)
+def _parse_quantization(value: str) -> dict:
+    modes = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        model_type, _, mode = part.rpartition("=")
+        modes[model_type.strip() or "*"] = mode.strip().lower()
+    return modes
+
+CPU_QUANTIZATION = _parse_quantization(os.getenv("QWEN_CPU_QUANTIZATION", ""))
+
+def _parse_int_map(value: str) -> dict:
+    """Parse "a=2, b=1" into {"a": 2, "b": 1}."""
+    return {k.strip(): int(v) for k, _, v in (p.partition("=") for p in value.split(",")) if k.strip() and v.strip()}
+
+# Task scheduling: concurrently running tasks per priority class (preview > segment > podcast > batch), in total,
+# and fair-queuing weights of client keys (X-Client-Id header, else client address; unlisted clients weigh 1)
+TASK_CONCURRENCY = {"preview": 2, "segment": 2, "podcast": 1, "batch": 1, **_parse_int_map(os.getenv("QWEN_TASK_CONCURRENCY", ""))}
+TASK_MAX_RUNNING = int(os.getenv("QWEN_TASK_MAX_RUNNING", "3"))
+CLIENT_WEIGHTS = _parse_int_map(os.getenv("QWEN_CLIENT_WEIGHTS", ""))
+
+# Engine calls in flight per interactive endpoint (beyond it: 503 + Retry-After), and their timeout in seconds
+ENDPOINT_CONCURRENCY = {"preview": 4, "detect_language": 2, "voice_mix": 2, "stream": 4, "benchmark": 1, **_parse_int_map(os.getenv("QWEN_ENDPOINT_CONCURRENCY", ""))}
+ENDPOINT_TIMEOUT_SECONDS = float(os.getenv("QWEN_ENDPOINT_TIMEOUT_SECONDS", "120"))
+
+# Codec frames (12.5 per second of audio) decoded per chunk by the streaming endpoint
+STREAM_CHUNK_FRAMES = int(os.getenv("QWEN_STREAM_CHUNK_FRAMES", "12"))
+
+# libsndfile compression level of Opus/MP3 streams, 0 (best quality) to <1 (smallest); 0.8 is ~40-60 kbit/s of speech
+STREAM_COMPRESSION_LEVEL = float(os.getenv("QWEN_STREAM_COMPRESSION_LEVEL", "0.8"))
+
+# Whisper checkpoint used for transcription, and how many 30 s windows (from any number of files) share one decode pass
+WHISPER_MODEL = os.getenv("QWEN_WHISPER_MODEL", "base")
+WHISPER_BATCH_SIZE = int(os.getenv("QWEN_WHISPER_BATCH_SIZE", "8"))
+
+# Batch speech-to-speech pipeline: sources transcribed + ICL-encoded per pass, and items the talker generates together
+S2S_PREPARE_BATCH = int(os.getenv("QWEN_S2S_PREPARE_BATCH", "8"))
+S2S_GENERATE_BATCH = int(os.getenv("QWEN_S2S_GENERATE_BATCH", "4"))
+
 LTX_MODELS = {
     "LTX_Video_2B": "Lightricks/LTX-Video",  # For checkpoint v0.9
 }
@@ -121,6 +200,19 @@ PROJECTS_DIR = BASE_DIR / "projects"
 PROJECTS_DIR.mkdir(parents=True, exist_ok=True)
 VOICE_LIBRARY_FILE = PROJECTS_DIR / "voices.json"
 
+# Persistent, content-addressed voice-clone prompts (x-vectors / ICL codes), shared by worker processes
+VOICE_STORE_DIR = Path(os.getenv("QWEN_VOICE_STORE_DIR", str(PROJECTS_DIR / "voice_store")))
+VOICE_STORE_MAX_MB = int(os.getenv("QWEN_VOICE_STORE_MAX_MB", "512"))
+
+# Synthesized PCM for greedy segment requests, and seeded ones the model samples with their own RNG (continuous
+# batching or prefix cache enabled), reused when the same request comes back
+SEGMENT_CACHE_DIR = Path(os.getenv("QWEN_SEGMENT_CACHE_DIR", str(PROJECTS_DIR / "segment_cache")))
+SEGMENT_CACHE_MAX_MB = int(os.getenv("QWEN_SEGMENT_CACHE_MAX_MB", "1024"))
+
+# Finished task results (WAVs, ZIP archives), served from disk instead of kept in the task registry
+RESULT_SPOOL_DIR = Path(os.getenv("QWEN_RESULT_SPOOL_DIR", str(PROJECTS_DIR / "result_spool")))
+RESULT_SPOOL_MAX_MB = int(os.getenv("QWEN_RESULT_SPOOL_MAX_MB", "2048"))
+
 VIDEO_DIR = PROJECTS_DIR / "videos"
 VIDEO_DIR.mkdir(parents=True, exist_ok=True)
 VOICE_IMAGES_DIR = PROJECTS_DIR / "voice_images"
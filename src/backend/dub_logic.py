@@ -1,6 +1,6 @@
 from .task_manager import task_manager, TaskStatus
 from .podcast_engine import PodcastEngine
-from .utils import numpy_to_wav_bytes
+from .result_spool import result_spool
 import hashlib
 from deep_translator import GoogleTranslator
 
@@ -35,9 +35,8 @@ def run_dub_task(task_id, source_audio, target_lang, engine: PodcastEngine):
         task_manager.update_task(task_id, progress=90, message="Encoding audio...")
 
         # 4. Finalize
-        wav_bytes = numpy_to_wav_bytes(wav, sr).read()
         task_manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, message="Ready", result={
-            "audio": wav_bytes,
+            "audio": result_spool.put_wav(task_id, wav, sr),
             "segments": result.get("segments", [])
         })
 
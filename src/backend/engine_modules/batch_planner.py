@@ -0,0 +1,78 @@
+from typing import Any, Dict, List
+
+from ..config import BATCH_MEMORY_MB
+
+# Sampling settings `Qwen3TTSForConditionalGeneration.generate` accepts per row; all others must match within a batch
+PER_ROW_SAMPLING_KEYS = (
+    "temperature",
+    "top_k",
+    "top_p",
+    "repetition_penalty",
+    "subtalker_temperature",
+    "subtalker_top_k",
+    "subtalker_top_p",
+)
+
+# Talker KV bytes per token of the 1.7B checkpoints in fp16 (28 layers x 8 KV heads x 128 dims x K/V)
+_DEFAULT_KV_BYTES_PER_TOKEN = 2 * 28 * 8 * 128 * 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough talker sequence length of one line: prompt (~4 chars per text token) plus codec frames to generate
+    (~15 spoken chars per second at 12.5 frames per second)."""
+    return 32 + len(text) // 4 + int(len(text) * 12.5 / 15)
+
+
+def kv_bytes_per_token(model: Any) -> int:
+    """KV-cache bytes one talker token occupies for a loaded `Qwen3TTSModel`."""
+    try:
+        config = model.model.config.talker_config
+        head_dim = getattr(config, "head_dim", None) or config.hidden_size // config.num_attention_heads
+        dtype_bytes = next(model.model.parameters()).element_size()
+        return int(2 * config.num_hidden_layers * config.num_key_value_heads * head_dim * dtype_bytes)
+    except Exception:
+        return _DEFAULT_KV_BYTES_PER_TOKEN
+
+
+def plan_batches(
+    lines: List[Dict[str, Any]],
+    bytes_per_token: int = _DEFAULT_KV_BYTES_PER_TOKEN,
+    memory_budget: int = BATCH_MEMORY_MB * 1024 * 1024,
+    max_batch_size: int = 16,
+    max_length_ratio: float = 1.5,
+) -> List[List[int]]:
+    """
+    Split lines into batches for batched talker generation.
+
+    Each line is a dict with `index`, estimated `tokens` and its `sampling` kwargs. Lines are grouped by the
+    sampling settings that cannot vary per row, sorted by length and packed shortest-first. A batch stops growing
+    when its longest line exceeds `max_length_ratio` x its shortest (every row decodes until the longest one
+    finishes) or when `rows x longest x bytes_per_token` would exceed `memory_budget`.
+
+    Returns the line indices of each batch.
+    """
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for line in lines:
+        shared = tuple(sorted((k, repr(v)) for k, v in line["sampling"].items() if k not in PER_ROW_SAMPLING_KEYS))
+        groups.setdefault(shared, []).append(line)
+
+    batches = []
+    for group in groups.values():
+        group.sort(key=lambda l: l["tokens"])
+        batch, shortest = [], 0
+        for line in group:
+            tokens = max(line["tokens"], 1)
+            fits = (
+                batch
+                and len(batch) < max_batch_size
+                and tokens <= shortest * max_length_ratio
+                and (len(batch) + 1) * tokens * bytes_per_token <= memory_budget
+            )
+            if not fits:
+                if batch:
+                    batches.append(batch)
+                batch, shortest = [], tokens
+            batch.append(line["index"])
+        if batch:
+            batches.append(batch)
+    return batches
@@ -0,0 +1,90 @@
+import os
+import uuid
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..config import logger
+
+
+class DiskLRUCache:
+    """Byte-budgeted directory of one-file-per-key entries.
+
+    Recency is tracked through file mtimes (touched on every hit), so several worker processes
+    sharing the directory also share the LRU order. Writes go through a temp file and an atomic
+    rename, so readers never observe a partially written entry.
+    """
+
+    suffix = ""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{self.suffix}"
+
+    def _tmp_path(self, key: str) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f"{key}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+
+    def _commit(self, tmp: Path, key: str) -> None:
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def _touch(self, path: Path) -> None:
+        try:
+            os.utime(path, None)  # mark as most recently used
+        except FileNotFoundError:
+            pass
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        try:
+            for entry in os.scandir(self.root):
+                if not entry.name.endswith(self.suffix):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the directory fits in `max_bytes`."""
+        with self.lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            if removed:
+                logger.info(f"⚡ Bolt: Evicted {removed} entries from {self.root.name}")
+            return removed
+
+    def clear(self) -> int:
+        with self.lock:
+            entries = self._entries()
+            for _, _, path in entries:
+                path.unlink(missing_ok=True)
+            return len(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -8,6 +8,21 @@ from ..config import BASE_DIR, SHARED_ASSETS_DIR, logger
 from ..utils import AudioPostProcessor, prune_dict_cache
 from pydub import AudioSegment
 
+
+class RenderState:
+    """What the last render of one editing session produced, so the next render only redoes what changed.
+
+    `blocks` maps `block_key` (block id + content hash) to its synthesized `(wav, sr)`. `layout` lists the
+    timeline placement of each rendered block and `mastered` is the mastered mix (before the watermark).
+    """
+
+    def __init__(self):
+        self.blocks: Dict[str, tuple] = {}
+        self.layout: List[Dict[str, Any]] = []
+        self.mastered: Optional[np.ndarray] = None
+        self.mastering: Optional[tuple] = None
+
+
 class PodcastPatcher:
     def __init__(self, bgm_cache, bgm_dir, shared_assets_dir):
         self.bgm_cache = bgm_cache
@@ -99,3 +114,60 @@ class PodcastPatcher:
             final_wav = AudioPostProcessor.normalize_acx(final_wav)
 
         return final_wav
+
+    def remaster_incremental(self, timeline: np.ndarray, layout: List[Dict[str, Any]], state: RenderState, sample_rate: int, eq_preset: str, reverb_level: float) -> Optional[np.ndarray]:
+        """
+        Master `timeline` by copying unchanged regions from the previous render and re-mastering only the rest.
+
+        A block's region (its audio plus the following pause) is reused when the block and its left neighbour are
+        unchanged, which covers the filter/reverb memory carried across the boundary. Dirty regions are mastered
+        with `context` seconds of preceding input for warm-up and crossfaded into the copied audio at their right
+        edge. Returns None when the result could differ from a full master (global peak/loudness normalization).
+        """
+        prev = state.mastered
+        if prev is None or not layout or prev.ndim != timeline.ndim:
+            return None
+        if max(np.max(timeline), -np.min(timeline)) > 1.0 or max(np.max(prev), -np.min(prev)) >= 1.0:
+            return None
+
+        context = int(0.5 * sample_rate)
+        fade = int(0.01 * sample_rate)
+        n = timeline.shape[-1]
+
+        def regions(segments, total):
+            # (start, end, identity of the region, identity of its left neighbour)
+            out, left = [], None
+            for j, seg in enumerate(segments):
+                end = segments[j + 1]["start"] if j + 1 < len(segments) else total
+                ident = (seg["key"], seg.get("pan", 0.0), end - seg["start"])
+                out.append((seg["start"], end, ident, left))
+                left = ident
+            return out
+
+        previous = {r[2][0]: r for r in regions(state.layout, prev.shape[-1]) if r[2][0] is not None}
+        out = np.empty(timeline.shape, dtype=prev.dtype)
+        dirty = []
+        current = regions(layout, n)
+        if current[0][0] > 0:
+            dirty.append([0, current[0][0]])
+        for start, end, ident, left in current:
+            old = previous.get(ident[0]) if ident[0] is not None else None
+            reusable = old is not None and old[2] == ident and old[3] == left and (left is None or left[2] >= context)
+            if reusable:
+                out[..., start:end] = prev[..., old[0]:old[1]]
+            elif dirty and dirty[-1][1] == start:
+                dirty[-1][1] = end
+            else:
+                dirty.append([start, end])
+
+        for a, b in dirty:
+            a0 = max(0, a - context)
+            b1 = min(n, b + fade)
+            chunk = self.apply_mastering(timeline[..., a0:b1].copy(), sample_rate, eq_preset, reverb_level, False)
+            if max(np.max(chunk), -np.min(chunk)) >= 1.0:
+                return None
+            out[..., a:b] = chunk[..., a - a0:b - a0]
+            if b1 > b:
+                ramp = np.linspace(0.0, 1.0, b1 - b, dtype=out.dtype)
+                out[..., b:b1] = out[..., b:b1] * ramp + chunk[..., b - a0:] * (1.0 - ramp)
+        return out
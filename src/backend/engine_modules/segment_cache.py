@@ -0,0 +1,112 @@
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..config import SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_MB, logger
+from .disk_cache import DiskLRUCache
+from .voice_store import model_revision
+
+# Profile fields that change the synthesized voice; UI-only fields (role, preview_text, ...) are ignored
+_PROFILE_FIELDS = ("type", "value", "ref_text", "instruct")
+
+
+def _is_greedy(gen_kwargs: Dict[str, Any]) -> bool:
+    return gen_kwargs.get("do_sample") is False and gen_kwargs.get("subtalker_dosample") is False
+
+
+def is_deterministic(gen_kwargs: Dict[str, Any], model: Any) -> bool:
+    """
+    True if the request reproduces the same audio: greedy for talker and sub-talker, or seeded and decoded by
+    `model` with its own RNG (`Qwen3TTSModel.seed_is_isolated`).
+
+    Elsewhere a seed only seeds the global RNG, which other requests draw from concurrently.
+    """
+    if _is_greedy(gen_kwargs):
+        return True
+    return gen_kwargs.get("seed") not in (None, -1) and model.seed_is_isolated(gen_kwargs)
+
+
+def _normalized(gen_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Generation kwargs that shape a deterministic request's output: no private flags, unset values or ignored seed."""
+    ignored = "seed" if _is_greedy(gen_kwargs) else None
+    return {k: v for k, v in gen_kwargs.items() if not k.startswith("_") and k != ignored and v is not None}
+
+
+class SegmentResultCache(DiskLRUCache):
+    """Synthesized segment PCM keyed by a fingerprint of the normalized request.
+
+    Only deterministic requests (see `is_deterministic`) are cached. Audio is stored before the
+    watermark, so toggling the watermark setting never serves stale output. A row of a padded batch is
+    stored under `batch_key`, since its batch-mates change the numerics.
+    """
+
+    suffix = ".wav"
+
+    def __init__(self, root: Path = SEGMENT_CACHE_DIR, max_bytes: int = SEGMENT_CACHE_MAX_MB * 1024 * 1024):
+        super().__init__(root, max_bytes)
+
+    def fingerprint(self, text: str, profile: Dict[str, Any], language: str, instruct: Optional[str],
+                    temperature: Optional[float], model: Any, gen_kwargs: Dict[str, Any]) -> Optional[str]:
+        """Fingerprint of a request whose `text` has already gone through `phoneme_manager.apply`."""
+        if not is_deterministic({**gen_kwargs, "temperature": temperature}, model):
+            return None
+        request = {
+            "text": text,
+            "profile": {k: profile.get(k) for k in _PROFILE_FIELDS},
+            "language": language,
+            "instruct": instruct,
+            "temperature": temperature,
+            "generate": _normalized(gen_kwargs),
+            "model": model_revision(model),
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def batch_key(key: Optional[str], batch: Sequence[Optional[str]]) -> Optional[str]:
+        """Key of the row fingerprinted `key` when synthesized in `batch` (the fingerprints of every row, in order).
+
+        A batch of one is the unbatched request, so it shares the key `fingerprint` gives the serial path.
+        """
+        if key is None or any(k is None for k in batch):
+            return None
+        if len(batch) <= 1:
+            return key
+        return hashlib.sha256(f"{key}|{','.join(batch)}".encode()).hexdigest()
+
+    def get(self, key: Optional[str]) -> Optional[Tuple[np.ndarray, int]]:
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            if not path.exists():
+                raise FileNotFoundError(path)
+            wav, sr = sf.read(str(path), dtype="float32")
+            self._touch(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cached segment {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return wav, sr
+
+    def put(self, key: Optional[str], wav: np.ndarray, sr: int) -> None:
+        if key is None:
+            return
+        try:
+            tmp = self._tmp_path(key)
+            sf.write(str(tmp), np.asarray(wav, dtype=np.float32), sr, format="WAV", subtype="FLOAT")
+            self._commit(tmp, key)
+        except Exception as e:
+            logger.warning(f"Failed to cache synthesized segment: {e}")
+
+
+# Global instance shared by every synthesizer in this process
+segment_cache = SegmentResultCache()
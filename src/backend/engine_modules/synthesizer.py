@@ -2,16 +2,22 @@ import torch
 import numpy as np
 from typing import List, Dict, Any, Optional
 import uuid
-import uuid
+from contextlib import nullcontext
 from pathlib import Path
 from ..qwen_tts.inference.qwen3_tts_model import VoiceClonePromptItem
-from ..model_loader import get_model
+from ..model_loader import get_model, leased, release_model
 from ..video_engine import VideoEngine
 from ..utils import phoneme_manager, prune_dict_cache, audit_manager
+from ..config import STREAM_CHUNK_FRAMES
+from .voice_store import voice_prompt_store
+from .segment_cache import segment_cache
 
 import logging
 logger = logging.getLogger("qwen_tts")
 
+# Model each profile type is synthesized with
+PROFILE_MODEL_TYPES = {"preset": "CustomVoice", "design": "VoiceDesign", "clone": "Base", "mix": "Base"}
+
 class VoiceSynthesizer:
     def __init__(self, upload_dir: Path, transcription_cache, translation_cache, prompt_cache, clone_embedding_cache, preset_embeddings, mix_embedding_cache, video_audio_cache, resolve_paths_func, extract_audio_func):
         self.upload_dir = upload_dir
@@ -73,29 +79,28 @@ class VoiceSynthesizer:
             cache_key = profile["value"]
             if cache_key in self.prompt_cache: return self.prompt_cache[cache_key][0].ref_spk_embedding
             if cache_key in self.clone_embedding_cache: return self.clone_embedding_cache[cache_key]
-        if model is None:
-            mtype = "Base" if ptype == "clone" else "CustomVoice"
-            model = get_model(mtype)
-        if ptype == "preset":
-            prune_dict_cache(self.preset_embeddings, limit=200, count=20)
-            emb = model.get_speaker_embedding(profile["value"])
-            self.preset_embeddings[profile["value"].lower()] = emb
-            return emb
-        elif ptype == "clone":
-            cache_key = profile["value"]
-            resolved = self._resolve_paths(cache_key)
-            clone_path = str(resolved[0])
-            if VideoEngine.is_video(clone_path): clone_path = self._extract_audio_with_cache(clone_path)
-            prompt = model.create_voice_clone_prompt(ref_audio=clone_path, x_vector_only_mode=True)
-            emb = prompt[0].ref_spk_embedding
+        mtype = "Base" if ptype == "clone" else "CustomVoice"
+        with (leased(get_model(mtype)) if model is None else nullcontext(model)) as model:
+            if ptype == "preset":
+                prune_dict_cache(self.preset_embeddings, limit=200, count=20)
+                emb = model.get_speaker_embedding(profile["value"])
+                self.preset_embeddings[profile["value"].lower()] = emb
+                return emb
+            elif ptype == "clone":
+                cache_key = profile["value"]
+                resolved = self._resolve_paths(cache_key)
+                clone_path = str(resolved[0])
+                if VideoEngine.is_video(clone_path): clone_path = self._extract_audio_with_cache(clone_path)
+                prompt = self.load_clone_prompt(clone_path, model)
+                emb = prompt[0].ref_spk_embedding
 
-            prune_dict_cache(self.prompt_cache, limit=200, count=20)
-            prune_dict_cache(self.clone_embedding_cache, limit=200, count=20)
+                prune_dict_cache(self.prompt_cache, limit=200, count=20)
+                prune_dict_cache(self.clone_embedding_cache, limit=200, count=20)
 
-            self.prompt_cache[cache_key] = prompt
-            self.clone_embedding_cache[cache_key] = emb
-            return emb
-        return None
+                self.prompt_cache[cache_key] = prompt
+                self.clone_embedding_cache[cache_key] = emb
+                return emb
+            return None
 
     def compute_mixed_embedding(self, mix_configs: List[Dict[str, Any]], model: Optional[Any] = None) -> Optional[torch.Tensor]:
         import json
@@ -115,71 +120,102 @@ class VoiceSynthesizer:
         self.mix_embedding_cache[cache_key] = mixed_emb
         return mixed_emb
 
+    def load_clone_prompt(self, ref_audio: str, model: Any, ref_text: Optional[str] = None) -> List[VoiceClonePromptItem]:
+        """Fetch the prompt for `ref_audio` from the persistent store, extracting it on a miss."""
+        # ⚡ Bolt: Keyed by audio content + model revision, so prompts survive restarts and are shared across workers
+        try:
+            key = voice_prompt_store.key(ref_audio, model, ref_text=ref_text)
+        except OSError:
+            key = None  # not a readable local file (e.g. URL); extract without persisting
+        if key is not None:
+            device = getattr(model, "device", None)
+            prompt = voice_prompt_store.get(key, device=device if isinstance(device, torch.device) else None)
+            if prompt is not None:
+                return prompt
+
+        if ref_text:
+            import soundfile as sf
+            audio_data, audio_sr = sf.read(ref_audio)
+            silence = np.zeros(int(audio_sr * 0.5), dtype=audio_data.dtype)
+            padded = np.concatenate([audio_data, silence])
+            padded_path = str(self.upload_dir / f"padded_{uuid.uuid4()}.wav")
+            sf.write(padded_path, padded, audio_sr)
+            ref_audio = padded_path
+
+        prompt = model.create_voice_clone_prompt(ref_audio, ref_text=ref_text or None, x_vector_only_mode=not ref_text)
+        if key is not None:
+            voice_prompt_store.put(key, prompt)
+        return prompt
+
+    def _get_clone_prompt(self, profile: Dict[str, Any], model: Any) -> List[VoiceClonePromptItem]:
+        ref_text = profile.get("ref_text")
+        use_icl = ref_text is not None and ref_text.strip() != ""
+        cache_key = profile["value"]
+        icl_cache_key = f"{cache_key}:icl:{ref_text}" if use_icl else cache_key
+        if icl_cache_key in self.prompt_cache:
+            return self.prompt_cache[icl_cache_key]
+        try:
+            resolved_paths = self._resolve_paths(profile["value"])
+        except (FileNotFoundError, PermissionError) as e:
+            raise RuntimeError(f"Cloning reference audio not found: {profile['value']}") from e
+
+        ref_audio = str(resolved_paths[0])
+        if VideoEngine.is_video(ref_audio): ref_audio = self._extract_audio_with_cache(ref_audio)
+
+        self._validate_ref_audio(ref_audio)
+
+        prompt = self.load_clone_prompt(ref_audio, model, ref_text=ref_text if use_icl else None)
+        prune_dict_cache(self.prompt_cache, limit=200, count=20)
+        self.prompt_cache[icl_cache_key] = prompt
+        return prompt
+
+    def _get_mix_prompt(self, profile: Dict[str, Any]) -> List[VoiceClonePromptItem]:
+        import json
+        cache_key = f"mix:{profile['value']}"
+        if cache_key in self.prompt_cache: return self.prompt_cache[cache_key]
+        prune_dict_cache(self.prompt_cache, limit=200, count=20)
+        mix_configs = json.loads(profile["value"])
+        mixed_emb = self.compute_mixed_embedding(mix_configs)
+        prompt = [VoiceClonePromptItem(ref_code=None, ref_spk_embedding=mixed_emb, x_vector_only_mode=True, icl_mode=False, ref_text=None)]
+        self.prompt_cache[cache_key] = prompt
+        return prompt
+
     def generate_segment(self, text: str, profile: Dict[str, Any], language: str = "auto", model: Optional[Any] = None, instruct: Optional[str] = None, temperature: Optional[float] = None, watermark_func=None, **gen_kwargs) -> tuple[np.ndarray, int]:
+        lease = None
         try:
-            import json
             text = phoneme_manager.apply(text)
             final_instruct = instruct or profile.get("instruct")
             wavs = None
             ptype = profile.get("type")
+            if ptype not in PROFILE_MODEL_TYPES:
+                raise RuntimeError(f"Unknown speaker type: {ptype}")
+            if model is None: model = lease = get_model(PROFILE_MODEL_TYPES[ptype])
+
+            # ⚡ Bolt: Serve repeated deterministic requests (previews, unchanged podcast lines) from the result cache.
+            # A quality retry inherits the original request's key so its output is stored under it.
+            cache_key = gen_kwargs.pop("_cache_key", None)
+            if not gen_kwargs.get("_is_retry"):
+                cache_key = segment_cache.fingerprint(text, profile, language, final_instruct, temperature, model, gen_kwargs)
+                cached = segment_cache.get(cache_key)
+                if cached is not None:
+                    wav, sr = cached
+                    return (watermark_func(wav, sr) if watermark_func else wav), sr
+            # A seed reaches the model, which gives the request its own RNG independent of its batch-mates
+            if gen_kwargs.get("seed") == -1:
+                gen_kwargs.pop("seed")
+
             if ptype == "preset":
-                if model is None: model = get_model("CustomVoice")
                 wavs, sr = model.generate_custom_voice(text=text, speaker=profile["value"], language=language, instruct=final_instruct, temperature=temperature, **gen_kwargs)
             elif ptype == "design":
-                if model is None: model = get_model("VoiceDesign")
                 design_instruct = profile["value"]
                 if final_instruct: design_instruct = f"{design_instruct}, {final_instruct}"
                 wavs, sr = model.generate_voice_design(text=text, instruct=design_instruct, language=language, non_streaming_mode=True, temperature=temperature, **gen_kwargs)
             elif ptype == "clone":
-                ref_text = profile.get("ref_text")
-                use_icl = ref_text is not None and ref_text.strip() != ""
-                cache_key = profile["value"]
-                icl_cache_key = f"{cache_key}:icl:{ref_text}" if use_icl else cache_key
-                if icl_cache_key in self.prompt_cache:
-                    prompt = self.prompt_cache[icl_cache_key]
-                else:
-                    try:
-                        resolved_paths = self._resolve_paths(profile["value"])
-                    except (FileNotFoundError, PermissionError) as e:
-                        raise RuntimeError(f"Cloning reference audio not found: {profile['value']}") from e
-                    
-                    if model is None: model = get_model("Base")
-                    ref_audio = str(resolved_paths[0])
-                    if VideoEngine.is_video(ref_audio): ref_audio = self._extract_audio_with_cache(ref_audio)
-                    
-                    self._validate_ref_audio(ref_audio)
-
-                    if use_icl:
-                        import soundfile as sf
-                        audio_data, audio_sr = sf.read(ref_audio)
-                        silence = np.zeros(int(audio_sr * 0.5), dtype=audio_data.dtype)
-                        padded = np.concatenate([audio_data, silence])
-                        padded_path = str(self.upload_dir / f"padded_{uuid.uuid4()}.wav")
-                        sf.write(padded_path, padded, audio_sr)
-                        ref_audio = padded_path
-
-                    prompt = model.create_voice_clone_prompt(
-                        ref_audio,
-                        ref_text=ref_text if use_icl else None,
-                        x_vector_only_mode=not use_icl
-                    )
-                    prune_dict_cache(self.prompt_cache, limit=200, count=20)
-                    self.prompt_cache[icl_cache_key] = prompt
-                if model is None: model = get_model("Base")
+                prompt = self._get_clone_prompt(profile, model)
                 wavs, sr = model.generate_voice_clone(text=text, language=language, voice_clone_prompt=prompt, instruct=final_instruct, temperature=temperature, **gen_kwargs)
             elif ptype == "mix":
-                cache_key = f"mix:{profile['value']}"
-                if cache_key in self.prompt_cache: prompt = self.prompt_cache[cache_key]
-                else:
-                    prune_dict_cache(self.prompt_cache, limit=200, count=20)
-                    mix_configs = json.loads(profile["value"])
-                    mixed_emb = self.compute_mixed_embedding(mix_configs)
-                    prompt = [VoiceClonePromptItem(ref_code=None, ref_spk_embedding=mixed_emb, x_vector_only_mode=True, icl_mode=False, ref_text=None)]
-                    self.prompt_cache[cache_key] = prompt
-                if model is None: model = get_model("Base")
+                prompt = self._get_mix_prompt(profile)
                 wavs, sr = model.generate_voice_clone(text=text, language=language, voice_clone_prompt=prompt, instruct=final_instruct, temperature=temperature, **gen_kwargs)
-            else:
-                raise RuntimeError(f"Unknown speaker type: {ptype}")
 
             if not wavs: raise RuntimeError("No waveforms generated")
             
@@ -190,12 +226,46 @@ class VoiceSynthesizer:
 
             if quality["quality"] == "warning" and not gen_kwargs.get("_is_retry"):
                 logger.warning(f"Low quality detected (SNR={quality['snr_db']}dB), retrying with lower temperature")
-                retry_kwargs = {**gen_kwargs, "temperature": 0.3, "top_k": 20, "_is_retry": True}
+                retry_kwargs = {**gen_kwargs, "temperature": 0.3, "top_k": 20, "_is_retry": True, "_cache_key": cache_key}
                 return self.generate_segment(text, profile, language, model, instruct, watermark_func=watermark_func, **retry_kwargs)
 
+            segment_cache.put(cache_key, wavs[0], sr)
             return wav_out, sr
         except Exception as e:
             if not isinstance(e, RuntimeError):
                 logger.error(f"Synthesis failed: {e}")
                 raise RuntimeError(f"Synthesis failed: {e}") from e
             raise
+        finally:
+            if lease is not None:
+                release_model(lease)
+
+    def stream_segment(self, text: str, profile: Dict[str, Any], language: str = "auto", instruct: Optional[str] = None, temperature: Optional[float] = None, chunk_frames: int = STREAM_CHUNK_FRAMES, watermark_func=None, **gen_kwargs):
+        """
+        Yield `(wav_chunk, sr)` for one segment while the talker is still generating.
+
+        Preset, clone and mix profiles are decoded incrementally every `chunk_frames` codec frames; voice design
+        has no streaming API and is yielded as a single chunk. The watermark tone is emitted after the last chunk.
+        """
+        ptype = profile.get("type")
+        if ptype not in ("preset", "clone", "mix"):
+            yield self.generate_segment(text, profile, language, None, instruct, temperature, watermark_func=watermark_func, **gen_kwargs)
+            return
+
+        text = phoneme_manager.apply(text)
+        final_instruct = instruct or profile.get("instruct")
+        if gen_kwargs.get("seed") == -1:
+            gen_kwargs.pop("seed")
+        with leased(get_model("CustomVoice" if ptype == "preset" else "Base")) as model:
+            if ptype == "preset":
+                chunks = model.stream_custom_voice(text=text, speaker=profile["value"], language=language, instruct=final_instruct, temperature=temperature, chunk_frames=chunk_frames, **gen_kwargs)
+            else:
+                prompt = self._get_clone_prompt(profile, model) if ptype == "clone" else self._get_mix_prompt(profile)
+                chunks = model.stream_voice_clone(text=text, language=language, voice_clone_prompt=prompt, instruct=final_instruct, temperature=temperature, chunk_frames=chunk_frames, **gen_kwargs)
+
+            sr = None
+            for wav, sr in chunks:
+                yield wav, sr
+        if watermark_func and sr is not None:
+            tone = watermark_func(np.zeros(0, dtype=np.float32), sr)
+            if len(tone): yield tone, sr
@@ -0,0 +1,194 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import WHISPER_BATCH_SIZE, WHISPER_MODEL, logger
+
+SAMPLE_RATE = 16000
+WINDOW_SAMPLES = 30 * SAMPLE_RATE  # Whisper's fixed 30 s input
+FRAME_SAMPLES = 480  # 30 ms voice-activity frames
+TIMESTAMP_SECONDS = 0.02  # resolution of Whisper's <|t|> tokens
+LOAD_WORKERS = 4  # threads reading and resampling input files
+
+# Voice-activity gate: a frame is speech when its RMS clears both an absolute floor (-60 dBFS) and a level
+# relative to the loud end of the file; speech is padded and short pauses bridged before windowing
+VAD_FLOOR = 1e-3
+VAD_RELATIVE = 0.05
+VAD_PAD_SECONDS = 0.2
+VAD_BRIDGE_SECONDS = 0.5
+
+# Whisper's own rule for dropping a window as silence: likely no speech and a low-confidence decode
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+
+def load_audio(path: str) -> np.ndarray:
+    """Mono float32 at 16 kHz."""
+    try:
+        import librosa
+        wav, _ = librosa.load(path, sr=SAMPLE_RATE, mono=True)
+        return wav.astype(np.float32, copy=False)
+    except Exception:
+        import whisper
+        return whisper.load_audio(path)
+
+
+def _try_load_audio(path: str) -> Optional[np.ndarray]:
+    try:
+        return load_audio(path)
+    except Exception as e:
+        logger.error(f"Transcription: could not read {path}: {e}")
+        return None
+
+
+def speech_windows(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Sample ranges (start, end) of at most 30 s that cover the speech in `audio`.
+
+    Silent stretches are left out; windows are packed greedily from consecutive speech regions and only a
+    region longer than 30 s on its own is cut mid-speech.
+    """
+    n_frames = len(audio) // FRAME_SAMPLES
+    if n_frames == 0:
+        return []
+    frames = audio[: n_frames * FRAME_SAMPLES].reshape(n_frames, FRAME_SAMPLES)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    speech = rms > max(VAD_FLOOR, float(np.percentile(rms, 95)) * VAD_RELATIVE)
+    if not speech.any():
+        return []
+
+    # Speech regions as frame ranges, with close neighbours merged
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))).tolist()
+    bridge = int(VAD_BRIDGE_SECONDS * SAMPLE_RATE / FRAME_SAMPLES)
+    regions: List[List[int]] = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if regions and start - regions[-1][1] <= bridge:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    pad = int(VAD_PAD_SECONDS * SAMPLE_RATE)
+    windows: List[Tuple[int, int]] = []
+    for start, end in regions:
+        start = max(0, start * FRAME_SAMPLES - pad)
+        end = min(len(audio), end * FRAME_SAMPLES + pad)
+        if windows and end - windows[-1][0] <= WINDOW_SAMPLES:
+            windows[-1] = (windows[-1][0], end)
+            continue
+        if windows and start < windows[-1][1]:
+            start = windows[-1][1]
+        while end - start > WINDOW_SAMPLES:
+            windows.append((start, start + WINDOW_SAMPLES))
+            start += WINDOW_SAMPLES
+        windows.append((start, end))
+    return windows
+
+
+class Transcriber:
+    """One Whisper model per process, shared by every engine and request thread.
+
+    `transcribe` gates each file through `speech_windows` and decodes the windows of all files together,
+    `batch_size` at a time, so a batch of short clips costs a few encoder passes instead of one per clip.
+    """
+
+    def __init__(self, model_name: str = WHISPER_MODEL, batch_size: int = WHISPER_BATCH_SIZE):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.model = None
+        self.lock = threading.Lock()  # serializes loading and decoding on the shared model
+
+    def _load(self):
+        if self.model is None:
+            import whisper
+            logger.info(f"Loading Whisper model '{self.model_name}'")
+            self.model = whisper.load_model(self.model_name)
+        return self.model
+
+    def unload(self) -> None:
+        with self.lock:
+            self.model = None
+
+    def transcribe(self, paths: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Transcribe several files in one pass. Returns `{"text", "language", "segments"}` per path, in order,
+        or None for a file that could not be read.
+        """
+        windows: List[Tuple[int, np.ndarray, float]] = []  # (file index, samples, start seconds)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(paths)
+        # ⚡ Bolt: Decode and resample the files in parallel; the model pass below is the only serialized part
+        with ThreadPoolExecutor(max_workers=max(1, min(LOAD_WORKERS, len(paths)))) as pool:
+            audios = list(pool.map(_try_load_audio, paths))
+        for i, audio in enumerate(audios):
+            if audio is None:
+                continue
+            results[i] = {"text": "", "language": "unknown", "segments": []}
+            windows.extend((i, audio[s:e], s / SAMPLE_RATE) for s, e in speech_windows(audio))
+
+        speech = {}  # file index -> {language: seconds of speech}
+        with self.lock:
+            for b in range(0, len(windows), self.batch_size):
+                batch = windows[b : b + self.batch_size]
+                decoded = self._decode_batch([w for _, w, _ in batch])
+                for (i, samples, offset), (text, language, segments) in zip(batch, decoded):
+                    if not text:
+                        continue
+                    result = results[i]
+                    result["text"] = f"{result['text']} {text}" if result["text"] else text
+                    for start, end, seg_text in segments:
+                        result["segments"].append({
+                            "id": len(result["segments"]), "start": round(offset + start, 2),
+                            "end": round(offset + end, 2), "text": seg_text,
+                        })
+                    by_language = speech.setdefault(i, {})
+                    by_language[language] = by_language.get(language, 0.0) + len(samples) / SAMPLE_RATE
+
+        # A file's language is the one most of its speech was detected as
+        for i, by_language in speech.items():
+            results[i]["language"] = max(by_language, key=by_language.get)
+        return results
+
+    def _decode_batch(self, audios: List[np.ndarray]) -> List[Tuple[str, str, List[Tuple[float, float, str]]]]:
+        """Decode up to 30 s windows in one encoder pass: (text, language, [(start, end, text)]) per window."""
+        import torch
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        model = self._load()
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(np.ascontiguousarray(a))), model.dims.n_mels)
+            for a in audios
+        ]).to(model.device)
+        options = whisper.DecodingOptions(task="transcribe", fp16=model.device.type == "cuda")
+        decoded = []
+        for audio, res in zip(audios, whisper.decode(model, mel, options)):
+            if res.no_speech_prob > NO_SPEECH_THRESHOLD and res.avg_logprob < LOGPROB_THRESHOLD:
+                decoded.append(("", res.language, []))
+                continue
+            tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages, language=res.language, task="transcribe")
+            segments = _timestamped_segments(res.tokens, tokenizer, len(audio) / SAMPLE_RATE)
+            decoded.append((res.text.strip(), res.language, segments))
+        return decoded
+
+
+def _timestamped_segments(tokens: List[int], tokenizer, duration: float) -> List[Tuple[float, float, str]]:
+    """Split a window's tokens at Whisper's <|start|> text <|end|> timestamp pairs."""
+    segments = []
+    start, text_tokens = None, []
+    for token in tokens:
+        if token < tokenizer.timestamp_begin:
+            text_tokens.append(token)
+            continue
+        t = (token - tokenizer.timestamp_begin) * TIMESTAMP_SECONDS
+        if start is not None and text_tokens:
+            segments.append((start, t, tokenizer.decode(text_tokens).strip()))
+            start, text_tokens = None, []
+        else:
+            start = t
+    if text_tokens:  # no closing timestamp: the text runs to the end of the window
+        segments.append((start or 0.0, duration, tokenizer.decode(text_tokens).strip()))
+    return [s for s in segments if s[2]]
+
+
+transcriber = Transcriber()
@@ -0,0 +1,134 @@
+import os
+import hashlib
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from safetensors import safe_open
+from safetensors.torch import save_file
+
+from ..qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel, VoiceClonePromptItem
+from ..config import VOICE_STORE_DIR, VOICE_STORE_MAX_MB, logger
+from .disk_cache import DiskLRUCache
+
+# ⚡ Bolt: Revision strings are derived from weight-file stats, so compute them once per loaded model
+_revision_cache: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def model_revision(model: Any) -> str:
+    """Identify the checkpoint behind a loaded `Qwen3TTSModel`.
+
+    Uses the model path plus size/mtime of its weight files, so replacing a checkpoint in place
+    invalidates every prompt extracted with the old weights.
+    """
+    try:
+        return _revision_cache[model]
+    except (KeyError, TypeError):
+        pass
+    config = getattr(getattr(model, "model", model), "config", None)
+    name = str(getattr(config, "_name_or_path", "") or getattr(config, "name_or_path", "") or type(model).__name__)
+    parts = [name, str(getattr(config, "_commit_hash", "") or "")]
+    if os.path.isdir(name):
+        for entry in sorted(os.scandir(name), key=lambda e: e.name):
+            if entry.name.endswith((".safetensors", ".bin")):
+                st = entry.stat()
+                parts.append(f"{entry.name}:{st.st_size}:{st.st_mtime_ns}")
+    revision = hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+    try:
+        _revision_cache[model] = revision
+    except TypeError:
+        pass
+    return revision
+
+
+class VoicePromptStore(DiskLRUCache):
+    """Content-addressed on-disk store for voice-clone prompts.
+
+    Each entry is one safetensors file holding the x-vector (and the ICL `ref_code` when present),
+    so reads are memory-mapped and any worker process pointed at the same directory shares it.
+    """
+
+    suffix = ".safetensors"
+
+    def __init__(self, root: Path = VOICE_STORE_DIR, max_bytes: int = VOICE_STORE_MAX_MB * 1024 * 1024):
+        super().__init__(root, max_bytes)
+        # ⚡ Bolt: Avoid re-hashing unchanged reference files (path:size:mtime -> sha256)
+        self._audio_hashes: Dict[str, str] = {}
+
+    def audio_hash(self, audio_path: str) -> str:
+        st = os.stat(audio_path)
+        stat_key = f"{audio_path}:{st.st_size}:{st.st_mtime_ns}"
+        digest = self._audio_hashes.get(stat_key)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(audio_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+            digest = h.hexdigest()
+            if len(self._audio_hashes) >= 1000:
+                self._audio_hashes.pop(next(iter(self._audio_hashes)))
+            self._audio_hashes[stat_key] = digest
+        return digest
+
+    def key(self, audio_path: str, model: Any, ref_text: Optional[str] = None) -> str:
+        """Key for the prompt of `audio_path`; ICL prompts (with `ref_text`) and x-vector prompts differ.
+
+        A speculative draft attached to `model` contributes its own x-vector, so it is part of the key too.
+        """
+        mode = f"icl:{ref_text}" if ref_text else "xvec"
+        revision = model_revision(model)
+        draft = getattr(model, "_draft", None)
+        if isinstance(draft, Qwen3TTSModel):
+            revision += f"+{model_revision(draft)}"
+        raw = f"{self.audio_hash(audio_path)}|{revision}|{mode}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str, device: Optional[Any] = None) -> Optional[List[VoiceClonePromptItem]]:
+        path = self._path(key)
+        try:
+            with safe_open(str(path), framework="pt", device=str(device or "cpu")) as f:
+                meta = f.metadata() or {}
+                names = set(f.keys())
+                item = VoiceClonePromptItem(
+                    ref_code=f.get_tensor("ref_code") if "ref_code" in names else None,
+                    ref_spk_embedding=f.get_tensor("ref_spk_embedding"),
+                    x_vector_only_mode=meta.get("x_vector_only_mode") == "1",
+                    icl_mode=meta.get("icl_mode") == "1",
+                    ref_text=meta.get("ref_text"),
+                    draft_spk_embedding=f.get_tensor("draft_spk_embedding") if "draft_spk_embedding" in names else None,
+                )
+            self._touch(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable voice prompt {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [item]
+
+    def put(self, key: str, prompt: List[VoiceClonePromptItem]) -> None:
+        item = prompt[0]
+        tensors = {"ref_spk_embedding": item.ref_spk_embedding.detach().cpu().contiguous()}
+        if item.ref_code is not None:
+            tensors["ref_code"] = item.ref_code.detach().cpu().contiguous()
+        if item.draft_spk_embedding is not None:
+            tensors["draft_spk_embedding"] = item.draft_spk_embedding.detach().cpu().contiguous()
+        metadata = {
+            "x_vector_only_mode": "1" if item.x_vector_only_mode else "0",
+            "icl_mode": "1" if item.icl_mode else "0",
+        }
+        if item.ref_text is not None:
+            metadata["ref_text"] = item.ref_text
+        try:
+            tmp = self._tmp_path(key)
+            save_file(tensors, str(tmp), metadata=metadata)
+            self._commit(tmp, key)
+        except Exception as e:
+            logger.warning(f"Failed to persist voice prompt: {e}")
+
+
+# Global instance shared by every synthesizer in this process
+voice_prompt_store = VoicePromptStore()
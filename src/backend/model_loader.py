@@ -1,8 +1,17 @@
 import sys
 import os
+import itertools
+import time
 import torch
 import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 # Fix import path for qwen_tts
 current_file = Path(__file__).resolve()
@@ -14,7 +23,10 @@ if str(backend_dir) not in sys.path:
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from .config import find_model_path, MODELS, logger
+from .config import (
+    find_model_path, MODELS, CONTINUOUS_BATCH_SIZE, STATIC_KV_CACHE, PREFIX_CACHE_MB, SPECULATIVE_DRAFT_TOKENS, CPU_QUANTIZATION, MMAP_WEIGHTS, DEDUP_WEIGHTS,
+    MODEL_RAM_BUDGET_MB, MODEL_VRAM_BUDGET_MB, MODEL_WARM_TIER, MODEL_PREFETCH, logger,
+)
 
 # Lazy-loaded reference (set on first use, not at import time)
 _Qwen3TTSModel = None
@@ -51,14 +63,57 @@ def _ensure_qwen_tts():
         _Qwen3TTSModel = None
 
 
+def model_footprint(model) -> Dict[str, int]:
+    """Bytes of parameters and buffers per device type across a TTS model, its speech tokenizer and its draft."""
+    modules, pending = [], [model]
+    while pending:
+        wrapper = pending.pop()
+        core = getattr(wrapper, "model", None)
+        if isinstance(core, torch.nn.Module):
+            modules.append(core)
+            tokenizer_model = getattr(getattr(core, "speech_tokenizer", None), "model", None)
+            if isinstance(tokenizer_model, torch.nn.Module):
+                modules.append(tokenizer_model)
+        if getattr(wrapper, "_draft", None) is not None:
+            pending.append(wrapper._draft)
+
+    seen, totals = set(), {}
+    for module in modules:
+        for tensor in itertools.chain(module.parameters(), module.buffers()):
+            # Tied weights share memory; memory-mapped ones share a storage but not their bytes
+            if tensor.data_ptr() in seen:
+                continue
+            seen.add(tensor.data_ptr())
+            totals[tensor.device.type] = totals.get(tensor.device.type, 0) + tensor.numel() * tensor.element_size()
+    return totals
+
+
 class ModelManager:
+    """
+    Keeps TTS models resident within a memory budget for the compute device.
+
+    Models are admitted against their measured byte footprint (estimated from the checkpoint before the first load)
+    and the least recently used ones are evicted until the next one fits. On GPU an evicted model that no caller
+    holds a lease on is parked in CPU RAM ("warm") instead of dropped, so switching back is a host-to-device copy
+    rather than a reload.
+
+    `lock` serializes loads and evictions and is held through disk reads; `residency_lock` only guards the
+    resident set and the leases, so cache hits never wait for a load.
+    """
+
     def __init__(self):
-        self.models = {}
-        self.lru_order = []  # list of keys, most recent at the end
-        self.max_models = 2
+        self.models = {}  # resident on self.device
+        self.warm = {}  # parked in CPU RAM (GPU only)
+        self.footprints = {}  # key -> measured {device type: bytes}
+        self.last_used = {}  # key -> time.monotonic() of the last request
+        self.leases = {}  # id(model) -> callers currently using it
+        self.prefetching = {}  # key -> event set when its background load ends
+        self.deduplicator = None  # created with the first load, once qwen_tts is importable
         self.device = self._get_best_device()
+        self.budgets = self._get_budgets()
         self.lock = threading.Lock()
-        
+        self.residency_lock = threading.Lock()
+
     def _get_best_device(self):
         """Identify best available device and log diagnostics."""
         cuda_available = torch.cuda.is_available()
@@ -74,69 +129,377 @@ class ModelManager:
             logger.warning("CUDA not available. Falling back to CPU. Performance will be slower.")
             return "cpu"
 
-    def load_model(self, model_type="VoiceDesign", size="1.7B"):
+    def _get_budgets(self) -> Dict[str, int]:
+        """Bytes of resident models allowed per device type."""
+        ram = MODEL_RAM_BUDGET_MB * 2**20
+        if not ram:
+            total = psutil.virtual_memory().total if psutil else 16 * 2**30
+            ram = int(total * 0.6)
+        budgets = {"cpu": ram}
+        if self.device == "cuda":
+            budgets["cuda"] = MODEL_VRAM_BUDGET_MB * 2**20 or int(torch.cuda.get_device_properties(0).total_memory * 0.9)
+        logger.info("Model memory budget: " + ", ".join(f"{d} {b / 2**30:.1f} GB" for d, b in budgets.items()))
+        return budgets
+
+    def _model_name(self, model_type):
+        if model_type == "VoiceDesign":
+            return MODELS["1.7B_VoiceDesign"]
+        if model_type == "CustomVoice":
+            return MODELS["CustomVoice_1.7B"]
+        if model_type == "Base":
+            return MODELS["1.7B_Base"]
+        logger.error(f"Unknown model type requested: {model_type}")
+        raise ValueError(f"Unknown model type: {model_type}")
+
+    def _size(self, key) -> int:
+        return sum(self.footprints.get(key, {}).values())
+
+    def _estimate_bytes(self, key, model_path) -> int:
+        """Measured footprint of a model loaded before, else its checkpoint size in the load dtype."""
+        if key in self.footprints:
+            return self._size(key)
+        stored = sum(f.stat().st_size for f in Path(model_path).rglob("*.safetensors"))
+        return stored * 2 if self.device == "cpu" else stored  # bf16 checkpoints load as fp32 on CPU, fp16 on GPU
+
+    def _resident_bytes(self) -> int:
+        return sum(self._size(k) for k in self.models)
+
+    def _is_idle(self, key) -> bool:
+        """True when no caller holds a lease on the model, so moving it cannot break one still using it."""
+        return self.leases.get(id(self.models[key]), 0) == 0
+
+    def _use(self, key, model, lease):
+        """Record a request for resident `key`. Caller holds `residency_lock`."""
+        self.last_used[key] = time.monotonic()
+        if lease:
+            self.leases[id(model)] = self.leases.get(id(model), 0) + 1
+
+    def release(self, model) -> None:
+        """Return a lease taken by `load_model(..., lease=True)`; a model evicted meanwhile is closed by its last user."""
+        with self.residency_lock:
+            count = self.leases.get(id(model))
+            if count is None:
+                return
+            if count > 1:
+                self.leases[id(model)] = count - 1
+                return
+            del self.leases[id(model)]
+            evicted = all(m is not model for m in itertools.chain(self.models.values(), self.warm.values()))
+        if evicted:
+            _close(model)
+
+    def _make_warm_room(self, size) -> bool:
+        """Drop least recently used warm models until `size` more bytes fit the RAM budget."""
+        if size > self.budgets["cpu"]:
+            return False
+        while self.warm and sum(self._size(k) for k in self.warm) + size > self.budgets["cpu"]:
+            oldest_key = min(self.warm, key=lambda k: self.last_used.get(k, 0))
+            logger.info(f"⚡ Bolt: Dropping warm model: {oldest_key}")
+            _close(self.warm.pop(oldest_key))
+        return True
+
+    def _evict(self, key):
+        """Park `key` in CPU RAM when on GPU, idle and within the RAM budget; drop it otherwise. Caller holds `lock`."""
+        with self.residency_lock:
+            park = self.device != "cpu" and MODEL_WARM_TIER and self._is_idle(key)
+            model = self.models.pop(key)
+            busy = self.leases.get(id(model), 0) > 0
+        self._forget_weights(model, key)
+        if park and self._make_warm_room(self._size(key)):
+            model.to("cpu")
+            self.warm[key] = model
+            logger.info(f"⚡ Bolt: Memory budget full. Parked model in CPU RAM: {key}")
+        else:
+            # A leased model keeps serving its callers; the last `release` closes it
+            if not busy:
+                _close(model)
+            del model
+            logger.info(f"⚡ Bolt: Memory budget full. Evicting model: {key}")
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _admit(self, key, needed):
+        """Evict least recently used resident models until `needed` more bytes fit the device budget."""
+        budget = self.budgets[self.device]
+        while self.models and self._resident_bytes() + needed > budget:
+            self._evict(min(self.models, key=lambda k: self.last_used.get(k, 0)))
+        if self._resident_bytes() + needed > budget:
+            logger.warning(
+                f"Model {key} ({needed / 2**20:.0f} MB) exceeds the {budget / 2**20:.0f} MB {self.device} budget; loading anyway"
+            )
+
+    def _forget_weights(self, model, key):
+        """Stop counting an evicted model's (and its draft's) shared weights as deduplicated."""
+        if self.deduplicator is None:
+            return
+        for wrapper in (model, getattr(model, "_draft", None)):
+            core = getattr(wrapper, "model", None)
+            if not isinstance(core, torch.nn.Module):
+                continue
+            try:
+                self.deduplicator.forget(core)
+            except Exception as e:
+                logger.warning(f"Weight deduplication bookkeeping failed for {key}: {e}")
+
+    def _deduplicate(self, model, key):
+        """Share weights identical to an already loaded model's; failures only cost the memory."""
+        try:
+            if self.deduplicator is None:
+                from .qwen_tts.core.models.weight_dedup import WeightDeduplicator
+                self.deduplicator = WeightDeduplicator()
+            saved = self.deduplicator.deduplicate(model.model)
+        except Exception as e:
+            logger.warning(f"Weight deduplication skipped for {key}: {e}")
+            return
+        if saved:
+            logger.info(
+                f"⚡ Bolt: {key} shares {sum(saved.values()) / 2**20:.0f} MB of weights with loaded models "
+                f"({', '.join(saved)})"
+            )
+
+    def _quantize(self, model, key, mode):
+        """Weight-only quantize a freshly loaded model; an unsupported mode keeps float weights."""
+        try:
+            stats = model.quantize(mode)
+        except ValueError as e:
+            logger.warning(f"Quantization skipped for {key}: {e}")
+            return
+        logger.info(
+            f"⚡ Bolt: {key} talker quantized to {mode} ({stats['layers']} linears): "
+            f"{stats['bytes_before'] / 2**20:.0f} MB -> {stats['bytes_after'] / 2**20:.0f} MB"
+        )
+
+    def _attach_speculative_draft(self, model, key):
+        """Load the 0.6B Base checkpoint as a speculative draft for `model`; failures keep plain decoding."""
+        draft_path = find_model_path(MODELS["0.6B_Base"])
+        if not draft_path:
+            logger.warning(f"Speculative decoding disabled for {key}: 0.6B Base draft not found")
+            return
+        try:
+            draft = _Qwen3TTSModel.from_pretrained(
+                str(draft_path),
+                device_map=self.device,
+                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+                local_files_only=True,
+                mmap_weights=MMAP_WEIGHTS
+            )
+            if DEDUP_WEIGHTS:
+                self._deduplicate(draft, f"{key} draft")
+            quant_mode = CPU_QUANTIZATION.get("Base", CPU_QUANTIZATION.get("*"))
+            if quant_mode and self.device == "cpu":
+                self._quantize(draft, f"{key} draft", quant_mode)
+            model.enable_speculative_decoding(draft, num_draft_tokens=SPECULATIVE_DRAFT_TOKENS)
+            logger.info(f"Speculative decoding enabled for {key} ({SPECULATIVE_DRAFT_TOKENS} draft frames per step)")
+        except Exception as e:
+            logger.warning(f"Speculative decoding unavailable for {key}: {e}")
+
+    def _load_from_disk(self, key, model_type, model_path):
+        logger.info(f"Loading Qwen-TTS model: {model_path.name} on {self.device}")
+        try:
+            model = _Qwen3TTSModel.from_pretrained(
+                str(model_path), 
+                device_map=self.device,
+                torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+                local_files_only=True,
+                mmap_weights=MMAP_WEIGHTS
+            )
+            logger.info(f"Model {key} loaded successfully.")
+
+            if DEDUP_WEIGHTS:
+                self._deduplicate(model, key)
+
+            quant_mode = CPU_QUANTIZATION.get(model_type, CPU_QUANTIZATION.get("*"))
+            if quant_mode and self.device == "cpu":
+                self._quantize(model, key, quant_mode)
+
+            if STATIC_KV_CACHE:
+                model.generate_defaults = {**model.generate_defaults, "use_static_cache": True}
+
+            if CONTINUOUS_BATCH_SIZE > 0:
+                model.enable_continuous_batching(max_batch_size=CONTINUOUS_BATCH_SIZE)
+                logger.info(f"Continuous batching enabled for {key} (max {CONTINUOUS_BATCH_SIZE} sequences)")
+
+            if PREFIX_CACHE_MB > 0:
+                try:
+                    model.enable_prefix_cache(max_bytes=PREFIX_CACHE_MB * 1024 * 1024)
+                    logger.info(f"Prefix KV cache enabled for {key} ({PREFIX_CACHE_MB} MB)")
+                except ValueError as e:
+                    logger.warning(f"Prefix KV cache unavailable for {key}: {e}")
+
+            if SPECULATIVE_DRAFT_TOKENS > 0 and model_type == "Base":
+                self._attach_speculative_draft(model, key)
+            return model
+        except Exception as e:
+            logger.critical(f"CRITICAL ERROR loading model: {e}")
+            import traceback
+            traceback.print_exc()
+            raise e
+
+    def _publish(self, key, model):
+        with self.residency_lock:
+            self.models[key] = model
+
+    def _activate(self, key, model_type):
+        """Make `key` resident: promote it from the warm tier or load it, evicting to fit. Caller holds `lock`."""
+        if key in self.warm:
+            model = self.warm.pop(key)
+            self._admit(key, self._size(key))
+            model.to(self.device)
+            logger.info(f"⚡ Bolt: Promoted warm model {key} to {self.device}")
+            if DEDUP_WEIGHTS:
+                self._deduplicate(model, key)  # the move to CPU gave it its own copies
+        else:
+            model_name = self._model_name(model_type)
+            model_path = find_model_path(model_name)
+            if not model_path:
+                logger.critical(f"Model {model_name} NOT FOUND. Initialization failed.")
+                raise FileNotFoundError(f"Model {model_name} not found.")
+            self._admit(key, self._estimate_bytes(key, model_path))
+            model = self._load_from_disk(key, model_type, Path(model_path))
+            self.footprints[key] = model_footprint(model)
+            logger.info(f"Model {key} footprint: {self._size(key) / 2**20:.0f} MB")
+        self._publish(key, model)
+        return model
+
+    def _resident(self, key, lease):
+        with self.residency_lock:
+            model = self.models.get(key)
+            if model is not None:
+                self._use(key, model, lease)
+            return model
+
+    def load_model(self, model_type="VoiceDesign", size="1.7B", lease=False):
+        """
+        The resident model for `model_type`, loaded or promoted first if needed. With `lease=True` it is not
+        moved to the warm tier until the caller hands it back with `release`.
+        """
+        key = f"{size}_{model_type}"
+
+        # ⚡ Bolt: Cache hits only take the residency lock; loads and evictions hold `lock` through disk reads
+        model = self._resident(key, lease)
+        if model is not None:
+            logger.debug(f"Model {key} found in cache.")
+            return model
+
         _ensure_qwen_tts()
         if _Qwen3TTSModel is None:
             logger.error("qwen_tts package failed to import. Check installation.")
             raise RuntimeError("qwen_tts package failed to import. Check installation.")
 
+        # A background prefetch of this model is already reading it: wait for it instead of loading it twice
+        pending = self.prefetching.get(key)
+        if pending is not None:
+            pending.wait()
+
         with self.lock:
-            key = f"{size}_{model_type}"
-
-            # ⚡ Bolt: Check LRU cache for existing model
-            if key in self.models:
-                logger.debug(f"Model {key} found in LRU cache.")
-                # Move to end of LRU list (mark as most recently used)
-                self.lru_order.remove(key)
-                self.lru_order.append(key)
-                return self.models[key]
-                
-            if model_type == "VoiceDesign":
-                model_name = MODELS["1.7B_VoiceDesign"]
-            elif model_type == "CustomVoice":
-                model_name = MODELS["CustomVoice_1.7B"]
-            elif model_type == "Base":
-                model_name = MODELS["1.7B_Base"]
+            model = self._resident(key, lease)
+            if model is None:
+                model = self._activate(key, model_type)
+                with self.residency_lock:
+                    self._use(key, model, lease)
+            return model
+
+    def prefetch(self, demand: Dict[str, int]) -> Optional[threading.Thread]:
+        """
+        Load the most demanded non-resident model type (`demand` maps model type to the items of the running render
+        still waiting for it) in a background thread, but only if it fits the budget without evicting anything.
+        Returns the thread, if one was started.
+        """
+        if not MODEL_PREFETCH:
+            return None
+        for model_type, count in sorted(demand.items(), key=lambda item: -item[1]):
+            key = f"1.7B_{model_type}"
+            if count <= 0 or key in self.models or key in self.prefetching:
+                continue
+            if key in self.warm:
+                needed = self._size(key)
             else:
-                logger.error(f"Unknown model type requested: {model_type}")
-                raise ValueError(f"Unknown model type: {model_type}")
-                 
-            model_path = find_model_path(model_name)
+                model_path = find_model_path(self._model_name(model_type))
+                if not model_path:
+                    continue
+                needed = self._estimate_bytes(key, model_path)
+            if self._resident_bytes() + needed > self.budgets[self.device]:
+                continue
+            with self.residency_lock:
+                if key in self.prefetching:
+                    continue
+                self.prefetching[key] = threading.Event()
+            thread = threading.Thread(target=self._prefetch, args=(key, model_type, needed), daemon=True, name=f"Prefetch-{key}")
+            thread.start()
+            return thread
+        return None
+
+    def _fits(self, needed) -> bool:
+        return self._resident_bytes() + needed <= self.budgets[self.device]
+
+    def _prefetch(self, key, model_type, needed):
+        """Read `key` from disk without holding `lock`, then publish it under the lock if it still fits."""
+        try:
+            _ensure_qwen_tts()
+            if _Qwen3TTSModel is None:
+                return
+            if key in self.warm:
+                # A host-to-device copy, not a read; a foreground load in progress wins
+                if self.lock.acquire(blocking=False):
+                    try:
+                        if key in self.warm and self._fits(needed):
+                            self._activate(key, model_type)
+                            self.last_used.setdefault(key, time.monotonic())
+                    finally:
+                        self.lock.release()
+                return
+            model_path = find_model_path(self._model_name(model_type))
             if not model_path:
-                logger.critical(f"Model {model_name} NOT FOUND. Initialization failed.")
-                raise FileNotFoundError(f"Model {model_name} not found.")
+                return
+            logger.info(f"⚡ Bolt: Prefetching {key} for the rest of the render")
+            model = self._load_from_disk(key, model_type, Path(model_path))
+            footprint = model_footprint(model)
+            with self.lock:
+                if key in self.models or not self._fits(sum(footprint.values())):
+                    logger.info(f"⚡ Bolt: Discarding prefetched {key}: loaded meanwhile or no longer fits")
+                    _close(model)
+                    return
+                self.footprints[key] = footprint
+                self._publish(key, model)
+                self.last_used.setdefault(key, time.monotonic())
+        except Exception as e:
+            logger.warning(f"Prefetch of {key} failed: {e}")
+        finally:
+            with self.residency_lock:
+                self.prefetching.pop(key).set()
 
-            # ⚡ Bolt: If at capacity, evict the least recently used model
-            if len(self.models) >= self.max_models:
-                oldest_key = self.lru_order.pop(0)
-                logger.info(f"⚡ Bolt: LRU Cache full. Evicting model: {oldest_key}")
-                old_model = self.models.pop(oldest_key)
-                del old_model
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "device": self.device,
+            "budget_mb": {d: b // 2**20 for d, b in self.budgets.items()},
+            "resident_mb": {k: self._size(k) // 2**20 for k in self.models},
+            "warm_mb": {k: self._size(k) // 2**20 for k in self.warm},
+            "deduplicated_mb": (self.deduplicator.bytes_saved if self.deduplicator else 0) // 2**20,
+        }
 
-            logger.info(f"Loading Qwen-TTS model: {model_name} on {self.device}")
-            try:
-                model = _Qwen3TTSModel.from_pretrained(
-                    str(model_path), 
-                    device_map=self.device,
-                    torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
-                    local_files_only=True
-                )
-                logger.info(f"Model {key} loaded successfully.")
-
-                # ⚡ Bolt: Store in LRU cache
-                self.models[key] = model
-                self.lru_order.append(key)
-                return model
-            except Exception as e:
-                logger.critical(f"CRITICAL ERROR loading model: {e}")
-                import traceback
-                traceback.print_exc()
-                raise e
+def _close(model) -> None:
+    """Stop a model's background scheduler threads, which otherwise keep a dropped model alive."""
+    close = getattr(model, "close", None)
+    if close is not None:
+        close()
 
 # Global instance
 manager = ModelManager()
 
 def get_model(model_type="VoiceDesign"):
-    return manager.load_model(model_type)
+    """The resident model of `model_type`, leased to the caller: hand it back with `release_model` (or `leased`)."""
+    return manager.load_model(model_type, lease=True)
+
+def release_model(model):
+    manager.release(model)
+
+@contextmanager
+def leased(model):
+    """Release a model from `get_model` when the block exits: `with leased(get_model("Base")) as model:`."""
+    try:
+        yield model
+    finally:
+        manager.release(model)
+
+def prefetch_models(demand):
+    return manager.prefetch(demand)
@@ -11,28 +11,32 @@ import logging
 import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 
 from .config import BASE_DIR, SHARED_ASSETS_DIR, VIDEO_DIR, logger
 from pydub import AudioSegment
 from deep_translator import GoogleTranslator
 
 from .qwen_tts.inference.qwen3_tts_model import VoiceClonePromptItem
-from .model_loader import get_model
+from .model_loader import get_model, leased, prefetch_models, release_model, manager as model_manager
 from .video_engine import VideoEngine
 from .utils import phoneme_manager, AudioPostProcessor, Profiler, prune_dict_cache, audit_manager
 
-from concurrent.futures import ThreadPoolExecutor
 import queue
 
 from .engine_modules.segmenter import TextSegmenter
 from .engine_modules.synthesizer import VoiceSynthesizer
-from .engine_modules.patcher import PodcastPatcher
+from .engine_modules.segment_cache import is_deterministic, segment_cache
+from .engine_modules.patcher import PodcastPatcher, RenderState
+from .engine_modules.batch_planner import estimate_tokens, kv_bytes_per_token, plan_batches
+from .engine_modules.transcriber import transcriber
 
 # ⚡ Bolt: Global cache for audio watermark tone to avoid redundant math and allocations
 _watermark_tone_cache = {}
 # ⚡ Bolt: Reference to system settings to avoid redundant circular-import-safe lookups
 _system_settings = None
+# Codec frames the talker generates per second of audio
+CODEC_FRAME_RATE = 12.5
 
 class PodcastEngine:
     def __init__(self):
@@ -44,7 +48,6 @@ class PodcastEngine:
         self._video_dir = Path(VIDEO_DIR).resolve()
         self._shared_assets_dir = Path(SHARED_ASSETS_DIR).resolve()
 
-        self.executor = ThreadPoolExecutor(max_workers=4)
         # Caches
         self.preset_embeddings = {}
         self.clone_embedding_cache = {}
@@ -62,8 +65,7 @@ class PodcastEngine:
             self._resolve_paths, self._extract_audio_with_cache
         )
         self.patcher = PodcastPatcher(self.bgm_cache, self._bgm_dir, self._shared_assets_dir)
-
-        self._whisper_model = None # Lazy load
+        self.render_states = {}  # render session (project) -> RenderState of its last podcast render
 
     def _resolve_paths(self, relative_path: str) -> List[Path]:
         """Resolve one or more relative paths against upload_dir and ensure safety."""
@@ -92,12 +94,29 @@ class PodcastEngine:
             resolved.append(path_obj)
         return resolved
 
+    @staticmethod
+    def _block_key(item: Dict[str, Any], profile: Optional[Dict[str, Any]], temperature: Optional[float], seed: Optional[int], gen_kwargs: Dict[str, Any]) -> Optional[str]:
+        """Block id plus a hash of everything that shapes the block's synthesized audio (not its placement)."""
+        if not item.get("id") or profile is None:
+            return None
+        content = {
+            "text": item.get("text"), "language": item.get("language", "auto"), "instruct": item.get("instruct"),
+            "temperature": item.get("temperature") if item.get("temperature") is not None else temperature,
+            "profile": profile, "seed": seed, "generate": gen_kwargs,
+        }
+        digest = hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"{item['id']}:{digest}"
+
     def _get_model_type_for_profile(self, profile: Dict[str, Any]) -> str:
         ptype = profile.get("type")
         if ptype == "preset": return "CustomVoice"
         if ptype == "design": return "VoiceDesign"
         return "Base"
 
+    def resident_model_types(self) -> List[str]:
+        """Model types loaded on this process's device (reported by inference workers for job routing)."""
+        return sorted(key.split("_", 1)[1] for key in model_manager.models)
+
     def get_system_status(self) -> Dict[str, Any]:
         return {
             "status": "ready",
@@ -137,40 +156,52 @@ class PodcastEngine:
 
     def transcribe_audio(self, audio_path: str) -> Dict[str, Any]:
         """Transcribe audio and return text, detected language, and segments."""
-        resolved = self._resolve_paths(audio_path)
-        actual_path = str(resolved[0])
-        if VideoEngine.is_video(actual_path):
-            actual_path = self._extract_audio_with_cache(actual_path)
-
-        path_obj = Path(actual_path)
-        cache_key = None
-        if path_obj.exists():
-            try:
-                stat = path_obj.stat()
-                cache_key = f"{actual_path}:{stat.st_size}:{stat.st_mtime}"
-                if cache_key in self.transcription_cache:
-                    return self.transcription_cache[cache_key]
-            except Exception: pass
-        if self._whisper_model is None:
-            import whisper
-            self._whisper_model = whisper.load_model("base")
-        
-        # Whisper returns {"text": ..., "language": ..., "segments": ...}
-        result = self._whisper_model.transcribe(actual_path)
-        
-        output = {
-            "text": result.get("text", ""),
-            "language": result.get("language", "unknown"),
-            "segments": result.get("segments", [])
-        }
-        
-        if cache_key:
-            try:
-                # ⚡ Bolt: Gradual cache pruning instead of drastic clear()
-                prune_dict_cache(self.transcription_cache, limit=1000, count=100)
-                self.transcription_cache[cache_key] = output
-            except Exception: pass
-        return output
+        result = self.transcribe_batch([audio_path])[0]
+        if result is None:
+            raise RuntimeError(f"Could not transcribe {audio_path}")
+        return result
+
+    def transcribe_batch(self, audio_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Transcribe several files, decoding all cache misses together in one batched Whisper pass.
+
+        Results are cached under `path:size:mtime`, like single-file transcriptions. A file that cannot be
+        read yields None.
+        """
+        outputs: List[Optional[Dict[str, Any]]] = [None] * len(audio_paths)
+        pending = {}  # actual path -> (cache key, indices into outputs)
+        for i, audio_path in enumerate(audio_paths):
+            resolved = self._resolve_paths(audio_path)
+            actual_path = str(resolved[0])
+            if VideoEngine.is_video(actual_path):
+                actual_path = self._extract_audio_with_cache(actual_path)
+
+            path_obj = Path(actual_path)
+            cache_key = None
+            if path_obj.exists():
+                try:
+                    stat = path_obj.stat()
+                    cache_key = f"{actual_path}:{stat.st_size}:{stat.st_mtime}"
+                    if cache_key in self.transcription_cache:
+                        outputs[i] = self.transcription_cache[cache_key]
+                        continue
+                except Exception: pass
+            pending.setdefault(actual_path, (cache_key, []))[1].append(i)
+
+        if not pending:
+            return outputs
+        # ⚡ Bolt: One batched, voice-activity-gated decode for every miss instead of a model call per file
+        results = transcriber.transcribe(list(pending))
+        for (cache_key, indices), output in zip(pending.values(), results):
+            for i in indices:
+                outputs[i] = output
+            if cache_key and output is not None:
+                try:
+                    # ⚡ Bolt: Gradual cache pruning instead of drastic clear()
+                    prune_dict_cache(self.transcription_cache, limit=1000, count=100)
+                    self.transcription_cache[cache_key] = output
+                except Exception: pass
+        return outputs
 
     def get_speaker_embedding(self, profile: Dict[str, str], model: Optional[Any] = None) -> Optional[torch.Tensor]:
         return self.synthesizer.get_speaker_embedding(profile, model)
@@ -296,13 +327,11 @@ class PodcastEngine:
         
         # 3. Process sequentially or in small batches to maintain stability
         # Processing too many chunks in parallel can cause VRAM spikes and OOM
-        # Using a generator here allows for true streaming response
+        # ⚡ Bolt: Each sentence is decoded incrementally while the talker generates it, so the first audio
+        # arrives after a few codec frames instead of after the whole first sentence.
         for chunk_text in final_chunks:
             try:
-                # ⚡ Bolt Stability: Add a small pause or reset context if needed here
-                # For now, generating segment-by-segment is safer than one huge prompt
-                wav, sr = self.generate_segment(chunk_text, profile, language, None, instruct, temperature=temperature)
-                yield wav, sr
+                yield from self.synthesizer.stream_segment(chunk_text, profile, language, instruct, temperature=temperature, watermark_func=self._apply_audio_watermark)
             except Exception as e:
                 logger.error(f"Chunk synthesis failed for '{chunk_text[:20]}...': {e}")
                 continue
@@ -310,116 +339,199 @@ class PodcastEngine:
     def generate_voice_changer(self, source_audio: str, target_profile: Optional[Dict[str, Any]] = None, preserve_prosody: bool = True, instruct: Optional[str] = None) -> Dict[str, Any]:
         result = self.transcribe_audio(source_audio)
         text = result["text"]
-        resolved = self._resolve_paths(source_audio)
-        source_path = str(resolved[0])
-        if VideoEngine.is_video(source_path): source_path = self._extract_audio_with_cache(source_path)
-        model = get_model("Base")
-        
-        target_emb = self.get_speaker_embedding(target_profile or {"type": "preset", "value": "Ryan"})
-        
-        if preserve_prosody:
-            # ICL mode captures prosody via ref_code
-            prompt_items = model.create_voice_clone_prompt(ref_audio=source_path, ref_text=text, x_vector_only_mode=False)
-            voice_clone_prompt = {
-                "ref_code": [prompt_items[0].ref_code],
-                "ref_spk_embedding": [target_emb],
-                "x_vector_only_mode": [False],
-                "icl_mode": [True]
-            }
-        else:
-            # Standard cloning: just the voice embedding
-            voice_clone_prompt = {
-                "ref_spk_embedding": [target_emb],
-                "x_vector_only_mode": [True],
-                "icl_mode": [False]
-            }
-            
-        wavs, sr = model.generate_voice_clone(text=text, voice_clone_prompt=voice_clone_prompt, instruct=instruct)
+        ref_codes = self.encode_voice_changer_sources([source_audio], [text], preserve_prosody)
+        wavs, sr = self.synthesize_voice_changer([text], ref_codes, target_profile, instruct=instruct)
         return {"waveform": wavs[0], "sample_rate": sr, "text": text}
 
-    def generate_podcast(self, script: List[Dict[str, Any]], profiles: Dict[str, Dict[str, Any]], bgm_mood: Optional[str] = None, ducking_level: float = 0.0, eq_preset: str = "flat", reverb_level: float = 0.0, master_acx: bool = False, temperature: Optional[float] = None, **gen_kwargs) -> Optional[Dict[str, Any]]:
+    def encode_voice_changer_sources(self, source_audios: List[str], texts: List[str], preserve_prosody: bool = True) -> List[Optional[torch.Tensor]]:
+        """ICL reference codes of several voice-changer sources in one speech-tokenizer pass (all None without prosody)."""
+        if not preserve_prosody:
+            return [None] * len(source_audios)
+        source_paths = []
+        for source_audio in source_audios:
+            source_path = str(self._resolve_paths(source_audio)[0])
+            if VideoEngine.is_video(source_path): source_path = self._extract_audio_with_cache(source_path)
+            source_paths.append(source_path)
+        # ICL mode captures prosody via ref_code
+        with leased(get_model("Base")) as model:
+            prompt_items = model.create_voice_clone_prompt(ref_audio=source_paths, ref_text=list(texts), x_vector_only_mode=False)
+        return [item.ref_code for item in prompt_items]
+
+    def synthesize_voice_changer(self, texts: List[str], ref_codes: List[Optional[torch.Tensor]], target_profile: Optional[Dict[str, Any]] = None, instruct: Optional[str] = None) -> tuple[List[np.ndarray], int]:
+        """Speak several transcripts in the target voice with one batched `generate_voice_clone` call."""
+        target_emb = self.get_speaker_embedding(target_profile or {"type": "preset", "value": "Ryan"})
+        icl = [code is not None for code in ref_codes]
+        voice_clone_prompt = {
+            "ref_spk_embedding": [target_emb] * len(texts),
+            "x_vector_only_mode": [not i for i in icl],
+            "icl_mode": icl,
+        }
+        if any(icl):
+            voice_clone_prompt["ref_code"] = list(ref_codes)
+        with leased(get_model("Base")) as model:
+            return model.generate_voice_clone(text=texts if len(texts) > 1 else texts[0], voice_clone_prompt=voice_clone_prompt, instruct=instruct)
+
+    @staticmethod
+    def _batch_kwargs(model: Any, temps: List[Optional[float]], **gen_kwargs) -> Dict[str, Any]:
+        """Generation kwargs of one planned batch: its rows' shared temperature, or one per row."""
+        sampling = {"temperature": temps[0]}
+        if len(set(temps)) > 1:
+            # ⚡ Bolt: One value per row; the talker applies them with vectorized logits warpers
+            default = model._merge_generate_kwargs(**dict(gen_kwargs))["temperature"]
+            sampling = {"temperature": [t if t is not None else default for t in temps]}
+        return {**gen_kwargs, **sampling}
+
+    def _synthesize_batch(self, mtype: str, model: Any, indices: List[int], script: List[Dict[str, Any]], profiles: Dict[str, Dict[str, Any]], texts: Dict[int, str], **kwargs) -> tuple[List[np.ndarray], int]:
+        """Synthesize one planned batch of script lines with a single batched `generate_*` call (`kwargs` from `_batch_kwargs`)."""
+        batch_texts = [texts[i] for i in indices]
+        batch_langs = [script[i].get("language", "auto") for i in indices]
+        batch_instructs = [script[i].get("instruct") or profiles[script[i]["role"]].get("instruct") for i in indices]
+
+        if mtype == "CustomVoice":
+            speakers = [profiles[script[i]["role"]]["value"] for i in indices]
+            return model.generate_custom_voice(text=batch_texts, speaker=speakers, language=batch_langs, instruct=batch_instructs, **kwargs)
+        if mtype == "VoiceDesign":
+            design_instructs = []
+            for i, idx in enumerate(indices):
+                p = profiles[script[idx]["role"]]
+                ins = p["value"]
+                if batch_instructs[i]: ins = f"{ins}, {batch_instructs[i]}"
+                design_instructs.append(ins)
+            return model.generate_voice_design(text=batch_texts, instruct=design_instructs, language=batch_langs, non_streaming_mode=True, **kwargs)
+
+        batch_prompts = []
+        for idx in indices:
+            p = profiles[script[idx]["role"]]
+            cache_key = p["value"] if p["type"] == "clone" else f"mix:{p['value']}"
+            if cache_key in self.prompt_cache:
+                prompt = self.prompt_cache[cache_key]
+            else:
+                if p["type"] == "clone":
+                    resolved = self._resolve_paths(p["value"])
+                    ref_audio = str(resolved[0])
+                    if VideoEngine.is_video(ref_audio): ref_audio = self._extract_audio_with_cache(ref_audio)
+                    prompt = self.synthesizer.load_clone_prompt(ref_audio, model)
+                elif p["type"] == "mix":
+                    mix_configs = json.loads(p["value"])
+                    mixed_emb = self._compute_mixed_embedding(mix_configs, model=model)
+                    prompt = [VoiceClonePromptItem(ref_code=None, ref_spk_embedding=mixed_emb, x_vector_only_mode=True, icl_mode=False, ref_text=None)]
+                else:
+                    raise ValueError(f"Profile type {p['type']} not compatible with Base model batching")
+                # ⚡ Bolt: Prevent unbounded growth of prompt cache
+                prune_dict_cache(self.prompt_cache, limit=200, count=20)
+                self.prompt_cache[cache_key] = prompt
+            batch_prompts.append(prompt[0])
+        return model.generate_voice_clone(text=batch_texts, language=batch_langs, voice_clone_prompt=batch_prompts, instruct=batch_instructs, **kwargs)
+
+    def generate_podcast(self, script: List[Dict[str, Any]], profiles: Dict[str, Dict[str, Any]], bgm_mood: Optional[str] = None, ducking_level: float = 0.0, eq_preset: str = "flat", reverb_level: float = 0.0, master_acx: bool = False, temperature: Optional[float] = None, render_session: Optional[str] = None, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None, **gen_kwargs) -> Optional[Dict[str, Any]]:
         with Profiler("Generate Podcast"):
             sample_rate = 24000
             waveforms = [None] * len(script)
             srs = [None] * len(script)
-
-            # ⚡ Bolt: Group segments by model type and temperature for batched synthesis
-            # Note: Batching currently only works for identical generation parameters.
-            # If segments have different temperatures, we might need more complex grouping or fall back to serial.
+            seed = gen_kwargs.pop("seed", None)
+
+            # ⚡ Bolt: Fine-grained progress for long renders: lines synthesized (or reused) and codec frames
+            # generated, reported after every batch
+            codec_frames = 0
+            def report(stage: str):
+                if on_progress is not None:
+                    on_progress({"stage": stage, "segments_done": sum(w is not None for w in waveforms),
+                                 "segments_total": len(script), "codec_frames": codec_frames})
+
+            # ⚡ Bolt: Incremental render — blocks whose id and content hash match the session's previous render
+            # reuse that audio, so only edited blocks are resynthesized.
+            state = None
+            block_keys = [None] * len(script)
+            if render_session:
+                if render_session not in self.render_states:
+                    prune_dict_cache(self.render_states, limit=8, count=1)
+                    self.render_states[render_session] = RenderState()
+                state = self.render_states[render_session]
+                for i, item in enumerate(script):
+                    block_keys[i] = self._block_key(item, profiles.get(item.get("role")), temperature, seed, gen_kwargs)
+                    if block_keys[i] in state.blocks:
+                        waveforms[i], srs[i] = state.blocks[block_keys[i]]
+
+            # ⚡ Bolt: Group segments by model type, then let the batch planner split each group into batches of
+            # similar length that fit the KV-cache budget. Lines with different temperatures share a batch: the
+            # talker samples each row with its own temperature instead of falling back to serial synthesis.
             groups = {"CustomVoice": [], "VoiceDesign": [], "Base": []}
             for i, item in enumerate(script):
                 role = item.get("role")
                 profile = profiles.get(role)
-                if profile is None:
+                if profile is None or waveforms[i] is not None:
                     continue
                 mtype = self._get_model_type_for_profile(profile)
                 if profile.get("type") == "preset":
                     mtype = "CustomVoice"
                 groups[mtype].append(i)
 
+            report("synthesizing")
+            pending = {mtype: len(indices) for mtype, indices in groups.items() if indices}
             for mtype, indices in groups.items():
                 if not indices:
                     continue
+                pending.pop(mtype)
+                batches = [indices]
+                model = lease = None
                 try:
-                    # Check if all segments in this group share the same temperature
-                    # If not, we fall back to serial synthesis for safety
-                    group_temps = [script[idx].get("temperature") if script[idx].get("temperature") is not None else temperature for idx in indices]
-                    if len(set(group_temps)) > 1:
-                         raise ValueError("Heterogeneous temperatures in batch; falling back to serial.")
-
-                    target_temp = group_temps[0]
-                    model = get_model(mtype)
-                    batch_texts = [phoneme_manager.apply(script[i]["text"]) for i in indices]
-                    batch_langs = [script[i].get("language", "auto") for i in indices]
-                    batch_instructs = [script[i].get("instruct") or profiles[script[i]["role"]].get("instruct") for i in indices]
-
-                    if mtype == "CustomVoice":
-                        speakers = [profiles[script[i]["role"]]["value"] for i in indices]
-                        wavs, sr = model.generate_custom_voice(text=batch_texts, speaker=speakers, language=batch_langs, instruct=batch_instructs, temperature=target_temp, **gen_kwargs)
-                    elif mtype == "VoiceDesign":
-                        design_instructs = []
-                        for i, idx in enumerate(indices):
-                            p = profiles[script[idx]["role"]]
-                            ins = p["value"]
-                            if batch_instructs[i]: ins = f"{ins}, {batch_instructs[i]}"
-                            design_instructs.append(ins)
-                        wavs, sr = model.generate_voice_design(text=batch_texts, instruct=design_instructs, language=batch_langs, non_streaming_mode=True, temperature=target_temp, **gen_kwargs)
-                    elif mtype == "Base":
-                        batch_prompts = []
-                        for i, idx in enumerate(indices):
-                            p = profiles[script[idx]["role"]]
-                            cache_key = p["value"] if p["type"] == "clone" else f"mix:{p['value']}"
-                            if cache_key in self.prompt_cache:
-                                prompt = self.prompt_cache[cache_key]
-                            else:
-                                if p["type"] == "clone":
-                                    resolved = self._resolve_paths(p["value"])
-                                    ref_audio = str(resolved[0])
-                                    if VideoEngine.is_video(ref_audio): ref_audio = self._extract_audio_with_cache(ref_audio)
-                                    prompt = model.create_voice_clone_prompt(ref_audio=ref_audio, x_vector_only_mode=True)
-                                elif p["type"] == "mix":
-                                    mix_configs = json.loads(p["value"])
-                                    mixed_emb = self._compute_mixed_embedding(mix_configs, model=model)
-                                    prompt = [VoiceClonePromptItem(ref_code=None, ref_spk_embedding=mixed_emb, x_vector_only_mode=True, icl_mode=False, ref_text=None)]
-                                else:
-                                    raise ValueError(f"Profile type {p['type']} not compatible with Base model batching")
-                                # ⚡ Bolt: Prevent unbounded growth of prompt cache
-                                prune_dict_cache(self.prompt_cache, limit=200, count=20)
-                                self.prompt_cache[cache_key] = prompt
-                            batch_prompts.append(prompt[0])
-                        wavs, sr = model.generate_voice_clone(text=batch_texts, language=batch_langs, voice_clone_prompt=batch_prompts, instruct=batch_instructs, temperature=target_temp, **gen_kwargs)
-
-                    for j, idx in enumerate(indices):
-                        waveforms[idx], srs[idx] = wavs[j], sr
-                except Exception as e:
-                    logger.warning(f"⚡ Bolt: Batch synthesis failed for {mtype}, falling back to serial: {e}")
+                    model = lease = get_model(mtype)
+                    # ⚡ Bolt: Load the model the remaining groups need while this group synthesizes
+                    prefetch_models(pending)
+
+                    texts, temps, fingerprints, planned = {}, {}, {}, []
                     for idx in indices:
+                        item, p = script[idx], profiles[script[idx]["role"]]
+                        texts[idx] = phoneme_manager.apply(item["text"])
+                        temps[idx] = item.get("temperature") if item.get("temperature") is not None else temperature
+                        fingerprints[idx] = segment_cache.fingerprint(texts[idx], p, item.get("language", "auto"), item.get("instruct") or p.get("instruct"), temps[idx], model, {**gen_kwargs, "seed": seed})
+                        planned.append({"index": idx, "tokens": estimate_tokens(texts[idx]), "sampling": {**gen_kwargs, "temperature": temps[idx]}})
+                    batches = plan_batches(planned, bytes_per_token=kv_bytes_per_token(model))
+                except Exception as e:
+                    logger.warning(f"⚡ Bolt: Batch planning failed for {mtype}, falling back to serial: {e}")
+                    model = None
+
+                try:
+                    for batch in batches:
                         try:
-                            item = script[idx]
-                            current_temp = item.get("temperature") if item.get("temperature") is not None else temperature
-                            wav, sr = self.generate_segment(item["text"], profile=profiles.get(item["role"]), language=item.get("language", "auto"), instruct=item.get("instruct"), temperature=current_temp, **gen_kwargs)
-                            waveforms[idx], srs[idx] = wav, sr
-                        except Exception: continue
+                            if model is None:
+                                raise RuntimeError(f"{mtype} model unavailable for batching")
+                            # ⚡ Bolt: A batch whose lines were all cached with the same batch-mates is not
+                            # resynthesized, so re-rendering only synthesizes the batches an edit touched.
+                            # The seed reaches the model, which gives each row its own RNG on scheduler paths,
+                            # as it does for a single segment
+                            kwargs = self._batch_kwargs(model, [temps[i] for i in batch], seed=None if seed == -1 else seed, **gen_kwargs)
+                            # Rows of mixed temperatures are sampled by the batched `generate`, where a seed is shared
+                            deterministic = is_deterministic(kwargs, model)
+                            batch_prints = [fingerprints[i] if deterministic else None for i in batch]
+                            cache_keys = [segment_cache.batch_key(fingerprints[i], batch_prints) for i in batch]
+                            cached = [segment_cache.get(key) for key in cache_keys]
+                            if all(c is not None for c in cached):
+                                for idx, (wav, sr) in zip(batch, cached):
+                                    waveforms[idx], srs[idx] = wav, sr
+                                report("synthesizing")
+                                continue
+                            wavs, sr = self._synthesize_batch(mtype, model, batch, script, profiles, texts, **kwargs)
+                            for j, idx in enumerate(batch):
+                                waveforms[idx], srs[idx] = wavs[j], sr
+                                segment_cache.put(cache_keys[j], wavs[j], sr)
+                                codec_frames += round(len(wavs[j]) * CODEC_FRAME_RATE / sr)
+                        except Exception as e:
+                            logger.warning(f"⚡ Bolt: Batch synthesis failed for {mtype}, falling back to serial: {e}")
+                            for idx in batch:
+                                try:
+                                    item = script[idx]
+                                    current_temp = item.get("temperature") if item.get("temperature") is not None else temperature
+                                    wav, sr = self.generate_segment(item["text"], profile=profiles.get(item["role"]), language=item.get("language", "auto"), instruct=item.get("instruct"), temperature=current_temp, seed=seed, **gen_kwargs)
+                                    waveforms[idx], srs[idx] = wav, sr
+                                    codec_frames += round(len(wav) * CODEC_FRAME_RATE / sr)
+                                except Exception: continue
+                        report("synthesizing")
+                finally:
+                    if lease is not None:
+                        release_model(lease)
+
+            report("mixing")
 
             # ⚡ Bolt: Check speaker embedding consistency across segments (Task 4.3)
             speaker_first_emb = {}  # role -> embedding of first segment
@@ -462,6 +574,7 @@ class PodcastEngine:
             # ACX/Audible prefers mono for voice, but 2026 trends favor spatial 3D audio.
             is_stereo_req = bgm_mood is not None
             final_wav, max_sample, speech_segments = self.patcher.construct_timeline(script, waveforms, srs, sample_rate, is_stereo_req)
+            layout = [{"key": block_keys[seg["index"]], "start": seg["start"], "pan": script[seg["index"]].get("pan", 0.0)} for seg in speech_segments]
 
             if bgm_mood:
                 is_stereo = any(s.get("pan", 0) != 0 for s in script) or bgm_mood is not None
@@ -473,7 +586,19 @@ class PodcastEngine:
                         final_wav += bgm_samples
 
             # ⚡ Bolt: Post-Processing Pipeline (Task 4.4)
-            final_wav = self.patcher.apply_mastering(final_wav, sample_rate, eq_preset, reverb_level, master_acx)
+            # With an unchanged mastering chain and no mix-wide stages (BGM bed, ACX loudness), only the regions
+            # around edited blocks are re-mastered; the rest is spliced in from the previous render.
+            mastering = (eq_preset, reverb_level, master_acx, bgm_mood, ducking_level, sample_rate)
+            mastered = None
+            if state is not None and state.mastering == mastering and not bgm_mood and not master_acx:
+                mastered = self.patcher.remaster_incremental(final_wav, layout, state, sample_rate, eq_preset, reverb_level)
+            if mastered is None:
+                mastered = self.patcher.apply_mastering(final_wav, sample_rate, eq_preset, reverb_level, master_acx)
+            final_wav = mastered
+
+            if state is not None:
+                state.blocks = {key: (waveforms[i], srs[i]) for i, key in enumerate(block_keys) if key is not None and waveforms[i] is not None}
+                state.layout, state.mastered, state.mastering = layout, final_wav, mastering
 
             # ⚡ Bolt: Apply watermark once at the very end of the podcast project.
             final_wav = self._apply_audio_watermark(final_wav, sample_rate)
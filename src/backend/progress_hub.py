@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from .config import logger
+
+
+class Subscription:
+    """One event-stream client's view of the hub.
+
+    Only the newest snapshot of each task is kept until the client reads it, so a slow client
+    coalesces bursts of progress updates instead of buffering all of them.
+    """
+
+    def __init__(self, task_id: Optional[str], loop: asyncio.AbstractEventLoop):
+        self.task_id = task_id
+        self.loop = loop
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.ready = asyncio.Event()
+
+    def _push(self, task_id: str, snapshot: Dict[str, Any]) -> None:
+        # Runs on the subscriber's event loop
+        self.pending[task_id] = snapshot
+        self.ready.set()
+
+    async def get(self) -> List[Dict[str, Any]]:
+        """Wait for and return the snapshots that changed since the last call."""
+        await self.ready.wait()
+        self.ready.clear()
+        snapshots = list(self.pending.values())
+        self.pending.clear()
+        return snapshots
+
+
+class ProgressHub:
+    """Fans task state changes out from task threads to asyncio subscribers (SSE streams)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers: Dict[Optional[str], Set[Subscription]] = {}  # task id (None = every task) -> subscriptions
+
+    def subscribe(self, task_id: Optional[str] = None) -> Subscription:
+        """Follow one task, or every task when `task_id` is None. Must be called on the event loop."""
+        subscription = Subscription(task_id, asyncio.get_running_loop())
+        with self.lock:
+            self.subscribers.setdefault(task_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            subscriptions = self.subscribers.get(subscription.task_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[subscription.task_id]
+
+    def has_subscribers(self, task_id: str) -> bool:
+        # Unlocked read: a subscriber added concurrently still gets the current state when it connects
+        return bool(self.subscribers.get(task_id) or self.subscribers.get(None))
+
+    def publish(self, task_id: str, snapshot: Dict[str, Any]) -> None:
+        """Hand `snapshot` to every subscriber of `task_id`; safe to call from any thread."""
+        with self.lock:
+            targets = [*self.subscribers.get(task_id, ()), *self.subscribers.get(None, ())]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, task_id, snapshot)
+            except RuntimeError:
+                # The client's event loop is gone
+                logger.debug(f"Dropping progress subscriber of a closed event loop ({task_id})")
+                self.unsubscribe(subscription)
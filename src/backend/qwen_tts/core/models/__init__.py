@@ -14,5 +14,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from .configuration_qwen3_tts import Qwen3TTSConfig
-from .modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
+from .modeling_qwen3_tts import (
+    PerRowRepetitionPenaltyLogitsProcessor,
+    PerRowSamplingLogitsWarper,
+    Qwen3TTSForConditionalGeneration,
+)
 from .processing_qwen3_tts import Qwen3TTSProcessor
\ No newline at end of file
@@ -0,0 +1,594 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Continuous batching for the Qwen3TTS talker decode loop.
+
+`Qwen3TTSForConditionalGeneration.generate` left-pads one fixed batch and decodes until the slowest row
+emits EOS. The scheduler below instead keeps a pool of KV slots: new requests are prefilled into a free
+slot at a step boundary, every active slot advances by one codec frame per batched forward, and rows are
+retired as soon as they finish so their slot can be reused by the next request.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import torch
+from transformers.generation.logits_process import TemperatureLogitsWarper, TopKLogitsWarper, TopPLogitsWarper
+from transformers.utils import logging
+
+from .modeling_qwen3_tts import multinomial_per_row
+
+logger = logging.get_logger(__name__)
+
+# Sampling arguments that must be identical for every request sharing the decode loop.
+SAMPLING_KEYS = (
+    "do_sample",
+    "top_k",
+    "top_p",
+    "temperature",
+    "repetition_penalty",
+    "subtalker_dosample",
+    "subtalker_top_k",
+    "subtalker_top_p",
+    "subtalker_temperature",
+)
+
+
+class TalkerKVSlots:
+    """
+    Per-sequence key/value storage for the talker.
+
+    Each layer owns one `(num_slots, num_kv_heads, capacity, head_dim)` buffer; every request occupies a single
+    slot and tracks its own length, so sequences of different lengths share a forward pass without padding the
+    prompt. Capacity grows geometrically when a slot runs out of room.
+    """
+
+    def __init__(self, config, num_slots: int, capacity: int = 256, device=None, dtype=torch.float32):
+        self.num_layers = config.num_hidden_layers
+        self.num_slots = num_slots
+        self.capacity = capacity
+        self.device = device
+        self.dtype = dtype
+        self.num_kv_heads = config.num_key_value_heads
+        self.head_dim = getattr(config, "head_dim", config.hidden_size // config.num_attention_heads)
+        shape = (num_slots, self.num_kv_heads, capacity, self.head_dim)
+        self.keys = [torch.zeros(shape, device=device, dtype=dtype) for _ in range(self.num_layers)]
+        self.values = [torch.zeros(shape, device=device, dtype=dtype) for _ in range(self.num_layers)]
+        self.lengths = torch.zeros(num_slots, dtype=torch.long, device=device)
+        self._free = list(range(num_slots))
+
+    @property
+    def free_slots(self) -> int:
+        return len(self._free)
+
+    def allocate(self) -> int:
+        slot = self._free.pop(0)
+        self.lengths[slot] = 0
+        return slot
+
+    def release(self, slot: int) -> None:
+        self.lengths[slot] = 0
+        self._free.append(slot)
+
+    def reserve(self, length: int) -> None:
+        """Make sure every slot can hold `length` positions."""
+        if length <= self.capacity:
+            return
+        new_capacity = max(length, self.capacity * 2)
+        for layer in range(self.num_layers):
+            for buffers in (self.keys, self.values):
+                grown = buffers[layer].new_zeros(
+                    (self.num_slots, self.num_kv_heads, new_capacity, self.head_dim)
+                )
+                grown[:, :, : self.capacity] = buffers[layer]
+                buffers[layer] = grown
+        self.capacity = new_capacity
+
+    def view(self, slots: torch.Tensor) -> "_TalkerKVSlotView":
+        return _TalkerKVSlotView(self, slots)
+
+
+class _TalkerKVSlotView:
+    """
+    Cache object handed to `Qwen3TTSTalkerModel.forward` for one batched step over `slots`.
+
+    `update` writes the new keys/values at each slot's own length and returns the slot rows truncated to the
+    longest active sequence; the caller masks out positions beyond each row's length.
+    """
+
+    def __init__(self, storage: TalkerKVSlots, slots: torch.Tensor):
+        self.storage = storage
+        self.slots = slots
+        self.starts = storage.lengths[slots]
+
+    def get_seq_length(self, layer_idx: int = 0) -> int:
+        return int(self.starts.max())
+
+    def update(self, key_states, value_states, layer_idx, cache_kwargs=None):
+        keys = self.storage.keys[layer_idx]
+        values = self.storage.values[layer_idx]
+        q_len = key_states.shape[2]
+        if q_len == 1:
+            keys[self.slots, :, self.starts] = key_states[:, :, 0]
+            values[self.slots, :, self.starts] = value_states[:, :, 0]
+        else:
+            for row, (slot, start) in enumerate(zip(self.slots.tolist(), self.starts.tolist())):
+                keys[slot, :, start : start + q_len] = key_states[row]
+                values[slot, :, start : start + q_len] = value_states[row]
+        span = int(self.starts.max()) + q_len
+        return keys[self.slots, :, :span], values[self.slots, :, :span]
+
+
+@dataclass
+class TalkerSequence:
+    """Decode state of one request inside the continuous batch."""
+
+    request_id: int
+    prompt_embeds: torch.Tensor  # (1, T, D)
+    trailing_text_hidden: torch.Tensor  # (1, L, D)
+    max_new_tokens: int
+    future: Future
+    frames: Optional[queue.Queue] = None  # receives each (num_code_groups,) frame, then `None`, when streaming
+    slot: int = -1
+    rope_delta: int = 0
+    text_step: int = 0
+    generated: int = 0
+    last_token: Optional[torch.Tensor] = None  # (1, 1)
+    past_hidden: Optional[torch.Tensor] = None  # (1, 1, D)
+    seen_tokens: Optional[torch.Tensor] = None  # (V,) bool, first-codebook tokens generated so far
+    prefix_len: int = 0  # leading prompt positions shareable through the prefix cache
+    generator: Optional[torch.Generator] = None  # private RNG of a seeded request; None draws from the global one
+    codes: List[torch.Tensor] = field(default_factory=list)
+    hiddens: List[torch.Tensor] = field(default_factory=list)
+    submitted_at: float = field(default_factory=time.perf_counter)
+
+
+class ContinuousBatchingScheduler:
+    """
+    In-process continuous-batching engine for `Qwen3TTSForConditionalGeneration`.
+
+    Requests are submitted one sample at a time and resolve to `(codes, hidden_states)` exactly like one entry of
+    the lists returned by `Qwen3TTSForConditionalGeneration.generate`. Sampling parameters are fixed per
+    scheduler (they are shared by the batched sub-talker call); use `is_compatible` to decide whether a request can
+    join or must fall back to `generate`.
+
+    The scheduler can be driven synchronously (`step` / `run_until_complete`) or by a background thread
+    (`start` / `stop`) so that concurrent callers share forward passes.
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, initial_capacity: int = 256, **sampling_kwargs):
+        attn_impl = getattr(model.talker.config, "_attn_implementation", "eager")
+        if attn_impl not in (None, "eager", "sdpa"):
+            raise ValueError(f"Continuous batching needs eager or sdpa attention, got {attn_impl}")
+
+        self.model = model
+        self.talker = model.talker
+        self.config = model.config.talker_config
+        self.max_batch_size = max_batch_size
+        self.sampling = {k: sampling_kwargs.get(k) for k in SAMPLING_KEYS}
+        self.prefix_cache = getattr(model, "prefix_cache", None)
+        self.eos_token_id = self.config.codec_eos_token_id
+        self.min_new_tokens = 2
+
+        self.kv = TalkerKVSlots(
+            self.config,
+            num_slots=max_batch_size,
+            capacity=initial_capacity,
+            device=self.talker.device,
+            dtype=self.talker.dtype,
+        )
+        suppress = torch.zeros(self.config.vocab_size, dtype=torch.bool, device=self.talker.device)
+        suppress[max(self.config.vocab_size - 1024, 0):] = True
+        suppress[self.eos_token_id] = False
+        self._suppress_mask = suppress
+
+        self._warpers = []
+        if self.sampling["temperature"] is not None and self.sampling["temperature"] != 1.0:
+            self._warpers.append(TemperatureLogitsWarper(self.sampling["temperature"]))
+        if self.sampling["top_k"]:
+            self._warpers.append(TopKLogitsWarper(self.sampling["top_k"]))
+        if self.sampling["top_p"] is not None and self.sampling["top_p"] < 1.0:
+            self._warpers.append(TopPLogitsWarper(self.sampling["top_p"]))
+
+        self.pending: deque = deque()
+        self.active: List[TalkerSequence] = []
+        self._ids = itertools.count()
+        self._cond = threading.Condition()
+        self._step_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.stats = {"steps": 0, "frames": 0, "admitted": 0, "retired": 0, "decode_time": 0.0}
+        self._pad_embed: Optional[torch.Tensor] = None
+
+    # ------------------------------------------------------------------ submission
+
+    def is_compatible(self, generate_kwargs: Dict[str, Any]) -> bool:
+        """True if a `generate` call with these kwargs can share this scheduler's decode loop."""
+        if generate_kwargs.get("logits_processor"):
+            return False
+        for key in SAMPLING_KEYS:
+            if key not in generate_kwargs:
+                continue
+            # Per-sample settings (lists / tensors) need the batched `generate` path
+            if isinstance(generate_kwargs[key], (list, tuple)) or torch.is_tensor(generate_kwargs[key]):
+                return False
+            if generate_kwargs[key] != self.sampling[key]:
+                return False
+        eos = generate_kwargs.get("eos_token_id")
+        return eos is None or eos == self.eos_token_id
+
+    @torch.no_grad()
+    def submit(
+        self,
+        input_ids: torch.Tensor,
+        language: str,
+        speaker: Optional[str] = None,
+        instruct_ids: Optional[torch.Tensor] = None,
+        ref_ids: Optional[torch.Tensor] = None,
+        voice_clone_prompt: Optional[dict] = None,
+        non_streaming_mode: bool = False,
+        max_new_tokens: int = 4096,
+        frames: Optional[queue.Queue] = None,
+        seed: Optional[int] = None,
+    ) -> Future:
+        """
+        Queue one sample. `voice_clone_prompt` uses the batched dict layout of `generate` with a single entry.
+        If `frames` is given, every decoded codec frame is also put on it as soon as it is produced, followed by
+        `None` once the sequence ends. A `seed` gives the sample its own RNG, so its tokens do not depend on
+        which other requests share the batch.
+
+        Returns a `Future` resolving to `(codes (T, num_code_groups), hidden_states (T, D))`.
+        """
+        prompt_embeds, trailing_text_hiddens, _, prefix_lengths = self.model.build_talker_prompt(
+            input_ids=[input_ids],
+            instruct_ids=[instruct_ids] if instruct_ids is not None else None,
+            ref_ids=[ref_ids] if ref_ids is not None else None,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=[language],
+            speakers=[speaker],
+            non_streaming_mode=non_streaming_mode,
+            return_prefix_lengths=True,
+        )
+        sequence = TalkerSequence(
+            request_id=next(self._ids),
+            prompt_embeds=prompt_embeds[0],
+            trailing_text_hidden=trailing_text_hiddens[0],
+            max_new_tokens=max_new_tokens,
+            future=Future(),
+            frames=frames,
+            prefix_len=prefix_lengths[0],
+        )
+        if seed is not None:
+            sequence.generator = torch.Generator(device=self.talker.device).manual_seed(seed)
+        with self._cond:
+            self.pending.append(sequence)
+            self._cond.notify()
+        return sequence.future
+
+    def generate(
+        self,
+        input_ids: List[torch.Tensor],
+        instruct_ids: Optional[List[torch.Tensor]] = None,
+        ref_ids: Optional[List[torch.Tensor]] = None,
+        voice_clone_prompt: Optional[dict] = None,
+        languages: List[str] = None,
+        speakers: List[str] = None,
+        non_streaming_mode: bool = False,
+        max_new_tokens: int = 4096,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        """
+        Drop-in replacement for `Qwen3TTSForConditionalGeneration.generate` backed by the shared decode loop.
+        With a `seed`, sample `i` of the call is seeded with `seed + i`.
+        """
+        futures = []
+        for index, input_id in enumerate(input_ids):
+            sample_prompt = None
+            if voice_clone_prompt is not None:
+                sample_prompt = {key: [value[index]] for key, value in voice_clone_prompt.items() if value is not None}
+                sample_prompt.setdefault("ref_code", None)
+            futures.append(
+                self.submit(
+                    input_id,
+                    language=languages[index],
+                    speaker=speakers[index] if speakers is not None else None,
+                    instruct_ids=instruct_ids[index] if instruct_ids is not None else None,
+                    ref_ids=ref_ids[index] if ref_ids is not None else None,
+                    voice_clone_prompt=sample_prompt,
+                    non_streaming_mode=non_streaming_mode,
+                    max_new_tokens=max_new_tokens,
+                    seed=None if seed is None else seed + index,
+                )
+            )
+        if self._thread is None:
+            self.run_until_complete()
+        results = [future.result() for future in futures]
+        return [codes for codes, _ in results], [hiddens for _, hiddens in results]
+
+    def stream(self, input_ids: torch.Tensor, language: str, **submit_kwargs) -> Iterator[torch.Tensor]:
+        """
+        Submit one sample and yield its `(num_code_groups,)` codec frames while the talker is still decoding.
+
+        Without a background thread the decode loop is driven inline, one step per frame. Closing the generator
+        early cancels the request and frees its slot at the next step.
+        """
+        frames: queue.Queue = queue.Queue()
+        future = self.submit(input_ids, language, frames=frames, **submit_kwargs)
+        try:
+            while True:
+                if self._thread is None:
+                    while frames.empty() and self.has_work():
+                        self.step()
+                frame = frames.get()
+                if frame is None:
+                    break
+                yield frame
+            future.result()
+        finally:
+            future.cancel()
+
+    # ------------------------------------------------------------------ driving
+
+    def has_work(self) -> bool:
+        return bool(self.pending or self.active)
+
+    def run_until_complete(self) -> None:
+        while self.has_work():
+            self.step()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._serve, name="talker-continuous-batching", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _serve(self) -> None:
+        while not self._stop_event.is_set():
+            with self._cond:
+                while not self.has_work() and not self._stop_event.is_set():
+                    self._cond.wait()
+            if self._stop_event.is_set():
+                break
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Continuous batching step failed: {e}")
+                for sequence in self.active:
+                    self.kv.release(sequence.slot)
+                    self._fail(sequence, e)
+                self.active = []
+
+    @torch.no_grad()
+    def step(self) -> List[TalkerSequence]:
+        """Admit pending requests into free slots, then advance every active sequence by one codec frame."""
+        with self._step_lock:
+            finished = self._admit()
+            if self.active:
+                finished.extend(self._decode())
+            return finished
+
+    # ------------------------------------------------------------------ internals
+
+    def _admit(self) -> List[TalkerSequence]:
+        finished = []
+        while self.kv.free_slots:
+            with self._cond:
+                if not self.pending:
+                    break
+                sequence = self.pending.popleft()
+            if sequence.future.cancelled():
+                continue
+            try:
+                self._prefill(sequence)
+            except Exception as e:
+                self.kv.release(sequence.slot)
+                self._fail(sequence, e)
+                continue
+            self.stats["admitted"] += 1
+            if self._should_retire(sequence):
+                finished.append(self._retire(sequence))
+            else:
+                self.active.append(sequence)
+        return finished
+
+    def _prefill(self, sequence: TalkerSequence) -> None:
+        sequence.slot = self.kv.allocate()
+        prompt_len = sequence.prompt_embeds.shape[1]
+        attention_mask = torch.ones((1, prompt_len), dtype=torch.long, device=self.talker.device)
+        position_ids, rope_deltas = self.talker.get_rope_index(attention_mask)
+        sequence.rope_delta = int(rope_deltas.view(-1)[0])
+
+        slots = torch.tensor([sequence.slot], device=self.talker.device)
+        # ⚡ Bolt: Restore the KV of a cached speaker/instruct/ICL prefix and prefill only the rest of the prompt.
+        prefix_len = min(sequence.prefix_len, prompt_len - 1) if self.prefix_cache is not None else 0
+        reused = 0
+        if prefix_len > 0:
+            key = self.prefix_cache.key(sequence.prompt_embeds[:, :prefix_len])
+            snapshot = self.prefix_cache.get(key)
+            if snapshot is not None:
+                reused = self._restore_prefix(sequence.slot, snapshot)
+        hidden_states = self._forward(sequence.prompt_embeds[:, reused:], slots, position_ids[..., reused:])
+        if prefix_len > 0 and not reused:
+            self.prefix_cache.put(
+                key,
+                [k[sequence.slot, :, :prefix_len].clone() for k in self.kv.keys],
+                [v[sequence.slot, :, :prefix_len].clone() for v in self.kv.values],
+            )
+        sequence.seen_tokens = torch.zeros(self.config.vocab_size, dtype=torch.bool, device=self.talker.device)
+        self._sample([sequence], hidden_states)
+
+    def _restore_prefix(self, slot: int, snapshot) -> int:
+        """Copy a cached prefix into `slot`; returns its length."""
+        keys, values = snapshot
+        length = keys[0].shape[-2]
+        self.kv.reserve(length)
+        for layer in range(self.kv.num_layers):
+            self.kv.keys[layer][slot, :, :length] = keys[layer]
+            self.kv.values[layer][slot, :, :length] = values[layer]
+        self.kv.lengths[slot] = length
+        return length
+
+    def _decode(self) -> List[TalkerSequence]:
+        start = time.perf_counter()
+        batch = self.active
+        device = self.talker.device
+        slots = torch.tensor([s.slot for s in batch], device=device)
+        last_tokens = torch.cat([s.last_token for s in batch], dim=0)
+        past_hidden = torch.cat([s.past_hidden for s in batch], dim=0)
+
+        codec_ids, inputs_embeds = self.talker.generate_residual_codes(
+            last_tokens,
+            past_hidden,
+            subtalker_dosample=self.sampling["subtalker_dosample"],
+            subtalker_top_p=self.sampling["subtalker_top_p"],
+            subtalker_top_k=self.sampling["subtalker_top_k"],
+            subtalker_temperature=self.sampling["subtalker_temperature"],
+            generators=self._generators(batch),
+        )
+        text_embeds = []
+        for row, sequence in enumerate(batch):
+            sequence.codes.append(codec_ids[row])
+            sequence.hiddens.append(past_hidden[row, 0])
+            if sequence.frames is not None:
+                sequence.frames.put(codec_ids[row])
+            if sequence.text_step < sequence.trailing_text_hidden.shape[1]:
+                text_embeds.append(sequence.trailing_text_hidden[:, sequence.text_step])
+            else:
+                text_embeds.append(self._tts_pad_embed())
+            sequence.text_step += 1
+        inputs_embeds = inputs_embeds + torch.stack(text_embeds, dim=0)
+
+        # Decode positions follow the talker's own rule: cache length + rope delta of the prompt.
+        positions = self.kv.lengths[slots] + torch.tensor([s.rope_delta for s in batch], device=device)
+        position_ids = positions.view(1, -1, 1).expand(3, -1, -1)
+        hidden_states = self._forward(inputs_embeds, slots, position_ids)
+        self._sample(batch, hidden_states)
+
+        self.stats["steps"] += 1
+        self.stats["frames"] += len(batch)
+        self.stats["decode_time"] += time.perf_counter() - start
+
+        finished = [s for s in batch if self._should_retire(s)]
+        if finished:
+            self.active = [s for s in batch if not self._should_retire(s)]
+            for sequence in finished:
+                self._retire(sequence)
+        return finished
+
+    def _forward(self, inputs_embeds: torch.Tensor, slots: torch.Tensor, position_ids: torch.Tensor) -> torch.Tensor:
+        q_len = inputs_embeds.shape[1]
+        self.kv.reserve(int(self.kv.lengths[slots].max()) + q_len)
+        view = self.kv.view(slots)
+        span = int(view.starts.max()) + q_len
+        # Row b, query i sits at absolute position starts[b] + i and may attend to keys 0..starts[b] + i.
+        query_pos = view.starts.view(-1, 1, 1) + torch.arange(q_len, device=inputs_embeds.device).view(1, -1, 1)
+        key_pos = torch.arange(span, device=inputs_embeds.device).view(1, 1, -1)
+        attention_mask = torch.zeros(
+            (len(slots), 1, q_len, span), dtype=inputs_embeds.dtype, device=inputs_embeds.device
+        )
+        attention_mask.masked_fill_((key_pos > query_pos).unsqueeze(1), torch.finfo(inputs_embeds.dtype).min)
+
+        outputs = self.talker.model(
+            inputs_embeds=inputs_embeds,
+            attention_mask=attention_mask,
+            position_ids=position_ids,
+            past_key_values=view,
+            use_cache=True,
+        )
+        self.kv.lengths[slots] += q_len
+        return outputs.last_hidden_state[:, -1:]
+
+    def _sample(self, batch: List[TalkerSequence], hidden_states: torch.Tensor) -> None:
+        logits = self.talker.codec_head(hidden_states[:, -1]).float()
+        logits = logits.masked_fill(self._suppress_mask, float("-inf"))
+
+        penalty = self.sampling["repetition_penalty"]
+        if penalty is not None and penalty != 1.0:
+            seen = torch.stack([s.seen_tokens for s in batch], dim=0)
+            penalized = torch.where(logits < 0, logits * penalty, logits / penalty)
+            logits = torch.where(seen, penalized, logits)
+
+        young = torch.tensor([s.generated < self.min_new_tokens for s in batch], device=logits.device)
+        logits[young, self.eos_token_id] = float("-inf")
+
+        if self.sampling["do_sample"]:
+            for warper in self._warpers:
+                logits = warper(None, logits)
+            probs = torch.softmax(logits, dim=-1)
+            next_tokens = multinomial_per_row(probs, self._generators(batch))
+        else:
+            next_tokens = torch.argmax(logits, dim=-1, keepdim=True)
+
+        for row, sequence in enumerate(batch):
+            sequence.last_token = next_tokens[row : row + 1]
+            sequence.past_hidden = hidden_states[row : row + 1]
+            sequence.seen_tokens[next_tokens[row, 0]] = True
+            sequence.generated += 1
+
+    @staticmethod
+    def _generators(batch: List[TalkerSequence]) -> Optional[List[Optional[torch.Generator]]]:
+        generators = [s.generator for s in batch]
+        return generators if any(g is not None for g in generators) else None
+
+    def _should_retire(self, sequence: TalkerSequence) -> bool:
+        return (
+            int(sequence.last_token[0, 0]) == self.eos_token_id
+            or sequence.generated >= sequence.max_new_tokens
+            or sequence.future.cancelled()
+        )
+
+    def _retire(self, sequence: TalkerSequence) -> TalkerSequence:
+        self.kv.release(sequence.slot)
+        self.stats["retired"] += 1
+        hidden_size = self.config.hidden_size
+        if sequence.codes:
+            codes = torch.stack(sequence.codes, dim=0)
+            hiddens = torch.stack(sequence.hiddens, dim=0)
+        else:
+            codes = torch.zeros((0, self.config.num_code_groups), dtype=torch.long, device=self.talker.device)
+            hiddens = torch.zeros((0, hidden_size), dtype=self.talker.dtype, device=self.talker.device)
+        if not sequence.future.cancelled():
+            sequence.future.set_result((codes, hiddens))
+        if sequence.frames is not None:
+            sequence.frames.put(None)
+        return sequence
+
+    def _fail(self, sequence: TalkerSequence, error: Exception) -> None:
+        if not sequence.future.cancelled():
+            sequence.future.set_exception(error)
+        if sequence.frames is not None:
+            sequence.frames.put(None)
+
+    def _tts_pad_embed(self) -> torch.Tensor:
+        if self._pad_embed is None:
+            pad_id = torch.tensor([[self.model.config.tts_pad_token_id]], device=self.talker.device)
+            self._pad_embed = self.talker.text_projection(self.talker.get_text_embeddings()(pad_id))[0]
+        return self._pad_embed
@@ -24,8 +24,8 @@ from librosa.filters import mel as librosa_mel_fn
 from torch import nn
 from torch.nn import functional as F
 from transformers.activations import ACT2FN
-from transformers.cache_utils import Cache, DynamicCache
-from transformers.generation import GenerationMixin
+from transformers.cache_utils import Cache, DynamicCache, StaticCache
+from transformers.generation import GenerationMixin, LogitsProcessor, LogitsProcessorList
 from transformers.integrations import use_kernel_forward_from_hub
 from transformers.masking_utils import (
     create_causal_mask,
@@ -51,6 +51,7 @@ from .configuration_qwen3_tts import (
     Qwen3TTSTalkerCodePredictorConfig,
     Qwen3TTSTalkerConfig,
 )
+from .weight_mmap import load_mmap_pretrained, mmap_load_kwargs
 
 logger = logging.get_logger(__name__)
 
@@ -451,7 +452,7 @@ class Qwen3TTSPreTrainedModel(PreTrainedModel):
     _supports_flash_attn_2 = True
     _supports_sdpa = True
     _supports_cache_class = True
-    _supports_static_cache = False
+    _supports_static_cache = True
     _supports_attention_backend = True
 
     def _init_weights(self, module):
@@ -485,7 +486,7 @@ class Qwen3TTSTalkerTextPreTrainedModel(PreTrainedModel):
     _supports_flex_attn = True
     _supports_cache_class = True
     _supports_quantized_cache = True
-    _supports_static_cache = False
+    _supports_static_cache = True
     _supports_attention_backend = True
 
     def _init_weights(self, module):
@@ -1151,6 +1152,118 @@ class Qwen3TTSTalkerCodePredictorModel(Qwen3TTSPreTrainedModel):
         )
 
 
+def warp_logits_per_row(scores, temperature, top_k, top_p):
+    """
+    Temperature -> top-k -> top-p on `(B, V)` scores with a separate value per row (`(B,)` tensors).
+    Each row is filtered exactly like the scalar HF warpers would; `top_k <= 0` and `top_p >= 1` disable a filter.
+    """
+    scores = scores / temperature.to(scores.dtype).unsqueeze(-1)
+    vocab = scores.size(-1)
+    sorted_scores = torch.sort(scores, dim=-1, descending=True).values
+    k = torch.where(top_k > 0, top_k.clamp(max=vocab), vocab).unsqueeze(-1)
+    kth = sorted_scores.gather(-1, k - 1)
+    scores = scores.masked_fill(scores < kth, -float("inf"))
+
+    sorted_logits, sorted_indices = torch.sort(scores, descending=False)
+    cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+    sorted_indices_to_remove = (cumulative_probs <= (1 - top_p.to(cumulative_probs.dtype)).unsqueeze(-1)) & (top_p < 1.0).unsqueeze(-1)
+    sorted_indices_to_remove[..., -1:] = False
+    indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+    return scores.masked_fill(indices_to_remove, -float("inf"))
+
+
+def multinomial_per_row(probs, generators=None):
+    """
+    Draw one token per row of `(B, V)` probabilities as `(B, 1)`. Rows whose entry in `generators` is a
+    `torch.Generator` draw from it, so a seeded request reproduces whatever else shares its batch; the other rows
+    draw together from the global RNG.
+    """
+    if generators is None or all(g is None for g in generators):
+        return torch.multinomial(probs, num_samples=1)
+    tokens = torch.empty((probs.size(0), 1), dtype=torch.long, device=probs.device)
+    shared = [row for row, g in enumerate(generators) if g is None]
+    if shared:
+        tokens[shared] = torch.multinomial(probs[shared], num_samples=1)
+    for row, g in enumerate(generators):
+        if g is not None:
+            tokens[row] = torch.multinomial(probs[row], num_samples=1, generator=g)
+    return tokens
+
+
+def sample_next_token(logits, do_sample=True, top_k=None, top_p=None, temperature=None, generators=None):
+    """
+    Pick the next token from `(B, V)` logits the same way `GenerationMixin._sample` does with the
+    temperature -> top-k -> top-p warpers, so seeded runs draw identical tokens without the HF
+    `generate()` machinery. `temperature`, `top_k` and `top_p` may also be `(B,)` tensors, one value per row;
+    `generators` optionally gives rows their own RNG (see `multinomial_per_row`).
+    """
+    if not do_sample:
+        return torch.argmax(logits, dim=-1)
+    scores = logits.float()
+    if any(torch.is_tensor(value) for value in (temperature, top_k, top_p)):
+        scores = warp_logits_per_row(scores, *per_row_sampling_tensors(scores.size(0), scores.device, temperature, top_k, top_p))
+    else:
+        if temperature is not None and temperature != 1.0:
+            scores = scores / temperature
+        if top_k is not None and top_k != 0:
+            top_k = min(top_k, scores.size(-1))
+            indices_to_remove = scores < torch.topk(scores, top_k)[0][..., -1, None]
+            scores = scores.masked_fill(indices_to_remove, -float("inf"))
+        if top_p is not None and top_p < 1.0:
+            sorted_logits, sorted_indices = torch.sort(scores, descending=False)
+            cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+            sorted_indices_to_remove = cumulative_probs <= (1 - top_p)
+            sorted_indices_to_remove[..., -1:] = 0
+            indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+            scores = scores.masked_fill(indices_to_remove, -float("inf"))
+    probs = nn.functional.softmax(scores, dim=-1)
+    return multinomial_per_row(probs, generators).squeeze(1)
+
+
+def is_per_row(value):
+    """True for sampling settings given per sample (a sequence or a non-scalar tensor) rather than per batch."""
+    return isinstance(value, (list, tuple)) or (torch.is_tensor(value) and value.dim() > 0)
+
+
+def per_row_sampling_tensors(batch_size, device, temperature=None, top_k=None, top_p=None):
+    """Broadcast scalar or per-row temperature / top-k / top-p to `(B,)` tensors; `None` disables a setting."""
+    def rows(value, default, dtype):
+        value = default if value is None else value
+        return torch.as_tensor(value, dtype=dtype, device=device).expand(batch_size)
+
+    return rows(temperature, 1.0, torch.float32), rows(top_k, 0, torch.long), rows(top_p, 1.0, torch.float32)
+
+
+class PerRowSamplingLogitsWarper(LogitsProcessor):
+    """
+    Per-sample temperature / top-k / top-p for a batched talker `generate()`, so rows with different sampling
+    settings can share one batch. Pass it as `logits_processor` with the scalar `temperature=1.0, top_k=0,
+    top_p=1.0` so HF's own warpers are no-ops.
+    """
+
+    def __init__(self, temperature, top_k, top_p):
+        self.temperature = torch.as_tensor(temperature, dtype=torch.float32)
+        self.top_k = torch.as_tensor(top_k, dtype=torch.long)
+        self.top_p = torch.as_tensor(top_p, dtype=torch.float32)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        device = scores.device
+        return warp_logits_per_row(scores, self.temperature.to(device), self.top_k.to(device), self.top_p.to(device))
+
+
+class PerRowRepetitionPenaltyLogitsProcessor(LogitsProcessor):
+    """`RepetitionPenaltyLogitsProcessor` with a separate penalty per sample (`(B,)` tensor)."""
+
+    def __init__(self, penalty):
+        self.penalty = torch.as_tensor(penalty, dtype=torch.float32)
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        penalty = self.penalty.to(device=scores.device, dtype=scores.dtype).unsqueeze(-1)
+        score = torch.gather(scores, 1, input_ids)
+        score = torch.where(score < 0, score * penalty, score / penalty)
+        return scores.scatter(1, input_ids, score)
+
+
 class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin):
     _tied_weights_keys = ["lm_head.weight"]
     _tp_plan = {"lm_head": "colwise_rep"}
@@ -1309,6 +1422,67 @@ class Qwen3TTSTalkerCodePredictorModelForConditionalGeneration(Qwen3TTSPreTraine
             generation_steps=generation_steps + 1,
         )
 
+    @torch.no_grad()
+    def decode_residual_codes(
+        self,
+        inputs_embeds,
+        codec_embeds_sum=None,
+        do_sample=True,
+        top_k=None,
+        top_p=None,
+        temperature=None,
+        past_key_values=None,
+        generators=None,
+    ):
+        """
+        Lean replacement for `generate(max_new_tokens=num_code_groups - 1)` on the sub-talker.
+
+        `inputs_embeds` is `(B, 2, D_talker)`: the talker hidden state followed by the first-codebook embedding.
+        Decodes the residual codebooks one by one with a plain forward loop (no logits processors, stopping
+        criteria or hidden-state tuples) and, if `codec_embeds_sum` `(B, 1, D_talker)` is given, adds each
+        residual codec embedding to it in place.
+
+        Returns:
+            `(B, num_code_groups - 1)` residual codes.
+        """
+        num_steps = self.config.num_code_groups - 1
+        batch_size = inputs_embeds.shape[0]
+        if past_key_values is None:
+            past_key_values = DynamicCache()
+        codec_embedding = self.model.get_input_embeddings()
+
+        sequences = torch.empty((batch_size, num_steps), dtype=torch.long, device=inputs_embeds.device)
+        hidden_states = self.small_to_mtp_projection(inputs_embeds)
+        cache_position = torch.arange(hidden_states.shape[1], device=inputs_embeds.device)
+        for step in range(num_steps):
+            outputs = self.model(
+                inputs_embeds=hidden_states,
+                past_key_values=past_key_values,
+                use_cache=True,
+                cache_position=cache_position,
+            )
+            logits = self.lm_head[step](outputs.last_hidden_state[:, -1])
+            tokens = sample_next_token(logits, do_sample, top_k, top_p, temperature, generators=generators)
+            sequences[:, step] = tokens
+
+            token_embeds = codec_embedding[step](tokens.unsqueeze(1))
+            if codec_embeds_sum is not None:
+                codec_embeds_sum.add_(token_embeds)
+            if step + 1 < num_steps:
+                hidden_states = self.small_to_mtp_projection(token_embeds)
+                cache_position = cache_position[-1:] + 1
+        return sequences
+
+    def _residual_cache(self, batch_size):
+        """Preallocated sub-talker cache, reset in place while the batch size stays the same."""
+        cache = getattr(self, "_cache", None)
+        if cache is None or cache.max_batch_size != batch_size:
+            cache = StaticCache(config=self.config, max_cache_len=self.config.num_code_groups)
+            self._cache = cache
+        else:
+            cache.reset()
+        return cache
+
     def _update_model_kwargs_for_generation(self, outputs, model_kwargs, is_encoder_decoder=False, num_new_tokens=1):
         model_kwargs = super()._update_model_kwargs_for_generation(
             outputs, model_kwargs, is_encoder_decoder, num_new_tokens
@@ -1630,6 +1804,44 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         sub_talker_loss = sub_talker_outputs.loss
         return sub_talker_logits, sub_talker_loss
 
+    def generate_residual_codes(
+        self,
+        input_ids,
+        past_hidden,
+        subtalker_dosample=None,
+        subtalker_top_p=None,
+        subtalker_top_k=None,
+        subtalker_temperature=None,
+        cache_implementation=None,
+        generators=None,
+    ):
+        """
+        Fill the residual codebooks for the first-codebook tokens in `input_ids` (B, 1).
+
+        Returns the full codec frame `(B, num_code_groups)` and the summed codec embedding `(B, 1, D)`
+        that is fed back into the talker for the next step. With `cache_implementation="static"` the
+        sub-talker reuses one preallocated KV cache (reset in place) for every frame of the same batch size.
+        """
+        last_id_hidden = self.get_input_embeddings()(input_ids)
+        past_key_values = None
+        if cache_implementation == "static":
+            past_key_values = self.code_predictor._residual_cache(input_ids.shape[0])
+        # ⚡ Bolt: Dedicated decode loop instead of `code_predictor.generate(...)`; residual embeddings are
+        # accumulated in place rather than concatenated and summed.
+        inputs_embeds = last_id_hidden.clone()
+        residual_codes = self.code_predictor.decode_residual_codes(
+            torch.cat((past_hidden, last_id_hidden), dim=1),
+            codec_embeds_sum=inputs_embeds,
+            do_sample=subtalker_dosample,
+            top_k=subtalker_top_k,
+            top_p=subtalker_top_p,
+            temperature=subtalker_temperature,
+            past_key_values=past_key_values,
+            generators=generators,
+        )
+        codec_ids = torch.cat((input_ids, residual_codes), dim=-1)
+        return codec_ids, inputs_embeds
+
     @can_return_tuple
     def forward(
         self,
@@ -1651,6 +1863,7 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
         subtalker_top_p=None,
         subtalker_top_k=None,
         subtalker_temperature=None,
+        subtalker_cache_implementation=None,
         **kwargs,
     ) -> CausalLMOutputWithPast:
         r"""
@@ -1665,24 +1878,15 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
             codec_ids = None
         # Generate
         else:
-            last_id_hidden = self.get_input_embeddings()(input_ids)
-            predictor_result = self.code_predictor.generate(
-                inputs_embeds=torch.cat((past_hidden, last_id_hidden), dim=1),
-                max_new_tokens=self.config.num_code_groups - 1,
-                do_sample=subtalker_dosample,
-                top_p=subtalker_top_p,
-                top_k=subtalker_top_k,
-                temperature=subtalker_temperature,
-                output_hidden_states=True,
-                return_dict_in_generate=True,
-            )
-            codec_ids = torch.cat((input_ids, predictor_result.sequences), dim=-1)
-            codec_hiddens = torch.cat(
-                [last_id_hidden]
-                + [self.code_predictor.get_input_embeddings()[i](predictor_result.sequences[..., i:i+1]) for i in range(self.config.num_code_groups - 1)],
-                dim=1,
+            codec_ids, inputs_embeds = self.generate_residual_codes(
+                input_ids,
+                past_hidden,
+                subtalker_dosample=subtalker_dosample,
+                subtalker_top_p=subtalker_top_p,
+                subtalker_top_k=subtalker_top_k,
+                subtalker_temperature=subtalker_temperature,
+                cache_implementation=subtalker_cache_implementation,
             )
-            inputs_embeds = codec_hiddens.sum(1, keepdim=True)
 
             if generation_step < trailing_text_hidden.shape[1]:
                 inputs_embeds = inputs_embeds + trailing_text_hidden[:, generation_step].unsqueeze(1)
@@ -1797,6 +2001,22 @@ class Qwen3TTSTalkerForConditionalGeneration(Qwen3TTSTalkerTextPreTrainedModel,
 
         return position_ids, mrope_position_deltas
 
+    def prepare_inputs_for_generation(
+        self, input_ids, past_key_values=None, attention_mask=None, inputs_embeds=None, **kwargs
+    ):
+        model_inputs = super().prepare_inputs_for_generation(
+            input_ids,
+            past_key_values=past_key_values,
+            attention_mask=attention_mask,
+            inputs_embeds=inputs_embeds,
+            **kwargs,
+        )
+        # Static caches make GenerationMixin pre-build a 4D mask, but the 3D rope indices are derived from the
+        # 2D padding mask; keep it and let `Qwen3TTSTalkerModel` build the causal mask itself.
+        if attention_mask is not None and attention_mask.ndim == 2:
+            model_inputs["attention_mask"] = attention_mask
+        return model_inputs
+
     def _update_model_kwargs_for_generation(self, outputs, model_kwargs, is_encoder_decoder=False, num_new_tokens=1):
         model_kwargs = super()._update_model_kwargs_for_generation(
             outputs, model_kwargs, is_encoder_decoder, num_new_tokens
@@ -1824,6 +2044,8 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
 
         self.speech_tokenizer = None
         self.generate_config = None
+        # Optional `TalkerPrefixCache`, used by the continuous-batching prefill
+        self.prefix_cache = None
 
         self.supported_speakers = self.config.talker_config.spk_id.keys()
         self.supported_languages = ["auto"]
@@ -1864,22 +2086,40 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         revision="main",
         use_safetensors=None,
         weights_only=True,
+        mmap_weights=False,
         **kwargs,
     ):
-        model = super().from_pretrained(
-            pretrained_model_name_or_path,
-            *model_args,
-            config=config,
-            cache_dir=cache_dir,
-            ignore_mismatched_sizes=ignore_mismatched_sizes,
-            force_download=force_download,
-            local_files_only=local_files_only,
-            token=token,
-            revision=revision,
-            use_safetensors=use_safetensors,
-            weights_only=weights_only,
-            **kwargs,
-        )
+        """
+        HF `from_pretrained`, plus the speech tokenizer and `generation_config.json`.
+
+        With `mmap_weights=True` a local checkpoint is mapped instead of read: the model is built on the meta device
+        and its parameters are views into the safetensors page cache (see `weight_mmap`). Anything that path cannot
+        handle (remote repos, `device_map="auto"`, keys that need converting, missing weights or buffers) falls back
+        to the regular load.
+        """
+        model = None
+        if mmap_weights:
+            try:
+                model = load_mmap_pretrained(
+                    pretrained_model_name_or_path, model_cls=cls, config=config, **mmap_load_kwargs(kwargs)
+                )
+            except Exception as e:
+                logger.warning(f"Memory-mapped load of {pretrained_model_name_or_path} failed, reading it instead: {e}")
+        if model is None:
+            model = super().from_pretrained(
+                pretrained_model_name_or_path,
+                *model_args,
+                config=config,
+                cache_dir=cache_dir,
+                ignore_mismatched_sizes=ignore_mismatched_sizes,
+                force_download=force_download,
+                local_files_only=local_files_only,
+                token=token,
+                revision=revision,
+                use_safetensors=use_safetensors,
+                weights_only=weights_only,
+                **kwargs,
+            )
         speech_tokenizer_path = cached_file(
             pretrained_model_name_or_path,
             "speech_tokenizer/config.json",
@@ -1898,6 +2138,7 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         speech_tokenizer = Qwen3TTSTokenizer.from_pretrained(
             speech_tokenizer_dir,
             *model_args,
+            mmap_weights=mmap_weights,
             **kwargs,
         )
         model.load_speech_tokenizer(speech_tokenizer)
@@ -1965,7 +2206,10 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
     ):
         voice_clone_spk_embeds = []
         for index in range(len(voice_clone_prompt['ref_spk_embedding'])):
-            ref_spk_embedding = voice_clone_prompt["ref_spk_embedding"][index].to(self.talker.device).to(self.talker.dtype)            
+            ref_spk_embedding = voice_clone_prompt["ref_spk_embedding"][index]
+            # A missing x-vector (e.g. a speculative draft without its own) means no speaker token
+            if ref_spk_embedding is not None:
+                ref_spk_embedding = ref_spk_embedding.to(self.talker.device).to(self.talker.dtype)
             voice_clone_spk_embeds.append(ref_spk_embedding)
         
         return voice_clone_spk_embeds
@@ -2024,53 +2268,30 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                 return text_embed + codec_embed, tts_pad_embed
 
     @torch.no_grad()
-    def generate(
+    def build_talker_prompt(
         self,
-        input_ids: Optional[list[torch.Tensor]] = None,
+        input_ids: list[torch.Tensor],
         instruct_ids: Optional[list[torch.Tensor]] = None,
         ref_ids: Optional[list[torch.Tensor]] = None,
         voice_clone_prompt: list[dict] = None,
         languages: list[str] = None,
         speakers: list[str] = None,
-        non_streaming_mode = False,
-        max_new_tokens: int = 4096,
-        do_sample: bool = True,
-        top_k: int = 50,
-        top_p: float = 1.0,
-        temperature: float = 0.9,
-        subtalker_dosample: bool = True,
-        subtalker_top_k: int = 50,
-        subtalker_top_p: float = 1.0,
-        subtalker_temperature: float = 0.9,
-        eos_token_id: Optional[int] = None,
-        repetition_penalty: float = 1.05,
-        **kwargs,
+        non_streaming_mode: bool = False,
+        return_prefix_lengths: bool = False,
     ):
-        talker_kwargs = {
-            "max_new_tokens": max_new_tokens,
-            "min_new_tokens": 2,
-            "do_sample": do_sample,
-            "top_k": top_k,
-            "top_p": top_p,
-            "temperature": temperature,
-            "subtalker_dosample": subtalker_dosample, 
-            "subtalker_top_k": subtalker_top_k,
-            "subtalker_top_p": subtalker_top_p,
-            "subtalker_temperature": subtalker_temperature,
-            "eos_token_id": eos_token_id
-            if eos_token_id is not None
-            else self.config.talker_config.codec_eos_token_id,
-            "repetition_penalty": repetition_penalty,
-            "suppress_tokens": [
-                i
-                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
-                if i not in (self.config.talker_config.codec_eos_token_id,)
-            ],
-            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
-            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
-        }
-        
+        """
+        Build the unpadded talker prefix for every sample.
+
+        Returns:
+            talker_input_embeds: list of `(1, T_i, D)` prefill embeddings (role, instruct, codec tags, speaker, ICL).
+            trailing_text_hiddens: list of `(1, L_i, D)` text embeddings fed one per decode step.
+            tts_pad_embed: `(1, 1, D)` embedding added once the trailing text is exhausted.
+            prefix_lengths (only with `return_prefix_lengths=True`): per sample, the number of leading prefill
+                positions that do not depend on the text being synthesized (instruct, role, codec tags, speaker and
+                the reference-text part of an ICL prompt), i.e. what a prefix KV cache can share between lines.
+        """
         talker_input_embeds = [[] for _ in range(len(input_ids))]
+        prefix_lengths = [0] * len(input_ids)
 
         voice_clone_spk_embeds = None
         # voice clone speaker prompt generate
@@ -2195,8 +2416,13 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
                                             ), dim=1) + codec_input_emebdding[:, :-1]
 
             talker_input_embed = torch.cat((_talker_input_embed_role, _talker_input_embed), dim=1)
+            prefix_lengths[index] = sum(item.shape[1] for item in talker_input_embeds[index]) + talker_input_embed.shape[1]
 
             if voice_clone_prompt is not None and voice_clone_prompt["ref_code"] is not None and voice_clone_prompt["icl_mode"][index]:
+                # Positions before the target text hold reference text (+ reference codes when streaming)
+                ref_text_len = ref_ids[index][:, 3:-2].shape[1]
+                ref_codec_len = voice_clone_prompt["ref_code"][index].shape[0] + 1
+                prefix_lengths[index] += ref_text_len if non_streaming_mode else min(ref_text_len, ref_codec_len)
                 icl_input_embed, trailing_text_hidden = self.generate_icl_prompt(
                     text_id=input_id[:, 3:-5],
                     ref_id=ref_ids[index][:, 3:-2],
@@ -2247,6 +2473,98 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
         for index, talker_input_embed in enumerate(talker_input_embeds):
             talker_input_embeds[index] = torch.cat([item for item in talker_input_embed if item is not None], dim=1)
 
+        if return_prefix_lengths:
+            return talker_input_embeds, trailing_text_hiddens, tts_pad_embed, prefix_lengths
+        return talker_input_embeds, trailing_text_hiddens, tts_pad_embed
+
+    @torch.no_grad()
+    def generate(
+        self,
+        input_ids: Optional[list[torch.Tensor]] = None,
+        instruct_ids: Optional[list[torch.Tensor]] = None,
+        ref_ids: Optional[list[torch.Tensor]] = None,
+        voice_clone_prompt: list[dict] = None,
+        languages: list[str] = None,
+        speakers: list[str] = None,
+        non_streaming_mode = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        eos_token_id: Optional[int] = None,
+        repetition_penalty: float = 1.05,
+        use_static_cache: bool = False,
+        **kwargs,
+    ):
+        """
+        Generate codec frames for a batch of samples.
+
+        The sampling settings (`temperature`, `top_k`, `top_p`, `repetition_penalty` and the `subtalker_*`
+        equivalents) take either one value for the whole batch or one value per sample (a list or `(B,)` tensor),
+        so a single batched forward can serve requests with different settings.
+        """
+        # ⚡ Bolt: Per-sample talker settings are applied by vectorized logits processors in place of HF's scalar
+        # warpers (which are disabled); per-sample sub-talker settings reach `sample_next_token` as tensors.
+        batch_size, device = len(input_ids), self.talker.device
+        logits_processor = LogitsProcessorList(kwargs.get("logits_processor") or [])
+        if is_per_row(repetition_penalty):
+            logits_processor.append(PerRowRepetitionPenaltyLogitsProcessor(repetition_penalty))
+            repetition_penalty = 1.0
+        if any(is_per_row(value) for value in (temperature, top_k, top_p)):
+            if do_sample:
+                logits_processor.append(PerRowSamplingLogitsWarper(*per_row_sampling_tensors(batch_size, device, temperature, top_k, top_p)))
+            temperature, top_k, top_p = 1.0, 0, 1.0
+        if any(is_per_row(value) for value in (subtalker_temperature, subtalker_top_k, subtalker_top_p)):
+            subtalker_temperature, subtalker_top_k, subtalker_top_p = per_row_sampling_tensors(
+                batch_size, device, subtalker_temperature, subtalker_top_k, subtalker_top_p
+            )
+
+        talker_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "min_new_tokens": 2,
+            "do_sample": do_sample,
+            "top_k": top_k,
+            "top_p": top_p,
+            "temperature": temperature,
+            "subtalker_dosample": subtalker_dosample, 
+            "subtalker_top_k": subtalker_top_k,
+            "subtalker_top_p": subtalker_top_p,
+            "subtalker_temperature": subtalker_temperature,
+            "eos_token_id": eos_token_id
+            if eos_token_id is not None
+            else self.config.talker_config.codec_eos_token_id,
+            "repetition_penalty": repetition_penalty,
+            "suppress_tokens": [
+                i
+                for i in range(self.config.talker_config.vocab_size - 1024, self.config.talker_config.vocab_size)
+                if i not in (self.config.talker_config.codec_eos_token_id,)
+            ],
+            "logits_processor": logits_processor,
+            "output_hidden_states": getattr(kwargs, "output_hidden_states", True),
+            "return_dict_in_generate": getattr(kwargs, "return_dict_in_generate", True)
+        }
+        if use_static_cache:
+            # ⚡ Bolt: Fixed-shape KV buffers for talker and sub-talker. GenerationMixin keeps them on the module
+            # (`_cache`) and resets them in place on the next call with the same batch size instead of
+            # reallocating; the sub-talker cache is reused for every frame.
+            talker_kwargs["cache_implementation"] = "static"
+            talker_kwargs["subtalker_cache_implementation"] = "static"
+        
+        talker_input_embeds, trailing_text_hiddens, tts_pad_embed = self.build_talker_prompt(
+            input_ids=input_ids,
+            instruct_ids=instruct_ids,
+            ref_ids=ref_ids,
+            voice_clone_prompt=voice_clone_prompt,
+            languages=languages,
+            speakers=speakers,
+            non_streaming_mode=non_streaming_mode,
+        )
+
         # for batch inferquence
         original_lengths = torch.tensor([t.shape[1] for t in talker_input_embeds])
         # left padding for talker input embeds
@@ -2304,6 +2622,8 @@ class Qwen3TTSForConditionalGeneration(Qwen3TTSPreTrainedModel, GenerationMixin)
 
 __all__ = [
     "Qwen3TTSForConditionalGeneration",
+    "PerRowSamplingLogitsWarper",
+    "PerRowRepetitionPenaltyLogitsProcessor",
     "Qwen3TTSTalkerForConditionalGeneration",
     "Qwen3TTSPreTrainedModel",
     "Qwen3TTSTalkerModel",
@@ -0,0 +1,78 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Talker KV snapshots for prompt prefixes shared across requests.
+
+Lines of a podcast or audiobook repeat the same speaker, instruct and ICL reference prefix. The cache keeps the
+talker keys/values computed for such a prefix, keyed by a hash of its prefill embeddings, so the next request
+with the same prefix copies them into its KV slot and only prefills its own text.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import torch
+
+KVSnapshot = Tuple[List[torch.Tensor], List[torch.Tensor]]
+
+
+class TalkerPrefixCache:
+    """LRU of per-layer `(num_kv_heads, prefix_len, head_dim)` key/value snapshots bounded by `max_bytes`."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, KVSnapshot]" = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "reused_tokens": 0}
+
+    @staticmethod
+    def key(prefix_embeds: torch.Tensor) -> str:
+        """Hash of the prefill embeddings `(1, P, D)` of a prefix."""
+        data = prefix_embeds.detach().to("cpu").contiguous()
+        digest = hashlib.sha256(f"{tuple(data.shape)}:{data.dtype}".encode())
+        digest.update(data.view(torch.uint8).numpy().tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[KVSnapshot]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["reused_tokens"] += entry[0][0].shape[-2]
+            return entry
+
+    def put(self, key: str, keys: List[torch.Tensor], values: List[torch.Tensor]) -> None:
+        size = sum(t.numel() * t.element_size() for t in (*keys, *values))
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (keys, values)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (old_keys, old_values) = self.entries.popitem(last=False)
+                self.bytes -= sum(t.numel() * t.element_size() for t in (*old_keys, *old_values))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
@@ -0,0 +1,170 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Weight-only int8 / int4 quantization of the talker and code predictor for CPU inference.
+
+Linear weights are stored as int8 with one scale per output channel, or as int4 with one scale per group of
+`group_size` input channels. On CPU the matmuls run through PyTorch's fused weight-only kernels
+(`_weight_int8pack_mm`, `_weight_int4pack_mm_for_cpu`) with bfloat16 activations, the only dtype they are fast for;
+outputs are cast back to the model dtype. Elsewhere, or for shapes those kernels do not support, the weight is
+dequantized on the fly. Embeddings, norms, the speaker encoder and the speech tokenizer are left untouched.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+import torch
+from torch import nn
+
+QUANT_MODES = ("int8", "int4")
+
+
+def _has_op(name: str) -> bool:
+    return hasattr(torch.ops.aten, name)
+
+
+class WeightOnlyLinear(nn.Module):
+    """Drop-in `nn.Linear` replacement holding int8 or int4 weights plus floating-point scales."""
+
+    def __init__(self, in_features: int, out_features: int, mode: str = "int8", group_size: int = 32, bias: bool = True):
+        super().__init__()
+        if mode not in QUANT_MODES:
+            raise ValueError(f"Unknown quantization mode {mode!r}, expected one of {QUANT_MODES}")
+        self.in_features = in_features
+        self.out_features = out_features
+        self.mode = mode
+        self.group_size = group_size
+        # int4 weights use the fused CPU layout when its shape constraints hold, else two nibbles per byte
+        self.fused = hasattr(torch, "_weight_int8pack_mm") if mode == "int8" else (
+            out_features % 16 == 0 and _has_op("_weight_int4pack_mm_for_cpu")
+        )
+        self.register_buffer("qweight", torch.empty(0, dtype=torch.uint8))
+        self.register_buffer("scales", torch.empty(0))
+        self.bias = nn.Parameter(torch.empty(out_features), requires_grad=False) if bias else None
+
+    @classmethod
+    def supports(cls, linear: nn.Linear, mode: str, group_size: int) -> bool:
+        return mode == "int8" or (linear.in_features % group_size == 0 and linear.in_features % 2 == 0)
+
+    @classmethod
+    @torch.no_grad()
+    def from_linear(cls, linear: nn.Linear, mode: str = "int8", group_size: int = 32) -> "WeightOnlyLinear":
+        module = cls(linear.in_features, linear.out_features, mode, group_size, bias=linear.bias is not None)
+        weight = linear.weight.detach().float().cpu()
+        dtype, device = linear.weight.dtype, linear.weight.device
+        if mode == "int4" and device.type != "cpu":
+            module.fused = False  # the packed int4 layout is CPU-specific
+
+        if mode == "int8":
+            scales = weight.abs().amax(dim=1).clamp(min=1e-8) / 127
+            qweight = (weight / scales[:, None]).round().clamp(-128, 127).to(torch.int8)
+        else:
+            grouped = weight.view(linear.out_features, -1, group_size)
+            scales = grouped.abs().amax(dim=-1).clamp(min=1e-8) / 7
+            unsigned = ((grouped / scales[..., None]).round().clamp(-8, 7) + 8).to(torch.int32).view_as(weight)
+            if module.fused:
+                qweight = torch.ops.aten._convert_weight_to_int4pack_for_cpu(unsigned, 1)
+                # (groups, N, 2) scale/zero pairs; zero 0 makes the kernel compute (q - 8) * scale
+                scales = torch.stack((scales, torch.zeros_like(scales)), dim=-1).transpose(0, 1).contiguous()
+            else:
+                qweight = (unsigned[:, 0::2] | (unsigned[:, 1::2] << 4)).to(torch.uint8)
+
+        module.qweight = qweight.to(device)
+        module.scales = scales.to(device=device, dtype=torch.bfloat16 if module.fused else dtype)
+        if linear.bias is not None:
+            module.bias.data = linear.bias.detach().clone()
+        return module
+
+    def dequantize(self) -> torch.Tensor:
+        """The `(out_features, in_features)` weight this module computes with (slow for fused int4; for inspection)."""
+        if self.mode == "int8":
+            return self.qweight.to(self.scales.dtype) * self.scales[:, None]
+        if self.fused:
+            eye = torch.eye(self.in_features, dtype=self.scales.dtype, device=self.qweight.device)
+            return torch.ops.aten._weight_int4pack_mm_for_cpu(eye, self.qweight, self.group_size, self.scales).T
+        unsigned = torch.stack((self.qweight & 0xF, self.qweight >> 4), dim=-1).view(self.out_features, -1)
+        grouped = (unsigned.to(self.scales.dtype) - 8).view(self.out_features, -1, self.group_size)
+        return (grouped * self.scales[..., None]).view(self.out_features, self.in_features)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        if not (self.fused and x.device.type == "cpu"):
+            return nn.functional.linear(x, self.dequantize().to(x.dtype), self.bias)
+        # ⚡ Bolt: bfloat16 activations hit the vectorized kernels; float32 inputs fall back to a much slower path
+        flat = x.reshape(-1, self.in_features).to(torch.bfloat16).contiguous()
+        if self.mode == "int8":
+            out = torch._weight_int8pack_mm(flat, self.qweight, self.scales)
+        else:
+            out = torch.ops.aten._weight_int4pack_mm_for_cpu(flat, self.qweight, self.group_size, self.scales)
+        out = out.to(x.dtype).view(*x.shape[:-1], self.out_features)
+        return out + self.bias if self.bias is not None else out
+
+    def extra_repr(self) -> str:
+        return f"in_features={self.in_features}, out_features={self.out_features}, mode={self.mode}, group_size={self.group_size}"
+
+
+def _module_bytes(module: nn.Module) -> int:
+    tensors = {id(t): t for t in list(module.parameters()) + list(module.buffers())}
+    return sum(t.numel() * t.element_size() for t in tensors.values())
+
+
+@torch.no_grad()
+def quantize_talker(model, mode: str = "int8", group_size: int = 32) -> Dict[str, int]:
+    """
+    Replace every `nn.Linear` of `model.talker` (decoder layers, codec head, text projection and the whole code
+    predictor) with a `WeightOnlyLinear` in place.
+
+    Returns the number of replaced layers and the talker's resident bytes before and after.
+    """
+    if mode not in QUANT_MODES:
+        raise ValueError(f"Unknown quantization mode {mode!r}, expected one of {QUANT_MODES}")
+    talker = model.talker
+    stats = {"layers": 0, "skipped": 0, "bytes_before": _module_bytes(talker)}
+    targets = [(name, module) for name, module in talker.named_modules() if isinstance(module, nn.Linear)]
+    for name, linear in targets:
+        if not WeightOnlyLinear.supports(linear, mode, group_size):
+            stats["skipped"] += 1
+            continue
+        parent_name, _, child = name.rpartition(".")
+        parent = talker.get_submodule(parent_name) if parent_name else talker
+        setattr(parent, child, WeightOnlyLinear.from_linear(linear, mode, group_size))
+        stats["layers"] += 1
+    stats["bytes_after"] = _module_bytes(talker)
+    model.quantization = mode
+    return stats
+
+
+def codec_token_agreement(reference: List[torch.Tensor], candidate: List[torch.Tensor]) -> float:
+    """Fraction of `(frame, codebook)` codec tokens that match; extra frames of the longer `(T, G)` codes count as misses."""
+    matches = total = 0
+    for ref, cand in zip(reference, candidate):
+        length = max(ref.shape[0], cand.shape[0])
+        n = min(ref.shape[0], cand.shape[0])
+        matches += int((ref[:n] == cand[:n]).sum())
+        total += length * ref.shape[-1]
+    return matches / total if total else 1.0
+
+
+def log_mel_distance(reference: np.ndarray, candidate: np.ndarray, sr: int, n_mels: int = 80) -> float:
+    """Mean absolute log-mel difference between two waveforms (the longer one is truncated)."""
+    import librosa
+
+    n = min(len(reference), len(candidate))
+    if n == 0:
+        return float("inf") if len(reference) != len(candidate) else 0.0
+    mels = [
+        np.log(np.maximum(librosa.feature.melspectrogram(y=w[:n].astype(np.float32), sr=sr, n_mels=n_mels), 1e-5))
+        for w in (reference, candidate)
+    ]
+    return float(np.mean(np.abs(mels[0] - mels[1])))
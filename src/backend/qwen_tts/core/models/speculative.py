@@ -0,0 +1,288 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Speculative decoding of the talker with a smaller Qwen3-TTS checkpoint as the draft.
+
+The talker input of every step embeds the whole previous codec frame (first-codebook token plus the residual
+codebooks filled by the code predictor), so drafts are whole frames: the draft model runs its own talker and code
+predictor for up to `num_draft_tokens` steps, then the target talker scores every drafted frame in one forward pass
+and the target code predictor scores every drafted residual in one batched, teacher-forced pass. Tokens are accepted
+left to right with speculative rejection sampling (keep with probability min(1, p / q), otherwise resample from
+max(p - q, 0)), so the output follows the target's distribution exactly; greedy decoding is token-identical to
+decoding with the target alone.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import torch
+from transformers import DynamicCache
+
+from .modeling_qwen3_tts import per_row_sampling_tensors, warp_logits_per_row
+
+
+def _sampling_probs(logits, do_sample, temperature, top_k, top_p):
+    """Distribution that `sample_next_token` draws from for `(N, V)` logits (one-hot argmax without sampling)."""
+    if not do_sample:
+        return torch.nn.functional.one_hot(logits.argmax(-1), logits.shape[-1]).float()
+    settings = per_row_sampling_tensors(logits.shape[0], logits.device, temperature, top_k, top_p)
+    return warp_logits_per_row(logits.float(), *settings).softmax(-1)
+
+
+def _accept(p, q, token):
+    """Keep `token` (drawn from `q`) with probability min(1, p / q), else draw a replacement from max(p - q, 0)."""
+    if torch.rand((), device=p.device) * q[token] < p[token]:
+        return token, True
+    residual = (p - q).clamp(min=0)
+    if residual.sum() <= 0:
+        residual = p
+    return int(torch.multinomial(residual / residual.sum(), 1)), False
+
+
+class _TalkerRun:
+    """KV cache and text conditioning of one sample on one model."""
+
+    def __init__(self, model, prompt_embeds, trailing_text_hidden, tts_pad_embed):
+        self.talker = model.talker
+        self.trailing_text_hidden = trailing_text_hidden
+        self.tts_pad_embed = tts_pad_embed
+        self.cache = DynamicCache()
+        self.past_hidden = self.forward(prompt_embeds)[:, -1:]
+
+    def forward(self, inputs_embeds):
+        return self.talker.model(inputs_embeds=inputs_embeds, past_key_values=self.cache, use_cache=True).last_hidden_state
+
+    def frame_embeds(self, frames, text_step):
+        """Talker inputs `(1, n, D)` for codec frames `(n, G)` decoded from text step `text_step` on."""
+        embeds = self.talker.get_input_embeddings()(frames[:, :1])
+        predictor_embeddings = self.talker.code_predictor.get_input_embeddings()
+        for j in range(1, frames.shape[1]):
+            embeds = embeds + predictor_embeddings[j - 1](frames[:, j : j + 1])
+        text = [
+            self.trailing_text_hidden[:, step] if step < self.trailing_text_hidden.shape[1] else self.tts_pad_embed[:, 0]
+            for step in range(text_step, text_step + frames.shape[0])
+        ]
+        return embeds.view(1, frames.shape[0], -1) + torch.cat(text, dim=0).unsqueeze(0)
+
+    def residual_logits(self, past_hidden, frames):
+        """Teacher-forced code predictor logits `(n, G - 1, V)` for frames `(n, G)` after `past_hidden` `(n, 1, D)`."""
+        predictor = self.talker.code_predictor
+        embeddings = predictor.get_input_embeddings()
+        inputs = [past_hidden, self.talker.get_input_embeddings()(frames[:, :1])]
+        inputs += [embeddings[j](frames[:, j + 1 : j + 2]) for j in range(frames.shape[1] - 2)]
+        hidden = predictor.model(
+            inputs_embeds=predictor.small_to_mtp_projection(torch.cat(inputs, dim=1)), use_cache=False
+        ).last_hidden_state
+        return torch.stack([predictor.lm_head[j](hidden[:, j + 1]) for j in range(frames.shape[1] - 1)], dim=1)
+
+    def crop(self, length: int, past_hidden) -> None:
+        self.cache.crop(length)
+        self.past_hidden = past_hidden
+
+
+class SpeculativeTalkerDecoder:
+    """
+    Draft-and-verify replacement for `Qwen3TTSForConditionalGeneration.generate` (one sample at a time).
+
+    `draft` must share the target's codec (vocabulary, code groups, EOS), e.g. the 0.6B Base checkpoint drafting
+    for the 1.7B Base one. Sampling semantics match `ContinuousBatchingScheduler`: suppressed control tokens,
+    repetition penalty over generated first-codebook tokens, `min_new_tokens=2` and temperature / top-k / top-p.
+    """
+
+    def __init__(self, model, draft, num_draft_tokens: int = 4):
+        target_config, draft_config = model.config.talker_config, draft.config.talker_config
+        for name in ("vocab_size", "num_code_groups", "codec_eos_token_id"):
+            if getattr(target_config, name) != getattr(draft_config, name):
+                raise ValueError(f"Draft model does not share the target's codec ({name} differs)")
+        self.model = model
+        self.draft = draft
+        self.num_draft_tokens = num_draft_tokens
+        self.eos_token_id = target_config.codec_eos_token_id
+        self.num_code_groups = target_config.num_code_groups
+        self.min_new_tokens = 2
+
+        suppress = torch.zeros(target_config.vocab_size, dtype=torch.bool, device=model.talker.device)
+        suppress[max(target_config.vocab_size - 1024, 0):] = True
+        suppress[self.eos_token_id] = False
+        self._suppress_mask = suppress
+        self.stats = {"verify_steps": 0, "drafted": 0, "accepted": 0}
+
+    @torch.no_grad()
+    def generate(
+        self,
+        input_ids: List[torch.Tensor],
+        instruct_ids: Optional[List[torch.Tensor]] = None,
+        ref_ids: Optional[List[torch.Tensor]] = None,
+        voice_clone_prompt: Optional[Dict[str, Any]] = None,
+        languages: List[str] = None,
+        speakers: List[str] = None,
+        non_streaming_mode: bool = False,
+        max_new_tokens: int = 4096,
+        do_sample: bool = True,
+        top_k: int = 50,
+        top_p: float = 1.0,
+        temperature: float = 0.9,
+        subtalker_dosample: bool = True,
+        subtalker_top_k: int = 50,
+        subtalker_top_p: float = 1.0,
+        subtalker_temperature: float = 0.9,
+        repetition_penalty: float = 1.05,
+        **kwargs,
+    ):
+        """
+        Same inputs and outputs as `Qwen3TTSForConditionalGeneration.generate`. Voice-clone prompts may carry a
+        `draft_spk_embedding` list with x-vectors from the draft's own speaker encoder; without it the draft is
+        conditioned on the ICL reference only (or no speaker), which lowers acceptance but not quality.
+        """
+        sampling = (
+            (do_sample, temperature, top_k, top_p, repetition_penalty),
+            (subtalker_dosample, subtalker_temperature, subtalker_top_k, subtalker_top_p),
+        )
+        draft_prompt = voice_clone_prompt
+        if voice_clone_prompt is not None:
+            draft_embeddings = voice_clone_prompt.get("draft_spk_embedding") or [None] * len(input_ids)
+            draft_prompt = {**voice_clone_prompt, "ref_spk_embedding": draft_embeddings}
+
+        codes_list, hiddens_list = [], []
+        for index, input_id in enumerate(input_ids):
+            runs = []
+            for model, prompt in ((self.model, voice_clone_prompt), (self.draft, draft_prompt)):
+                sample_prompt = None
+                if prompt is not None:
+                    sample_prompt = {key: [value[index]] for key, value in prompt.items() if value is not None}
+                    sample_prompt.setdefault("ref_code", None)
+                prompt_embeds, trailing_text_hiddens, tts_pad_embed = model.build_talker_prompt(
+                    input_ids=[input_id],
+                    instruct_ids=[instruct_ids[index]] if instruct_ids is not None else None,
+                    ref_ids=[ref_ids[index]] if ref_ids is not None else None,
+                    voice_clone_prompt=sample_prompt,
+                    languages=[languages[index]],
+                    speakers=[speakers[index]] if speakers is not None else None,
+                    non_streaming_mode=non_streaming_mode,
+                )
+                runs.append(_TalkerRun(model, prompt_embeds[0], trailing_text_hiddens[0], tts_pad_embed))
+            codes, hiddens = self._decode(*runs, max_new_tokens, *sampling)
+            codes_list.append(codes)
+            hiddens_list.append(hiddens)
+        return codes_list, hiddens_list
+
+    def _first_codebook_probs(self, run: _TalkerRun, hidden, seen, generated: int, sampling):
+        do_sample, temperature, top_k, top_p, penalty = sampling
+        logits = run.talker.codec_head(hidden).float().masked_fill(self._suppress_mask, float("-inf"))
+        if penalty is not None and penalty != 1.0:
+            logits = torch.where(seen, torch.where(logits < 0, logits * penalty, logits / penalty), logits)
+        if generated < self.min_new_tokens:
+            logits[..., self.eos_token_id] = float("-inf")
+        return _sampling_probs(logits, do_sample, temperature, top_k, top_p)
+
+    def _residual_probs(self, run: _TalkerRun, past_hidden, frames, sampling):
+        logits = run.residual_logits(past_hidden, frames)
+        probs = _sampling_probs(logits.flatten(0, 1), *sampling)
+        return probs.view(*logits.shape)
+
+    def _complete_residuals(self, run: _TalkerRun, past_hidden, frame, start: int, sampling) -> None:
+        """Sample residual codebooks `start..` of `frame` in place from the target code predictor."""
+        for j in range(start, self.num_code_groups - 1):
+            probs = self._residual_probs(run, past_hidden, frame[None], sampling)[0, j]
+            frame[j + 1] = int(torch.multinomial(probs, 1))
+
+    def _decode(
+        self, target: _TalkerRun, draft: _TalkerRun, max_new_tokens: int, talker_sampling, subtalker_sampling
+    ):
+        device = target.past_hidden.device
+        seen = torch.zeros(self._suppress_mask.shape[0], dtype=torch.bool, device=device)
+        token = int(torch.multinomial(self._first_codebook_probs(target, target.past_hidden[:, -1], seen, 0, talker_sampling)[0], 1))
+        seen[token] = True
+        generated = 1
+        pending_frame = None  # residuals of `token` fixed by a rejected draft, not yet fed to the talkers
+        codes, hiddens = [], []
+
+        while token != self.eos_token_id and generated < max_new_tokens:
+            target_start, draft_start = target.cache.get_seq_length(), draft.cache.get_seq_length()
+            fixed_first = pending_frame is not None
+
+            # Draft up to `num_draft_tokens` frames ahead with the small model
+            frames, draft_pasts, proposals = [], [draft.past_hidden], []
+            draft_seen, draft_token = seen.clone(), token
+            for k in range(min(self.num_draft_tokens, max_new_tokens - generated)):
+                if k == 0 and fixed_first:
+                    frame = pending_frame
+                else:
+                    first = torch.tensor([[draft_token]], device=device)
+                    residual = draft.talker.code_predictor.decode_residual_codes(
+                        torch.cat((draft_pasts[-1], draft.talker.get_input_embeddings()(first)), dim=1),
+                        do_sample=subtalker_sampling[0],
+                        temperature=subtalker_sampling[1],
+                        top_k=subtalker_sampling[2],
+                        top_p=subtalker_sampling[3],
+                    )
+                    frame = torch.cat((first[0], residual[0]))
+                frames.append(frame)
+                hidden = draft.forward(draft.frame_embeds(frame[None], len(codes) + k))[:, -1:]
+                draft_pasts.append(hidden)
+                q = self._first_codebook_probs(draft, hidden[:, -1], draft_seen, generated + k, talker_sampling)[0]
+                draft_token = int(torch.multinomial(q, 1))
+                draft_seen[draft_token] = True
+                proposals.append((draft_token, q))
+                if draft_token == self.eos_token_id:
+                    break
+
+            # Score every drafted frame with the target in one talker pass and one code-predictor pass
+            n = len(frames)
+            stacked = torch.stack(frames)
+            hidden = target.forward(target.frame_embeds(stacked, len(codes)))
+            target_pasts = torch.cat((target.past_hidden, hidden), dim=1)
+            p_residual = self._residual_probs(target, target_pasts[0, :n, None], stacked, subtalker_sampling)
+            q_residual = self._residual_probs(draft, torch.cat(draft_pasts[:n], dim=1)[0, :, None], stacked, subtalker_sampling)
+            self.stats["verify_steps"] += 1
+            self.stats["drafted"] += n
+
+            # Accept left to right: residual codebooks of frame k, then the first-codebook token of frame k + 1
+            kept, pending_frame = 0, None
+            for k in range(n):
+                frame = stacked[k].clone()
+                if not (k == 0 and fixed_first):
+                    for j in range(self.num_code_groups - 1):
+                        frame[j + 1], ok = _accept(p_residual[k, j], q_residual[k, j], int(frame[j + 1]))
+                        if not ok:
+                            self._complete_residuals(target, target_pasts[:, k : k + 1], frame, j + 1, subtalker_sampling)
+                            pending_frame = frame
+                            break
+                    if pending_frame is not None:
+                        break
+                codes.append(frame)
+                hiddens.append(target_pasts[0, k])
+                kept += 1
+
+                proposal, q = proposals[k]
+                p = self._first_codebook_probs(target, hidden[:, k], seen, generated, talker_sampling)[0]
+                token, ok = _accept(p, q, proposal)
+                seen[token] = True
+                generated += 1
+                if ok:
+                    self.stats["accepted"] += 1
+                else:
+                    break
+
+            # Both caches keep exactly the frames that were accepted
+            target.crop(target_start + kept, target_pasts[:, kept : kept + 1])
+            draft.crop(draft_start + kept, draft_pasts[kept])
+
+        if codes:
+            return torch.stack(codes), torch.stack(hiddens)
+        config = self.model.config.talker_config
+        return (
+            torch.zeros((0, self.num_code_groups), dtype=torch.long, device=device),
+            torch.zeros((0, config.hidden_size), dtype=self.model.talker.dtype, device=device),
+        )
@@ -0,0 +1,148 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Sharing byte-identical submodule weights between loaded Qwen3-TTS variants.
+
+The CustomVoice, VoiceDesign and Base checkpoints may carry identical copies of the speech tokenizer, the speaker
+encoder and the text embedding. Each of those submodules of a newly loaded model is compared with the ones already
+registered: first by a cheap signature (tensor names, shapes, dtypes and device), then, only when signatures
+collide, by a content hash. On a match the new module's parameters and buffers are pointed at the registered
+module's tensors and its own copies are freed.
+
+Sharing is per tensor, not per module instance: moving one model to another device or dtype gives it fresh
+tensors and leaves the other model's weights where they are.
+"""
+
+import hashlib
+import threading
+import weakref
+from typing import Dict, List, Tuple
+
+import torch
+from torch import nn
+
+
+def dedup_targets(model) -> Dict[str, nn.Module]:
+    """The submodules of a `Qwen3TTSForConditionalGeneration` that variants may share, by name."""
+    targets = {}
+    tokenizer_model = getattr(getattr(model, "speech_tokenizer", None), "model", None)
+    if isinstance(tokenizer_model, nn.Module):
+        targets["speech_tokenizer"] = tokenizer_model
+    if getattr(model, "speaker_encoder", None) is not None:
+        targets["speaker_encoder"] = model.speaker_encoder
+    targets["text_embedding"] = model.talker.get_text_embeddings()
+    return targets
+
+
+def _named_tensors(module: nn.Module) -> List[Tuple[str, torch.Tensor]]:
+    params = module.named_parameters(remove_duplicate=False)
+    buffers = module.named_buffers(remove_duplicate=False)
+    return sorted([*params, *buffers], key=lambda item: item[0])
+
+
+def _signature(module: nn.Module) -> tuple:
+    return tuple((name, tuple(t.shape), str(t.dtype), str(t.device)) for name, t in _named_tensors(module))
+
+
+def _content_digest(module: nn.Module) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    for name, tensor in _named_tensors(module):
+        digest.update(name.encode())
+        digest.update(tensor.detach().reshape(-1).view(torch.uint8).cpu().numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _share(module: nn.Module, source: nn.Module) -> int:
+    """Point `module`'s tensors at `source`'s same-named ones; returns the bytes no longer held twice."""
+    sources = dict(_named_tensors(source))
+    freed, seen = 0, set()
+    for name, tensor in _named_tensors(module):
+        shared = sources[name]
+        if tensor.data_ptr() != shared.data_ptr() and tensor.data_ptr() not in seen:
+            seen.add(tensor.data_ptr())
+            freed += tensor.numel() * tensor.element_size()
+        owner_name, _, leaf = name.rpartition(".")
+        owner = module.get_submodule(owner_name)
+        if leaf in owner._parameters:
+            owner._parameters[leaf].data = shared.data
+        else:
+            owner._buffers[leaf] = shared
+    return freed
+
+
+class WeightDeduplicator:
+    """Registry of shareable submodules across loaded models, held weakly so evicted models are not kept alive."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.registry: Dict[tuple, List[weakref.ref]] = {}
+        self.digests: "weakref.WeakKeyDictionary[nn.Module, str]" = weakref.WeakKeyDictionary()
+        self.bytes_saved = 0
+
+    def _digest(self, module: nn.Module) -> str:
+        if module not in self.digests:
+            self.digests[module] = _content_digest(module)
+        return self.digests[module]
+
+    @torch.no_grad()
+    def deduplicate(self, model) -> Dict[str, int]:
+        """
+        Share the weights of `model`'s speech tokenizer, speaker encoder and text embedding with identical
+        submodules of previously registered models, and register them for later ones.
+
+        Returns the bytes deduplicated per shared submodule name.
+        """
+        saved = {}
+        with self.lock:
+            for name, module in dedup_targets(model).items():
+                key = (name, _signature(module))
+                # ⚡ Bolt: Only hash contents when another live module has the same signature
+                candidates = [m for m in (ref() for ref in self.registry.get(key, [])) if m is not None]
+                match = next((m for m in candidates if m is not module and self._digest(m) == self._digest(module)), None)
+                freed = _share(module, match) if match is not None else 0
+                if freed:
+                    saved[name] = freed
+                if module not in candidates:
+                    candidates.append(module)
+                self.registry[key] = [weakref.ref(m) for m in candidates]
+            self.bytes_saved = self._shared_bytes()
+        return saved
+
+    def forget(self, model) -> int:
+        """
+        Unregister `model`'s submodules because it is being evicted; its weights no longer count as shared.
+
+        Returns the bytes that stop being deduplicated.
+        """
+        with self.lock:
+            gone = set(map(id, dedup_targets(model).values()))
+            for key, refs in list(self.registry.items()):
+                live = [ref for ref in refs if ref() is not None and id(ref()) not in gone]
+                if live:
+                    self.registry[key] = live
+                else:
+                    del self.registry[key]
+            before, self.bytes_saved = self.bytes_saved, self._shared_bytes()
+        return before - self.bytes_saved
+
+    def _shared_bytes(self) -> int:
+        """Bytes the registered modules would hold in addition if none of their tensors were shared."""
+        held, distinct = 0, {}
+        for refs in self.registry.values():
+            for module in filter(None, (ref() for ref in refs)):
+                own = {t.data_ptr(): t.numel() * t.element_size() for _, t in _named_tensors(module)}
+                held += sum(own.values())
+                distinct.update(own)
+        return held - sum(distinct.values())
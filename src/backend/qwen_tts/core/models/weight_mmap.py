@@ -0,0 +1,169 @@
+# coding=utf-8
+# Copyright 2026 The Alibaba Qwen team.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Zero-copy loading of local safetensors checkpoints through memory maps.
+
+The model skeleton is built on the meta device (no random init, no allocation) and every parameter is assigned a
+view into a private, read-only mapping of its shard. Tensors already in the requested dtype on CPU are never
+copied: their pages come straight from the OS page cache, which every worker process mapping the same file shares,
+so loading a model again after eviction costs little more than building the skeleton. Tensors that need a dtype
+conversion or a device transfer are copied once, from the page cache: a bf16 checkpoint loaded as fp32 on CPU gains
+nothing over a regular read.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import torch
+from accelerate import init_empty_weights
+from transformers import AutoConfig, AutoModel
+
+logger = logging.getLogger("studio")
+
+_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def mmap_safetensors(path: Union[str, Path]) -> Dict[str, torch.Tensor]:
+    """Tensors of one safetensors file as views into a copy-on-write memory map of it."""
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    (header_len,) = struct.unpack("<Q", mapped[:8])
+    header = json.loads(mapped[8 : 8 + header_len])
+    header.pop("__metadata__", None)
+    start = 8 + header_len
+    data = torch.frombuffer(mapped, dtype=torch.uint8, offset=start) if len(mapped) > start else torch.empty(0, dtype=torch.uint8)
+
+    tensors = {}
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        raw = data[begin:end]
+        dtype = _DTYPES[info["dtype"]]
+        if raw.storage_offset() % dtype.itemsize:
+            raw = raw.clone()  # unaligned tensor (not produced by the safetensors writer): copy it
+        tensors[name] = raw.view(dtype).view(info["shape"])
+    return tensors
+
+
+def mmap_checkpoint(model_dir: Union[str, Path]) -> Dict[str, torch.Tensor]:
+    """All tensors of the `*.safetensors` shards directly inside `model_dir`."""
+    shards = sorted(Path(model_dir).glob("*.safetensors"))
+    if not shards:
+        raise FileNotFoundError(f"No safetensors weights in {model_dir}")
+    state = {}
+    for shard in shards:
+        state.update(mmap_safetensors(shard))
+    return state
+
+
+def _ignored_unexpected(model: torch.nn.Module, name: str) -> bool:
+    patterns = getattr(model, "_keys_to_ignore_on_load_unexpected", None) or []
+    return any(re.search(pattern, name) for pattern in patterns)
+
+
+def assign_weights(
+    model: torch.nn.Module,
+    state: Dict[str, torch.Tensor],
+    dtype: Optional[torch.dtype] = None,
+    device: Optional[Union[str, torch.device]] = None,
+) -> None:
+    """
+    Assign checkpoint tensors to a meta-initialized `model` in place, converting floating tensors to `dtype` and
+    moving them to `device` only when they differ.
+
+    Checkpoint keys are taken as they are: nothing is renamed the way `from_pretrained` converts legacy layouts.
+    Raises `ValueError` when the checkpoint has tensors the model does not define (it needs that conversion), or
+    when a parameter or buffer is left unassigned.
+    """
+    expected = model.state_dict(keep_vars=True)
+    unexpected = [name for name in state if name not in expected and not _ignored_unexpected(model, name)]
+    if unexpected:
+        raise ValueError(f"Checkpoint has {len(unexpected)} tensors the model does not define (e.g. {unexpected[0]})")
+    converted = {}
+    for name, tensor in state.items():
+        if name not in expected:
+            continue
+        if device is not None:
+            tensor = tensor.to(device)
+        if dtype is not None and tensor.is_floating_point() and tensor.dtype != dtype:
+            tensor = tensor.to(dtype)
+        converted[name] = tensor
+
+    model.load_state_dict(converted, strict=False, assign=True)
+    model.tie_weights()
+    # Tied parameters are filled by `tie_weights`; persistent buffers keep their constructor value unless the
+    # checkpoint has them, which `from_pretrained` would report as newly initialized
+    buffers = {name for name, _ in model.named_buffers()}
+    missing = [
+        name for name, tensor in model.state_dict(keep_vars=True).items()
+        if tensor.is_meta or (name in buffers and name not in converted)
+    ]
+    missing += [name for name, buffer in model.named_buffers() if buffer.is_meta and name not in missing]
+    if missing:
+        raise ValueError(f"Checkpoint is missing {len(missing)} weights (e.g. {missing[0]})")
+    if device is not None:
+        # Non-persistent buffers (rotary frequencies, ...) were built on CPU with the skeleton
+        model.to(device)
+
+
+def load_mmap_pretrained(
+    model_dir: Union[str, Path],
+    model_cls=None,
+    config=None,
+    dtype: Optional[torch.dtype] = None,
+    device: Optional[Union[str, torch.device]] = None,
+    attn_implementation: Optional[str] = None,
+) -> torch.nn.Module:
+    """
+    Build `model_cls` (default: the `AutoModel` registered for the config) from `config` (default: `model_dir`'s) on
+    the meta device and map its weights in.
+    """
+    if not os.path.isdir(model_dir):
+        raise FileNotFoundError(f"{model_dir} is not a local model directory")
+    if config is None:
+        config = AutoConfig.from_pretrained(model_dir)
+    if attn_implementation is not None:
+        config._attn_implementation = attn_implementation
+    with init_empty_weights():
+        model = model_cls(config) if model_cls is not None else AutoModel.from_config(config)
+    assign_weights(model, mmap_checkpoint(model_dir), dtype=dtype, device=device)
+    return model.eval()
+
+
+def mmap_load_kwargs(from_pretrained_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """`load_mmap_pretrained` arguments matching HF `from_pretrained` kwargs; `ValueError` for unsupported ones."""
+    device = from_pretrained_kwargs.get("device_map")
+    if (device is not None and not isinstance(device, (str, torch.device))) or device == "auto":
+        raise ValueError(f"device_map={device!r} needs the regular loader")
+    dtype = from_pretrained_kwargs.get("torch_dtype", from_pretrained_kwargs.get("dtype"))
+    if isinstance(dtype, str):
+        dtype = None if dtype == "auto" else getattr(torch, dtype)
+    return {"dtype": dtype, "device": device, "attn_implementation": from_pretrained_kwargs.get("attn_implementation")}
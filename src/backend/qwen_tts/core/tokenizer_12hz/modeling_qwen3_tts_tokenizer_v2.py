@@ -914,6 +914,117 @@ class Qwen3TTSTokenizerV2Decoder(Qwen3TTSTokenizerV2DecoderPreTrainedModel):
             start_index = end_index
         return torch.cat(wavs, dim=-1)
 
+    def stateful_decode(self, codes, chunk_size=300):
+        """
+        Decode `codes` chunk by chunk through a `Qwen3TTSTokenizerV2StreamingDecoder`.
+
+        Unlike `chunked_decode` nothing is recomputed between chunks and no samples are lost at chunk
+        boundaries: the result equals `forward(codes)` while peak activation memory stays bounded by `chunk_size`.
+        """
+        streamer = Qwen3TTSTokenizerV2StreamingDecoder(self)
+        wavs = [streamer.decode(codes[..., start : start + chunk_size]) for start in range(0, codes.shape[-1], chunk_size)]
+        return torch.cat(wavs, dim=-1)
+
+
+class Qwen3TTSTokenizerV2StreamingDecoder:
+    """
+    Stateful, frame-by-frame front end for `Qwen3TTSTokenizerV2Decoder`.
+
+    Every convolution in the decoder is causal, so instead of re-running overlapping context frames the streamer
+    keeps, per layer, the input tail a causal conv still needs (`kernel_size - 1` samples), the previous input
+    frames a transposed conv still overlaps, and a sliding-window KV cache for the pre-transformer. Feeding codes
+    in any split yields the same samples as one `decoder(codes)` call, just incrementally.
+    """
+
+    def __init__(self, decoder: "Qwen3TTSTokenizerV2Decoder"):
+        self.decoder = decoder
+        self.reset()
+
+    def reset(self) -> None:
+        self.past_key_values = DynamicCache(config=self.decoder.config)
+        self._conv_tails = {}
+        self._trans_history = {}
+        self._trans_frames = {}
+
+    @torch.inference_mode()
+    def decode(self, codes: torch.Tensor) -> torch.Tensor:
+        """Decode the next `(B, Q, T)` codes and return the `(B, 1, N)` samples they complete."""
+        decoder = self.decoder
+        if codes.shape[1] != decoder.config.num_quantizers:
+            raise ValueError(f"Expected {decoder.config.num_quantizers} layer of codes, got {codes.shape[1]}")
+
+        hidden = decoder.quantizer.decode(codes)
+        hidden = self._causal_conv(decoder.pre_conv, hidden).transpose(1, 2)
+        hidden = decoder.pre_transformer(
+            inputs_embeds=hidden, past_key_values=self.past_key_values, use_cache=True
+        ).last_hidden_state
+        hidden = hidden.permute(0, 2, 1)
+        for trans_conv, convnext in decoder.upsample:
+            hidden = self._convnext(convnext, self._trans_conv(trans_conv, hidden))
+        wav = hidden
+        for block in decoder.decoder:
+            wav = self._block(block, wav)
+        return wav.clamp(min=-1, max=1)
+
+    def _block(self, module: nn.Module, hidden: torch.Tensor) -> torch.Tensor:
+        if isinstance(module, Qwen3TTSTokenizerV2CausalConvNet):
+            return self._causal_conv(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2CausalTransConvNet):
+            return self._trans_conv(module, hidden)
+        if isinstance(module, Qwen3TTSTokenizerV2DecoderDecoderBlock):
+            for layer in module.block:
+                hidden = self._block(layer, hidden)
+            return hidden
+        if isinstance(module, Qwen3TTSTokenizerV2DecoderDecoderResidualUnit):
+            residual = hidden
+            hidden = self._causal_conv(module.conv1, module.act1(hidden))
+            hidden = self._causal_conv(module.conv2, module.act2(hidden))
+            return hidden + residual
+        return module(hidden)
+
+    def _convnext(self, module: Qwen3TTSTokenizerV2ConvNeXtBlock, hidden: torch.Tensor) -> torch.Tensor:
+        residual = hidden
+        hidden = self._causal_conv(module.dwconv, hidden).permute(0, 2, 1)
+        hidden = module.pwconv2(module.act(module.pwconv1(module.norm(hidden))))
+        hidden = (module.gamma * hidden).permute(0, 2, 1)
+        return residual + hidden
+
+    def _causal_conv(self, module: Qwen3TTSTokenizerV2CausalConvNet, hidden: torch.Tensor) -> torch.Tensor:
+        # stride-1 causal conv: output t only needs inputs t - kernel_size + 1 .. t (zeros before the stream starts)
+        tail_size = module.kernel_size - 1
+        if tail_size == 0:
+            return module.conv(hidden) if hidden.shape[-1] else hidden.new_zeros(hidden.shape[0], module.conv.out_channels, 0)
+        tail = self._conv_tails.get(module)
+        if tail is None:
+            tail = hidden.new_zeros(hidden.shape[0], hidden.shape[1], tail_size)
+        hidden = torch.cat([tail, hidden], dim=-1)
+        self._conv_tails[module] = hidden[..., -tail_size:]
+        if hidden.shape[-1] == tail_size:
+            return hidden.new_zeros(hidden.shape[0], module.conv.out_channels, 0)
+        return module.conv(hidden)
+
+    def _trans_conv(self, module: Qwen3TTSTokenizerV2CausalTransConvNet, hidden: torch.Tensor) -> torch.Tensor:
+        # Input frame n writes raw outputs n*stride .. n*stride + kernel - 1 and the first `left_pad` raw outputs are
+        # dropped, so once frames < n1 are known every output below n1*stride - left_pad is final.
+        stride = module.conv.stride[0]
+        num_history = (module.conv.kernel_size[0] - 1) // stride
+        seen = self._trans_frames.get(module, 0)
+        history = self._trans_history.get(module)
+        if hidden.shape[-1] == 0:
+            return hidden.new_zeros(hidden.shape[0], module.conv.out_channels, 0)
+
+        frames = hidden if history is None else torch.cat([history, hidden], dim=-1)
+        first_frame = seen - (0 if history is None else history.shape[-1])
+        total = seen + hidden.shape[-1]
+        if num_history:
+            self._trans_history[module] = frames[..., -num_history:]
+        self._trans_frames[module] = total
+
+        raw = module.conv(frames)
+        start = max(seen * stride, module.left_pad) - first_frame * stride
+        end = total * stride - first_frame * stride
+        return raw[..., start:end].contiguous()
+
 
 class Qwen3TTSTokenizerV2Encoder(MimiModel):
     def __init__(self, config: MimiConfig):
@@ -1029,7 +1140,8 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         """
         return_dict = return_dict if return_dict is not None else self.config.return_dict
 
-        audio_values = self.decoder.chunked_decode(audio_codes.transpose(1, 2)).squeeze(1)
+        # ⚡ Bolt: Carry conv tails and the transformer KV cache across chunks instead of re-decoding overlap frames
+        audio_values = self.decoder.stateful_decode(audio_codes.transpose(1, 2)).squeeze(1)
 
         audio_lengths = (audio_codes[..., 0] > 0).sum(1) * self.decode_upsample_rate
         audio_values = [a[:l] for a, l in zip(audio_values, audio_lengths)]
@@ -1042,4 +1154,4 @@ class Qwen3TTSTokenizerV2Model(Qwen3TTSTokenizerV2PreTrainedModel):
         return Qwen3TTSTokenizerV2DecoderOutput(audio_values)
 
 
-__all__ = ["Qwen3TTSTokenizerV2Model", "Qwen3TTSTokenizerV2PreTrainedModel"]
+__all__ = ["Qwen3TTSTokenizerV2Model", "Qwen3TTSTokenizerV2PreTrainedModel", "Qwen3TTSTokenizerV2StreamingDecoder"]
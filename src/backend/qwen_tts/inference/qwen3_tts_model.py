@@ -17,8 +17,10 @@ import base64
 import io
 import urllib.request
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
@@ -28,6 +30,11 @@ import torch
 from transformers import AutoConfig, AutoModel, AutoProcessor
 
 from ..core.models import Qwen3TTSConfig, Qwen3TTSForConditionalGeneration, Qwen3TTSProcessor
+from ..core.models.continuous_batching import SAMPLING_KEYS, ContinuousBatchingScheduler
+from ..core.models.modeling_qwen3_tts import is_per_row
+from ..core.models.prefix_cache import TalkerPrefixCache
+from ..core.models.quantization import quantize_talker
+from ..core.models.speculative import SpeculativeTalkerDecoder
 
 logger = logging.getLogger("studio")
 
@@ -39,6 +46,16 @@ AudioLike = Union[
 
 MaybeList = Union[Any, List[Any]]
 
+# Background decode loops kept per model for sampling settings the shared scheduler does not serve
+MAX_PRIVATE_SCHEDULERS = 4
+
+
+def _is_uniform(generate_kwargs: Dict[str, Any]) -> bool:
+    """False for per-sample sampling settings or custom logits processors, which need the batched `generate`."""
+    return not generate_kwargs.get("logits_processor") and not any(
+        is_per_row(generate_kwargs.get(key)) for key in SAMPLING_KEYS
+    )
+
 
 @dataclass
 class VoiceClonePromptItem:
@@ -52,6 +69,7 @@ class VoiceClonePromptItem:
     x_vector_only_mode: bool
     icl_mode: bool
     ref_text: Optional[str] = None
+    draft_spk_embedding: Optional[torch.Tensor] = None  # (D,) from the speculative draft's own speaker encoder
 
 
 class Qwen3TTSModel:
@@ -82,6 +100,7 @@ class Qwen3TTSModel:
         "subtalker_top_p": 1.0,
         "subtalker_temperature": 0.9,
         "max_new_tokens": 2048,
+        "use_static_cache": False,
     }
 
     def __init__(self, model: Qwen3TTSForConditionalGeneration, processor, generate_defaults: Optional[Dict[str, Any]] = None):
@@ -90,6 +109,11 @@ class Qwen3TTSModel:
         self.generate_defaults = generate_defaults or {}
         self._cached_languages = None
         self._cached_speakers = None
+        self._batch_scheduler: Optional[ContinuousBatchingScheduler] = None
+        self._private_schedulers: "OrderedDict[Tuple, ContinuousBatchingScheduler]" = OrderedDict()
+        self._scheduler_lock = threading.Lock()
+        self._draft: Optional["Qwen3TTSModel"] = None
+        self._speculative: Optional[SpeculativeTalkerDecoder] = None
 
         self.device = getattr(model, "device", None)
         if self.device is None:
@@ -357,6 +381,210 @@ class Qwen3TTSModel:
                 kwargs[name] = self.generate_defaults.get(name, hard_val)
         return kwargs
 
+    def _check_model_type(self, model_type: str, method: str) -> None:
+        if self.model.tts_model_type != model_type:
+            raise ValueError(
+                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
+                f"tts_model_size: {self.model.tts_model_size}\n"
+                f"tts_model_type: {self.model.tts_model_type}\n"
+                f"does not support {method}, Please check Model Card or Readme for more details."
+            )
+
+    def enable_continuous_batching(self, max_batch_size: int = 8, **kwargs) -> ContinuousBatchingScheduler:
+        """
+        Start a shared continuous-batching decode loop for this model.
+
+        Subsequent `generate_*` calls whose sampling parameters match the scheduler's (the merged defaults plus
+        any overrides passed here) are decoded together with concurrent callers; other calls fall back to the
+        regular batched `generate`.
+        """
+        if self._batch_scheduler is None:
+            sampling = self._merge_generate_kwargs(**kwargs)
+            self._batch_scheduler = ContinuousBatchingScheduler(self.model, max_batch_size=max_batch_size, **sampling)
+            self._batch_scheduler.start()
+        return self._batch_scheduler
+
+    def disable_continuous_batching(self) -> None:
+        if self._batch_scheduler is not None:
+            self._batch_scheduler.stop()
+            self._batch_scheduler = None
+
+    def close(self) -> None:
+        """Stop every decode-loop thread of this model (they hold references that keep it alive)."""
+        self.disable_continuous_batching()
+        with self._scheduler_lock:
+            schedulers = list(self._private_schedulers.values())
+            self._private_schedulers.clear()
+        for scheduler in schedulers:
+            scheduler.stop()
+
+    def _scheduler_for(self, generate_kwargs: Dict[str, Any]) -> ContinuousBatchingScheduler:
+        """
+        The shared scheduler if `generate_kwargs` are compatible with it, else this model's background scheduler
+        for these sampling settings, created on first use. Idle ones beyond MAX_PRIVATE_SCHEDULERS are stopped.
+        """
+        scheduler = self._batch_scheduler
+        if scheduler is not None and scheduler.is_compatible(generate_kwargs):
+            return scheduler
+        key = tuple(generate_kwargs.get(k) for k in SAMPLING_KEYS) + (generate_kwargs.get("eos_token_id"),)
+        stale = []
+        with self._scheduler_lock:
+            scheduler = self._private_schedulers.get(key)
+            if scheduler is None:
+                scheduler = ContinuousBatchingScheduler(self.model, **generate_kwargs)
+                scheduler.start()
+                self._private_schedulers[key] = scheduler
+                for other_key, other in list(self._private_schedulers.items()):
+                    if len(self._private_schedulers) <= MAX_PRIVATE_SCHEDULERS:
+                        break
+                    if other is not scheduler and not other.has_work():
+                        stale.append(self._private_schedulers.pop(other_key))
+            self._private_schedulers.move_to_end(key)
+        for other in stale:
+            other.stop()
+        return scheduler
+
+    def enable_prefix_cache(self, max_bytes: int = 256 * 1024 * 1024) -> TalkerPrefixCache:
+        """
+        Keep talker KV snapshots of repeated prompt prefixes (speaker, instruct, codec tags, ICL reference text)
+        so later requests with the same prefix only prefill their own text.
+
+        The prefix is restored by the continuous-batching prefill, so calls that would otherwise use the regular
+        `generate` are decoded on a private scheduler while the cache is enabled.
+        """
+        attn_impl = getattr(self.model.talker.config, "_attn_implementation", "eager")
+        if attn_impl not in (None, "eager", "sdpa"):
+            raise ValueError(f"Prefix caching needs eager or sdpa attention, got {attn_impl}")
+        if self.model.prefix_cache is None:
+            self.model.prefix_cache = TalkerPrefixCache(max_bytes)
+        return self.model.prefix_cache
+
+    def disable_prefix_cache(self) -> None:
+        self.model.prefix_cache = None
+
+    def enable_speculative_decoding(self, draft: "Qwen3TTSModel", num_draft_tokens: int = 4) -> SpeculativeTalkerDecoder:
+        """
+        Draft up to `num_draft_tokens` codec frames per step with a smaller Base checkpoint sharing this model's
+        codec (e.g. 0.6B for 1.7B) and verify them with one target forward pass; output follows this model's
+        distribution exactly.
+
+        Voice-clone prompts created afterwards also carry the draft's own x-vector. Streaming, per-sample sampling
+        settings and custom logits processors keep using the regular decode paths.
+        """
+        self._check_model_type("base", "enable_speculative_decoding")
+        self._speculative = SpeculativeTalkerDecoder(self.model, draft.model, num_draft_tokens=num_draft_tokens)
+        self._draft = draft
+        return self._speculative
+
+    def disable_speculative_decoding(self) -> None:
+        self._speculative = None
+        self._draft = None
+
+    def quantize(self, mode: str = "int8", group_size: int = 32) -> Dict[str, int]:
+        """
+        Weight-only quantize the talker and code predictor linears in place ("int8" per output channel or "int4"
+        per `group_size` inputs). Meant for CPU inference, where fused int8/int4 matmul kernels are used.
+
+        Returns the replaced layer count and the talker's resident bytes before and after.
+        """
+        return quantize_talker(self.model, mode=mode, group_size=group_size)
+
+    def to(self, device: Union[str, torch.device]) -> "Qwen3TTSModel":
+        """
+        Move the model, its speech tokenizer and the speculative draft to `device` in place. Cached prefix KV lives
+        on the old device and is dropped. Must not be called while a generation is running.
+        """
+        device = torch.device(device)
+        # Decode loops keep their KV buffers on the old device: stop them and restart the shared one afterwards
+        shared = self._batch_scheduler
+        self.close()
+        self.model.to(device)
+        tokenizer = getattr(self.model, "speech_tokenizer", None)
+        if tokenizer is not None and tokenizer.model is not None:
+            tokenizer.model.to(device)
+            tokenizer.device = device
+        if self.model.prefix_cache is not None:
+            self.model.prefix_cache.clear()
+        if self._draft is not None:
+            self._draft.to(device)
+        self.device = device
+        if shared is not None:
+            self.enable_continuous_batching(max_batch_size=shared.max_batch_size, **shared.sampling)
+        return self
+
+    def _generate_codes(self, seed: Optional[int] = None, **generate_kwargs):
+        """
+        Route a `generate` call to the shared scheduler, speculative decoder, a private scheduler or plain `generate`.
+
+        On scheduler paths a `seed` gives every sample its own RNG (sample `i` uses `seed + i`), so the output does not
+        depend on concurrent requests; the other paths seed the global RNG.
+        """
+        scheduler = self._batch_scheduler
+        if scheduler is not None and scheduler.is_compatible(generate_kwargs):
+            return scheduler.generate(seed=seed, **generate_kwargs)
+        if self._uses_private_scheduler(generate_kwargs):
+            return self._scheduler_for(generate_kwargs).generate(seed=seed, **generate_kwargs)
+        if seed is not None:
+            torch.manual_seed(seed)
+        if self._speculative is not None and _is_uniform(generate_kwargs):
+            return self._speculative.generate(**generate_kwargs)
+        return self.model.generate(**generate_kwargs)
+
+    def _uses_private_scheduler(self, generate_kwargs: Dict[str, Any]) -> bool:
+        """True if `_generate_codes` decodes these (merged) kwargs on a private scheduler to reuse cached prefixes."""
+        return self.model.prefix_cache is not None and _is_uniform(generate_kwargs) and self._speculative is None
+
+    def seed_is_isolated(self, generate_kwargs: Dict[str, Any]) -> bool:
+        """
+        True if a `generate_*` call with these kwargs (including `seed`) samples from its own RNG, i.e. it is routed
+        to a scheduler, so the same seed reproduces the same codes whatever else the model is decoding.
+        """
+        seed = generate_kwargs.get("seed")
+        if seed is None or seed == -1:
+            return False
+        merged = self._merge_generate_kwargs(**{k: v for k, v in generate_kwargs.items() if k != "seed"})
+        scheduler = self._batch_scheduler
+        return (scheduler is not None and scheduler.is_compatible(merged)) or self._uses_private_scheduler(merged)
+
+    def _stream_wavs(
+        self,
+        generate_inputs: Dict[str, Any],
+        chunk_frames: int,
+        left_context: Optional[torch.Tensor] = None,
+        seed: Optional[int] = None,
+        **generate_kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Decode one sample frame by frame and yield `(wav_chunk, sample_rate)` every `chunk_frames` codec frames.
+
+        Uses the shared continuous-batching loop when it is running and compatible, otherwise this model's
+        background scheduler for the request's sampling settings, which concurrent streams share.
+        """
+        scheduler = self._scheduler_for(generate_kwargs)
+
+        voice_clone_prompt = generate_inputs.get("voice_clone_prompt")
+        if voice_clone_prompt is not None:
+            voice_clone_prompt = {key: [value[0]] for key, value in voice_clone_prompt.items() if value is not None}
+            voice_clone_prompt.setdefault("ref_code", None)
+        frames = scheduler.stream(
+            generate_inputs["input_ids"][0],
+            language=generate_inputs["languages"][0],
+            speaker=(generate_inputs.get("speakers") or [None])[0],
+            instruct_ids=(generate_inputs.get("instruct_ids") or [None])[0],
+            ref_ids=(generate_inputs.get("ref_ids") or [None])[0],
+            voice_clone_prompt=voice_clone_prompt,
+            non_streaming_mode=generate_kwargs.get("non_streaming_mode", False),
+            max_new_tokens=generate_kwargs["max_new_tokens"],
+            seed=seed,
+        )
+        tokenizer = self.model.speech_tokenizer
+        sample_rate = int(tokenizer.get_output_sample_rate())
+        try:
+            for wav in tokenizer.stream_decode(frames, chunk_frames=chunk_frames, left_context=left_context):
+                yield wav, sample_rate
+        finally:
+            frames.close()
+
     # voice clone model
     @torch.inference_mode()
     def create_voice_clone_prompt(
@@ -404,13 +632,7 @@ class Qwen3TTSModel:
                 - If x_vector_only_mode=False but ref_text is missing.
                 - If batch lengths mismatch.
         """
-        if self.model.tts_model_type != "base":
-            raise ValueError(
-                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
-                f"tts_model_size: {self.model.tts_model_size}\n"
-                f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support create_voice_clone_prompt, Please check Model Card or Readme for more details."
-            )
+        self._check_model_type("base", "create_voice_clone_prompt")
         
         ref_audio_list = self._ensure_list(ref_audio)
         ref_text_list = self._ensure_list(ref_text) if isinstance(ref_text, list) else ([ref_text] * len(ref_audio_list))
@@ -485,8 +707,17 @@ class Qwen3TTSModel:
         if isinstance(spk_embs, torch.Tensor) and spk_embs.ndim == 1:
             spk_embs = [spk_embs]
 
+        # The speculative draft has its own speaker encoder; conditioning it on its own x-vector keeps acceptance high
+        draft_embs = [None] * len(normalized)
+        if self._draft is not None:
+            draft_embs = self._draft.model.extract_speaker_embedding(
+                audio=wavs_to_embed, sr=self.model.speaker_encoder_sample_rate
+            )
+            if isinstance(draft_embs, torch.Tensor) and draft_embs.ndim == 1:
+                draft_embs = [draft_embs]
+
         items: List[VoiceClonePromptItem] = []
-        for i, ((wav, sr), code, rtext, xvec_only, spk_emb) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list, spk_embs)):
+        for i, ((wav, sr), code, rtext, xvec_only, spk_emb, draft_emb) in enumerate(zip(normalized, ref_codes, ref_text_list, xvec_list, spk_embs, draft_embs)):
             if not xvec_only:
                 if rtext is None or rtext == "":
                     raise ValueError(f"ref_text is required when x_vector_only_mode=False (ICL mode). Bad index={i}")
@@ -498,17 +729,85 @@ class Qwen3TTSModel:
                     x_vector_only_mode=bool(xvec_only),
                     icl_mode=bool(not xvec_only),
                     ref_text=rtext,
+                    draft_spk_embedding=draft_emb,
                 )
             )
         return items
 
     def _prompt_items_to_voice_clone_prompt(self, items: List[VoiceClonePromptItem]) -> Dict[str, Any]:
-        return dict(
+        prompt = dict(
             ref_code=[it.ref_code for it in items],
             ref_spk_embedding=[it.ref_spk_embedding for it in items],
             x_vector_only_mode=[it.x_vector_only_mode for it in items],
             icl_mode=[it.icl_mode for it in items],
         )
+        if any(it.draft_spk_embedding is not None for it in items):
+            prompt["draft_spk_embedding"] = [it.draft_spk_embedding for it in items]
+        return prompt
+
+    def _voice_clone_inputs(
+        self,
+        text: Union[str, List[str]],
+        language: Union[str, List[str]],
+        ref_audio: Optional[Union[AudioLike, List[AudioLike]]],
+        ref_text: Optional[Union[str, List[Optional[str]]]],
+        x_vector_only_mode: Union[bool, List[bool]],
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]],
+    ) -> Dict[str, Any]:
+        """Validate and tokenize `generate_voice_clone` arguments into `model.generate` inputs."""
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(texts) != len(languages):
+            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
+
+        self._validate_languages(languages)
+
+        if voice_clone_prompt is None:
+            if ref_audio is None:
+                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
+            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
+            if len(prompt_items) == 1 and len(texts) > 1:
+                prompt_items = prompt_items * len(texts)
+            if len(prompt_items) != len(texts):
+                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+            ref_texts_for_ids = [it.ref_text for it in prompt_items]
+        else:
+            if isinstance(voice_clone_prompt, list):
+                prompt_items = voice_clone_prompt
+                if len(prompt_items) == 1 and len(texts) > 1:
+                    prompt_items = prompt_items * len(texts)
+                if len(prompt_items) != len(texts):
+                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
+                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
+                ref_texts_for_ids = [it.ref_text for it in prompt_items]
+            else:
+                voice_clone_prompt_dict = voice_clone_prompt
+                ref_texts_for_ids = None
+
+        input_texts = [self._build_assistant_text(t) for t in texts]
+        input_ids = self._tokenize_texts(input_texts)
+
+        ref_ids = None
+        if ref_texts_for_ids is not None:
+            # ⚡ Bolt: Batched tokenization for reference texts
+            non_empty_indices = [i for i, rt in enumerate(ref_texts_for_ids) if rt and rt != ""]
+            ref_ids = [None] * len(ref_texts_for_ids)
+
+            if non_empty_indices:
+                non_empty_texts = [self._build_ref_text(ref_texts_for_ids[i]) for i in non_empty_indices]
+                tokenized = self._tokenize_texts(non_empty_texts)
+                for idx, tok in zip(non_empty_indices, tokenized):
+                    ref_ids[idx] = tok
+
+        return {
+            "input_ids": input_ids,
+            "ref_ids": ref_ids,
+            "voice_clone_prompt": voice_clone_prompt_dict,
+            "languages": languages,
+        }
 
     # voice clone model
     @torch.no_grad()
@@ -590,71 +889,12 @@ class Qwen3TTSModel:
             ValueError:
                 If batch sizes mismatch or required prompt inputs are missing.
         """
-        if self.model.tts_model_type != "base":
-            raise ValueError(
-                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
-                f"tts_model_size: {self.model.tts_model_size}\n"
-                f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_clone, Please check Model Card or Readme for more details."
-            )
-        
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(texts) != len(languages):
-            raise ValueError(f"Batch size mismatch: text={len(texts)}, language={len(languages)}")
-
-        self._validate_languages(languages)
-
-        if voice_clone_prompt is None:
-            if ref_audio is None:
-                raise ValueError("Either `voice_clone_prompt` or `ref_audio` must be provided.")
-            prompt_items = self.create_voice_clone_prompt(ref_audio=ref_audio, ref_text=ref_text, x_vector_only_mode=x_vector_only_mode)
-            if len(prompt_items) == 1 and len(texts) > 1:
-                prompt_items = prompt_items * len(texts)
-            if len(prompt_items) != len(texts):
-                raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-            voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-            ref_texts_for_ids = [it.ref_text for it in prompt_items]
-        else:
-            if isinstance(voice_clone_prompt, list):
-                prompt_items = voice_clone_prompt
-                if len(prompt_items) == 1 and len(texts) > 1:
-                    prompt_items = prompt_items * len(texts)
-                if len(prompt_items) != len(texts):
-                    raise ValueError(f"Batch size mismatch: prompt={len(prompt_items)}, text={len(texts)}")
-                voice_clone_prompt_dict = self._prompt_items_to_voice_clone_prompt(prompt_items)
-                ref_texts_for_ids = [it.ref_text for it in prompt_items]
-            else:
-                voice_clone_prompt_dict = voice_clone_prompt
-                ref_texts_for_ids = None
-
-        input_texts = [self._build_assistant_text(t) for t in texts]
-        input_ids = self._tokenize_texts(input_texts)
-
-        ref_ids = None
-        if ref_texts_for_ids is not None:
-            # ⚡ Bolt: Batched tokenization for reference texts
-            non_empty_indices = [i for i, rt in enumerate(ref_texts_for_ids) if rt and rt != ""]
-            ref_ids = [None] * len(ref_texts_for_ids)
-
-            if non_empty_indices:
-                non_empty_texts = [self._build_ref_text(ref_texts_for_ids[i]) for i in non_empty_indices]
-                tokenized = self._tokenize_texts(non_empty_texts)
-                for idx, tok in zip(non_empty_indices, tokenized):
-                    ref_ids[idx] = tok
-
+        self._check_model_type("base", "generate_voice_clone")
+        gen_inputs = self._voice_clone_inputs(text, language, ref_audio, ref_text, x_vector_only_mode, voice_clone_prompt)
+        voice_clone_prompt_dict = gen_inputs["voice_clone_prompt"]
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            ref_ids=ref_ids,
-            voice_clone_prompt=voice_clone_prompt_dict,
-            languages=languages,
-            non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
-        )
+        talker_codes_list, _ = self._generate_codes(non_streaming_mode=non_streaming_mode, **gen_inputs, **gen_kwargs)
 
         codes_for_decode = []
         for i, codes in enumerate(talker_codes_list):
@@ -679,6 +919,41 @@ class Qwen3TTSModel:
 
         return wavs_out, fs
 
+    @torch.no_grad()
+    def stream_voice_clone(
+        self,
+        text: str,
+        language: str = None,
+        ref_audio: Optional[AudioLike] = None,
+        ref_text: Optional[str] = None,
+        x_vector_only_mode: bool = False,
+        voice_clone_prompt: Optional[Union[Dict[str, Any], List[VoiceClonePromptItem]]] = None,
+        non_streaming_mode: bool = False,
+        chunk_frames: int = 12,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_voice_clone` for a single text.
+
+        Codec frames are decoded while the talker is still generating, so the first audio is available after
+        `chunk_frames` frames instead of after the whole utterance. In ICL mode the reference codes serve as the
+        decoder's left context for the first chunk rather than being decoded and cut off.
+
+        Yields:
+            Tuple[np.ndarray, int]:
+                (wav_chunk, sample_rate)
+        """
+        self._check_model_type("base", "stream_voice_clone")
+        if isinstance(text, list) and len(text) != 1:
+            raise ValueError("stream_voice_clone synthesizes a single text; use generate_voice_clone for batches.")
+        gen_inputs = self._voice_clone_inputs(text, language, ref_audio, ref_text, x_vector_only_mode, voice_clone_prompt)
+        ref_code_list = gen_inputs["voice_clone_prompt"].get("ref_code")
+        ref_code = ref_code_list[0] if ref_code_list is not None else None
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
+        yield from self._stream_wavs(
+            gen_inputs, chunk_frames, left_context=ref_code, non_streaming_mode=non_streaming_mode, **gen_kwargs
+        )
+
     # voice design model
     @torch.no_grad()
     def generate_voice_design(
@@ -730,13 +1005,7 @@ class Qwen3TTSModel:
             Tuple[List[np.ndarray], int]:
                 (wavs, sample_rate)
         """
-        if self.model.tts_model_type != "voice_design":
-            raise ValueError(
-                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
-                f"tts_model_size: {self.model.tts_model_size}\n"
-                f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_voice_design, Please check Model Card or Readme for more details."
-            )
+        self._check_model_type("voice_design", "generate_voice_design")
         
         texts = self._ensure_list(text)
         languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
@@ -765,7 +1034,7 @@ class Qwen3TTSModel:
 
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        talker_codes_list, _ = self.model.generate(
+        talker_codes_list, _ = self._generate_codes(
             input_ids=input_ids,
             instruct_ids=instruct_ids,
             languages=languages,
@@ -776,6 +1045,54 @@ class Qwen3TTSModel:
         wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
         return wavs, fs
 
+    def _custom_voice_inputs(
+        self,
+        text: Union[str, List[str]],
+        speaker: Union[str, List[str]],
+        language: Union[str, List[str]],
+        instruct: Optional[Union[str, List[str]]],
+    ) -> Dict[str, Any]:
+        """Validate and tokenize `generate_custom_voice` arguments into `model.generate` inputs."""
+        texts = self._ensure_list(text)
+        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
+        speakers = self._ensure_list(speaker)
+        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
+            instruct = None
+        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
+
+        if len(languages) == 1 and len(texts) > 1:
+            languages = languages * len(texts)
+        if len(speakers) == 1 and len(texts) > 1:
+            speakers = speakers * len(texts)
+        if len(instructs) == 1 and len(texts) > 1:
+            instructs = instructs * len(texts)
+
+        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
+            raise ValueError(
+                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
+            )
+
+        self._validate_languages(languages)
+        self._validate_speakers(speakers)
+
+        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
+
+        # ⚡ Bolt: Batched tokenization for instructions
+        instruct_ids: List[Optional[torch.Tensor]] = [None] * len(instructs)
+        non_empty_indices = [i for i, ins in enumerate(instructs) if ins and ins != ""]
+        if non_empty_indices:
+            non_empty_texts = [self._build_instruct_text(instructs[i]) for i in non_empty_indices]
+            tokenized = self._tokenize_texts(non_empty_texts)
+            for idx, tok in zip(non_empty_indices, tokenized):
+                instruct_ids[idx] = tok
+
+        return {
+            "input_ids": input_ids,
+            "instruct_ids": instruct_ids,
+            "languages": languages,
+            "speakers": speakers,
+        }
+
     # custom voice model
     @torch.no_grad()
     def generate_custom_voice(
@@ -834,60 +1151,42 @@ class Qwen3TTSModel:
             ValueError:
                 If any speaker/language is unsupported or batch sizes mismatch.
         """
-        if self.model.tts_model_type != "custom_voice":
-            raise ValueError(
-                f"model with \ntokenizer_type: {self.model.tokenizer_type}\n"
-                f"tts_model_size: {self.model.tts_model_size}\n"
-                f"tts_model_type: {self.model.tts_model_type}\n"
-                "does not support generate_custom_voice, Please check Model Card or Readme for more details."
-            )
-
-        texts = self._ensure_list(text)
-        languages = self._ensure_list(language) if isinstance(language, list) else ([language] * len(texts) if language is not None else ["Auto"] * len(texts))
-        speakers = self._ensure_list(speaker)
-        if self.model.tts_model_size in "0b6": # for 0b6 model, instruct is not supported
-            instruct = None
-        instructs = self._ensure_list(instruct) if isinstance(instruct, list) else ([instruct] * len(texts) if instruct is not None else [""] * len(texts))
-
-        if len(languages) == 1 and len(texts) > 1:
-            languages = languages * len(texts)
-        if len(speakers) == 1 and len(texts) > 1:
-            speakers = speakers * len(texts)
-        if len(instructs) == 1 and len(texts) > 1:
-            instructs = instructs * len(texts)
+        self._check_model_type("custom_voice", "generate_custom_voice")
+        gen_inputs = self._custom_voice_inputs(text, speaker, language, instruct)
+        gen_kwargs = self._merge_generate_kwargs(**kwargs)
 
-        if not (len(texts) == len(languages) == len(speakers) == len(instructs)):
-            raise ValueError(
-                f"Batch size mismatch: text={len(texts)}, language={len(languages)}, speaker={len(speakers)}, instruct={len(instructs)}"
-            )
+        talker_codes_list, _ = self._generate_codes(non_streaming_mode=non_streaming_mode, **gen_inputs, **gen_kwargs)
 
-        self._validate_languages(languages)
-        self._validate_speakers(speakers)
+        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
+        return wavs, fs
 
-        input_ids = self._tokenize_texts([self._build_assistant_text(t) for t in texts])
+    @torch.no_grad()
+    def stream_custom_voice(
+        self,
+        text: str,
+        speaker: str,
+        language: str = None,
+        instruct: Optional[str] = None,
+        non_streaming_mode: bool = False,
+        chunk_frames: int = 12,
+        **kwargs,
+    ) -> Iterator[Tuple[np.ndarray, int]]:
+        """
+        Streaming variant of `generate_custom_voice` for a single text.
 
-        # ⚡ Bolt: Batched tokenization for instructions
-        instruct_ids: List[Optional[torch.Tensor]] = [None] * len(instructs)
-        non_empty_indices = [i for i, ins in enumerate(instructs) if ins and ins != ""]
-        if non_empty_indices:
-            non_empty_texts = [self._build_instruct_text(instructs[i]) for i in non_empty_indices]
-            tokenized = self._tokenize_texts(non_empty_texts)
-            for idx, tok in zip(non_empty_indices, tokenized):
-                instruct_ids[idx] = tok
+        Codec frames are decoded while the talker is still generating, so the first audio is available after
+        `chunk_frames` frames instead of after the whole utterance.
 
+        Yields:
+            Tuple[np.ndarray, int]:
+                (wav_chunk, sample_rate)
+        """
+        self._check_model_type("custom_voice", "stream_custom_voice")
+        if isinstance(text, list) and len(text) != 1:
+            raise ValueError("stream_custom_voice synthesizes a single text; use generate_custom_voice for batches.")
+        gen_inputs = self._custom_voice_inputs(text, speaker, language, instruct)
         gen_kwargs = self._merge_generate_kwargs(**kwargs)
-
-        talker_codes_list, _ = self.model.generate(
-            input_ids=input_ids,
-            instruct_ids=instruct_ids,
-            languages=languages,
-            speakers=speakers,
-            non_streaming_mode=non_streaming_mode,
-            **gen_kwargs,
-        )
-
-        wavs, fs = self.model.speech_tokenizer.decode([{"audio_codes": c} for c in talker_codes_list])
-        return wavs, fs
+        yield from self._stream_wavs(gen_inputs, chunk_frames, non_streaming_mode=non_streaming_mode, **gen_kwargs)
 
     @torch.inference_mode()
     def get_speaker_embedding(self, speaker_name: str) -> torch.Tensor:
@@ -16,7 +16,7 @@
 import base64
 import io
 import urllib.request
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import librosa
@@ -31,6 +31,7 @@ from ..core import (
     Qwen3TTSTokenizerV1Model,
     Qwen3TTSTokenizerV2Config,
     Qwen3TTSTokenizerV2Model,
+    Qwen3TTSTokenizerV2StreamingDecoder,
 )
 
 AudioInput = Union[
@@ -61,13 +62,15 @@ class Qwen3TTSTokenizer:
         self.device = None
 
     @classmethod
-    def from_pretrained(cls, pretrained_model_name_or_path: str, **kwargs) -> "Qwen3TTSTokenizer":
+    def from_pretrained(cls, pretrained_model_name_or_path: str, mmap_weights: bool = False, **kwargs) -> "Qwen3TTSTokenizer":
         """
         Initialize tokenizer with HuggingFace `from_pretrained` style.
 
         Args:
             pretrained_model_name_or_path (str):
                 HuggingFace repo id or local directory.
+            mmap_weights (bool):
+                Map a local checkpoint's safetensors instead of reading them (falls back to a regular load).
             **kwargs (Any):
                 Forwarded to `AutoModel.from_pretrained(...)` directly.
                 Typical examples: device_map="cuda:0", dtype=torch.bfloat16, attn_implementation="eager".
@@ -85,7 +88,16 @@ class Qwen3TTSTokenizer:
         AutoModel.register(Qwen3TTSTokenizerV2Config, Qwen3TTSTokenizerV2Model)
 
         inst.feature_extractor = AutoFeatureExtractor.from_pretrained(pretrained_model_name_or_path)
-        inst.model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
+        inst.model = None
+        if mmap_weights:
+            from ..core.models.weight_mmap import load_mmap_pretrained, mmap_load_kwargs
+
+            try:
+                inst.model = load_mmap_pretrained(pretrained_model_name_or_path, **mmap_load_kwargs(kwargs))
+            except Exception:
+                inst.model = None
+        if inst.model is None:
+            inst.model = AutoModel.from_pretrained(pretrained_model_name_or_path, **kwargs)
         inst.config = inst.model.config
 
         inst.device = getattr(inst.model, "device", None)
@@ -372,6 +384,57 @@ class Qwen3TTSTokenizer:
         wavs = [w.to(torch.float32).detach().cpu().numpy() for w in wav_tensors]
         return wavs, int(self.model.get_output_sample_rate())
 
+    def stream_decode(
+        self,
+        frames: Iterable[torch.Tensor],
+        chunk_frames: int = 12,
+        left_context: Optional[torch.Tensor] = None,
+        left_context_size: int = 25,
+    ) -> Iterator[np.ndarray]:
+        """
+        Incrementally decode a stream of 12Hz codec frames.
+
+        Frames are buffered into chunks of `chunk_frames` and pushed through a stateful streaming decoder, so each
+        chunk costs only its own frames and audio can be played while the codes are still being generated.
+
+        Args:
+            frames (Iterable[torch.Tensor]):
+                Codec frames of shape `(Q,)` (one per step) or `(T, Q)`.
+            chunk_frames (int):
+                Number of frames decoded per yielded chunk.
+            left_context (Optional[torch.Tensor]):
+                `(T, Q)` codes preceding the stream (e.g. a voice clone `ref_code`). Its last `left_context_size`
+                frames warm up the decoder state; their audio is discarded.
+            left_context_size (int):
+                Maximum number of `left_context` frames used for warm-up.
+
+        Yields:
+            np.ndarray: 1-D float32 waveform chunk at `get_output_sample_rate()`.
+        """
+        if self.model.get_model_type() != "qwen3_tts_tokenizer_12hz":
+            raise ValueError("Streaming decode is only supported by the 12Hz tokenizer.")
+        if chunk_frames < 1:
+            raise ValueError(f"`chunk_frames` must be positive, got {chunk_frames}")
+
+        streamer = Qwen3TTSTokenizerV2StreamingDecoder(self.model.decoder)
+        if left_context is not None and left_context.shape[0] > 0:
+            streamer.decode(left_context[-left_context_size:].T.unsqueeze(0).to(self.device))
+
+        buffer: List[torch.Tensor] = []
+        buffered = 0
+        for frame in frames:
+            frame = frame.reshape(-1, frame.shape[-1])
+            buffer.append(frame)
+            buffered += frame.shape[0]
+            while buffered >= chunk_frames:
+                codes = torch.cat(buffer, dim=0)
+                buffer, buffered = [codes[chunk_frames:]], codes.shape[0] - chunk_frames
+                wav = streamer.decode(codes[:chunk_frames].T.unsqueeze(0).to(self.device))
+                yield wav[0, 0].to(torch.float32).detach().cpu().numpy()
+        if buffered:
+            wav = streamer.decode(torch.cat(buffer, dim=0).T.unsqueeze(0).to(self.device))
+            yield wav[0, 0].to(torch.float32).detach().cpu().numpy()
+
     def get_model_type(self) -> str:
         """
         Get the underlying tokenizer model type.
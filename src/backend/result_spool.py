@@ -0,0 +1,104 @@
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from .config import RESULT_SPOOL_DIR, RESULT_SPOOL_MAX_MB, logger
+from .engine_modules.disk_cache import DiskLRUCache
+
+
+class SpooledResult:
+    """A finished task's output file, kept in the task record in place of its bytes."""
+
+    def __init__(self, path: Path, media_type: str, filename: Optional[str] = None):
+        self.path = Path(path)
+        self.media_type = media_type
+        self.filename = filename
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @property
+    def size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+
+class ResultSpool(DiskLRUCache):
+    """Task results (WAVs, ZIP archives) on disk, one file per task, within a byte budget.
+
+    When the budget is exceeded the least recently downloaded results are deleted; their tasks
+    then report the result as expired instead of the process holding every recent render in RAM.
+    """
+
+    suffix = ".result"
+
+    def __init__(self, root: Path = RESULT_SPOOL_DIR, max_bytes: int = RESULT_SPOOL_MAX_MB * 1024 * 1024):
+        super().__init__(root, max_bytes)
+
+    def _spooled(self, task_id: str, media_type: str, filename: Optional[str]) -> SpooledResult:
+        result = SpooledResult(self._path(task_id), media_type, filename)
+        if not result.exists:
+            logger.warning(f"Result of task {task_id} is larger than the result spool budget and was dropped")
+        return result
+
+    def put(self, task_id: str, data: Union[bytes, BinaryIO], media_type: str, filename: Optional[str] = None) -> SpooledResult:
+        """Spool `data` (bytes or a readable file object) as the result of `task_id`."""
+        tmp = self._tmp_path(task_id)
+        with open(tmp, "wb") as f:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+        self._commit(tmp, task_id)
+        return self._spooled(task_id, media_type, filename)
+
+    def put_wav(self, task_id: str, waveform: np.ndarray, sample_rate: int) -> SpooledResult:
+        """Encode `waveform` straight into the spool file, never building the WAV bytes in memory."""
+        tmp = self._tmp_path(task_id)
+        sf.write(str(tmp), np.asarray(waveform, dtype=np.float32), sample_rate, format="WAV")
+        self._commit(tmp, task_id)
+        return self._spooled(task_id, "audio/wav", None)
+
+    def new_file(self, task_id: str) -> Path:
+        """Temp path to write a result to incrementally; publish it with `commit_file`."""
+        return self._tmp_path(task_id)
+
+    def commit_file(self, tmp: Path, task_id: str, media_type: str, filename: Optional[str] = None) -> SpooledResult:
+        self._commit(Path(tmp), task_id)
+        return self._spooled(task_id, media_type, filename)
+
+    def touch(self, result: SpooledResult) -> None:
+        """Mark a result as recently used so it is evicted last."""
+        self._touch(result.path)
+
+    def discard(self, result: Any) -> None:
+        """Delete the spooled files referenced by a task result, if any."""
+        if isinstance(result, dict):
+            for value in result.values():
+                self.discard(value)
+        elif isinstance(result, SpooledResult) and result.path.parent == self.root:
+            result.path.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """Delete every result, including temp files of interrupted writes (e.g. from before a restart)."""
+        removed = super().clear()
+        for leftover in self.root.glob("*.tmp") if self.root.exists() else []:
+            leftover.unlink(missing_ok=True)
+        return removed
+
+
+def find_spooled(result: Any, key: str = "audio") -> Optional[SpooledResult]:
+    """The spooled file of a task result: the result itself, or its `key` entry for dict results."""
+    if isinstance(result, dict):
+        result = result.get(key)
+    return result if isinstance(result, SpooledResult) else None
+
+
+# Global instance
+result_spool = ResultSpool()
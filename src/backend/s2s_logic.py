@@ -1,9 +1,18 @@
-import io
 import zipfile
 import os
+import queue
+import threading
+import time
+import numpy as np
+from .config import S2S_GENERATE_BATCH, S2S_PREPARE_BATCH, logger
 from .task_manager import task_manager, TaskStatus
 from .podcast_engine import PodcastEngine
-from .utils import numpy_to_wav_bytes
+from .result_spool import result_spool
+from .utils.stream_encoder import PCMStreamEncoder
+
+_DONE = object()  # end-of-stream marker passed down the batch S2S pipeline
+WAV_ENTRY_BLOCK = 1 << 18  # samples encoded per write into a ZIP entry
+STAGE_POLL = 0.1  # seconds a pipeline stage blocks on a queue before checking whether the pipeline was stopped
 
 def run_s2s_task(task_id, source_audio, target_voice, engine: PodcastEngine, preserve_prosody: bool = True, instruct: str = None):
     try:
@@ -26,44 +35,173 @@ def run_s2s_task(task_id, source_audio, target_voice, engine: PodcastEngine, pre
 
         task_manager.update_task(task_id, progress=90, message="Encoding audio...")
 
-        wav_bytes = numpy_to_wav_bytes(wav, sr).read()
-        task_manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, message="Ready", result=wav_bytes)
+        spooled = result_spool.put_wav(task_id, wav, sr)
+        task_manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, message="Ready", result=spooled)
 
     except Exception as e:
         task_manager.update_task(task_id, status=TaskStatus.FAILED, error=str(e), message=f"S2S failed: {e}")
 
+def _write_wav_entry(zip_file, name, waveform, sample_rate):
+    """Encode a waveform straight into an archive entry, a block at a time, without a whole-file WAV copy."""
+    waveform = np.asarray(waveform).reshape(-1)
+    encoder = PCMStreamEncoder(sample_rate, total_frames=len(waveform))
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.file_size = 44 + 2 * len(waveform)  # lets zipfile pick ZIP64 up front for very long outputs
+    with zip_file.open(info, "w") as entry:
+        entry.write(encoder.header())
+        for start in range(0, len(waveform), WAV_ENTRY_BLOCK):
+            entry.write(encoder.encode(waveform[start : start + WAV_ENTRY_BLOCK]))
+
+
+class _StageStats:
+    """Items a batch S2S pipeline stage finished and the seconds it spent working on them."""
+
+    def __init__(self):
+        self.items = 0
+        self.busy = 0.0
+
+    def report(self):
+        return {"items": self.items, "busy_s": round(self.busy, 2), "items_per_s": round(self.items / self.busy, 2) if self.busy else None}
+
+
+def _run_batched(stats, fn, batch):
+    """Apply `fn` to a batch of items at once; if it fails, retry item by item so one bad source only fails itself."""
+    started = time.perf_counter()
+    try:
+        fn(batch)
+    except Exception as e:
+        if len(batch) == 1:
+            batch[0]["error"] = e
+        else:
+            for item in batch:
+                try:
+                    fn([item])
+                except Exception as item_error:
+                    item["error"] = item_error
+    stats.items += len(batch)
+    stats.busy += time.perf_counter() - started
+
+
+def _put(outbox, item, stop):
+    """Hand `item` to the next stage, waiting for room unless the pipeline is stopped. False once it is."""
+    while not stop.is_set():
+        try:
+            outbox.put(item, timeout=STAGE_POLL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _stage(stats, fn, inbox, outbox, batch_size, stop):
+    """
+    Pipeline thread: take the next item plus whatever else is already queued (up to `batch_size`), process the
+    ones that have not failed upstream, and pass all of them on. `_DONE` is forwarded once the inbox is drained;
+    once `stop` is set the thread exits without blocking on a queue nobody reads any more.
+    """
+    try:
+        done = False
+        while not done and not stop.is_set():
+            try:
+                batch = [inbox.get(timeout=STAGE_POLL)]
+            except queue.Empty:
+                continue
+            while len(batch) < batch_size and batch[-1] is not _DONE:
+                try:
+                    batch.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            done = batch[-1] is _DONE
+            if done:
+                batch.pop()
+            live = [item for item in batch if item["error"] is None]
+            if live:
+                _run_batched(stats, fn, live)
+            for item in batch:
+                if not _put(outbox, item, stop):
+                    return
+    finally:
+        _put(outbox, _DONE, stop)
+
+
 def run_batch_s2s_task(task_id, source_audios, target_voice, engine: PodcastEngine, preserve_prosody: bool = True, instruct: str = None):
+    """
+    Convert many sources as a staged pipeline: transcribe -> ICL encode -> generate -> ZIP.
+
+    Each stage runs on its own thread and works on batches (Whisper windows of several files, one speech-tokenizer
+    pass, one batched talker call), with bounded queues in between, so every stage stays busy and results are
+    written into the archive as they arrive. Per-stage throughput is reported in the task detail.
+    """
     try:
         total = len(source_audios)
-        results = []
-        
         profile = {"type": target_voice["type"], "value": target_voice["value"]}
+        stats = {name: _StageStats() for name in ("transcribe", "encode", "generate", "write")}
+        stop = threading.Event()  # set when the writer is finished, so stage threads never outlive the task
 
-        for i, source in enumerate(source_audios):
-            current_progress = int((i / total) * 90)
-            task_manager.update_task(task_id, progress=current_progress, message=f"Processing {i+1}/{total}: {source}")
-            
-            try:
-                res = engine.generate_voice_changer(source, profile, preserve_prosody=preserve_prosody, instruct=instruct)
-                wav_bytes = numpy_to_wav_bytes(res["waveform"], res["sample_rate"]).read()
-                results.append((source, wav_bytes))
-            except Exception as e:
-                print(f"Error processing {source}: {e}")
-                continue
+        def transcribe(items):
+            for item, result in zip(items, engine.transcribe_batch([item["source"] for item in items])):
+                if result is None:
+                    item["error"] = RuntimeError(f"Could not transcribe {item['source']}")
+                else:
+                    item["text"] = result["text"]
+
+        def encode(items):
+            codes = engine.encode_voice_changer_sources([item["source"] for item in items], [item["text"] for item in items], preserve_prosody)
+            for item, code in zip(items, codes):
+                item["ref_code"] = code
+
+        def generate(items):
+            wavs, sr = engine.synthesize_voice_changer([item["text"] for item in items], [item["ref_code"] for item in items], profile, instruct=instruct)
+            for item, wav in zip(items, wavs):
+                item["waveform"], item["sample_rate"] = wav, sr
+                item["ref_code"] = None
+
+        sources, transcribed = queue.Queue(), queue.Queue(maxsize=2 * S2S_PREPARE_BATCH)
+        encoded, generated = queue.Queue(maxsize=2 * S2S_GENERATE_BATCH), queue.Queue(maxsize=2 * S2S_GENERATE_BATCH)
+        for source in source_audios:
+            sources.put({"source": source, "error": None})
+        sources.put(_DONE)
+        for name, fn, inbox, outbox, batch_size in (
+            ("transcribe", transcribe, sources, transcribed, S2S_PREPARE_BATCH),
+            ("encode", encode, transcribed, encoded, S2S_PREPARE_BATCH),
+            ("generate", generate, encoded, generated, S2S_GENERATE_BATCH),
+        ):
+            threading.Thread(target=_stage, args=(stats[name], fn, inbox, outbox, max(1, batch_size), stop), name=f"s2s-{name}-{task_id}", daemon=True).start()
+
+        task_manager.update_task(task_id, progress=0, message=f"Processing {total} files...")
+        # ⚡ Bolt: Stream each result into the spooled archive as it arrives instead of collecting them all first
+        zip_path = result_spool.new_file(task_id)
+        done = converted = 0
+        try:
+            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+                while (item := generated.get()) is not _DONE:
+                    done += 1
+                    if item["error"] is not None:
+                        logger.warning(f"Batch S2S {task_id}: could not convert {item['source']}: {item['error']}")
+                    else:
+                        started = time.perf_counter()
+                        # Use original filename but with .wav extension for the result
+                        base_name = os.path.splitext(os.path.basename(item["source"]))[0]
+                        _write_wav_entry(zip_file, f"{base_name}_converted.wav", item.pop("waveform"), item["sample_rate"])
+                        stats["write"].items += 1
+                        stats["write"].busy += time.perf_counter() - started
+                        converted += 1
+                    task_manager.update_task(task_id, progress=int(done / total * 95), message=f"Processed {done}/{total}: {item['source']}",
+                                             detail={"stages": {name: stage.report() for name, stage in stats.items()}})
+        except Exception:
+            zip_path.unlink(missing_ok=True)
+            raise
+        finally:
+            stop.set()
 
-        if not results:
+        logger.info(f"Batch S2S {task_id}: {converted}/{total} converted; " + ", ".join(f"{name} {stage.items} in {stage.busy:.1f}s" for name, stage in stats.items()))
+        if not converted:
+            zip_path.unlink(missing_ok=True)
             raise Exception("All batch items failed")
 
-        task_manager.update_task(task_id, progress=95, message="Creating ZIP archive...")
-        
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for source, data in results:
-                # Use original filename but with .wav extension for the result
-                base_name = os.path.splitext(os.path.basename(source))[0]
-                zip_file.writestr(f"{base_name}_converted.wav", data)
-        
-        task_manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, message="Ready", result=zip_buffer.getvalue())
+        spooled = result_spool.commit_file(zip_path, task_id, "application/zip", filename=f"batch_{task_id}.zip")
+        task_manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, message="Ready", result=spooled)
 
     except Exception as e:
         task_manager.update_task(task_id, status=TaskStatus.FAILED, error=str(e), message=f"Batch S2S failed: {e}")
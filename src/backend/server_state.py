@@ -1,4 +1,9 @@
+from .config import WORKER_PROCESSES, WORKER_DEVICES, WORKER_QUEUE_SIZE
 from .podcast_engine import PodcastEngine
 from .task_manager import task_manager, TaskStatus
+from .worker_pool import WorkerPool
 
 engine = PodcastEngine()
+
+# ⚡ Bolt: Model-hosting worker processes for queued synthesis jobs; None keeps synthesis in this process
+worker_pool = WorkerPool(WORKER_PROCESSES, devices=WORKER_DEVICES or None, queue_size=WORKER_QUEUE_SIZE) if WORKER_PROCESSES > 0 else None
@@ -1,8 +1,13 @@
 import uuid
+import heapq
+import itertools
 import threading
 import time
-from typing import Dict, Any, Optional, List
-from .config import logger
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, List, Callable
+from .config import TASK_CONCURRENCY, TASK_MAX_RUNNING, CLIENT_WEIGHTS, logger
+from .result_spool import result_spool
+from .progress_hub import ProgressHub
 
 class TaskStatus:
     """Constants representing the lifecycle states of an asynchronous task."""
@@ -12,6 +17,35 @@ class TaskStatus:
     FAILED = "failed"
     CANCELLED = "cancelled"
 
+# Scheduling classes in dispatch priority order, and the class of each scheduled task type. Other task types
+# (e.g. model downloads) start immediately.
+PRIORITY_CLASSES = ("preview", "segment", "podcast", "batch")
+TASK_CLASSES = {
+    "segment_generation": "segment",
+    "s2s": "segment",
+    "podcast_generation": "podcast",
+    "dub": "podcast",
+    "batch_s2s": "batch",
+    "video_generation": "batch",
+    "narrated_video": "batch",
+}
+
+class _QueuedCall:
+    """A call waiting for a slot in its priority class."""
+    def __init__(self, task_id, task_type, priority_class, fn, args, kwargs, client, cost):
+        self.task_id = task_id
+        self.task_type = task_type
+        self.priority_class = priority_class
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.client = client
+        self.cost = cost
+        self.future = Future()
+        self.start_tag = 0.0
+        self.order = (0.0, 0)  # (finish tag, arrival sequence): queue order within the class
+        self.started_at = None
+
 class TaskManager:
     """
     A thread-safe manager for tracking and controlling asynchronous background tasks.
@@ -19,9 +53,21 @@ class TaskManager:
     This class maintains a registry of tasks, their progress, and associated execution threads.
     It provides mechanisms for task creation, status updates, cancellation via threading events,
     and automatic cleanup of stale task data.
+
+    Task bodies handed to `submit` are scheduled: each task type belongs to a priority class
+    (interactive preview > segment > podcast > batch/video) with a bounded number of running calls,
+    and queued calls of a class are served in weighted fair order across client keys.
     """
-    def __init__(self):
-        """Initialize the TaskManager with empty registries and a thread lock."""
+    def __init__(self, class_limits: Optional[Dict[str, int]] = None, max_running: Optional[int] = None,
+                 client_weights: Optional[Dict[str, int]] = None):
+        """
+        Initialize the TaskManager with empty registries, queues and a thread lock.
+
+        Args:
+            class_limits: Max concurrently running calls per priority class (default: TASK_CONCURRENCY).
+            max_running: Max concurrently running scheduled calls across all classes (default: TASK_MAX_RUNNING).
+            client_weights: Fair-queuing weight per client key; unlisted clients weigh 1 (default: CLIENT_WEIGHTS).
+        """
         self.tasks: Dict[str, Dict[str, Any]] = {}
         self.threads: Dict[str, threading.Thread] = {}
         self.stop_events: Dict[str, threading.Event] = {}
@@ -29,6 +75,22 @@ class TaskManager:
         self._cleanup_thread = None
         self._cleanup_stop_event = threading.Event()
 
+        # ⚡ Bolt: Scheduler state. Each class keeps a heap of queued calls ordered by their weighted-fair-queuing
+        # finish tag, so within a class every client gets throughput in proportion to its weight.
+        self.class_limits = {**TASK_CONCURRENCY, **(class_limits or {})}
+        self.max_running = max_running or TASK_MAX_RUNNING
+        self.client_weights = CLIENT_WEIGHTS if client_weights is None else client_weights
+        self.queues: Dict[str, list] = {c: [] for c in PRIORITY_CLASSES}
+        self.running: Dict[str, List[_QueuedCall]] = {c: [] for c in PRIORITY_CLASSES}
+        self._queued: Dict[str, _QueuedCall] = {}  # task id -> queued call
+        self._virtual_time = {c: 0.0 for c in PRIORITY_CLASSES}
+        self._client_tags: Dict[tuple, float] = {}  # (class, client) -> finish tag of the client's last call
+        self._unit_seconds: Dict[str, float] = {}  # task type -> moving average of run seconds per unit of cost
+        self._seq = itertools.count()
+
+        # ⚡ Bolt: State changes are pushed to event-stream subscribers instead of being polled
+        self.hub = ProgressHub()
+
     def start_cleanup_loop(self, interval: int = 3600):
         """
         Starts a background daemon thread that periodically prunes stale task records.
@@ -79,6 +141,7 @@ class TaskManager:
                 "message": "Task queued",
                 "result": None,
                 "error": None,
+                "detail": {},
                 "created_at": time.time(),
                 "updated_at": time.time(),
                 "metadata": metadata or {}
@@ -87,6 +150,150 @@ class TaskManager:
         logger.info(f"Task created: {task_id} ({task_type})")
         return task_id
 
+    def submit(self, task_id: str, fn: Callable, *args, client: str = "anonymous", cost: float = 1.0, **kwargs) -> Future:
+        """
+        Run `fn(task_id, *args, **kwargs)` for a registered task once its priority class has a free slot.
+
+        Args:
+            task_id: The registered task the call works on; its type selects the priority class.
+            fn: The task body. It reports progress and results through `update_task`.
+            client: Fair-queuing key of the requester.
+            cost: Relative amount of work (e.g. files in a batch); a client's queued work is served in proportion
+                to its weight, not its number of tasks.
+
+        Returns:
+            A Future of the call's return value.
+        """
+        with self.lock:
+            task_type = self.tasks[task_id]["type"]
+        priority_class = TASK_CLASSES.get(task_type)
+        call = _QueuedCall(task_id, task_type, priority_class, fn, (task_id, *args), kwargs, client, cost)
+        if priority_class is None:
+            self._start(call)
+        else:
+            self._enqueue(call)
+        return call.future
+
+    def schedule(self, priority_class: str, fn: Callable, *args, client: str = "anonymous", cost: float = 1.0, **kwargs) -> Future:
+        """Run an untracked call such as an interactive preview, `fn(*args, **kwargs)`, under the scheduler."""
+        call = _QueuedCall(None, priority_class, priority_class, fn, args, kwargs, client, cost)
+        self._enqueue(call)
+        return call.future
+
+    def _enqueue(self, call: _QueuedCall):
+        with self.lock:
+            weight = max(self.client_weights.get(call.client, 1), 1)
+            key = (call.priority_class, call.client)
+            call.start_tag = max(self._virtual_time[call.priority_class], self._client_tags.get(key, 0.0))
+            call.order = (call.start_tag + call.cost / weight, next(self._seq))
+            self._client_tags[key] = call.order[0]
+            heapq.heappush(self.queues[call.priority_class], (*call.order, call))
+            if call.task_id is not None:
+                self._queued[call.task_id] = call
+        self._dispatch()
+
+    def _is_live(self, call: _QueuedCall) -> bool:
+        if call.task_id is None:
+            return not call.future.cancelled()  # e.g. an endpoint timed out waiting for it
+        return self.tasks.get(call.task_id, {}).get("status") == TaskStatus.PENDING
+
+    def _dispatch(self):
+        """
+        Start queued calls, highest priority class first, while their class limit and the global limit allow.
+        Interactive previews only count against their own class limit.
+        """
+        to_start = []
+        with self.lock:
+            while True:
+                call = None
+                busy = sum(len(self.running[c]) for c in PRIORITY_CLASSES if c != "preview")
+                for priority_class in PRIORITY_CLASSES:
+                    queue = self.queues[priority_class]
+                    # Tasks cancelled (or cleaned up) while queued never start
+                    while queue and not self._is_live(queue[0][2]):
+                        dropped = heapq.heappop(queue)[2]
+                        self._queued.pop(dropped.task_id, None)
+                        dropped.future.cancel()
+                    if priority_class != "preview" and busy >= self.max_running:
+                        break
+                    if queue and len(self.running[priority_class]) < self.class_limits.get(priority_class, 1):
+                        call = heapq.heappop(queue)[2]
+                        break
+                if call is None:
+                    break
+                self._virtual_time[call.priority_class] = call.start_tag
+                self._queued.pop(call.task_id, None)
+                self.running[call.priority_class].append(call)
+                to_start.append(call)
+        for call in to_start:
+            self._start(call)
+
+    def _start(self, call: _QueuedCall):
+        call.started_at = time.time()
+        thread = threading.Thread(target=self._run, args=(call,), daemon=True, name=f"Task-{call.task_type}")
+        if call.task_id is not None:
+            self.register_thread(call.task_id, thread)
+        thread.start()
+
+    def _run(self, call: _QueuedCall):
+        try:
+            if call.future.set_running_or_notify_cancel():
+                try:
+                    result = call.fn(*call.args, **call.kwargs)
+                except BaseException as e:
+                    logger.error(f"Scheduled {call.task_type} call failed: {e}", exc_info=True)
+                    call.future.set_exception(e)
+                else:
+                    call.future.set_result(result)
+        finally:
+            elapsed = time.time() - call.started_at
+            with self.lock:
+                per_unit = elapsed / max(call.cost, 1e-6)
+                previous = self._unit_seconds.get(call.task_type)
+                self._unit_seconds[call.task_type] = per_unit if previous is None else 0.7 * previous + 0.3 * per_unit
+                if call.priority_class is not None:
+                    self.running[call.priority_class].remove(call)
+            self._dispatch()
+
+    def queue_info(self, task_id: str) -> Dict[str, Any]:
+        """
+        Queue position (1 = next of its class to start, 0 = running, None = not scheduled) and estimated seconds
+        until the task finishes.
+
+        Estimates come from moving averages of past run times per task type (for a running task without history,
+        from its progress) and are None when there is nothing to go on yet.
+        """
+        with self.lock:
+            task = self.tasks.get(task_id)
+            call = self._queued.get(task_id)
+            if call is None:
+                running = next((c for r in self.running.values() for c in r if c.task_id == task_id), None)
+                if running is None:
+                    return {"queue_position": None, "eta_seconds": None}
+                elapsed = time.time() - running.started_at
+                unit = self._unit_seconds.get(running.task_type)
+                if unit is not None:
+                    remaining = unit * running.cost - elapsed
+                elif task and task["progress"] > 0:
+                    remaining = elapsed * (100 - task["progress"]) / task["progress"]
+                else:
+                    return {"queue_position": 0, "eta_seconds": None}
+                return {"queue_position": 0, "eta_seconds": round(max(remaining, 0.0), 1)}
+
+            ahead = [c for *order, c in self.queues[call.priority_class] if tuple(order) < call.order and self._is_live(c)]
+            position = len(ahead) + 1
+            units = [self._unit_seconds.get(c.task_type) for c in (*ahead, call)]
+            running = self.running[call.priority_class]
+            if any(u is None for u in units):
+                return {"queue_position": position, "eta_seconds": None}
+            slots = max(min(self.class_limits.get(call.priority_class, 1), self.max_running), 1)
+            soonest = min(
+                (max(self._unit_seconds.get(c.task_type, 0.0) * c.cost - (time.time() - c.started_at), 0.0) for c in running),
+                default=0.0,
+            )
+            backlog = sum(u * c.cost for u, c in zip(units, ahead)) / slots
+            return {"queue_position": position, "eta_seconds": round(soonest + backlog + units[-1] * call.cost, 1)}
+
     def register_thread(self, task_id: str, thread: threading.Thread):
         """
         Associate a task ID with the OS thread executing the workload.
@@ -146,12 +353,15 @@ class TaskManager:
 
             if task_id in self.stop_events:
                 self.stop_events[task_id].set()
+            snapshot = self._snapshot(task) if self.hub.has_subscribers(task_id) else None
 
-            logger.info(f"Task cancelled: {task_id}")
-            return True
+        self._publish(task_id, snapshot)
+        logger.info(f"Task cancelled: {task_id}")
+        return True
 
     def update_task(self, task_id: str, status: Optional[str] = None, progress: Optional[int] = None, 
-                    message: Optional[str] = None, result: Any = None, error: Optional[str] = None):
+                    message: Optional[str] = None, result: Any = None, error: Optional[str] = None,
+                    detail: Optional[Dict[str, Any]] = None):
         """
         Atomically update the state and metadata of a registered task.
 
@@ -162,6 +372,7 @@ class TaskManager:
             message: Human-readable description of current progress.
             result: The final output data (only set on completion).
             error: Descriptive error message if the task fails.
+            detail: Fine-grained progress counters (e.g. segments done), merged into the task's `detail`.
         """
         with self.lock:
             if task_id not in self.tasks:
@@ -184,8 +395,13 @@ class TaskManager:
                 task["result"] = result
             if error:
                 task["error"] = error
+            if detail:
+                task["detail"] = {**task["detail"], **detail}
             
             task["updated_at"] = time.time()
+            snapshot = self._snapshot(task) if self.hub.has_subscribers(task_id) else None
+
+        self._publish(task_id, snapshot)
         
         # ⚡ Bolt: Log terminal states to Audit Log
         if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
@@ -197,6 +413,23 @@ class TaskManager:
         
         logger.debug(f"Task updated: {task_id} - {status} ({progress}%)")
 
+    @staticmethod
+    def _snapshot(task: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a task record for clients: the result payload is replaced by a `has_result` flag."""
+        snapshot = {k: v for k, v in task.items() if k != "result"}
+        snapshot["has_result"] = bool(task["result"])
+        return snapshot
+
+    def _publish(self, task_id: str, snapshot: Optional[Dict[str, Any]]):
+        if snapshot is not None:
+            self.hub.publish(task_id, snapshot)
+
+    def snapshot(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Client view of a task (see `_snapshot`), or None if it does not exist."""
+        with self.lock:
+            task = self.tasks.get(task_id)
+            return self._snapshot(task) if task else None
+
     def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve task information."""
         with self.lock:
@@ -222,6 +455,7 @@ class TaskManager:
         with self.lock:
             to_delete = [tid for tid, t in self.tasks.items() if now - t["created_at"] > max_age_seconds]
             for tid in to_delete:
+                result_spool.discard(self.tasks[tid]["result"])
                 del self.tasks[tid]
                 self.threads.pop(tid, None)
                 self.stop_events.pop(tid, None)
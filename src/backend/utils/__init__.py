@@ -490,16 +490,20 @@ class StorageManager:
                 engine = server_state.engine
                 # Clear dictionaries if they exist
                 for attr in ["preset_embeddings", "clone_embedding_cache", "mix_embedding_cache", 
-                            "bgm_cache", "prompt_cache", "transcription_cache", 
+                            "bgm_cache", "prompt_cache", "transcription_cache", "render_states", 
                             "translation_cache", "video_audio_cache"]:
                     if hasattr(engine, attr):
                         getattr(engine, attr).clear()
                 
-                # Clear whisper model if lazy-loaded
-                if hasattr(engine, "_whisper_model"):
-                    engine._whisper_model = None
-                
                 logger.info("StorageManager: Engine in-memory caches purged.")
+
+            # Drop the shared Whisper model; it is lazily reloaded by the next transcription
+            from ..engine_modules.transcriber import transcriber
+            transcriber.unload()
+
+            # Cached segment audio is a regenerable artifact; persistent voice prompts are kept (size-bounded)
+            from ..engine_modules.segment_cache import segment_cache
+            pruned_count += segment_cache.clear()
             
             # Clear CUDA cache if applicable
             # ⚡ Bolt: Use top-level torch import
@@ -0,0 +1,47 @@
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object: zipfile then writes each entry once, with a trailing data descriptor."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[Path, str]], compression: int = zipfile.ZIP_DEFLATED,
+               chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield the bytes of a ZIP archive of `(path, arcname)` files while it is being built.
+
+    Files are read `chunk_size` bytes at a time and their compressed output handed on immediately, so memory
+    stays constant however large the archive gets.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression) as archive:
+        for path, arcname in entries:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            info.compress_type = compression
+            with open(path, "rb") as src, archive.open(info, "w") as dst:
+                while chunk := src.read(chunk_size):
+                    dst.write(chunk)
+                    data = sink.take()
+                    if data:
+                        yield data
+            yield sink.take()
+    yield sink.take()
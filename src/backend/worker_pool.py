@@ -0,0 +1,334 @@
+"""
+Model-hosting inference worker processes fed by a local job queue.
+
+Each worker is a spawned process with its own engine and model manager, pinned to a slice of the CPU cores and to
+one device, so synthesis in one worker neither holds the HTTP process's GIL nor serializes with other workers. The
+parent routes each job to the worker that already has (or is about to load) the model types it needs, or to the
+worker holding its affinity key's state (a podcast render session), keeps at most `queue_size` jobs per worker in
+flight and rejects further jobs with `WorkerPoolFull` instead of queueing without bound. Waveforms come back through shared memory; only their name, shape and dtype cross the result queue.
+"""
+
+import atexit
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .config import logger
+
+# A worker that has to load a model first counts as this many queued jobs when routing
+COLD_MODEL_PENALTY = 2
+
+# Seconds between checks that every worker process is still alive
+LIVENESS_INTERVAL = 1.0
+
+# Affinity keys (render sessions) remembered; the least recently used is forgotten first
+MAX_AFFINITIES = 256
+
+
+class WorkerPoolFull(RuntimeError):
+    """Every worker already has `queue_size` jobs in flight."""
+
+
+class _SharedArray:
+    """Handle of a numpy array a worker left in a shared-memory block for the parent to copy out."""
+
+    def __init__(self, name: str, shape: tuple, dtype: str):
+        self.name, self.shape, self.dtype = name, shape, dtype
+
+
+def _export(value: Any, blocks: List[shared_memory.SharedMemory]) -> Any:
+    """Replace every numpy array inside `value` with a `_SharedArray`, copying it into a new block."""
+    if isinstance(value, np.ndarray):
+        shm = shared_memory.SharedMemory(create=True, size=max(value.nbytes, 1))
+        # The parent unlinks the block once it has copied it out, so this process must not clean it up on exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+        np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)[...] = value
+        blocks.append(shm)
+        return _SharedArray(shm.name, value.shape, value.dtype.str)
+    if isinstance(value, dict):
+        return {k: _export(v, blocks) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_export(v, blocks) for v in value)
+    return value
+
+
+def _import(value: Any) -> Any:
+    """Inverse of `_export`: copy every shared array out of its block and unlink the block."""
+    if isinstance(value, _SharedArray):
+        shm = shared_memory.SharedMemory(name=value.name)
+        try:
+            return np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+    if isinstance(value, dict):
+        return {k: _import(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_import(v) for v in value)
+    return value
+
+
+def default_engine():
+    """The worker-side engine: the regular `PodcastEngine` of `server_state`."""
+    from . import server_state
+
+    return server_state.engine
+
+
+def _worker_main(index: int, cores: List[int], engine_factory: Callable[[], Any], jobs, results) -> None:
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    import torch
+
+    if cores:
+        torch.set_num_threads(len(cores))
+    engine = engine_factory()
+    resident = getattr(engine, "resident_model_types", lambda: [])
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, method, kwargs = job
+        blocks = []
+        try:
+            payload = _export(getattr(engine, method)(**kwargs), blocks)
+            results.put((index, job_id, True, payload, resident()))
+        except Exception as e:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+            logger.error(f"Worker {index}: {method} failed: {e}", exc_info=True)
+            results.put((index, job_id, False, f"{type(e).__name__}: {e}", resident()))
+        finally:
+            for shm in blocks:
+                shm.close()
+
+
+class _Worker:
+    def __init__(self, index: int, device: str, cores: List[int]):
+        self.index = index
+        self.device = device
+        self.cores = cores
+        self.process = None
+        self.jobs = None
+        self.inflight: Dict[int, tuple] = {}  # job id -> (future, model types the job needs)
+        self.resident: set = set()  # model types the worker reported loaded
+
+    @property
+    def models(self) -> set:
+        """Model types that are resident or will be once the queued jobs run."""
+        return self.resident.union(*(needed for _, needed in self.inflight.values()))
+
+
+def default_devices(num_workers: int) -> List[str]:
+    """Workers spread round-robin over the visible GPUs, or all on CPU."""
+    import torch
+
+    gpus = torch.cuda.device_count() if torch.cuda.is_available() else 0
+    return [f"cuda:{i % gpus}" if gpus else "cpu" for i in range(num_workers)]
+
+
+class WorkerPool:
+    """
+    A fixed set of inference worker processes with bounded per-worker queues.
+
+    Args:
+        num_workers: Number of worker processes.
+        devices: Device per worker ("cpu", "cuda:1", ...), cycled if shorter; defaults to `default_devices`.
+        queue_size: Jobs a worker may have queued or running before it stops accepting more.
+        engine_factory: Picklable callable building the engine inside a worker; jobs call its methods.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        devices: Optional[List[str]] = None,
+        queue_size: int = 2,
+        engine_factory: Callable[[], Any] = default_engine,
+    ):
+        self.queue_size = queue_size
+        self.engine_factory = engine_factory
+        self._devices = devices
+        self._num_workers = num_workers
+        self._ctx = mp.get_context("spawn")  # CUDA cannot be used in forked children
+        self._ids = itertools.count()
+        self.lock = threading.Lock()
+        self.slot_freed = threading.Condition(self.lock)
+        self.workers: List[_Worker] = []
+        self.affinity: "OrderedDict[str, int]" = OrderedDict()  # affinity key -> index of the worker holding its state
+        self.results = None
+        self._collector = None
+        self._closed = False
+
+    def start(self) -> None:
+        with self.lock:
+            if self.workers or self._closed:
+                return
+            devices = self._devices or default_devices(self._num_workers)
+            cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+            per_worker = max(1, len(cores) // self._num_workers)
+            self.results = self._ctx.Queue()
+            for i in range(self._num_workers):
+                share = cores[i * per_worker : (i + 1) * per_worker] if len(cores) >= self._num_workers else []
+                worker = _Worker(i, devices[i % len(devices)], share)
+                self._spawn(worker)
+                self.workers.append(worker)
+            self._collector = threading.Thread(target=self._collect, daemon=True, name="WorkerPoolCollector")
+            self._collector.start()
+        atexit.register(self.shutdown)
+        logger.info(f"⚡ Bolt: Started {self._num_workers} inference workers on {', '.join(w.device for w in self.workers)}")
+
+    def _spawn(self, worker: _Worker) -> None:
+        worker.jobs = self._ctx.Queue()
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker.index, worker.cores, self.engine_factory, worker.jobs, self.results),
+            daemon=True,
+            name=f"InferenceWorker-{worker.index}",
+        )
+        # The child reads its GPU from the environment it is started with, before anything initializes CUDA
+        saved = os.environ.get("CUDA_VISIBLE_DEVICES")
+        os.environ["CUDA_VISIBLE_DEVICES"] = worker.device.partition(":")[2] if worker.device.startswith("cuda") else ""
+        try:
+            worker.process.start()
+        finally:
+            if saved is None:
+                os.environ.pop("CUDA_VISIBLE_DEVICES", None)
+            else:
+                os.environ["CUDA_VISIBLE_DEVICES"] = saved
+
+    def submit(self, method: str, kwargs: Dict[str, Any], model_types: Iterable[str] = (), affinity: Optional[str] = None,
+               wait: Optional[float] = 0) -> Future:
+        """
+        Queue `engine.<method>(**kwargs)` on the worker best placed to run it: the fewest queued jobs, where a
+        worker that would first have to load one of `model_types` counts as `COLD_MODEL_PENALTY` jobs busier per
+        missing model.
+
+        Jobs with the same `affinity` key go to the same worker, whose engine keeps state between them (a podcast
+        render session's blocks). Only when that worker's queue is full does the job go elsewhere, and the key
+        moves with it.
+
+        Returns a `Future` of the call's result; raises `WorkerPoolFull` when no worker has a free queue slot within
+        `wait` seconds (None: wait as long as it takes).
+        """
+        self.start()
+        needed = set(model_types)
+        with self.lock:
+            has_slot = lambda: self._closed or any(len(w.inflight) < self.queue_size for w in self.workers)
+            self.slot_freed.wait_for(has_slot, timeout=wait)
+            if self._closed:
+                raise RuntimeError("Worker pool shut down")
+            open_workers = [w for w in self.workers if len(w.inflight) < self.queue_size]
+            if not open_workers:
+                raise WorkerPoolFull(f"All {len(self.workers)} inference workers have {self.queue_size} jobs queued")
+            pinned = self.workers[self.affinity[affinity]] if affinity in self.affinity else None
+            if pinned in open_workers:
+                worker = pinned
+            else:
+                # Ties go to the worker with fewer models, spreading model types over the pool's memory
+                worker = min(
+                    open_workers,
+                    key=lambda w: (len(w.inflight) + COLD_MODEL_PENALTY * len(needed - w.models), len(w.models)),
+                )
+            if affinity is not None:
+                self.affinity[affinity] = worker.index
+                self.affinity.move_to_end(affinity)
+                if len(self.affinity) > MAX_AFFINITIES:
+                    self.affinity.popitem(last=False)
+            job_id = next(self._ids)
+            future = Future()
+            worker.inflight[job_id] = (future, needed)
+            worker.jobs.put((job_id, method, kwargs))
+        return future
+
+    def _collect(self) -> None:
+        next_check = time.monotonic() + LIVENESS_INTERVAL
+        while not (self._closed and not any(w.inflight for w in self.workers)):
+            # ⚡ Bolt: Liveness is checked on a timer, not only when results stop arriving, so a crashed worker's
+            # jobs fail fast even while the other workers keep the result queue busy
+            if time.monotonic() >= next_check:
+                self._restart_dead_workers()
+                next_check = time.monotonic() + LIVENESS_INTERVAL
+            try:
+                index, job_id, ok, payload, resident = self.results.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            with self.lock:
+                worker = self.workers[index]
+                worker.resident = set(resident)
+                future, _ = worker.inflight.pop(job_id, (None, None))
+                self.slot_freed.notify_all()
+            try:
+                result = _import(payload)
+            except Exception as e:
+                ok, result = False, f"Could not read worker result: {e}"
+            if future is None:
+                continue
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(result))
+
+    def _restart_dead_workers(self) -> None:
+        with self.lock:
+            for worker in self.workers:
+                if self._closed or worker.process.is_alive():
+                    continue
+                logger.error(f"Inference worker {worker.index} exited with code {worker.process.exitcode}; restarting")
+                for future, _ in worker.inflight.values():
+                    future.set_exception(RuntimeError(f"Inference worker {worker.index} exited"))
+                worker.inflight.clear()
+                worker.resident = set()
+                self._spawn(worker)
+                self.slot_freed.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "queue_size": self.queue_size,
+                "workers": [
+                    {
+                        "device": w.device,
+                        "cores": len(w.cores),
+                        "alive": w.process.is_alive(),
+                        "queued": len(w.inflight),
+                        "models": sorted(w.resident),
+                    }
+                    for w in self.workers
+                ],
+            }
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Let workers finish their queued jobs, then stop them."""
+        with self.lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self.workers)
+            self.slot_freed.notify_all()
+        for worker in workers:
+            worker.jobs.put(None)
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._collector is not None:
+            self._collector.join(timeout)
+        for worker in workers:
+            for future, _ in worker.inflight.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Worker pool shut down"))
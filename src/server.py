@@ -11,6 +11,7 @@ except ImportError:
     video = None
 
 from backend import server_state
+from backend.result_spool import result_spool
 from backend.config import logger
 
 app = FastAPI(title="Qwen-TTS Studio")
@@ -58,6 +59,12 @@ if __name__ == "__main__":
     
     # ⚡ Bolt: Start task manager background cleanup
     server_state.task_manager.start_cleanup_loop()
+    # Results spooled by a previous run belong to tasks this process never knew about
+    result_spool.clear()
+
+    # ⚡ Bolt: Spawn inference workers before serving so the first request does not pay for it
+    if server_state.worker_pool is not None:
+        server_state.worker_pool.start()
 
     print("\n" + "="*50)
     print("  QWEN-TTS STUDIO IS READY")
@@ -32,6 +32,7 @@ export const ProductionManager = {
         let script = [];
         if (isProduction) {
             script = window.CanvasManager.blocks.map(b => ({
+                id: b.id,
                 role: b.role,
                 text: b.text,
                 language: b.language || 'auto',
@@ -90,7 +91,9 @@ export const ProductionManager = {
                     reverb_level: reverbLevel,
                     stream: streamEnabled,
                     master_acx: masterAcx,
-                    temperature: globalTemperature
+                    temperature: globalTemperature,
+                    // Production renders only resynthesize edited blocks
+                    render_session: isProduction ? (document.getElementById('project-select')?.value || 'canvas') : null
                 })
             });
 
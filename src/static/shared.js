@@ -109,28 +109,67 @@ async function getVoicePreview(profile) {
 }
 
 const TaskPoller = {
-    async poll(taskId, onProgress, interval = 1000) {
-        return new Promise((resolve, reject) => {
-            const timer = setInterval(async () => {
+    // Calls onUpdate(task) on every state change until the task finishes; returns a function that stops watching.
+    // Uses the server-sent event stream, falling back to polling where EventSource is unavailable or fails.
+    watch(taskId, onUpdate, interval = 1000) {
+        const terminal = (task) => ['completed', 'failed', 'cancelled'].includes(task.status);
+        let timer = null;
+        let source = null;
+        const stop = () => {
+            if (source) source.close();
+            if (timer) clearInterval(timer);
+        };
+        const poll = () => {
+            timer = setInterval(async () => {
                 try {
                     const res = await fetch(`/api/tasks/${taskId}`);
                     if (!res.ok) throw new Error("Status check failed");
-
                     const task = await res.json();
-                    if (onProgress) onProgress(task);
+                    if (terminal(task)) stop();
+                    onUpdate(task);
+                } catch (e) {
+                    stop();
+                    onUpdate({ status: 'failed', error: e.message });
+                }
+            }, interval);
+        };
 
+        if (typeof EventSource === 'undefined') {
+            poll();
+            return stop;
+        }
+        source = new EventSource(`/api/tasks/${taskId}/events`);
+        source.addEventListener('task', (event) => {
+            const task = JSON.parse(event.data);
+            if (terminal(task)) stop();
+            onUpdate(task);
+        });
+        source.onerror = () => {
+            // The server closes the stream once the task is finished; anything else falls back to polling
+            source.close();
+            source = null;
+            if (!timer) poll();
+        };
+        return stop;
+    },
+
+    async poll(taskId, onProgress, interval = 1000) {
+        return new Promise((resolve, reject) => {
+            let done = false;
+            this.watch(taskId, async (task) => {
+                if (done) return;
+                if (onProgress) onProgress(task);
+                try {
                     if (task.status === 'completed') {
-                        clearInterval(timer);
+                        done = true;
                         const resultRes = await fetch(`/api/tasks/${taskId}/result`);
                         if (!resultRes.ok) throw new Error("Failed to download result");
-                        const blob = await resultRes.blob();
-                        resolve(blob);
-                    } else if (task.status === 'failed') {
-                        clearInterval(timer);
-                        reject(new Error(task.error || "Task failed"));
+                        resolve(await resultRes.blob());
+                    } else if (task.status === 'failed' || task.status === 'cancelled') {
+                        done = true;
+                        reject(new Error(task.error || `Task ${task.status}`));
                     }
                 } catch (e) {
-                    clearInterval(timer);
                     reject(e);
                 }
             }, interval);
@@ -80,25 +80,16 @@ export const TaskManager = {
     pollTask(taskId, onComplete) {
         const statusText = document.getElementById('status-text') || document.getElementById('status-badge');
 
-        const interval = setInterval(async () => {
-            try {
-                const res = await fetch(`/api/tasks/${taskId}`);
-                const data = await res.json();
-
-                if (data.status === 'completed') {
-                    clearInterval(interval);
-                    if (statusText) statusText.innerText = "Task Ready";
-                    if (onComplete) onComplete(data);
-                    else alert("Task Complete!");
-                } else if (data.status === 'failed') {
-                    clearInterval(interval);
-                    if (statusText) statusText.innerText = "Task Failed";
-                    alert(`Error: ${data.error}`);
-                } else {
-                    if (statusText) statusText.innerText = `Processing: ${data.progress}% - ${data.message}`;
-                }
-            } catch (err) {
-                console.error("Polling error", err);
+        window.TaskPoller.watch(taskId, (data) => {
+            if (data.status === 'completed') {
+                if (statusText) statusText.innerText = "Task Ready";
+                if (onComplete) onComplete(data);
+                else alert("Task Complete!");
+            } else if (data.status === 'failed') {
+                if (statusText) statusText.innerText = "Task Failed";
+                alert(`Error: ${data.error}`);
+            } else if (statusText) {
+                statusText.innerText = `Processing: ${data.progress}% - ${data.message}`;
             }
         }, 2000);
     }
@@ -17,6 +17,37 @@ try:
 except Exception:
     pass
 
+# Some test modules replace torch/transformers in sys.modules with MagicMocks at import time.
+# Snapshot the real modules first so fixtures that run actual model code can put them back.
+_MODEL_MODULE_ROOTS = {"torch", "transformers", "librosa", "soundfile", "safetensors", "backend"}
+try:
+    import torch  # noqa: F401
+    import transformers  # noqa: F401
+    import soundfile  # noqa: F401
+    import safetensors.torch  # noqa: F401
+    from backend.qwen_tts.core.models import modeling_qwen3_tts  # noqa: F401
+    _REAL_MODEL_MODULES = {
+        name: module for name, module in sys.modules.items() if name.split(".")[0] in _MODEL_MODULE_ROOTS
+    }
+except Exception:
+    _REAL_MODEL_MODULES = {}
+try:
+    from backend import podcast_engine  # noqa: F401
+    _REAL_MODEL_MODULES.update({
+        name: module for name, module in sys.modules.items() if name.split(".")[0] in _MODEL_MODULE_ROOTS
+    })
+except Exception:
+    pass
+
+
+@pytest.fixture
+def real_model_modules(monkeypatch):
+    """Temporarily restore the real torch/transformers modules for tests that run model code."""
+    for name, module in _REAL_MODEL_MODULES.items():
+        if sys.modules.get(name) is not module:
+            monkeypatch.setitem(sys.modules, name, module)
+
+
 @pytest.fixture(scope="session")
 def start_server():
     """Start the uvicorn server in a subprocess for E2E tests."""
@@ -48,3 +79,32 @@ def start_server():
     yield process
     process.terminate()
     process.wait()
+
+
+@pytest.fixture
+def tiny_tts_model(real_model_modules):
+    """A randomly initialised, CPU-sized Qwen3TTSForConditionalGeneration (CustomVoice layout)."""
+    import torch
+    from backend.qwen_tts.core.models.configuration_qwen3_tts import Qwen3TTSConfig
+    from backend.qwen_tts.core.models.modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
+
+    torch.manual_seed(0)
+    config = Qwen3TTSConfig(
+        talker_config=dict(
+            vocab_size=1088, hidden_size=32, intermediate_size=64, num_hidden_layers=2,
+            num_attention_heads=4, num_key_value_heads=2, head_dim=8,
+            text_vocab_size=128, text_hidden_size=32, num_code_groups=4,
+            codec_eos_token_id=1070, codec_think_id=1071, codec_nothink_id=1072, codec_think_bos_id=1073,
+            codec_think_eos_id=1074, codec_pad_id=1075, codec_bos_id=1076,
+            spk_id={"alice": 1077}, spk_is_dialect={"alice": False}, codec_language_id={"english": 1078},
+            rope_scaling={"rope_type": "default", "mrope_section": [1, 1, 2], "interleaved": False},
+            code_predictor_config=dict(
+                vocab_size=64, hidden_size=16, intermediate_size=32, num_hidden_layers=1,
+                num_attention_heads=2, num_key_value_heads=1, head_dim=8, num_code_groups=4,
+            ),
+        ),
+        tts_model_type="custom_voice",
+        im_start_token_id=100, im_end_token_id=101,
+        tts_pad_token_id=102, tts_bos_token_id=103, tts_eos_token_id=104,
+    )
+    return Qwen3TTSForConditionalGeneration(config).eval()
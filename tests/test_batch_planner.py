@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _line(index, tokens, **sampling):
+    return {"index": index, "tokens": tokens, "sampling": sampling}
+
+
+def test_plan_buckets_by_length_and_sampling():
+    from backend.engine_modules.batch_planner import plan_batches
+
+    lines = [
+        _line(0, 100, temperature=0.7),
+        _line(1, 400, temperature=0.9),
+        _line(2, 110, temperature=0.9),
+        _line(3, 120, temperature=0.9, do_sample=False),
+        _line(4, 420, temperature=0.5),
+    ]
+    batches = plan_batches(lines, bytes_per_token=1, memory_budget=1 << 30)
+    # Temperatures mix freely; lengths and the shared settings split the batches
+    assert sorted(map(sorted, batches)) == [[0, 2], [1, 4], [3]]
+
+
+def test_plan_respects_memory_budget_and_batch_size():
+    from backend.engine_modules.batch_planner import plan_batches
+
+    lines = [_line(i, 100, temperature=0.9) for i in range(10)]
+    assert [len(b) for b in plan_batches(lines, bytes_per_token=10, memory_budget=3000)] == [3, 3, 3, 1]
+    assert [len(b) for b in plan_batches(lines, bytes_per_token=1, memory_budget=1 << 30, max_batch_size=4)] == [4, 4, 2]
+
+
+def test_per_row_warper_matches_scalar_warpers():
+    import torch
+    from transformers.generation import TemperatureLogitsWarper, TopKLogitsWarper, TopPLogitsWarper
+    from backend.qwen_tts.core.models import PerRowSamplingLogitsWarper
+
+    settings = [(0.7, 50, 1.0), (1.3, 0, 0.8), (0.9, 5, 0.95), (1.0, 3000, 0.5)]
+    scores = torch.randn(len(settings), 2048, generator=torch.Generator().manual_seed(0))
+    warped = PerRowSamplingLogitsWarper(*zip(*settings))(None, scores)
+
+    for row, (t, k, p) in enumerate(settings):
+        expected = TemperatureLogitsWarper(t)(None, scores[row:row + 1])
+        if k > 0:
+            expected = TopKLogitsWarper(k)(None, expected)
+        if p < 1.0:
+            expected = TopPLogitsWarper(p)(None, expected)
+        assert torch.equal(warped[row:row + 1].isinf(), expected.isinf())
+        torch.testing.assert_close(warped[row:row + 1], expected)
+
+
+def test_mixed_temperatures_share_one_batch(monkeypatch):
+    from backend import podcast_engine
+    from backend.api.system import SystemSettings
+
+    model = MagicMock()
+    model._merge_generate_kwargs.side_effect = lambda **kw: {"temperature": 0.9, **kw}
+    model.generate_custom_voice.side_effect = lambda text, **kw: ([np.full(2400, 0.1, dtype=np.float32) for _ in text], 24000)
+    monkeypatch.setattr(podcast_engine, "get_model", lambda mtype: model)
+    monkeypatch.setattr(podcast_engine, "_system_settings", SystemSettings(watermark_audio=False))
+    engine = podcast_engine.PodcastEngine()
+    monkeypatch.setattr(engine, "get_speaker_embedding", lambda profile: None)
+
+    script = [
+        {"role": "host", "text": "A calm opening line.", "temperature": 0.6},
+        {"role": "host", "text": "An excited reply line!", "temperature": 1.2},
+        {"role": "host", "text": "A line at the default."},
+    ]
+    engine.generate_podcast(script, profiles={"host": {"type": "preset", "value": "Ryan"}})
+
+    assert model.generate_custom_voice.call_count == 1
+    kwargs = model.generate_custom_voice.call_args.kwargs
+    expected = {s["text"]: s.get("temperature", 0.9) for s in script}
+    assert kwargs["temperature"] == pytest.approx([expected[t] for t in kwargs["text"]])
+
+
+def test_podcast_batch_passes_seed_to_the_model(monkeypatch):
+    import torch
+    from backend import podcast_engine
+    from backend.api.system import SystemSettings
+
+    model = MagicMock()
+    model.generate_custom_voice.side_effect = lambda text, **kw: ([np.full(2400, 0.1, dtype=np.float32) for _ in text], 24000)
+    monkeypatch.setattr(podcast_engine, "get_model", lambda mtype: model)
+    monkeypatch.setattr(podcast_engine, "_system_settings", SystemSettings(watermark_audio=False))
+    engine = podcast_engine.PodcastEngine()
+    monkeypatch.setattr(engine, "get_speaker_embedding", lambda profile: None)
+    global_seeds = []
+    monkeypatch.setattr(torch, "manual_seed", global_seeds.append)
+
+    script = [{"role": "host", "text": "A first line."}, {"role": "host", "text": "A second line."}]
+    model.seed_is_isolated.return_value = False
+    engine.generate_podcast(script, profiles={"host": {"type": "preset", "value": "Ryan"}}, seed=7)
+
+    assert model.generate_custom_voice.call_count == 1
+    assert model.generate_custom_voice.call_args.kwargs["seed"] == 7
+    assert global_seeds == []  # the process-wide RNG is left to the model's own routing
@@ -0,0 +1,101 @@
+import io
+import threading
+import time
+import zipfile
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend import s2s_logic
+from backend.result_spool import ResultSpool
+from backend.task_manager import TaskManager, TaskStatus
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+class FakeEngine:
+    """Records the batch sizes each stage is called with; "bad" sources fail to encode."""
+
+    def __init__(self):
+        self.calls = {"transcribe": [], "encode": [], "generate": []}
+        self.threads = set()
+
+    def transcribe_batch(self, sources):
+        self.calls["transcribe"].append(len(sources))
+        self.threads.add(threading.current_thread().name)
+        return [{"text": f"text of {s}", "language": "en", "segments": []} for s in sources]
+
+    def encode_voice_changer_sources(self, sources, texts, preserve_prosody):
+        self.calls["encode"].append(len(sources))
+        if any(s.startswith("bad") for s in sources):
+            raise ValueError("Reference audio duration must be between 3s and 30s")
+        return [f"codes of {s}" for s in sources]
+
+    def synthesize_voice_changer(self, texts, ref_codes, target_profile, instruct=None):
+        self.calls["generate"].append(len(texts))
+        time.sleep(0.01)  # the talker is the slow stage; items queue up behind it meanwhile
+        self.threads.add(threading.current_thread().name)
+        return [np.full(2400, 0.1, dtype=np.float32) for _ in texts], 24000
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    manager, spool = TaskManager(), ResultSpool(tmp_path / "results", max_bytes=10_000_000)
+    monkeypatch.setattr(s2s_logic, "task_manager", manager)
+    monkeypatch.setattr(s2s_logic, "result_spool", spool)
+    monkeypatch.setattr(s2s_logic, "S2S_PREPARE_BATCH", 8)
+    monkeypatch.setattr(s2s_logic, "S2S_GENERATE_BATCH", 4)
+    return manager
+
+
+def test_pipeline_batches_stages_and_isolates_failures(setup):
+    engine = FakeEngine()
+    sources = [f"clip{i}.wav" for i in range(19)] + ["bad.wav"]
+    task_id = setup.create_task("batch_s2s")
+
+    s2s_logic.run_batch_s2s_task(task_id, sources, {"type": "preset", "value": "Ryan"}, engine)
+
+    task = setup.get_task(task_id)
+    assert task["status"] == TaskStatus.COMPLETED
+    with zipfile.ZipFile(task["result"].path) as archive:
+        assert sorted(archive.namelist()) == sorted(f"clip{i}_converted.wav" for i in range(19))
+        wav, sr = sf.read(io.BytesIO(archive.read("clip3_converted.wav")), dtype="float32")
+    assert sr == 24000 and len(wav) == 2400 and abs(wav - 0.1).max() < 1e-3
+
+    assert engine.calls["transcribe"] == [8, 8, 4]
+    assert max(engine.calls["generate"]) > 1 and sum(engine.calls["generate"]) == 19
+    assert len(engine.threads) == 2  # transcription and generation ran on their own stage threads
+    stages = task["detail"]["stages"]
+    assert stages["generate"]["items"] == 19 and stages["write"]["items"] == 19
+    assert stages["transcribe"]["items"] == 20 and stages["transcribe"]["items_per_s"] > 0
+
+
+def test_all_items_failing_fails_the_task(setup):
+    task_id = setup.create_task("batch_s2s")
+    s2s_logic.run_batch_s2s_task(task_id, ["bad1.wav", "bad2.wav"], {"type": "preset", "value": "Ryan"}, FakeEngine())
+    assert setup.get_task(task_id)["status"] == TaskStatus.FAILED
+
+
+def test_writer_failure_stops_stages_and_removes_partial_archive(setup, tmp_path, monkeypatch):
+    written = []
+
+    def failing_write(zip_file, name, waveform, sample_rate):
+        written.append(name)
+        if len(written) == 2:
+            raise OSError("No space left on device")
+        zip_file.writestr(name, b"")
+
+    monkeypatch.setattr(s2s_logic, "_write_wav_entry", failing_write)
+    task_id = setup.create_task("batch_s2s")
+    sources = [f"clip{i}.wav" for i in range(60)]  # far more than the bounded queues hold
+
+    s2s_logic.run_batch_s2s_task(task_id, sources, {"type": "preset", "value": "Ryan"}, FakeEngine())
+
+    task = setup.get_task(task_id)
+    assert task["status"] == TaskStatus.FAILED and "No space left" in task["error"]
+    assert not [p for p in (tmp_path / "results").rglob("*") if p.is_file()]
+    deadline = time.monotonic() + 5
+    while any(t.name.endswith(task_id) for t in threading.enumerate()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not [t.name for t in threading.enumerate() if t.name.endswith(task_id)]
@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+import torch
+
+from backend.qwen_tts.core.models.continuous_batching import ContinuousBatchingScheduler, TalkerKVSlots
+
+GREEDY = dict(
+    do_sample=False, top_k=50, top_p=1.0, temperature=0.9, repetition_penalty=1.05,
+    subtalker_dosample=False, subtalker_top_k=50, subtalker_top_p=1.0, subtalker_temperature=0.9,
+)
+
+
+def _prompts():
+    torch.manual_seed(1)
+    return [
+        (torch.randint(0, 100, (1, 12)), "english", "alice", 12),
+        (torch.randint(0, 100, (1, 20)), "auto", None, 30),
+        (torch.randint(0, 100, (1, 9)), "auto", "alice", 6),
+    ]
+
+
+def _reference(model, prompts):
+    return [
+        model.generate(input_ids=[ids], languages=[lang], speakers=[spk], max_new_tokens=n, **GREEDY)[0][0]
+        for ids, lang, spk, n in prompts
+    ]
+
+
+def test_staggered_admission_matches_generate(tiny_tts_model):
+    prompts = _prompts()
+    expected = _reference(tiny_tts_model, prompts)
+
+    scheduler = ContinuousBatchingScheduler(tiny_tts_model, max_batch_size=2, initial_capacity=8, **GREEDY)
+    futures = [scheduler.submit(prompts[0][0], prompts[0][1], prompts[0][2], max_new_tokens=prompts[0][3])]
+    for _ in range(3):
+        scheduler.step()
+    # Joins mid-flight; the third request waits for a free slot.
+    for ids, lang, spk, n in prompts[1:]:
+        futures.append(scheduler.submit(ids, lang, spk, max_new_tokens=n))
+    scheduler.run_until_complete()
+
+    for ref, future in zip(expected, futures):
+        codes, hiddens = future.result()
+        assert torch.equal(ref, codes)
+        assert hiddens.shape == (codes.shape[0], tiny_tts_model.config.talker_config.hidden_size)
+    assert scheduler.stats["admitted"] == scheduler.stats["retired"] == 3
+    assert scheduler.kv.free_slots == 2
+
+
+def test_generate_interface_and_background_thread(tiny_tts_model):
+    prompts = _prompts()
+    expected = _reference(tiny_tts_model, prompts[:2])
+
+    scheduler = ContinuousBatchingScheduler(tiny_tts_model, max_batch_size=4, **GREEDY)
+    scheduler.start()
+    try:
+        results = {}
+
+        def worker(index):
+            ids, lang, spk, n = prompts[index]
+            codes, _ = scheduler.generate(input_ids=[ids], languages=[lang], speakers=[spk], max_new_tokens=n)
+            results[index] = codes[0]
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=60)
+    finally:
+        scheduler.stop()
+
+    for index, ref in enumerate(expected):
+        assert torch.equal(ref, results[index])
+
+
+def test_seeded_requests_reproduce_regardless_of_batch_mates(tiny_tts_model):
+    sampling = {**GREEDY, "do_sample": True, "subtalker_dosample": True}
+    ids, lang, spk, n = _prompts()[1]
+
+    alone = ContinuousBatchingScheduler(tiny_tts_model, **sampling)
+    future = alone.submit(ids, lang, spk, max_new_tokens=n, seed=7)
+    alone.run_until_complete()
+
+    shared = ContinuousBatchingScheduler(tiny_tts_model, **sampling)
+    others = [shared.submit(o_ids, o_lang, o_spk, max_new_tokens=o_n) for o_ids, o_lang, o_spk, o_n in _prompts()[::2]]
+    for _ in range(2):
+        shared.step()  # unseeded batch-mates consume the global RNG before and while the seeded request runs
+    seeded = shared.submit(ids, lang, spk, max_new_tokens=n, seed=7)
+    shared.run_until_complete()
+
+    assert torch.equal(future.result()[0], seeded.result()[0])
+    assert all(o.done() for o in others)
+
+
+def test_is_compatible_rejects_different_sampling(tiny_tts_model):
+    scheduler = ContinuousBatchingScheduler(tiny_tts_model, **GREEDY)
+    assert scheduler.is_compatible({"temperature": 0.9, "max_new_tokens": 10})
+    assert not scheduler.is_compatible({"temperature": 0.3})
+    assert not scheduler.is_compatible({"temperature": [0.9, 0.9]})
+    assert not scheduler.is_compatible({"eos_token_id": 1})
+
+
+def test_kv_slots_grow_and_recycle(tiny_tts_model):
+    slots = TalkerKVSlots(tiny_tts_model.config.talker_config, num_slots=2, capacity=4)
+    a = slots.allocate()
+    slots.keys[0][a, :, :4] = 1.0
+    slots.reserve(10)
+    assert slots.capacity >= 10
+    assert torch.all(slots.keys[0][a, :, :4] == 1.0)
+    slots.release(a)
+    assert slots.free_slots == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from backend import server_state
+from backend.api import engine_calls
+from backend.task_manager import TaskManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = TaskManager(class_limits={"preview": 1})
+    monkeypatch.setattr(server_state, "task_manager", manager)
+    monkeypatch.setattr(engine_calls, "ENDPOINT_CONCURRENCY", {"preview": 2})
+    return manager
+
+
+def test_engine_calls_leave_the_event_loop_free(manager):
+    release = threading.Event()
+
+    async def run():
+        call = asyncio.ensure_future(engine_calls.run_engine_call("preview", lambda: release.wait(5) and "wav"))
+        ticks = 0
+        while not call.done():
+            ticks += 1
+            if ticks == 5:
+                release.set()
+            await asyncio.sleep(0.01)
+        return ticks, await call
+
+    ticks, result = asyncio.run(run())
+    assert result == "wav" and ticks >= 5
+
+
+def test_limits_and_timeouts(manager):
+    release = threading.Event()
+    started = []
+
+    def slow(label):
+        started.append(label)
+        release.wait(5)
+        return label
+
+    async def run():
+        first = asyncio.ensure_future(engine_calls.run_engine_call("preview", slow, "first"))
+        await asyncio.sleep(0.05)
+        # The class has one slot, so the second call queues and times out without ever starting
+        with pytest.raises(HTTPException) as timed_out:
+            await engine_calls.run_engine_call("preview", slow, "second", timeout=0.1)
+        queued = asyncio.ensure_future(engine_calls.run_engine_call("preview", slow, "third"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as rejected:
+            await engine_calls.run_engine_call("preview", slow, "fourth")
+        release.set()
+        return timed_out.value, rejected.value, await first, await queued
+
+    timed_out, rejected, first, third = asyncio.run(run())
+    assert timed_out.status_code == 504
+    assert rejected.status_code == 503 and rejected.headers["Retry-After"] == "1"
+    assert (first, third) == ("first", "third")
+    time.sleep(0.05)
+    assert started == ["first", "third"]
+    assert engine_calls._active["preview"] == 0
+
+
+def test_timed_out_call_keeps_its_slot_until_it_finishes(manager):
+    release = threading.Event()
+
+    async def run():
+        with pytest.raises(HTTPException):
+            await engine_calls.run_engine_call("preview", lambda: release.wait(5), timeout=0.05)
+        held = engine_calls._active["preview"]  # the call is still running on its worker thread
+        release.set()
+        for _ in range(100):
+            if engine_calls._active["preview"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        return held, engine_calls._active["preview"]
+
+    assert asyncio.run(run()) == (1, 0)
+
+
+def test_streams_take_their_slot_only_when_iterated(manager):
+    async def run():
+        engine_calls.stream_engine_output("preview", iter([b"a"]))  # response never sent
+        engine_calls.stream_engine_output("preview", iter([b"b"]))
+        assert engine_calls._active.get("preview", 0) == 0
+
+        body = engine_calls.stream_engine_output("preview", iter([b"c", b"d"]))
+        chunks = []
+        async for chunk in body:
+            chunks.append(chunk)
+            assert engine_calls._active["preview"] == 1
+        return chunks
+
+    assert asyncio.run(run()) == [b"c", b"d"]
+    assert engine_calls._active["preview"] == 0
+
+    engine_calls._active["preview"] = 2
+    try:
+        with pytest.raises(HTTPException) as rejected:
+            engine_calls.stream_engine_output("preview", iter([]))
+        assert rejected.value.status_code == 503
+    finally:
+        engine_calls._active["preview"] = 0
@@ -0,0 +1,90 @@
+import zlib
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _speech(text):
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    n = 24000 + 240 * len(text)
+    return (0.3 * np.sin(np.arange(n) * rng.uniform(0.02, 0.2)) * rng.uniform(0.5, 1.0, n)).astype(np.float32)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    from backend import podcast_engine
+    from backend.api.system import SystemSettings
+
+    model = MagicMock()
+    model.generate_custom_voice.side_effect = lambda text, **kw: ([_speech(t) for t in text], 24000)
+    monkeypatch.setattr(podcast_engine, "get_model", lambda mtype: model)
+    monkeypatch.setattr(podcast_engine, "_system_settings", SystemSettings(watermark_audio=False))
+    engine = podcast_engine.PodcastEngine()
+    monkeypatch.setattr(engine, "get_speaker_embedding", lambda profile: None)
+    engine.model = model
+    return engine
+
+
+PROFILES = {"host": {"type": "preset", "value": "Ryan"}, "guest": {"type": "preset", "value": "Serena"}}
+MASTERING = dict(eq_preset="warm", reverb_level=0.3)
+
+
+def _script():
+    return [{"id": f"b{i}", "role": "host" if i % 2 else "guest", "text": f"Line number {i} of the episode."} for i in range(6)]
+
+
+def _full_render(engine, script):
+    return engine.generate_podcast(script, profiles=PROFILES, **MASTERING)["waveform"]
+
+
+def test_only_edited_blocks_are_resynthesized(engine):
+    script = _script()
+    engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)
+    assert engine.model.generate_custom_voice.call_count == 1
+
+    script[3] = {**script[3], "text": "A rewritten line."}
+    engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)
+    assert engine.model.generate_custom_voice.call_args.kwargs["text"] == ["A rewritten line."]
+
+    # Moving a block or changing its pause does not resynthesize anything
+    script[0], script[1] = script[1], script[0]
+    script[4] = {**script[4], "pause_after": 1.2}
+    engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)
+    assert engine.model.generate_custom_voice.call_count == 2
+
+
+@pytest.mark.parametrize("edit", ["text", "pause", "delete", "insert"])
+def test_incremental_master_matches_full_render(engine, edit, monkeypatch):
+    script = _script()
+    engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)
+
+    if edit == "text":
+        script[2] = {**script[2], "text": "Something completely different and a bit longer."}
+    elif edit == "pause":
+        script[4] = {**script[4], "pause_after": 1.5}
+    elif edit == "delete":
+        del script[3]
+    else:
+        script.insert(1, {"id": "new", "role": "guest", "text": "An inserted aside."})
+
+    remaster = MagicMock(side_effect=engine.patcher.apply_mastering)
+    monkeypatch.setattr(engine.patcher, "apply_mastering", remaster)
+    incremental = engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)["waveform"]
+    mastered = sum(call.args[0].shape[-1] for call in remaster.call_args_list)
+
+    expected = _full_render(engine, script)
+    assert incremental.shape == expected.shape
+    assert mastered < expected.shape[-1] / 2  # only the edited neighbourhood went through the mastering chain
+    np.testing.assert_allclose(incremental, expected, atol=1e-3)
+
+
+def test_bgm_or_changed_mastering_falls_back_to_full_master(engine):
+    script = _script()
+    engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", **MASTERING)
+    script[1] = {**script[1], "text": "Edited."}
+
+    out = engine.generate_podcast(script, profiles=PROFILES, render_session="ep1", eq_preset="bright", reverb_level=0.3)
+    np.testing.assert_allclose(out["waveform"], engine.generate_podcast(script, profiles=PROFILES, eq_preset="bright", reverb_level=0.3)["waveform"])
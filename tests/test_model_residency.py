@@ -0,0 +1,151 @@
+import threading
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+MB = 2**20
+
+
+class FakeTTS:
+    """Stands in for Qwen3TTSModel: a core module with one MB of float32 weights."""
+
+    loads = []
+
+    def __init__(self, path):
+        import torch
+
+        self.path = path
+        self.model = torch.nn.Linear(512, 512, bias=False)
+        self.devices = []
+        self.closed = False
+
+    @classmethod
+    def from_pretrained(cls, path, **kwargs):
+        cls.loads.append(path)
+        return cls(path)
+
+    def to(self, device):
+        self.devices.append(str(device))
+        return self
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path):
+    import torch
+    from backend import model_loader
+
+    monkeypatch.setattr(model_loader, "torch", torch)
+    monkeypatch.setattr(model_loader, "_ensure_qwen_tts", lambda: None)
+    monkeypatch.setattr(model_loader, "MODEL_RAM_BUDGET_MB", 1024)
+    monkeypatch.setattr(model_loader, "_Qwen3TTSModel", FakeTTS)
+
+    def find_model_path(name):
+        path = tmp_path / name.replace("/", "_")
+        path.mkdir(exist_ok=True)
+        (path / "model.safetensors").write_bytes(bytes(int(0.6 * MB)))  # estimated as 1.2 MB of float32 on CPU
+        return path
+
+    monkeypatch.setattr(model_loader, "find_model_path", find_model_path)
+    FakeTTS.loads = []
+    mgr = model_loader.ModelManager()
+    mgr.device = "cpu"
+    mgr.budgets = {"cpu": int(2.5 * MB)}
+    return mgr
+
+
+def test_models_are_evicted_by_bytes_in_lru_order(manager):
+    manager.load_model("Base")
+    manager.load_model("CustomVoice")
+    manager.load_model("Base")  # refresh, so CustomVoice is now least recently used
+    assert manager.stats()["resident_mb"] == {"1.7B_Base": 1, "1.7B_CustomVoice": 1}
+
+    manager.load_model("VoiceDesign")
+    assert set(manager.models) == {"1.7B_Base", "1.7B_VoiceDesign"}
+    assert not manager.warm  # no warm tier on CPU
+
+    manager.budgets["cpu"] = 4 * MB
+    manager.load_model("CustomVoice")
+    assert len(manager.models) == 3 and len(FakeTTS.loads) == 4
+
+
+def test_cache_hits_do_not_wait_for_a_load(manager):
+    model = manager.load_model("Base")
+    result = []
+    with manager.lock:  # as if another model were loading
+        thread = threading.Thread(target=lambda: result.append(manager.load_model("Base")))
+        thread.start()
+        thread.join(timeout=5)
+    assert result == [model]
+
+
+def test_gpu_evictions_park_idle_models_in_cpu_ram(manager):
+    manager.device = "cuda"
+    manager.budgets = {"cuda": int(2.5 * MB), "cpu": 4 * MB}
+    manager.load_model("Base")
+    manager.load_model("CustomVoice")
+    held = manager.load_model("VoiceDesign", lease=True)  # evicts Base, which nobody leases
+    assert set(manager.warm) == {"1.7B_Base"} and manager.warm["1.7B_Base"].devices == ["cpu"]
+
+    manager.load_model("Base")  # promoted from RAM, not reloaded; CustomVoice is parked in its place
+    assert manager.models["1.7B_Base"].devices == ["cpu", "cuda"] and set(manager.warm) == {"1.7B_CustomVoice"}
+
+    manager.load_model("CustomVoice")  # VoiceDesign is still leased, so it is dropped, not moved
+    assert "1.7B_VoiceDesign" not in manager.models and "1.7B_VoiceDesign" not in manager.warm
+    assert held.devices == [] and len(FakeTTS.loads) == 3
+    assert not held.closed  # its caller is still generating with it
+    manager.release(held)
+    assert held.closed and not manager.leases
+
+
+def test_evicted_models_leave_the_deduplicator(manager):
+    forgotten = []
+    manager.deduplicator = type("Dedup", (), {"forget": lambda self, core: forgotten.append(core), "bytes_saved": 0})()
+    base = manager.load_model("Base")
+    manager.load_model("CustomVoice")
+    manager.load_model("VoiceDesign")  # evicts Base
+    assert forgotten == [base.model]
+
+
+def test_leases_count_callers_not_references(manager):
+    manager.device = "cuda"
+    manager.budgets = {"cuda": int(1.5 * MB), "cpu": 4 * MB}
+    first = manager.load_model("Base", lease=True)
+    manager.load_model("Base", lease=True)
+    manager.release(first)
+    manager.load_model("CustomVoice")  # Base still has one lease: dropped, not moved under its caller
+    assert "1.7B_Base" not in manager.warm and first.devices == []
+
+    unleased = manager.load_model("Base")
+    reference = unleased  # a reference alone is not a use
+    manager.load_model("VoiceDesign")
+    assert manager.warm["1.7B_Base"] is reference and reference.devices == ["cpu"]
+
+
+def test_prefetch_loads_the_most_demanded_model_only_when_it_fits(manager):
+    manager.load_model("Base")
+    thread = manager.prefetch({"Base": 5, "VoiceDesign": 1, "CustomVoice": 3})
+    thread.join(timeout=5)
+    assert set(manager.models) == {"1.7B_Base", "1.7B_CustomVoice"}
+
+    assert manager.prefetch({"VoiceDesign": 2}) is None  # would need an eviction
+    assert "1.7B_VoiceDesign" not in manager.models
+
+
+def test_prefetch_reads_without_the_loader_lock(manager):
+    manager.budgets["cpu"] = 4 * MB
+    with manager.lock:  # as if another model were loading
+        thread = manager.prefetch({"CustomVoice": 1})
+        for _ in range(500):
+            if FakeTTS.loads:
+                break
+            threading.Event().wait(0.01)
+        assert len(FakeTTS.loads) == 1 and "1.7B_CustomVoice" not in manager.models
+    thread.join(timeout=5)
+    assert "1.7B_CustomVoice" in manager.models and not manager.prefetching
+
+    manager.load_model("CustomVoice")
+    assert len(FakeTTS.loads) == 1
@@ -0,0 +1,43 @@
+import pytest
+import torch
+
+from backend.qwen_tts.core.models.modeling_qwen3_tts import sample_next_token
+
+SAMPLED = dict(
+    do_sample=True, top_k=50, top_p=0.9, temperature=0.9, repetition_penalty=1.05,
+    subtalker_dosample=True, subtalker_top_k=50, subtalker_top_p=1.0, subtalker_temperature=0.9,
+)
+
+
+def _batch(model, **sampling):
+    torch.manual_seed(3)
+    ids = torch.randint(0, 100, (1, 12))
+    torch.manual_seed(0)
+    codes, _ = model.generate(input_ids=[ids, ids], languages=["english"] * 2, speakers=["alice"] * 2, max_new_tokens=10, **sampling)
+    return codes
+
+
+@pytest.mark.parametrize("temperature,top_k,top_p", [(0.7, 50, 1.0), (1.3, 0, 0.8), (1.0, 5, 0.5)])
+def test_sample_next_token_tensor_settings_match_scalars(temperature, top_k, top_p):
+    logits = torch.randn(4, 512, generator=torch.Generator().manual_seed(0))
+    torch.manual_seed(0)
+    expected = sample_next_token(logits, True, top_k, top_p, temperature)
+    torch.manual_seed(0)
+    tokens = sample_next_token(logits, True, torch.full((4,), top_k), torch.full((4,), top_p), torch.full((4,), temperature))
+    assert torch.equal(tokens, expected)
+
+
+@pytest.mark.parametrize("key", ["temperature", "top_k", "top_p", "repetition_penalty", "subtalker_temperature", "subtalker_top_k"])
+def test_uniform_per_row_settings_match_scalar_batch(tiny_tts_model, key):
+    expected = _batch(tiny_tts_model, **SAMPLED)
+    codes = _batch(tiny_tts_model, **{**SAMPLED, key: [SAMPLED[key]] * 2})
+    assert all(torch.equal(a, b) for a, b in zip(codes, expected))
+
+
+def test_each_row_follows_its_own_settings(tiny_tts_model):
+    greedy = dict(SAMPLED, do_sample=False, subtalker_dosample=False)
+    low = _batch(tiny_tts_model, **{**greedy, "repetition_penalty": 1.0})
+    high = _batch(tiny_tts_model, **{**greedy, "repetition_penalty": 3.0})
+    mixed = _batch(tiny_tts_model, **{**greedy, "repetition_penalty": [1.0, 3.0]})
+    assert torch.equal(mixed[0], low[0]) and torch.equal(mixed[1], high[1])
+    assert not torch.equal(low[1], high[1])
@@ -0,0 +1,75 @@
+import pytest
+import torch
+
+from backend.qwen_tts.core.models.continuous_batching import ContinuousBatchingScheduler
+from backend.qwen_tts.core.models.prefix_cache import TalkerPrefixCache
+
+GREEDY = dict(
+    do_sample=False, top_k=50, top_p=1.0, temperature=0.9, repetition_penalty=1.05,
+    subtalker_dosample=False, subtalker_top_k=50, subtalker_top_p=1.0, subtalker_temperature=0.9,
+)
+
+
+def _text_ids(length, seed):
+    """`<|im_start|>assistant\n` + text + tail, like the processor's chat template."""
+    torch.manual_seed(seed)
+    return torch.cat([torch.tensor([[100, 10, 11]]), torch.randint(0, 100, (1, length + 5))], dim=1)
+
+
+def _icl_prompt():
+    torch.manual_seed(5)
+    return {
+        "ref_spk_embedding": [torch.randn(32)],
+        "ref_code": [torch.randint(0, 64, (10, 4))],
+        "x_vector_only_mode": [False],
+        "icl_mode": [True],
+    }
+
+
+@pytest.mark.parametrize("icl", [False, True])
+@pytest.mark.parametrize("non_streaming_mode", [False, True])
+def test_prefix_length_marks_line_independent_positions(tiny_tts_model, icl, non_streaming_mode):
+    kwargs = dict(languages=["english"], non_streaming_mode=non_streaming_mode, return_prefix_lengths=True)
+    if icl:
+        kwargs.update(voice_clone_prompt=_icl_prompt(), ref_ids=[_text_ids(6, 9)])
+    else:
+        kwargs.update(speakers=["alice"], instruct_ids=[torch.randint(0, 100, (1, 7))])
+
+    a, _, _, (prefix_a,) = tiny_tts_model.build_talker_prompt(input_ids=[_text_ids(12, 1)], **kwargs)
+    b, _, _, (prefix_b,) = tiny_tts_model.build_talker_prompt(input_ids=[_text_ids(15, 2)], **kwargs)
+    assert prefix_a == prefix_b > 0
+    assert torch.equal(a[0][:, :prefix_a], b[0][:, :prefix_a])
+    assert not torch.equal(a[0][:, prefix_a], b[0][:, prefix_a])
+
+
+def test_scheduler_restores_cached_prefix(tiny_tts_model):
+    prompts = [(_text_ids(n, seed), n + 4) for seed, n in enumerate((12, 20, 9))]
+
+    def run():
+        scheduler = ContinuousBatchingScheduler(tiny_tts_model, **GREEDY)
+        return [
+            scheduler.generate(input_ids=[ids], languages=["english"], speakers=["alice"], max_new_tokens=n)[0][0]
+            for ids, n in prompts
+        ]
+
+    expected = run()
+    tiny_tts_model.prefix_cache = cache = TalkerPrefixCache(max_bytes=1 << 20)
+    try:
+        codes = run()
+    finally:
+        tiny_tts_model.prefix_cache = None
+
+    assert all(torch.equal(a, b) for a, b in zip(codes, expected))
+    assert (cache.stats["misses"], cache.stats["hits"]) == (1, 2)
+    assert len(cache.entries) == 1
+
+
+def test_cache_evicts_least_recently_used():
+    entry = lambda: ([torch.zeros(2, 4, 8)], [torch.zeros(2, 4, 8)])  # 512 bytes
+    cache = TalkerPrefixCache(max_bytes=1024)
+    cache.put("a", *entry())
+    cache.put("b", *entry())
+    assert cache.get("a") is not None
+    cache.put("c", *entry())
+    assert list(cache.entries) == ["a", "c"] and cache.bytes == 1024
+    assert TalkerPrefixCache.key(torch.ones(1, 3, 4)) != TalkerPrefixCache.key(torch.ones(1, 4, 3))
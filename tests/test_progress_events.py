@@ -0,0 +1,64 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import server_state
+from backend.api import tasks
+from backend.progress_hub import ProgressHub
+from backend.task_manager import TaskManager, TaskStatus
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = TaskManager()
+    monkeypatch.setattr(server_state, "task_manager", manager)
+    return manager
+
+
+def _events(response):
+    return [json.loads(line[len("data: "):]) for line in response.iter_lines() if line.startswith("data: ")]
+
+
+def test_task_stream_pushes_updates_until_the_task_finishes(manager):
+    app = FastAPI()
+    app.include_router(tasks.router)
+    task_id = manager.create_task("podcast_generation")
+
+    def work():
+        while not manager.hub.has_subscribers(task_id):
+            threading.Event().wait(0.01)
+        manager.update_task(task_id, status=TaskStatus.PROCESSING, progress=40, detail={"segments_done": 2, "segments_total": 5})
+        manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, result=b"RIFF")
+
+    threading.Thread(target=work).start()
+    with TestClient(app).stream("GET", f"/api/tasks/{task_id}/events") as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response)
+
+    assert events[0]["status"] == TaskStatus.PENDING
+    assert events[-1]["status"] == TaskStatus.COMPLETED and events[-1]["has_result"] is True
+    assert "result" not in events[-1]
+    assert events[-1]["detail"] == {"segments_done": 2, "segments_total": 5}
+    assert not manager.hub.subscribers  # the stream unsubscribed when it ended
+
+    assert TestClient(app).get("/api/tasks/missing/events").status_code == 404
+
+
+def test_slow_subscribers_only_see_the_latest_state():
+    hub = ProgressHub()
+
+    async def run():
+        one, every = hub.subscribe("a"), hub.subscribe()
+        publisher = threading.Thread(target=lambda: [hub.publish(t, {"task": t, "progress": p}) for t in ("a", "b") for p in range(50)])
+        publisher.start()
+        publisher.join()
+        await asyncio.sleep(0.01)  # let the loop run the handed-over pushes
+        return await one.get(), await every.get()
+
+    one, every = asyncio.run(run())
+    assert one == [{"task": "a", "progress": 49}]
+    assert every == [{"task": "a", "progress": 49}, {"task": "b", "progress": 49}]
@@ -0,0 +1,60 @@
+import pytest
+import torch
+from torch import nn
+
+from backend.qwen_tts.core.models.quantization import WeightOnlyLinear, codec_token_agreement, quantize_talker
+
+
+@pytest.mark.parametrize("mode", ["int8", "int4"])
+@pytest.mark.parametrize("out_features", [64, 24])  # 24 rows rule out the fused int4 layout
+def test_weight_only_linear_approximates_float(mode, out_features):
+    torch.manual_seed(0)
+    linear = nn.Linear(128, out_features)
+    quantized = WeightOnlyLinear.from_linear(linear, mode)
+    x = torch.randn(2, 5, 128)
+
+    out = quantized(x)
+    assert out.shape == (2, 5, out_features) and out.dtype == x.dtype
+    expected = nn.functional.linear(x, quantized.dequantize().float(), linear.bias)
+    torch.testing.assert_close(out, expected, atol=0.05, rtol=0.02)  # bfloat16 activations on the fused path
+
+    error = (quantized.dequantize().float() - linear.weight).abs().max()
+    assert error <= linear.weight.abs().max() / (100 if mode == "int8" else 10)
+
+
+@pytest.mark.parametrize("mode", ["int8", "int4"])
+def test_quantize_talker_shrinks_weights_and_keeps_outputs_close(tiny_tts_model, mode):
+    torch.manual_seed(3)
+    embeds = torch.randn(1, 9, 32)
+    with torch.no_grad():
+        expected = tiny_tts_model.talker.codec_head(tiny_tts_model.talker.model(inputs_embeds=embeds).last_hidden_state)
+
+    stats = quantize_talker(tiny_tts_model, mode)
+    assert stats["layers"] > 0 and stats["bytes_after"] < stats["bytes_before"]
+    assert isinstance(tiny_tts_model.talker.model.layers[0].mlp.down_proj, WeightOnlyLinear)
+    assert tiny_tts_model.quantization == mode
+
+    with torch.no_grad():
+        logits = tiny_tts_model.talker.codec_head(tiny_tts_model.talker.model(inputs_embeds=embeds).last_hidden_state)
+    assert (logits - expected).abs().max() < 0.1 * expected.abs().max()
+
+    ids = torch.cat([torch.tensor([[100, 10, 11]]), torch.randint(0, 100, (1, 17))], dim=1)
+    codes, _ = tiny_tts_model.generate(
+        input_ids=[ids], languages=["english"], speakers=["alice"], max_new_tokens=8, do_sample=False, subtalker_dosample=False
+    )
+    assert codes[0].shape[-1] == 4
+
+
+def test_codec_token_agreement_counts_length_mismatch():
+    ref = torch.zeros(4, 2, dtype=torch.long)
+    assert codec_token_agreement([ref], [ref.clone()]) == 1.0
+    assert codec_token_agreement([ref], [torch.cat([ref[:2], torch.ones(2, 2, dtype=torch.long)])]) == 0.5
+    assert codec_token_agreement([ref], [ref[:2]]) == 0.5
+
+
+def test_quantization_setting_parses_per_model_type():
+    from backend.config import _parse_quantization
+
+    assert _parse_quantization("") == {}
+    assert _parse_quantization("int8") == {"*": "int8"}
+    assert _parse_quantization("Base=int8, CustomVoice=INT4") == {"Base": "int8", "CustomVoice": "int4"}
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import server_state
+from backend.api import tasks
+from backend.result_spool import ResultSpool
+from backend.task_manager import TaskManager, TaskStatus
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    from backend import task_manager as task_manager_module
+
+    spool = ResultSpool(tmp_path / "results", max_bytes=100_000)
+    monkeypatch.setattr(tasks, "result_spool", spool)
+    monkeypatch.setattr(task_manager_module, "result_spool", spool)
+    return spool
+
+
+@pytest.fixture
+def client(monkeypatch):
+    manager = TaskManager()
+    monkeypatch.setattr(server_state, "task_manager", manager)
+    app = FastAPI()
+    app.include_router(tasks.router)
+    return TestClient(app), manager
+
+
+def _finish(manager, spool, samples):
+    task_id = manager.create_task("segment_generation")
+    spooled = spool.put_wav(task_id, np.zeros(samples, dtype=np.float32), 24000)
+    manager.update_task(task_id, status=TaskStatus.COMPLETED, progress=100, result=spooled)
+    return task_id
+
+
+def test_results_are_served_from_disk_with_ranges(spool, client):
+    http, manager = client
+    task_id = _finish(manager, spool, 4000)
+    assert manager.get_task(task_id)["result"].size == 44 + 4000 * 2
+
+    status = http.get(f"/api/tasks/{task_id}").json()
+    assert status["has_result"] is True and "result" not in status
+
+    full = http.get(f"/api/tasks/{task_id}/result")
+    assert full.status_code == 200 and full.content.startswith(b"RIFF")
+    part = http.get(f"/api/tasks/{task_id}/result", headers={"Range": "bytes=0-3"})
+    assert part.status_code == 206 and part.content == b"RIFF"
+    assert part.headers["content-range"] == f"bytes 0-3/{len(full.content)}"
+
+    manager.tasks[task_id]["created_at"] -= 7200
+    manager.cleanup_old_tasks()
+    assert spool.stats()["entries"] == 0
+
+
+def test_budget_evicts_oldest_results(spool, client):
+    http, manager = client
+    first = _finish(manager, spool, 30_000)
+    second = _finish(manager, spool, 30_000)  # 60 KB each, over the 100 KB budget together
+
+    assert http.get(f"/api/tasks/{first}/result").status_code == 410
+    assert http.get(f"/api/tasks/{second}/result").status_code == 200
+    assert spool.stats()["bytes"] <= spool.max_bytes
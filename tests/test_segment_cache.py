@@ -0,0 +1,192 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from backend.engine_modules.segment_cache import SegmentResultCache
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+GREEDY = {"do_sample": False, "subtalker_dosample": False}
+
+
+def _speech(seed):
+    """One second of tone with a silent tail, so the synthesizer's quality check passes."""
+    wav = 0.1 * np.sin(np.arange(24000) * 0.05 * (1 + seed % 5)).astype(np.float32)
+    wav[-2400:] = 0
+    return wav
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    from backend import podcast_engine
+    from backend.engine_modules import synthesizer
+
+    cache = SegmentResultCache(tmp_path / "segments", max_bytes=1 << 24)
+    monkeypatch.setattr(synthesizer, "segment_cache", cache)
+    monkeypatch.setattr(podcast_engine, "segment_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def model(monkeypatch):
+    from backend import podcast_engine
+    from backend.engine_modules import synthesizer
+
+    model = MagicMock()
+    model.model.config._name_or_path = "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice"
+    model.seed_is_isolated.return_value = False  # plain `generate`: a seed draws from the global RNG
+    model.generate_custom_voice.side_effect = lambda text, **kw: (
+        [_speech(len(t)) for t in (text if isinstance(text, list) else [text])], 24000
+    )
+    monkeypatch.setattr(synthesizer, "get_model", lambda mtype: model)
+    monkeypatch.setattr(podcast_engine, "get_model", lambda mtype: model)
+    return model
+
+
+def test_fingerprint_only_for_deterministic_requests(tmp_path):
+    cache = SegmentResultCache(tmp_path)
+    model = MagicMock()
+    model.seed_is_isolated.return_value = False
+    profile = {"type": "preset", "value": "Ryan", "role": "host"}
+    args = ("Hello.", profile, "auto", None, 0.9, model)
+
+    assert cache.fingerprint(*args, {"top_k": 50}) is None
+    # A seed draws from the global RNG outside the scheduler, so seeded sampling is not reproducible
+    assert cache.fingerprint(*args, {"seed": 7}) is None
+    key = cache.fingerprint(*args, GREEDY)
+    assert key is not None and key == cache.fingerprint(*args, dict(GREEDY))
+    assert key != cache.fingerprint("Hello!", *args[1:], GREEDY)
+    assert key != cache.fingerprint(*args, {**GREEDY, "max_new_tokens": 100})
+    # UI-only profile fields, unset values, private flags and an ignored seed do not split the cache
+    assert key == cache.fingerprint("Hello.", {"type": "preset", "value": "Ryan"}, *args[2:], GREEDY)
+    assert key == cache.fingerprint(*args, {**GREEDY, "seed": None, "_is_retry": True})
+    assert key == cache.fingerprint(*args, {**GREEDY, "seed": 7})
+
+    # On a scheduler path a seed gives the request its own RNG: cached, and keyed by the seed
+    model.seed_is_isolated.return_value = True
+    seeded = cache.fingerprint(*args, {"seed": 7})
+    assert seeded is not None and seeded not in (key, cache.fingerprint(*args, {"seed": 8}))
+    assert cache.fingerprint(*args, {"seed": -1}) is None
+    assert model.seed_is_isolated.call_args.args[0]["temperature"] == 0.9
+
+
+def test_seed_is_isolated_follows_scheduler_routing(tiny_tts_model):
+    from backend.qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+
+    model = Qwen3TTSModel(tiny_tts_model, None)
+    try:
+        assert not model.seed_is_isolated({"seed": 1})  # plain `generate` seeds the global RNG
+        model.enable_continuous_batching(max_batch_size=2)
+        assert model.seed_is_isolated({"seed": 1, "temperature": None})
+        assert not model.seed_is_isolated({"temperature": None})
+        assert not model.seed_is_isolated({"seed": 1, "temperature": [0.5, 0.9]})  # per-row settings use `generate`
+        model.disable_continuous_batching()
+        model.enable_prefix_cache()
+        assert model.seed_is_isolated({"seed": 1, "temperature": 0.5})
+    finally:
+        model.close()
+
+
+def test_batch_key_depends_on_batch_mates():
+    assert SegmentResultCache.batch_key("a", ["a"]) == "a"
+    in_ab = SegmentResultCache.batch_key("a", ["a", "b"])
+    assert in_ab not in ("a", SegmentResultCache.batch_key("a", ["a", "c"]), SegmentResultCache.batch_key("b", ["a", "b"]))
+    assert SegmentResultCache.batch_key("a", ["a", None]) is None
+
+
+def test_pcm_roundtrip_and_counters(tmp_path):
+    cache = SegmentResultCache(tmp_path)
+    wav = np.random.default_rng(0).uniform(-1, 1, 4800).astype(np.float32)
+    cache.put("k", wav, 24000)
+    got, sr = cache.get("k")
+    assert sr == 24000 and np.array_equal(got, wav)
+    assert cache.get("other") is None
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_generate_segment_served_from_cache(cache, model):
+    from backend.engine_modules.synthesizer import VoiceSynthesizer
+
+    synth = VoiceSynthesizer(None, {}, {}, {}, {}, {}, {}, {}, None, None)
+    profile = {"type": "preset", "value": "Ryan"}
+    watermark = lambda wav, sr: np.concatenate([wav, np.zeros(10, dtype=np.float32)])
+
+    first, _ = synth.generate_segment("Hello there.", profile, watermark_func=watermark, **GREEDY)
+    second, _ = synth.generate_segment("Hello there.", profile, watermark_func=watermark, **GREEDY)
+    synth.generate_segment("Hello there.", profile, temperature=0.9, seed=3)  # seeded sampling on the global RNG
+
+    assert model.generate_custom_voice.call_count == 2
+    np.testing.assert_array_equal(first, second)
+    assert len(second) == 24010  # watermark is re-applied to the cached PCM
+    assert cache.stats()["entries"] == 1
+
+
+def test_podcast_rerender_only_synthesizes_edited_batch(cache, model, monkeypatch):
+    from backend import podcast_engine
+    from backend.podcast_engine import PodcastEngine
+
+    # Two lines per batch, in script order
+    monkeypatch.setattr(podcast_engine, "plan_batches", lambda planned, **kw: [
+        [p["index"] for p in planned[i:i + 2]] for i in range(0, len(planned), 2)
+    ])
+    engine = PodcastEngine()
+    profiles = {"host": {"type": "preset", "value": "Ryan"}}
+    script = [{"role": "host", "text": f"Line number {i}."} for i in range(4)]
+
+    engine.generate_podcast(script, profiles=profiles, **GREEDY)
+    assert model.generate_custom_voice.call_count == 2
+
+    engine.generate_podcast(script, profiles=profiles, **GREEDY)
+    assert model.generate_custom_voice.call_count == 2
+
+    # The edited line's batch is resynthesized whole: its neighbour's audio depends on its batch-mate
+    script[2] = {"role": "host", "text": "An edited line."}
+    engine.generate_podcast(script, profiles=profiles, **GREEDY)
+    assert model.generate_custom_voice.call_count == 3
+    assert model.generate_custom_voice.call_args.kwargs["text"] == ["An edited line.", "Line number 3."]
+
+
+def test_podcast_line_reuses_unbatched_preview(cache, model):
+    from backend.engine_modules.synthesizer import VoiceSynthesizer
+    from backend.podcast_engine import PodcastEngine
+
+    profile = {"type": "preset", "value": "Ryan"}
+    VoiceSynthesizer(None, {}, {}, {}, {}, {}, {}, {}, None, None).generate_segment("Just one line.", profile, **GREEDY)
+    PodcastEngine().generate_podcast([{"role": "host", "text": "Just one line."}], profiles={"host": profile}, **GREEDY)
+    assert model.generate_custom_voice.call_count == 1
+
+
+def test_repeated_preview_served_from_cache(cache, tiny_tts_model, monkeypatch):
+    """The kwargs `/api/voice/preview` really sends are cached once the model isolates seeded requests."""
+    import asyncio
+    from httpx import ASGITransport, AsyncClient
+    from server import app
+    from backend import server_state
+    from backend.engine_modules import synthesizer
+    from backend.engine_modules.synthesizer import VoiceSynthesizer
+    from backend.qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+
+    model = Qwen3TTSModel(tiny_tts_model, None)
+    model.model.config._name_or_path = "Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice"
+    model.generate_custom_voice = MagicMock(side_effect=lambda text, **kw: ([_speech(len(text))], 24000))
+    monkeypatch.setattr(synthesizer, "get_model", lambda mtype: model)
+    engine = MagicMock()
+    engine.generate_segment.side_effect = VoiceSynthesizer(None, {}, {}, {}, {}, {}, {}, {}, None, None).generate_segment
+    monkeypatch.setattr(server_state, "engine", engine)
+
+    async def preview_twice():
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(2):
+                resp = await client.post("/api/voice/preview", json={"type": "preset", "value": "Ryan", "preview_text": "Hello there."})
+                assert resp.status_code == 200
+
+    try:
+        asyncio.run(preview_twice())
+        assert model.generate_custom_voice.call_count == 2  # without a scheduler the seed is not isolated
+        model.enable_continuous_batching(max_batch_size=2)
+        asyncio.run(preview_twice())
+        assert model.generate_custom_voice.call_count == 3
+        assert model.generate_custom_voice.call_args.kwargs["seed"] is not None
+    finally:
+        model.close()
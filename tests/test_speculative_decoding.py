@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from backend.qwen_tts.core.models.continuous_batching import ContinuousBatchingScheduler
+from backend.qwen_tts.core.models.speculative import SpeculativeTalkerDecoder
+
+GREEDY = dict(
+    do_sample=False, top_k=50, top_p=1.0, temperature=0.9, repetition_penalty=1.05,
+    subtalker_dosample=False, subtalker_top_k=50, subtalker_top_p=1.0, subtalker_temperature=0.9,
+)
+SAMPLED = {**GREEDY, "do_sample": True, "subtalker_dosample": True}
+
+
+@pytest.fixture
+def other_draft(tiny_tts_model):
+    """Same codec as `tiny_tts_model`, different weights: most drafted frames get rejected."""
+    torch.manual_seed(1)
+    return type(tiny_tts_model)(tiny_tts_model.config).eval()
+
+
+def _inputs(seed, length=20):
+    torch.manual_seed(seed)
+    ids = torch.cat([torch.tensor([[100, 10, 11]]), torch.randint(0, 100, (1, length + 5))], dim=1)
+    return dict(input_ids=[ids], languages=["english"], speakers=["alice"], max_new_tokens=30)
+
+
+def _icl_inputs():
+    torch.manual_seed(5)
+    xvector = torch.randn(32)
+    prompt = {
+        "ref_spk_embedding": [xvector],
+        "draft_spk_embedding": [xvector],
+        "ref_code": [torch.randint(0, 64, (10, 4))],
+        "x_vector_only_mode": [False],
+        "icl_mode": [True],
+    }
+    return {**_inputs(3), "voice_clone_prompt": prompt, "ref_ids": [_inputs(4, 6)["input_ids"][0]], "speakers": None}
+
+
+@pytest.mark.parametrize("draft_kind", ["same", "other"])
+@pytest.mark.parametrize("inputs", [_inputs(0), _icl_inputs()], ids=["speaker", "icl"])
+def test_greedy_output_matches_target_alone(tiny_tts_model, other_draft, draft_kind, inputs):
+    draft = tiny_tts_model if draft_kind == "same" else other_draft
+    expected = ContinuousBatchingScheduler(tiny_tts_model, **GREEDY).generate(**inputs)[0][0]
+
+    decoder = SpeculativeTalkerDecoder(tiny_tts_model, draft, num_draft_tokens=4)
+    codes, hiddens = decoder.generate(**inputs, **GREEDY)
+
+    assert torch.equal(codes[0], expected)
+    assert hiddens[0].shape == (expected.shape[0], tiny_tts_model.config.talker_config.hidden_size)
+    assert decoder.stats["drafted"] >= expected.shape[0]
+    if draft_kind == "same":
+        # Every drafted frame is accepted, so each verification step covers several frames
+        assert decoder.stats["accepted"] == decoder.stats["drafted"]
+        assert decoder.stats["verify_steps"] < expected.shape[0] / 2
+    else:
+        assert decoder.stats["accepted"] < decoder.stats["drafted"]
+
+
+def test_sampling_with_identical_draft_accepts_everything(tiny_tts_model):
+    decoder = SpeculativeTalkerDecoder(tiny_tts_model, tiny_tts_model, num_draft_tokens=3)
+    torch.manual_seed(0)
+    codes, _ = decoder.generate(**_inputs(1), **SAMPLED)
+
+    assert codes[0].shape[0] > 0
+    assert decoder.stats["accepted"] == decoder.stats["drafted"]
+
+
+def test_draft_must_share_the_codec(tiny_tts_model):
+    talker_config = SimpleNamespace(**{**vars(tiny_tts_model.config.talker_config), "num_code_groups": 8})
+    draft = SimpleNamespace(config=SimpleNamespace(talker_config=talker_config))
+    with pytest.raises(ValueError, match="num_code_groups"):
+        SpeculativeTalkerDecoder(tiny_tts_model, draft)
@@ -0,0 +1,46 @@
+import pytest
+import torch
+from transformers.cache_utils import StaticCache
+
+
+def _generate(model, seed=None, **kwargs):
+    torch.manual_seed(7)
+    ids = [torch.randint(0, 100, (1, 12)), torch.randint(0, 100, (1, 18))]
+    if seed is not None:
+        torch.manual_seed(seed)
+    codes, _ = model.generate(
+        input_ids=ids, languages=["english", "auto"], speakers=["alice", None], max_new_tokens=20, **kwargs
+    )
+    return codes
+
+
+def test_static_cache_matches_dynamic_greedy(tiny_tts_model):
+    greedy = dict(do_sample=False, subtalker_dosample=False)
+    dynamic = _generate(tiny_tts_model, **greedy)
+    static = _generate(tiny_tts_model, use_static_cache=True, **greedy)
+    for a, b in zip(dynamic, static):
+        assert torch.equal(a, b)
+
+
+def test_static_cache_matches_dynamic_seeded(tiny_tts_model):
+    dynamic = _generate(tiny_tts_model, seed=3)
+    static = _generate(tiny_tts_model, seed=3, use_static_cache=True)
+    for a, b in zip(dynamic, static):
+        assert torch.equal(a, b)
+
+
+def test_static_buffers_are_reused(tiny_tts_model):
+    _generate(tiny_tts_model, use_static_cache=True, do_sample=False)
+    talker_cache = tiny_tts_model.talker._cache
+    predictor_cache = tiny_tts_model.talker.code_predictor._cache
+    assert isinstance(talker_cache, StaticCache) and isinstance(predictor_cache, StaticCache)
+    predictor_keys = predictor_cache.layers[0].keys
+
+    _generate(tiny_tts_model, use_static_cache=True, do_sample=False)
+    assert tiny_tts_model.talker._cache is talker_cache
+    assert tiny_tts_model.talker.code_predictor._cache is predictor_cache
+    assert predictor_cache.layers[0].keys.data_ptr() == predictor_keys.data_ptr()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,37 @@
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from backend.utils.stream_encoder import encode_stream
+
+SR = 24000
+
+
+def _chunks(seconds=3, chunk=12 * 1920):
+    wav = (0.5 * np.sin(np.arange(SR * seconds) * 0.05)).astype(np.float32)
+    return wav, [(wav[i : i + chunk], SR) for i in range(0, len(wav), chunk)]
+
+
+def test_pcm_stream_has_one_header_and_raw_frames():
+    wav, chunks = _chunks()
+    parts = list(encode_stream(chunks, "pcm"))
+
+    assert len(parts) == len(chunks) + 1 and len(parts[0]) == 44
+    assert b"".join(parts).count(b"RIFF") == 1
+    assert [len(p) for p in parts[1:]] == [2 * len(c) for c, _ in chunks]
+    decoded, sr = sf.read(io.BytesIO(b"".join(parts)), dtype="float32")
+    assert sr == SR and np.abs(decoded - wav).max() < 1e-4
+
+
+@pytest.mark.parametrize("fmt", ["opus", "mp3"])
+def test_compressed_streams_decode_in_full_and_are_smaller(fmt):
+    wav, chunks = _chunks()
+    parts = list(encode_stream(chunks, fmt, compression_level=0.8))
+    data = b"".join(parts)
+
+    assert sum(1 for p in parts[1:-1] if p) >= 2  # frames go out while chunks keep coming, not only at the end
+    assert len(data) * 4 < 2 * len(wav)
+    decoded, sr = sf.read(io.BytesIO(data), dtype="float32")
+    assert sr == SR and len(decoded) >= len(wav)
@@ -0,0 +1,149 @@
+import pytest
+import torch
+
+
+@pytest.fixture
+def tiny_speech_tokenizer(real_model_modules):
+    """A randomly initialised 12Hz speech tokenizer whose 4 codebooks match `tiny_tts_model`."""
+    from backend.qwen_tts.core.tokenizer_12hz.configuration_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Config
+    from backend.qwen_tts.core.tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import Qwen3TTSTokenizerV2Model
+    from backend.qwen_tts.inference.qwen3_tts_tokenizer import Qwen3TTSTokenizer
+
+    torch.manual_seed(0)
+    config = Qwen3TTSTokenizerV2Config(
+        encoder_config=dict(
+            hidden_size=64, num_hidden_layers=1, num_attention_heads=4, num_key_value_heads=4, head_dim=16,
+            intermediate_size=64, num_filters=4, upsample_groups=64, codebook_size=64, codebook_dim=16,
+            num_quantizers=4, sliding_window=8,
+        ),
+        decoder_config=dict(
+            codebook_size=64, codebook_dim=16, hidden_size=32, latent_dim=32, num_attention_heads=4,
+            num_key_value_heads=4, intermediate_size=64, num_hidden_layers=1, num_quantizers=4,
+            upsample_rates=(2, 2), upsampling_ratios=(2,), decoder_dim=32, sliding_window=8,
+        ),
+        encoder_valid_num_quantizers=4,
+        decode_upsample_rate=8,
+        encode_downsample_rate=8,
+    )
+    model = Qwen3TTSTokenizerV2Model(config).eval()
+    # The default init leaves the codebooks at zero, which would make every decoded sample zero.
+    for name, param in model.decoder.named_parameters():
+        if "cluster_usage" in name:
+            param.data.uniform_(0.5, 2.0)
+        elif param.dim() > 1:
+            param.data.normal_(0, param[0].numel() ** -0.5)
+        else:
+            param.data.normal_(0, 0.3)
+    model.decoder.decoder[-1].conv.weight.data *= 0.01
+    tokenizer = Qwen3TTSTokenizer()
+    tokenizer.model = model
+    tokenizer.config = config
+    tokenizer.device = torch.device("cpu")
+    return tokenizer
+
+
+def _processor(text, return_tensors="pt", padding=True):
+    ids = [torch.tensor([100, 7, 8] + [ord(c) % 90 for c in t] + [101, 100, 7, 8, 9]) for t in text]
+    input_ids = torch.nn.utils.rnn.pad_sequence(ids, batch_first=True)
+    attention_mask = torch.nn.utils.rnn.pad_sequence([torch.ones_like(i) for i in ids], batch_first=True)
+    return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+@pytest.mark.parametrize("splits", [[1] * 30, [3, 7, 1, 12, 7], [30]])
+def test_streaming_decoder_matches_forward(tiny_speech_tokenizer, splits):
+    from backend.qwen_tts.core.tokenizer_12hz.modeling_qwen3_tts_tokenizer_v2 import (
+        Qwen3TTSTokenizerV2StreamingDecoder,
+    )
+
+    decoder = tiny_speech_tokenizer.model.decoder
+    codes = torch.randint(0, 64, (2, 4, sum(splits)))
+    with torch.inference_mode():
+        expected = decoder(codes)
+    assert expected.abs().max() > 0
+
+    streamer = Qwen3TTSTokenizerV2StreamingDecoder(decoder)
+    chunks, start = [], 0
+    for size in splits:
+        chunks.append(streamer.decode(codes[..., start : start + size]))
+        start += size
+    streamed = torch.cat(chunks, dim=-1)
+    assert streamed.shape == expected.shape
+    torch.testing.assert_close(streamed, expected, rtol=1e-4, atol=1e-5)
+
+
+def test_stateful_decode_matches_forward(tiny_speech_tokenizer):
+    decoder = tiny_speech_tokenizer.model.decoder
+    codes = torch.randint(0, 64, (1, 4, 37))
+    with torch.inference_mode():
+        expected = decoder(codes)
+    torch.testing.assert_close(decoder.stateful_decode(codes, chunk_size=10), expected, rtol=1e-4, atol=1e-5)
+
+
+def test_scheduler_stream_yields_generate_frames(tiny_tts_model):
+    from backend.qwen_tts.core.models.continuous_batching import ContinuousBatchingScheduler
+
+    torch.manual_seed(7)
+    input_ids = torch.randint(0, 100, (1, 14))
+    greedy = dict(do_sample=False, subtalker_dosample=False, repetition_penalty=1.05)
+    expected, _ = tiny_tts_model.generate(
+        input_ids=[input_ids], languages=["english"], speakers=["alice"], max_new_tokens=30, **greedy
+    )
+
+    scheduler = ContinuousBatchingScheduler(tiny_tts_model, max_batch_size=1, **greedy)
+    frames = list(scheduler.stream(input_ids, language="english", speaker="alice", max_new_tokens=30))
+    assert torch.equal(torch.stack(frames), expected[0])
+    assert not scheduler.has_work()
+
+
+def test_closing_stream_cancels_request(tiny_tts_model):
+    from backend.qwen_tts.core.models.continuous_batching import ContinuousBatchingScheduler
+
+    scheduler = ContinuousBatchingScheduler(tiny_tts_model, max_batch_size=1, do_sample=False, subtalker_dosample=False)
+    stream = scheduler.stream(torch.randint(0, 100, (1, 14)), language="english", speaker="alice", max_new_tokens=30)
+    next(stream)
+    stream.close()
+    scheduler.run_until_complete()
+    assert scheduler.kv.free_slots == 1
+
+
+def test_stream_custom_voice_yields_chunks_as_frames_arrive(tiny_tts_model, tiny_speech_tokenizer):
+    from backend.qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+
+    tiny_tts_model.load_speech_tokenizer(tiny_speech_tokenizer)
+    tiny_tts_model.tts_model_size = "1b7"
+    model = Qwen3TTSModel(tiny_tts_model, _processor)
+    greedy = dict(do_sample=False, subtalker_dosample=False, max_new_tokens=30)
+
+    chunks = list(model.stream_custom_voice("Hello there.", speaker="alice", language="english", chunk_frames=4, **greedy))
+
+    gen_inputs = model._custom_voice_inputs("Hello there.", "alice", "english", None)
+    codes, _ = tiny_tts_model.generate(**gen_inputs, **model._merge_generate_kwargs(**greedy))
+    frames = codes[0]
+    with torch.inference_mode():
+        expected = tiny_speech_tokenizer.model.decoder(frames.T.unsqueeze(0))
+
+    assert len(chunks) == -(-frames.shape[0] // 4)
+    assert all(sr == tiny_speech_tokenizer.get_output_sample_rate() for _, sr in chunks)
+    streamed = torch.cat([torch.from_numpy(wav) for wav, _ in chunks])
+    torch.testing.assert_close(streamed, expected[0, 0].float(), rtol=1e-4, atol=1e-5)
+
+
+def test_streams_share_one_background_scheduler_per_sampling_setup(tiny_tts_model, tiny_speech_tokenizer):
+    from backend.qwen_tts.inference.qwen3_tts_model import Qwen3TTSModel
+
+    tiny_tts_model.load_speech_tokenizer(tiny_speech_tokenizer)
+    tiny_tts_model.tts_model_size = "1b7"
+    model = Qwen3TTSModel(tiny_tts_model, _processor)
+    greedy = dict(do_sample=False, subtalker_dosample=False, max_new_tokens=8)
+    try:
+        first = list(model.stream_custom_voice("Hello there.", speaker="alice", language="english", chunk_frames=4, **greedy))
+        second = list(model.stream_custom_voice("Hello there.", speaker="alice", language="english", chunk_frames=4, **greedy))
+        list(model.stream_custom_voice("Hi.", speaker="alice", language="english", chunk_frames=4, **{**greedy, "repetition_penalty": 1.2}))
+
+        assert len(model._private_schedulers) == 2
+        scheduler = next(iter(model._private_schedulers.values()))
+        assert scheduler._thread is not None and scheduler.stats["admitted"] == 2
+        assert all(torch.equal(torch.from_numpy(a), torch.from_numpy(b)) for (a, _), (b, _) in zip(first, second))
+    finally:
+        model.close()
+    assert not model._private_schedulers and scheduler._thread is None
@@ -0,0 +1,43 @@
+import pytest
+import torch
+
+
+def _prefix(model, batch_size=2):
+    talker = model.talker
+    torch.manual_seed(11)
+    past_hidden = torch.randn(batch_size, 1, talker.config.hidden_size)
+    first_codes = torch.randint(0, 1000, (batch_size, 1))
+    return torch.cat((past_hidden, talker.get_input_embeddings()(first_codes)), dim=1)
+
+
+@pytest.mark.parametrize(
+    "sampling",
+    [
+        dict(do_sample=False),
+        dict(do_sample=True, top_k=50, top_p=1.0, temperature=0.9),
+        dict(do_sample=True, top_k=8, top_p=0.7, temperature=1.3),
+    ],
+)
+def test_decode_residual_codes_matches_generate(tiny_tts_model, sampling):
+    predictor = tiny_tts_model.talker.code_predictor
+    inputs_embeds = _prefix(tiny_tts_model)
+
+    torch.manual_seed(0)
+    expected = predictor.generate(
+        inputs_embeds=inputs_embeds, max_new_tokens=predictor.config.num_code_groups - 1, **sampling
+    )
+    torch.manual_seed(0)
+    codes = predictor.decode_residual_codes(inputs_embeds, **sampling)
+    assert torch.equal(codes, expected)
+
+
+def test_decode_residual_codes_sums_embeddings_in_place(tiny_tts_model):
+    predictor = tiny_tts_model.talker.code_predictor
+    inputs_embeds = _prefix(tiny_tts_model)
+    running = inputs_embeds[:, 1:].clone()
+
+    codes = predictor.decode_residual_codes(inputs_embeds, codec_embeds_sum=running, do_sample=False)
+    expected = inputs_embeds[:, 1:] + sum(
+        predictor.get_input_embeddings()[i](codes[:, i : i + 1]) for i in range(codes.shape[1])
+    )
+    torch.testing.assert_close(running, expected)
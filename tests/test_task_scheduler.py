@@ -0,0 +1,126 @@
+import threading
+import time
+
+from backend.task_manager import TaskManager, TaskStatus
+
+
+class Gate:
+    """Task body that records its start order and blocks until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+
+    def __call__(self, task_id, label):
+        self.started.append(label)
+        self.release.wait(10)
+        return label
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_higher_priority_classes_start_first_within_limits():
+    tm = TaskManager(class_limits={"segment": 1, "podcast": 1, "batch": 1}, max_running=1)
+    gate = Gate()
+    blocker = tm.create_task("batch_s2s")
+    tm.submit(blocker, gate, "blocker")
+    _wait_for(lambda: gate.started == ["blocker"])
+
+    futures = [tm.submit(tm.create_task(t), gate, t) for t in ("video_generation", "podcast_generation", "segment_generation")]
+    preview = tm.schedule("preview", lambda: "preview")
+    assert preview.result(timeout=5) == "preview"  # previews do not wait for the global limit
+    assert gate.started == ["blocker"]
+
+    gate.release.set()
+    for f in futures:
+        f.result(timeout=5)
+    assert gate.started == ["blocker", "segment_generation", "podcast_generation", "video_generation"]
+
+
+def test_clients_share_a_class_by_weight():
+    tm = TaskManager(class_limits={"segment": 1}, client_weights={"studio": 2})
+    gate = Gate()
+    tm.submit(tm.create_task("segment_generation"), gate, "blocker")
+    _wait_for(lambda: gate.started == ["blocker"])
+
+    # A bulk client queues first, but does not hold everyone else back until its backlog drains
+    futures = [tm.submit(tm.create_task("segment_generation"), gate, f"bulk{i}", client="bulk") for i in range(4)]
+    futures += [tm.submit(tm.create_task("segment_generation"), gate, f"studio{i}", client="studio") for i in range(4)]
+    gate.release.set()
+    for f in futures:
+        f.result(timeout=5)
+    assert gate.started[1:] == ["studio0", "bulk0", "studio1", "studio2", "bulk1", "studio3", "bulk2", "bulk3"]
+
+
+def test_cancelled_queued_tasks_never_start_and_queue_info_tracks_position():
+    tm = TaskManager(class_limits={"batch": 1})
+    gate = Gate()
+    running = tm.create_task("batch_s2s")
+    tm.submit(running, gate, "running", cost=2)
+    _wait_for(lambda: gate.started == ["running"])
+    cancelled, queued = tm.create_task("batch_s2s"), tm.create_task("batch_s2s")
+    cancelled_future = tm.submit(cancelled, gate, "cancelled")
+    tm.submit(queued, gate, "queued", cost=3)
+
+    assert tm.queue_info(running)["queue_position"] == 0
+    assert tm.queue_info(queued) == {"queue_position": 2, "eta_seconds": None}  # no run time history yet
+    assert tm.cancel_task(cancelled)
+    assert tm.queue_info(queued)["queue_position"] == 1
+
+    tm._unit_seconds["batch_s2s"] = 10.0
+    info = tm.queue_info(queued)
+    assert info["queue_position"] == 1 and 49.0 <= info["eta_seconds"] <= 50.0  # ~20s left running + 3 units
+
+    gate.release.set()
+    _wait_for(lambda: tm.queue_info(queued)["queue_position"] is None)
+    assert cancelled_future.cancelled()
+    assert gate.started == ["running", "queued"]
+    assert tm.get_task(cancelled)["status"] == TaskStatus.CANCELLED
+
+
+def test_worker_pool_receives_synthesis_in_scheduler_order(monkeypatch, real_model_modules):
+    from concurrent.futures import Future
+    from types import SimpleNamespace
+
+    import numpy as np
+    from backend import server_state
+    from backend.api import generation
+    from backend.api.schemas import PodcastRequest
+
+    class FakePool:
+        submitted = []
+
+        def submit(self, method, kwargs, model_types=(), affinity=None, wait=0):
+            self.submitted.append(kwargs["text"])
+            future = Future()
+            future.set_result((np.zeros(10, dtype=np.float32), 24000))
+            return future
+
+    tm = TaskManager(class_limits={"segment": 1}, client_weights={"studio": 2})
+    monkeypatch.setattr(server_state, "task_manager", tm)
+    monkeypatch.setattr(server_state, "worker_pool", FakePool())
+    monkeypatch.setattr(server_state, "engine", SimpleNamespace(_get_model_type_for_profile=lambda p: "CustomVoice"))
+    monkeypatch.setattr(generation, "result_spool", SimpleNamespace(put_wav=lambda task_id, wav, sr: {"path": task_id}))
+
+    gate = Gate()
+    tm.submit(tm.create_task("segment_generation"), gate, "blocker")
+    _wait_for(lambda: gate.started == ["blocker"])
+
+    futures = []
+    for client, n in (("bulk", 2), ("studio", 2)):
+        for i in range(n):
+            request = PodcastRequest(profiles={"host": {"role": "host", "type": "preset", "value": "Ryan"}},
+                                     script=[{"role": "host", "text": f"{client}{i}"}])
+            task_id = tm.create_task("segment_generation")
+            futures.append(tm.submit(task_id, generation.run_synthesis_task, False, request, client=client))
+    assert FakePool.submitted == []  # nothing reaches the workers before the scheduler dispatches it
+
+    gate.release.set()
+    for f in futures:
+        f.result(timeout=5)
+    assert FakePool.submitted == ["studio0", "bulk0", "studio1", "bulk1"]
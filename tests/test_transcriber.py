@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+
+import pytest
+
+from backend.engine_modules.transcriber import SAMPLE_RATE, Transcriber, speech_windows
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _write(path, audio):
+    import soundfile as sf  # the real module; some test modules replace it at import time
+    sf.write(str(path), audio, SAMPLE_RATE)
+
+
+def _tone(seconds):
+    return (0.3 * np.sin(np.arange(int(SAMPLE_RATE * seconds)) * 0.1)).astype(np.float32)
+
+
+def _silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), dtype=np.float32)
+
+
+def test_speech_windows_skip_silence_and_stay_within_30s():
+    audio = np.concatenate([_silence(2), _tone(10), _silence(5), _tone(25), _silence(3), _tone(40)])
+    windows = speech_windows(audio)
+
+    assert all(0 < end - start <= 30 * SAMPLE_RATE for start, end in windows)
+    assert windows[0][0] > 1.5 * SAMPLE_RATE  # leading silence is not decoded
+    covered = sum(end - start for start, end in windows)
+    assert covered < len(audio) - 8 * SAMPLE_RATE
+    assert speech_windows(_silence(10)) == []
+
+
+class RecordingTranscriber(Transcriber):
+    def __init__(self):
+        super().__init__(batch_size=8)
+        self.batches = []
+
+    def _decode_batch(self, audios):
+        self.batches.append(len(audios))
+        return [(f"words{len(a) // SAMPLE_RATE}", "en", [(0.0, 1.0, f"words{len(a) // SAMPLE_RATE}")]) for a in audios]
+
+
+def test_files_and_windows_share_decode_passes(tmp_path):
+    paths = []
+    for i, audio in enumerate([_tone(3), _tone(4), np.concatenate([_tone(20), _silence(4), _tone(20)]), _silence(3)]):
+        paths.append(str(tmp_path / f"clip{i}.wav"))
+        _write(paths[-1], audio)
+    service = RecordingTranscriber()
+
+    results = service.transcribe(paths)
+
+    assert service.batches == [4]  # four speech windows from three files, one pass; the silent file adds none
+    assert results[2]["text"].count("words") == 2 and results[2]["segments"][1]["start"] > 20
+    assert results[3] == {"text": "", "language": "unknown", "segments": []}
+
+
+def test_engine_batch_keeps_the_transcription_cache_contract(tmp_path, monkeypatch):
+    from backend.podcast_engine import PodcastEngine
+
+    path = tmp_path / "clip.wav"
+    _write(path, _tone(2))
+    service = RecordingTranscriber()
+    monkeypatch.setattr("backend.podcast_engine.transcriber", service)
+    engine = PodcastEngine()
+    monkeypatch.setattr(engine, "_resolve_paths", lambda p: [Path(p)])
+
+    first = engine.transcribe_batch([str(path), str(path)])
+    assert first[0] is first[1] and service.batches == [1]
+
+    stat = path.stat()
+    assert engine.transcription_cache[f"{path}:{stat.st_size}:{stat.st_mtime}"] is first[0]
+    assert engine.transcribe_audio(str(path)) is first[0] and service.batches == [1]
@@ -19,22 +19,20 @@ def test_transcribe_video_handling(engine):
     with patch.object(engine, '_resolve_paths') as mock_resolve, \
          patch('backend.video_engine.VideoEngine.is_video') as mock_is_video, \
          patch('backend.video_engine.VideoEngine.extract_audio') as mock_extract, \
-         patch('whisper.load_model') as mock_whisper:
+         patch('backend.engine_modules.transcriber.transcriber.transcribe') as mock_transcribe:
 
         mock_resolve.return_value = [Path("/app/uploads/test.mp4")]
         mock_is_video.return_value = True
         mock_extract.return_value = "/app/projects/videos/ext_audio.wav"
 
-        mock_model = MagicMock()
-        mock_model.transcribe.return_value = {"text": "Hello world"}
-        mock_whisper.return_value = mock_model
+        mock_transcribe.return_value = [{"text": "Hello world"}]
 
         result = engine.transcribe_audio("test.mp4")
 
         assert result["text"] == "Hello world"
         mock_is_video.assert_called_once()
         mock_extract.assert_called_once_with(str(Path("/app/uploads/test.mp4")))
-        mock_model.transcribe.assert_called_once_with("/app/projects/videos/ext_audio.wav")
+        mock_transcribe.assert_called_once_with(["/app/projects/videos/ext_audio.wav"])
 
 def test_dub_video_handling(engine):
     """Test that dub_audio handles video files through the pipeline."""
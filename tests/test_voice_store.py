@@ -0,0 +1,106 @@
+import os
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+
+from backend.engine_modules.voice_store import VoicePromptStore
+from backend.qwen_tts.inference.qwen3_tts_model import VoiceClonePromptItem
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _prompt(icl=False):
+    return [VoiceClonePromptItem(
+        ref_code=torch.randint(0, 2048, (40, 16)) if icl else None,
+        ref_spk_embedding=torch.randn(1024),
+        x_vector_only_mode=not icl,
+        icl_mode=icl,
+        ref_text="Hello there." if icl else None,
+    )]
+
+
+def _wav(path, seed):
+    sf.write(str(path), np.random.default_rng(seed).uniform(-0.5, 0.5, 24000 * 3), 24000)
+    return str(path)
+
+
+def test_roundtrip_and_sharing_across_instances(tmp_path):
+    store = VoicePromptStore(tmp_path, max_bytes=1 << 20)
+    xvec, icl = _prompt(), _prompt(icl=True)
+    store.put("a", xvec)
+    store.put("b", icl)
+
+    # A second instance (e.g. another worker process) reads the same files
+    other = VoicePromptStore(tmp_path, max_bytes=1 << 20)
+    got = other.get("a")[0]
+    assert torch.equal(got.ref_spk_embedding, xvec[0].ref_spk_embedding)
+    assert got.ref_code is None and got.x_vector_only_mode and not got.icl_mode
+
+    got = other.get("b")[0]
+    assert torch.equal(got.ref_code, icl[0].ref_code)
+    assert got.icl_mode and got.ref_text == "Hello there."
+    assert other.get("missing") is None
+    assert (other.hits, other.misses) == (2, 1)
+
+
+def test_key_depends_on_content_mode_and_model(tmp_path):
+    store = VoicePromptStore(tmp_path / "store")
+    model_a, model_b = MagicMock(), MagicMock()
+    model_a.model.config._name_or_path = "Qwen/Qwen3-TTS-12Hz-1.7B-Base"
+    model_b.model.config._name_or_path = "Qwen/Qwen3-TTS-12Hz-0.6B-Base"
+
+    ref = _wav(tmp_path / "ref.wav", 0)
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(open(ref, "rb").read())
+
+    key = store.key(ref, model_a)
+    assert store.key(str(copy), model_a) == key  # same content, different path
+    assert store.key(ref, model_b) != key
+    assert store.key(ref, model_a, ref_text="Hi") != key
+    assert store.key(_wav(tmp_path / "other.wav", 1), model_a) != key
+
+
+def test_lru_eviction_by_size(tmp_path):
+    store = VoicePromptStore(tmp_path, max_bytes=1 << 20)
+    for i, key in enumerate("abc"):
+        store.put(key, _prompt())
+        os.utime(store._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+    entry_size = store._path("a").stat().st_size
+
+    assert store.get("a") is not None  # "a" becomes most recently used
+    store.max_bytes = entry_size * 3
+    store.put("d", _prompt())
+
+    assert store.get("b") is None
+    assert all(store.get(k) is not None for k in "acd")
+    assert store.stats()["entries"] == 3
+
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    store = VoicePromptStore(tmp_path)
+    store._path("bad").write_bytes(b"not a safetensors file")
+    assert store.get("bad") is None
+    assert not store._path("bad").exists()
+
+
+def test_synthesizer_reuses_stored_prompt(tmp_path, monkeypatch):
+    from backend.engine_modules import synthesizer as synth_mod
+
+    monkeypatch.setattr(synth_mod, "voice_prompt_store", VoicePromptStore(tmp_path / "store"))
+    ref = _wav(tmp_path / "ref.wav", 2)
+    model = MagicMock()
+    model.create_voice_clone_prompt.return_value = _prompt()
+
+    def make():
+        return synth_mod.VoiceSynthesizer(tmp_path, {}, {}, {}, {}, {}, {}, {}, lambda p: [tmp_path / p], None)
+
+    first = make().get_speaker_embedding({"type": "clone", "value": "ref.wav"}, model=model)
+    # A fresh synthesizer (empty in-memory caches, as after a restart) hits the persistent store
+    second = make().get_speaker_embedding({"type": "clone", "value": "ref.wav"}, model=model)
+
+    assert model.create_voice_clone_prompt.call_count == 1
+    assert torch.equal(first, second)
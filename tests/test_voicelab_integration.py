@@ -39,9 +39,7 @@ from backend import server_state
 server_state.engine = mock_engine
 
 # Now we can import the app
-with patch("backend.api.generation.numpy_to_wav_bytes") as mock_wav_helper:
-    mock_wav_helper.return_value = io.BytesIO(b"RIFF_WAVE_DATA")
-    from server import app
+from server import app
 
 @pytest_asyncio.fixture
 async def client():
@@ -65,6 +63,7 @@ async def test_stream_synthesis_integration(client):
     response = await client.post("/api/generate/stream", json=payload)
     assert response.status_code == 200
     assert response.headers["content-type"] == "audio/wav"
+    assert response.content.count(b"RIFF") == 1 and len(response.content) == 44 + 2 * 1000
 
 @pytest.mark.asyncio
 async def test_video_suggestion_integration(client):
@@ -132,6 +131,7 @@ async def test_clone_preview_with_ref_text(client):
     response = await client.post("/api/voice/preview", json=payload)
     assert response.status_code == 200
     assert response.headers["content-type"] == "audio/wav"
+    assert response.content.count(b"RIFF") == 1 and len(response.content) == 44 + 2 * 1000
     
     # Verify engine was called with ref_text
     mock_engine.generate_segment.assert_called()
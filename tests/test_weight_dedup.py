@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _clone(model, tokenizer_model):
+    copy = type(model)(model.config)
+    copy.load_state_dict(model.state_dict())
+    copy.speech_tokenizer = SimpleNamespace(model=tokenizer_model)
+    return copy.eval()
+
+
+def test_identical_submodules_share_tensors(tiny_tts_model):
+    import torch
+    from backend.qwen_tts.core.models.weight_dedup import WeightDeduplicator
+
+    torch.manual_seed(0)
+    tokenizer = torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.BatchNorm1d(8))
+    tiny_tts_model.speech_tokenizer = SimpleNamespace(model=tokenizer)
+    twin = _clone(tiny_tts_model, torch.nn.Sequential(torch.nn.Linear(8, 8), torch.nn.BatchNorm1d(8)))
+    twin.speech_tokenizer.model.load_state_dict(tokenizer.state_dict())
+
+    dedup = WeightDeduplicator()
+    assert dedup.deduplicate(tiny_tts_model) == {}
+    assert not dedup.digests  # nothing to compare against yet, so nothing is hashed
+    saved = dedup.deduplicate(twin)
+
+    embedding = tiny_tts_model.talker.get_text_embeddings().weight
+    assert saved == {"speech_tokenizer": (8 * 8 + 8 + 4 * 8) * 4 + 8, "text_embedding": embedding.numel() * 4}
+    assert dedup.bytes_saved == sum(saved.values())
+    assert twin.talker.get_text_embeddings().weight.data_ptr() == embedding.data_ptr()
+    assert twin.speech_tokenizer.model[1].running_mean is tokenizer[1].running_mean
+    assert dedup.deduplicate(twin) == {}  # already shared
+    assert dedup.bytes_saved == sum(saved.values())
+
+    # Moving one model gives it its own copy instead of moving the other's weights
+    tiny_tts_model.talker.to(torch.float64)
+    assert twin.talker.get_text_embeddings().weight.dtype == torch.float32
+
+
+def test_different_weights_stay_separate(tiny_tts_model):
+    import torch
+    from backend.qwen_tts.core.models.weight_dedup import WeightDeduplicator
+
+    other = _clone(tiny_tts_model, None)
+    with torch.no_grad():
+        other.talker.get_text_embeddings().weight[0, 0] += 1
+
+    dedup = WeightDeduplicator()
+    dedup.deduplicate(tiny_tts_model)
+    assert dedup.deduplicate(other) == {}
+    assert other.talker.get_text_embeddings().weight.data_ptr() != tiny_tts_model.talker.get_text_embeddings().weight.data_ptr()
+
+
+def test_forgetting_an_evicted_model_stops_counting_its_savings(tiny_tts_model):
+    from backend.qwen_tts.core.models.weight_dedup import WeightDeduplicator
+
+    twin = _clone(tiny_tts_model, None)
+    third = _clone(tiny_tts_model, None)
+    dedup = WeightDeduplicator()
+    for model in (tiny_tts_model, twin, third):
+        dedup.deduplicate(model)
+    embedding_bytes = tiny_tts_model.talker.get_text_embeddings().weight.numel() * 4
+    assert dedup.bytes_saved == 2 * embedding_bytes
+
+    # The first model was the source of the shared weights; the other two still share them
+    assert dedup.forget(tiny_tts_model) == embedding_bytes
+    assert dedup.bytes_saved == embedding_bytes
+    assert dedup.forget(twin) == embedding_bytes and dedup.bytes_saved == 0
+    assert dedup.deduplicate(tiny_tts_model) == {}  # re-registered: shares with `third` again
+    assert dedup.bytes_saved == embedding_bytes
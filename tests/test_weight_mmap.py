@@ -0,0 +1,119 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures("real_model_modules")
+
+
+def _save_checkpoint(model, directory):
+    from safetensors.torch import save_file
+
+    directory.mkdir(exist_ok=True)
+    save_file({k: v.contiguous() for k, v in model.state_dict().items()}, str(directory / "model.safetensors"))
+    return directory
+
+
+def test_mmap_safetensors_matches_safetensors_reader(tmp_path):
+    import torch
+    from safetensors.torch import load_file, save_file
+    from backend.qwen_tts.core.models.weight_mmap import mmap_safetensors
+
+    tensors = {
+        "a": torch.randn(3, 5),
+        "b": torch.arange(7, dtype=torch.int64),
+        "c": torch.randn(4).to(torch.bfloat16),
+        "d": torch.tensor([True, False]),
+    }
+    save_file(tensors, str(tmp_path / "w.safetensors"))
+
+    mapped = mmap_safetensors(tmp_path / "w.safetensors")
+    reference = load_file(str(tmp_path / "w.safetensors"))
+    assert mapped.keys() == reference.keys()
+    for name, tensor in reference.items():
+        assert mapped[name].dtype == tensor.dtype and torch.equal(mapped[name], tensor)
+    # Views into one mapping rather than per-tensor copies
+    assert mapped["a"].untyped_storage().data_ptr() == mapped["b"].untyped_storage().data_ptr()
+
+
+def test_mapped_model_matches_original(tiny_tts_model, tmp_path):
+    import torch
+    from backend.qwen_tts.core.models.weight_mmap import load_mmap_pretrained
+
+    checkpoint = _save_checkpoint(tiny_tts_model, tmp_path / "ckpt")
+    model = load_mmap_pretrained(checkpoint, type(tiny_tts_model), tiny_tts_model.config)
+
+    reference = tiny_tts_model.state_dict()
+    assert model.state_dict().keys() == reference.keys()
+    assert all(torch.equal(v, reference[k]) for k, v in model.state_dict().items())
+    assert not model.training
+    weight = model.talker.model.layers[0].mlp.down_proj.weight
+    assert weight.untyped_storage().nbytes() > weight.numel() * weight.element_size()  # a view, not a copy
+
+    embeds = torch.randn(1, 6, 32)
+    with torch.no_grad():
+        expected = tiny_tts_model.talker.model(inputs_embeds=embeds).last_hidden_state
+        torch.testing.assert_close(model.talker.model(inputs_embeds=embeds).last_hidden_state, expected)
+
+
+def test_mapped_model_converts_dtype_and_rejects_missing_weights(tiny_tts_model, tmp_path):
+    import torch
+    from safetensors.torch import save_file
+    from backend.qwen_tts.core.models.weight_mmap import load_mmap_pretrained
+
+    checkpoint = _save_checkpoint(tiny_tts_model, tmp_path / "ckpt")
+    model = load_mmap_pretrained(checkpoint, type(tiny_tts_model), tiny_tts_model.config, dtype=torch.bfloat16)
+    assert model.talker.codec_head.weight.dtype == torch.bfloat16
+
+    state = {k: v.contiguous() for k, v in tiny_tts_model.state_dict().items() if "codec_head" not in k}
+    save_file(state, str(checkpoint / "model.safetensors"))
+    with pytest.raises(ValueError, match="missing"):
+        load_mmap_pretrained(checkpoint, type(tiny_tts_model), tiny_tts_model.config)
+
+
+def test_mmap_load_kwargs_follow_from_pretrained():
+    import torch
+    from backend.qwen_tts.core.models.weight_mmap import mmap_load_kwargs
+
+    assert mmap_load_kwargs({"torch_dtype": "float16", "device_map": "cpu"}) == {
+        "dtype": torch.float16, "device": "cpu", "attn_implementation": None,
+    }
+    assert mmap_load_kwargs({"dtype": "auto"})["dtype"] is None
+    with pytest.raises(ValueError):
+        mmap_load_kwargs({"device_map": "auto"})
+    with pytest.raises(ValueError):
+        mmap_load_kwargs({"device_map": {"": 0}})
+
+
+def test_mapped_model_rejects_keys_that_need_converting(tiny_tts_model, tmp_path):
+    from safetensors.torch import save_file
+    from backend.qwen_tts.core.models.weight_mmap import load_mmap_pretrained
+
+    checkpoint = _save_checkpoint(tiny_tts_model, tmp_path / "ckpt")
+    state = {f"model.{k}": v.contiguous() for k, v in tiny_tts_model.state_dict().items()}
+    save_file(state, str(checkpoint / "model.safetensors"))
+    with pytest.raises(ValueError, match="does not define"):
+        load_mmap_pretrained(checkpoint, type(tiny_tts_model), tiny_tts_model.config)
+
+
+def test_assign_weights_rejects_missing_buffers():
+    import torch
+    from accelerate import init_empty_weights
+    from backend.qwen_tts.core.models.weight_mmap import assign_weights
+
+    class Scaled(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.linear = torch.nn.Linear(2, 2)
+            self.register_buffer("scale", torch.ones(2))
+
+        def tie_weights(self):
+            pass
+
+    with init_empty_weights():
+        model = Scaled()
+    state = {k: torch.zeros_like(v, device="cpu") for k, v in Scaled().state_dict().items()}
+    assign_weights(model, state)
+    assert torch.equal(model.scale, torch.zeros(2))
+
+    with init_empty_weights():
+        model = Scaled()
+    with pytest.raises(ValueError, match="missing 1 weights \\(e.g. scale\\)"):
+        assign_weights(model, {k: v for k, v in state.items() if k != "scale"})
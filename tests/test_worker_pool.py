@@ -0,0 +1,115 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from backend.worker_pool import WorkerPool, WorkerPoolFull
+
+
+class FakeEngine:
+    """Picklable stand-in for PodcastEngine, built inside each worker process."""
+
+    def __init__(self):
+        self.loaded = set()
+
+    def resident_model_types(self):
+        return sorted(self.loaded)
+
+    def generate_segment(self, text, model_type="Base", delay=0.0):
+        time.sleep(delay)
+        self.loaded.add(model_type)
+        return np.full(len(text), os.getpid(), dtype=np.float32), 24000
+
+    def generate_podcast(self, script):
+        return {"waveform": np.arange(len(script), dtype=np.int16), "sample_rate": 24000, "segments": [{"text": t} for t in script]}
+
+    def fail(self):
+        raise ValueError("bad profile")
+
+    def crash(self):
+        os._exit(3)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(num_workers, queue_size=2):
+        pool = WorkerPool(num_workers, devices=["cpu"], queue_size=queue_size, engine_factory=FakeEngine)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_results_come_back_through_shared_memory(make_pool):
+    pool = make_pool(1)
+    wav, sr = pool.submit("generate_segment", {"text": "hello"}).result(timeout=60)
+    assert sr == 24000 and wav.shape == (5,) and wav[0] != os.getpid()
+
+    result = pool.submit("generate_podcast", {"script": ["a", "b", "c"]}).result(timeout=60)
+    assert result["waveform"].dtype == np.int16 and list(result["waveform"]) == [0, 1, 2]
+    assert result["segments"][2] == {"text": "c"}
+
+    with pytest.raises(RuntimeError, match="ValueError: bad profile"):
+        pool.submit("fail", {}).result(timeout=60)
+
+
+def test_jobs_go_to_the_worker_with_their_model_resident(make_pool):
+    pool = make_pool(2)
+    base_pid = pool.submit("generate_segment", {"text": "x", "model_type": "Base"}, ["Base"]).result(timeout=60)[0][0]
+    design_pid = pool.submit("generate_segment", {"text": "x", "model_type": "VoiceDesign"}, ["VoiceDesign"]).result(timeout=60)[0][0]
+    assert pool.stats()["workers"][0]["models"] == ["Base"]
+
+    futures = [pool.submit("generate_segment", {"text": "x", "model_type": t}, [t]) for t in ("VoiceDesign", "Base")]
+    assert [f.result(timeout=60)[0][0] for f in futures] == [design_pid, base_pid]
+
+
+def test_full_queues_reject_jobs_until_one_finishes(make_pool):
+    pool = make_pool(1, queue_size=1)
+    slow = pool.submit("generate_segment", {"text": "x", "delay": 1.0})
+    with pytest.raises(WorkerPoolFull):
+        pool.submit("generate_segment", {"text": "y"})
+    slow.result(timeout=60)
+    assert pool.submit("generate_segment", {"text": "y"}).result(timeout=60)[1] == 24000
+
+
+def test_submit_can_wait_for_a_free_slot(make_pool):
+    pool = make_pool(1, queue_size=1)
+    slow = pool.submit("generate_segment", {"text": "x", "delay": 1.0})
+    with pytest.raises(WorkerPoolFull):
+        pool.submit("generate_segment", {"text": "y"}, wait=0.1)
+    waited = pool.submit("generate_segment", {"text": "y"}, wait=None)  # returns once the slow job's slot frees
+    assert waited.result(timeout=60)[1] == 24000 and slow.result(timeout=60)[1] == 24000
+
+
+def test_crashed_worker_fails_its_jobs_and_is_replaced(make_pool):
+    pool = make_pool(1)
+    with pytest.raises(RuntimeError, match="exited"):
+        pool.submit("crash", {}).result(timeout=60)
+    assert pool.submit("generate_segment", {"text": "ok"}).result(timeout=60)[1] == 24000
+
+
+def test_crashed_worker_is_noticed_while_others_keep_returning_results(make_pool):
+    pool = make_pool(2, queue_size=4)
+    crashed = pool.submit("crash", {})
+    deadline = time.monotonic() + 10
+    while not crashed.done() and time.monotonic() < deadline:
+        # Results keep arriving faster than the collector's queue timeout
+        pool.submit("generate_segment", {"text": "x", "delay": 0.2}, ["Base"]).result(timeout=60)
+    with pytest.raises(RuntimeError, match="exited"):
+        crashed.result(timeout=0)
+
+
+def test_render_sessions_stay_on_one_worker(make_pool):
+    pool = make_pool(2)
+    session_pid = pool.submit("generate_segment", {"text": "x", "model_type": "Base"}, ["Base"], affinity="s1").result(timeout=60)[0][0]
+    design_pid = pool.submit("generate_segment", {"text": "x", "model_type": "VoiceDesign"}, ["VoiceDesign"]).result(timeout=60)[0][0]
+    assert design_pid != session_pid
+
+    # Without the session the VoiceDesign worker would be chosen
+    pinned = pool.submit("generate_segment", {"text": "x", "model_type": "VoiceDesign"}, ["VoiceDesign"], affinity="s1")
+    assert pinned.result(timeout=60)[0][0] == session_pid
@@ -0,0 +1,19 @@
+import io
+import os
+import zipfile
+
+from backend.utils.zip_stream import stream_zip
+
+
+def test_archive_is_streamed_in_chunks_and_reads_back(tmp_path):
+    big, small = tmp_path / "video.mp4", tmp_path / "project.json"
+    big.write_bytes(os.urandom(300_000))
+    small.write_text('{"blocks": []}')
+
+    parts = list(stream_zip([(small, "p.json"), (big, "p.mp4")], chunk_size=64 * 1024))
+
+    assert sum(1 for p in parts if p) > 4  # compressed data leaves before the archive is finished
+    assert max(len(p) for p in parts) < 150_000
+    with zipfile.ZipFile(io.BytesIO(b"".join(parts))) as archive:
+        assert archive.testzip() is None
+        assert archive.read("p.mp4") == big.read_bytes() and archive.read("p.json") == small.read_bytes()
@@ -0,0 +1,128 @@
+import time
+import json
+import sys
+import argparse
+from pathlib import Path
+from unittest.mock import patch
+
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from transformers.cache_utils import DynamicLayer, StaticLayer
+
+from backend.qwen_tts.core.models.configuration_qwen3_tts import Qwen3TTSConfig
+from backend.qwen_tts.core.models.modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
+
+# Small random model (same layout as the real CustomVoice checkpoints) so the benchmark runs anywhere.
+RANDOM_CONFIG = dict(
+    talker_config=dict(
+        vocab_size=3072, hidden_size=256, intermediate_size=768, num_hidden_layers=4,
+        num_attention_heads=8, num_key_value_heads=2, head_dim=32,
+        text_vocab_size=1024, text_hidden_size=256, num_code_groups=16,
+        codec_eos_token_id=2150, codec_think_id=2154, codec_nothink_id=2155, codec_think_bos_id=2156,
+        codec_think_eos_id=2157, codec_pad_id=2148, codec_bos_id=2149,
+        spk_id={"ryan": 3000}, spk_is_dialect={"ryan": False}, codec_language_id={"english": 2050},
+        rope_scaling={"rope_type": "default", "mrope_section": [4, 6, 6], "interleaved": False},
+        code_predictor_config=dict(
+            vocab_size=2048, hidden_size=128, intermediate_size=384, num_hidden_layers=2,
+            num_attention_heads=4, num_key_value_heads=2, head_dim=32, num_code_groups=16,
+        ),
+    ),
+    tts_model_type="custom_voice",
+    im_start_token_id=1000, im_end_token_id=1001,
+    tts_pad_token_id=1002, tts_bos_token_id=1003, tts_eos_token_id=1004,
+)
+
+
+class KVAllocationCounter:
+    """Counts key/value buffer allocations made by HF cache layers (DynamicLayer grows by torch.cat)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        counter = self
+        dynamic_update = DynamicLayer.update
+        static_init = StaticLayer.lazy_initialization
+
+        def counted_update(layer, *args, **kwargs):
+            counter.count += 2  # keys + values re-concatenated
+            return dynamic_update(layer, *args, **kwargs)
+
+        def counted_init(layer, *args, **kwargs):
+            counter.count += 2
+            return static_init(layer, *args, **kwargs)
+
+        self._patches = [
+            patch.object(DynamicLayer, "update", counted_update),
+            patch.object(StaticLayer, "lazy_initialization", counted_init),
+        ]
+        for p in self._patches:
+            p.start()
+        return self
+
+    def __exit__(self, *exc):
+        for p in self._patches:
+            p.stop()
+
+
+def load_model(use_real: bool):
+    if use_real:
+        from backend.model_loader import get_model
+        return get_model("CustomVoice").model
+    torch.manual_seed(0)
+    return Qwen3TTSForConditionalGeneration(Qwen3TTSConfig(**RANDOM_CONFIG)).eval()
+
+
+def run_benchmark(use_real=False, batch_size=2, max_new_tokens=64, runs=3):
+    model = load_model(use_real)
+    device = model.talker.device
+    input_ids = [torch.randint(0, 900, (1, 24), device=device) for _ in range(batch_size)]
+    speaker = next(iter(model.config.talker_config.spk_id))
+    kwargs = dict(
+        input_ids=input_ids,
+        languages=["auto"] * batch_size,
+        speakers=[speaker] * batch_size,
+        max_new_tokens=max_new_tokens,
+        do_sample=False,
+        subtalker_dosample=False,
+    )
+
+    results = []
+    print(f"\n{'Mode':<8} | {'KV allocs':<10} | {'Frames':<7} | {'Step (ms)':<10} | {'Total (s)':<9}")
+    print("-" * 55)
+    for mode, static in (("dynamic", False), ("static", True)):
+        # Warm up (also allocates the persistent static buffers once)
+        model.generate(use_static_cache=static, **kwargs)
+        for _ in range(runs):
+            with KVAllocationCounter() as counter:
+                start = time.perf_counter()
+                codes, _ = model.generate(use_static_cache=static, **kwargs)
+                elapsed = time.perf_counter() - start
+            frames = max(c.shape[0] for c in codes)
+            step_ms = elapsed / max(frames, 1) * 1000
+            results.append({
+                "mode": mode,
+                "kv_allocations": counter.count,
+                "frames": frames,
+                "step_ms": step_ms,
+                "elapsed": elapsed,
+                "timestamp": time.time(),
+            })
+            print(f"{mode:<8} | {counter.count:>10} | {frames:>7} | {step_ms:>9.2f} | {elapsed:>8.2f}")
+
+    output_path = Path(__file__).resolve().parent / "benchmark_kv_cache_results.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dynamic vs static KV cache for talker + sub-talker")
+    parser.add_argument("--real", action="store_true", help="Use the installed CustomVoice model instead of a random one")
+    parser.add_argument("--batch-size", type=int, default=2)
+    parser.add_argument("--max-new-tokens", type=int, default=64)
+    args = parser.parse_args()
+    run_benchmark(use_real=args.real, batch_size=args.batch_size, max_new_tokens=args.max_new_tokens)
@@ -0,0 +1,101 @@
+import time
+import json
+import sys
+import argparse
+from pathlib import Path
+
+import torch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from backend.qwen_tts.core.models.quantization import QUANT_MODES, codec_token_agreement, log_mel_distance, quantize_talker
+
+# Calibration sentences: short, long, numbers and punctuation so agreement is not measured on one prosody only
+CALIBRATION_TEXTS = [
+    "Hello, and welcome back to the show.",
+    "The quarterly report shows revenue of 4.2 million dollars, up 12 percent from last year.",
+    "Wait... did you really just say that? I can't believe it!",
+    "In the beginning, the universe was created. This has made a lot of people very angry and been widely regarded as a bad move.",
+]
+
+
+def load_baseline(use_real: bool):
+    """fp32 wrapper for the installed CustomVoice checkpoint, or a small random core model with the same layout."""
+    if use_real:
+        from backend.config import MODELS, find_model_path
+        from backend.qwen_tts import Qwen3TTSModel
+
+        return Qwen3TTSModel.from_pretrained(
+            str(find_model_path(MODELS["CustomVoice_1.7B"])), device_map="cpu", torch_dtype=torch.float32, local_files_only=True
+        )
+    from benchmark_kv_cache import load_model
+
+    return load_model(use_real=False)
+
+
+def generate_codes(model, use_real: bool, max_new_tokens: int):
+    """Greedy codec tokens (and waveforms for the real model) for every calibration sentence."""
+    greedy = dict(do_sample=False, subtalker_dosample=False, max_new_tokens=max_new_tokens)
+    start = time.perf_counter()
+    if use_real:
+        gen_inputs = model._custom_voice_inputs(CALIBRATION_TEXTS, "Ryan", "English", None)
+        codes, _ = model.model.generate(**gen_inputs, **model._merge_generate_kwargs(**greedy))
+        wavs, sr = model.model.speech_tokenizer.decode([{"audio_codes": c} for c in codes])
+    else:
+        batch = len(CALIBRATION_TEXTS)
+        torch.manual_seed(0)
+        input_ids = [torch.randint(0, 900, (1, 8 + len(t) // 4)) for t in CALIBRATION_TEXTS]
+        codes, _ = model.generate(
+            input_ids=input_ids, languages=["auto"] * batch, speakers=["ryan"] * batch, **greedy
+        )
+        wavs, sr = None, None
+    elapsed = time.perf_counter() - start
+    frames = sum(c.shape[0] for c in codes)
+    return codes, wavs, sr, elapsed / max(frames, 1) * 1000
+
+
+def run_benchmark(use_real=False, max_new_tokens=256, group_size=32):
+    baseline = load_baseline(use_real)
+    core = baseline.model if use_real else baseline
+    ref_codes, ref_wavs, sr, ref_step = generate_codes(baseline, use_real, max_new_tokens)
+
+    results = [{"mode": "fp32", "agreement": 1.0, "mel_distance": 0.0, "step_ms": ref_step}]
+    print(f"\n{'Mode':<6} | {'Talker MB':<9} | {'Agreement':<9} | {'Mel dist':<8} | {'Step (ms)':<9}")
+    print("-" * 55)
+    print(f"{'fp32':<6} | {'':<9} | {1.0:>9.3f} | {0.0:>8.3f} | {ref_step:>9.2f}")
+    for mode in QUANT_MODES:
+        model = load_baseline(use_real)  # fresh fp32 weights (the config does not deep-copy)
+        stats = quantize_talker(model.model if use_real else model, mode=mode, group_size=group_size)
+        codes, wavs, _, step_ms = generate_codes(model, use_real, max_new_tokens)
+        agreement = codec_token_agreement(ref_codes, codes)
+        mel = (
+            sum(log_mel_distance(a, b, sr) for a, b in zip(ref_wavs, wavs)) / len(wavs) if wavs is not None else None
+        )
+        results.append({
+            "mode": mode,
+            "talker_mb_before": stats["bytes_before"] / 2**20,
+            "talker_mb_after": stats["bytes_after"] / 2**20,
+            "agreement": agreement,
+            "mel_distance": mel,
+            "step_ms": step_ms,
+            "timestamp": time.time(),
+        })
+        mel_str = f"{mel:>8.3f}" if mel is not None else f"{'n/a':>8}"
+        print(f"{mode:<6} | {stats['bytes_after'] / 2**20:>9.1f} | {agreement:>9.3f} | {mel_str} | {step_ms:>9.2f}")
+        del model
+    print(f"\nfp32 talker: {sum(p.numel() * p.element_size() for p in core.talker.parameters()) / 2**20:.1f} MB")
+
+    output_path = Path(__file__).resolve().parent / "benchmark_quantization_results.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Codec-token agreement and mel distance of int8/int4 talkers vs fp32")
+    parser.add_argument("--real", action="store_true", help="Use the installed CustomVoice model instead of a random one")
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    parser.add_argument("--group-size", type=int, default=32)
+    args = parser.parse_args()
+    run_benchmark(use_real=args.real, max_new_tokens=args.max_new_tokens, group_size=args.group_size)
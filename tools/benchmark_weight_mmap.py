@@ -0,0 +1,108 @@
+import gc
+import sys
+import time
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+import torch
+from accelerate import init_empty_weights
+from safetensors.torch import load_file, save_file
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from backend.qwen_tts.core.models.configuration_qwen3_tts import Qwen3TTSConfig
+from backend.qwen_tts.core.models.modeling_qwen3_tts import Qwen3TTSForConditionalGeneration
+from backend.qwen_tts.core.models.weight_mmap import assign_weights, load_mmap_pretrained
+
+from benchmark_kv_cache import RANDOM_CONFIG
+
+
+def save_random_checkpoint(directory: Path, dtype: torch.dtype) -> Path:
+    torch.manual_seed(0)
+    model = Qwen3TTSForConditionalGeneration(Qwen3TTSConfig(**RANDOM_CONFIG)).to(dtype).eval()
+    directory.mkdir()
+    save_file({k: v.contiguous() for k, v in model.state_dict().items()}, str(directory / "model.safetensors"))
+    return directory
+
+
+def read_load(model_dir: Path, config, dtype: torch.dtype):
+    """Read every shard into fresh memory and assign it to a meta skeleton: a lower bound of `from_pretrained`."""
+    with init_empty_weights():
+        model = Qwen3TTSForConditionalGeneration(config)
+    state = {}
+    for shard in sorted(model_dir.glob("*.safetensors")):
+        state.update(load_file(str(shard)))
+    assign_weights(model, state, dtype=dtype, device="cpu")
+    return model.eval()
+
+
+def mmap_load(model_dir: Path, config, dtype: torch.dtype):
+    return load_mmap_pretrained(model_dir, Qwen3TTSForConditionalGeneration, config, dtype=dtype, device="cpu")
+
+
+def mapped_fraction(model) -> float:
+    """Share of parameter bytes that are views into the checkpoint mapping rather than copies."""
+    total = mapped = 0
+    for param in model.parameters():
+        size = param.numel() * param.element_size()
+        total += size
+        if param.untyped_storage().nbytes() > size:
+            mapped += size
+    return mapped / max(total, 1)
+
+
+def time_loads(loader, model_dir: Path, config, dtype: torch.dtype, runs: int):
+    """Seconds of the first load and the median of `runs` warm reloads (page cache hot, as after eviction)."""
+    times, fraction = [], 0.0
+    for _ in range(runs + 1):
+        gc.collect()
+        start = time.perf_counter()
+        model = loader(model_dir, config, dtype)
+        times.append(time.perf_counter() - start)
+        fraction = mapped_fraction(model)
+        del model
+    warm = sorted(times[1:])
+    return times[0], warm[len(warm) // 2], fraction
+
+
+def run_benchmark(model_dir=None, runs=5):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        if model_dir is not None:
+            config = Qwen3TTSConfig.from_pretrained(model_dir)
+            checkpoints = [("checkpoint", Path(model_dir))]
+        else:
+            config = Qwen3TTSConfig(**RANDOM_CONFIG)
+            checkpoints = [
+                (f"random {torch_dtype}".replace("torch.", ""), save_random_checkpoint(Path(tmp) / str(i), torch_dtype))
+                for i, torch_dtype in enumerate((torch.float32, torch.bfloat16))
+            ]
+
+        print(f"\n{'Checkpoint':<16} | {'Load as':<8} | {'Loader':<6} | {'First (s)':<9} | {'Warm (s)':<8} | {'Mapped':<6}")
+        print("-" * 68)
+        for name, path in checkpoints:
+            for dtype in (torch.float32, torch.bfloat16):
+                for loader_name, loader in (("read", read_load), ("mmap", mmap_load)):
+                    first, warm, fraction = time_loads(loader, path, config, dtype, runs)
+                    load_as = str(dtype).replace("torch.", "")
+                    results.append({
+                        "checkpoint": name, "load_dtype": load_as, "loader": loader_name,
+                        "first_s": first, "warm_s": warm, "mapped_fraction": fraction,
+                    })
+                    print(f"{name:<16} | {load_as:<8} | {loader_name:<6} | {first:>9.3f} | {warm:>8.3f} | {fraction:>6.0%}")
+
+    output_path = Path(__file__).resolve().parent / "benchmark_weight_mmap_results.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="First and warm (page cache hot) load times: regular read vs memory map")
+    parser.add_argument("--model-dir", help="A local checkpoint directory instead of a small random model")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(model_dir=args.model_dir, runs=args.runs)